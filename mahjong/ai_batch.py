@@ -0,0 +1,209 @@
+"""
+배치 AI 평가 모듈 (numpy 필요)
+- 여러 테이블 x 4좌석 손패를 (B, 4, 34) 개수 배열로 받아 한 번에 반응 판정
+- 론: 수패별 완성형 키 테이블로 벡터화된 화료형 체크 후, 드문 후보만 is_winning_hand로 역 확인
+- 펑/명깡: 개수 배열 마스크, 후보 전체의 호출 후 역 점수를 쌓은 개수 배열로 한 번에 계산해
+  역 부족(MIN_OPEN_YAKU_POINTS 미만)은 거절, 남은 후보만 evaluate_call로 샹텐/유효패 점수 계산
+  (샹텐 탐색은 배열 연산으로 표현하지 않으므로 남은 후보는 좌석별 계산)
+"""
+
+import numpy as np
+
+from mahjong_game import TILE_KINDS, NUM_TILE_KINDS, is_winning_hand
+from mahjong_ai import (evaluate_call, EAST_KIND, DRAGON_KINDS, TERMINAL_HONOR_KINDS, MIN_OPEN_YAKU_POINTS)
+
+
+# 수패 9칸 개수 벡터 -> 5진수 키
+SUIT_KEY_POWERS = np.array([5 ** i for i in range(9)], dtype=np.int64)
+SUIT_SLICES = (slice(0, 9), slice(9, 18), slice(18, 27))
+HONOR_SLICE = slice(27, 34)
+DRAGON_INDEX = np.array(DRAGON_KINDS)
+TERMINAL_HONOR_INDEX = np.array(sorted(TERMINAL_HONOR_KINDS))
+CALL_USED = {'peng': 2, 'ming_gang': 3}
+
+
+def _build_suit_key_tables():
+    """한 수패로 만들 수 있는 (몸통만) / (몸통 + 머리 1개) 완성형 키 집합"""
+    meld_shapes = []
+    for i in range(9):
+        shape = [0] * 9
+        shape[i] = 3
+        meld_shapes.append(tuple(shape))
+    for i in range(7):
+        shape = [0] * 9
+        shape[i] = shape[i + 1] = shape[i + 2] = 1
+        meld_shapes.append(tuple(shape))
+
+    complete = {(0,) * 9}
+    frontier = set(complete)
+    for _ in range(4):
+        grown = set()
+        for counts in frontier:
+            for shape in meld_shapes:
+                merged = tuple(a + b for a, b in zip(counts, shape))
+                if max(merged) <= 4:
+                    grown.add(merged)
+        complete |= grown
+        frontier = grown
+
+    with_pair = set()
+    for counts in complete:
+        if sum(counts) > 12:
+            continue
+        for i in range(9):
+            if counts[i] + 2 <= 4:
+                merged = list(counts)
+                merged[i] += 2
+                with_pair.add(tuple(merged))
+
+    def to_keys(patterns):
+        return np.sort(np.array([sum(c * 5 ** i for i, c in enumerate(p)) for p in patterns], dtype=np.int64))
+
+    return to_keys(complete), to_keys(with_pair)
+
+
+COMPLETE_SUIT_KEYS, PAIR_SUIT_KEYS = _build_suit_key_tables()
+
+
+def agari_shape_mask(counts):
+    """(..., 34) 개수 배열 중 4몸통 1머리 화료형인 것 (역 확인 전)"""
+    counts = np.asarray(counts, dtype=np.int64)
+    valid = counts.sum(axis=-1) == 14
+    pair_groups = np.zeros(counts.shape[:-1], dtype=np.int64)
+
+    for suit in SUIT_SLICES:
+        keys = counts[..., suit] @ SUIT_KEY_POWERS
+        is_complete = np.isin(keys, COMPLETE_SUIT_KEYS)
+        has_pair = np.isin(keys, PAIR_SUIT_KEYS)
+        valid &= is_complete | has_pair
+        pair_groups += has_pair
+
+    honors = counts[..., HONOR_SLICE]
+    valid &= ~np.any((honors == 1) | (honors == 4), axis=-1)
+    pair_groups += np.sum(honors == 2, axis=-1)
+
+    return valid & (pair_groups == 1)
+
+
+def yaku_potential_batch(counts, meld_counts):
+    """(..., 34) 손패/종류별 멜드 수 배열의 역 점수 추정 (estimate_yaku_potential과 같은 규칙)"""
+    counts = np.asarray(counts, dtype=np.int64)
+    total = counts + 3 * np.asarray(meld_counts, dtype=np.int64)
+    points = np.zeros(counts.shape[:-1])
+
+    # 동 커쯔 (자풍+장풍) / 동 대자
+    points += np.where(total[..., EAST_KIND] >= 3, 2.0, np.where(counts[..., EAST_KIND] == 2, 1.0, 0.0))
+    # 삼원패 커쯔 / 대자
+    dragon_total = total[..., DRAGON_INDEX]
+    points += np.where(dragon_total >= 3, 1.0, np.where(counts[..., DRAGON_INDEX] == 2, 0.5, 0.0)).sum(axis=-1)
+    # 탕야오
+    points += ~np.any(total[..., TERMINAL_HONOR_INDEX] > 0, axis=-1)
+    # 혼일색/청일색
+    man = total[..., 0:9].sum(axis=-1)
+    tong = total[..., 9:18].sum(axis=-1)
+    honor = total[..., HONOR_SLICE].sum(axis=-1)
+    points += np.where((man == 0) != (tong == 0), np.where(honor > 0, 2.0, 8.0), 0.0)
+    # 돌돌이
+    triplets = np.sum(total >= 3, axis=-1)
+    points += np.where(triplets >= 4, 2.0, np.where(triplets == 3, 1.0, 0.0))
+    return points
+
+
+def counts_to_tiles(counts):
+    """개수 벡터를 패 이름 목록으로 변환 (평가 함수 입력용)"""
+    tiles = []
+    for kind, count in enumerate(counts):
+        tiles.extend([TILE_KINDS[kind]] * int(count))
+    return tiles
+
+
+def evaluate_reactions_batch(hand_counts, meld_counts, flower_counts, discarded_kinds, discarders,
+                             visible_counts=None, score_calls=True):
+    """B개 테이블의 버림패 1장에 대한 4좌석 반응을 한 번에 판정
+
+    hand_counts: (B, 4, 34) 손패 개수, meld_counts: (B, 4, 34) 종류별 멜드 수(펑/깡 1개 = 1),
+    flower_counts: (B, 4), discarded_kinds: (B,), discarders: (B,), visible_counts: (B, 34).
+    반환: 'ron', 'peng', 'ming_gang' (B, 4) 불리언 마스크와
+    'peng_score', 'gang_score' (합법이 아니거나 역 부족으로 거절이면 nan), 'peng_accept', 'gang_accept'.
+    """
+    hand_counts = np.asarray(hand_counts, dtype=np.int64)
+    meld_counts = np.asarray(meld_counts, dtype=np.int64)
+    flower_counts = np.asarray(flower_counts, dtype=np.int64)
+    discarded_kinds = np.asarray(discarded_kinds, dtype=np.int64)
+    discarders = np.asarray(discarders, dtype=np.int64)
+    batch = hand_counts.shape[0]
+    rows = np.arange(batch)
+
+    # 버린 사람 제외
+    others = np.ones((batch, 4), dtype=bool)
+    others[rows, discarders] = False
+
+    # 펑/명깡 합법 마스크
+    held = hand_counts[rows, :, discarded_kinds]
+    peng = others & (held >= 2)
+    ming_gang = others & (held >= 3)
+
+    # 론: 멜드를 3장씩 펼친 가상 손패 + 버림패로 화료형 체크
+    virtual = hand_counts + 3 * meld_counts
+    virtual[rows, :, discarded_kinds] += 1
+    ron = others & agari_shape_mask(virtual)
+
+    # 화료형 후보만 역 확인 (드묾)
+    for b, seat in zip(*np.nonzero(ron)):
+        is_menzen = meld_counts[b, seat].sum() == 0
+        if not is_winning_hand(counts_to_tiles(virtual[b, seat]), is_tsumo=False, is_menzen=is_menzen,
+                               flower_count=int(flower_counts[b, seat])):
+            ron[b, seat] = False
+
+    result = {
+        'ron': ron,
+        'peng': peng,
+        'ming_gang': ming_gang,
+        'peng_score': np.full((batch, 4), np.nan),
+        'gang_score': np.full((batch, 4), np.nan),
+        'peng_accept': np.zeros((batch, 4), dtype=bool),
+        'gang_accept': np.zeros((batch, 4), dtype=bool),
+    }
+    if not score_calls:
+        return result
+
+    # 펑/깡 후보 전체의 호출 후 개수 배열을 쌓아 역 점수를 한 번에 계산
+    candidates = [(b, seat, call_type) for call_type in CALL_USED
+                  for b, seat in zip(*np.nonzero(result[call_type] & ~ron))]
+    if not candidates:
+        return result
+    index = np.array([(b, seat) for b, seat, _ in candidates])
+    kinds = discarded_kinds[index[:, 0]]
+    after_counts = hand_counts[index[:, 0], index[:, 1]].copy()
+    after_melds = meld_counts[index[:, 0], index[:, 1]].copy()
+    call_rows = np.arange(len(candidates))
+    after_counts[call_rows, kinds] -= [CALL_USED[call_type] for _, _, call_type in candidates]
+    after_melds[call_rows, kinds] += 1
+    potential = yaku_potential_batch(after_counts, after_melds)
+
+    # 역이 되는 후보만 샹텐/유효패 점수 계산 (역 부족 후보는 거절, 점수 nan)
+    for row in np.nonzero(potential >= MIN_OPEN_YAKU_POINTS)[0]:
+        b, seat, call_type = candidates[row]
+        score_key, accept_key = ('peng_score', 'peng_accept') if call_type == 'peng' else ('gang_score', 'gang_accept')
+        visible = visible_counts[b] if visible_counts is not None else None
+        evaluation = evaluate_call(counts_to_tiles(hand_counts[b, seat]), TILE_KINDS[kinds[row]], call_type,
+                                   counts_to_tiles(meld_counts[b, seat]), visible)
+        result[score_key][b, seat] = evaluation['score']
+        result[accept_key][b, seat] = evaluation['accept']
+
+    return result
+
+
+def evaluate_table_reactions(hand_counts, meld_counts, flower_counts, discarded_kind, discarder,
+                             visible_counts=None, score_calls=True):
+    """테이블 1개용 래퍼 - (4, 34) 입력, (4,) 결과"""
+    visible = None if visible_counts is None else np.asarray(visible_counts)[None]
+    result = evaluate_reactions_batch(np.asarray(hand_counts)[None], np.asarray(meld_counts)[None],
+                                      np.asarray(flower_counts)[None], [discarded_kind], [discarder],
+                                      visible, score_calls)
+    return {key: value[0] for key, value in result.items()}
+
+
+def empty_count_array(batch=1):
+    """(B, 4, 34) 0 개수 배열"""
+    return np.zeros((batch, 4, NUM_TILE_KINDS), dtype=np.int64)
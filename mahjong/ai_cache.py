@@ -0,0 +1,301 @@
+"""
+AI 의사결정 캐시 모듈
+- Zobrist 해시 (손패/멜드 수/공개패 개수, 패 1장 변화마다 O(1) 갱신)
+- ZobristTracker: EventLog 구독자 - 쯔모/버림/펑/깡 이벤트로 좌석별 키를 갱신
+  (MAHJONG_ZOBRIST_CHECK=1이면 결정마다 전체 해시와 비교하는 디버그 검사)
+- 스레드 안전한 크기 제한 LRU 캐시 (좌석/게임 간 공유)
+- 캐시 파일 저장/불러오기 (고정 struct 레이아웃 + 형식 버전, 실행 코드 없음)
+"""
+
+import os
+import random
+import struct
+import threading
+from collections import OrderedDict
+
+from mahjong_game import NUM_TILE_KINDS, tile_to_kind
+from mahjong_ai import evaluate_discards
+from game_events import EVENT_START, EVENT_DRAW, EVENT_DISCARD, EVENT_PENG, EVENT_GANG
+
+
+# 캐시 파일 형식 버전 (해시 테이블이나 평가 함수가 바뀌면 올릴 것)
+CACHE_FORMAT_VERSION = 2
+CACHE_MAGIC = b'MJAC'
+
+# 캐시 파일 고정 레이아웃 (리틀 엔디언): 헤더 뒤에 항목마다 키 + 후보 수 + 후보별 (샹텐, 유효패 수, 패 인덱스)
+_CACHE_HEADER = struct.Struct('<4sHI')   # magic, 버전, 항목 수
+_CACHE_ENTRY = struct.Struct('<QB')      # Zobrist 키, 후보 수
+_CACHE_SCORE = struct.Struct('<bHB')     # 샹텐, 유효패 수, 패 인덱스
+
+# 설정 시 이벤트로 갱신한 키를 결정마다 전체 해시와 비교 (디버그용)
+ZOBRIST_CHECK_ENV = "MAHJONG_ZOBRIST_CHECK"
+
+# 실행마다 같은 키가 나오도록 고정 시드로 난수 테이블 생성
+ZOBRIST_SEED = 0x4D414A4F
+MAX_TILE_COPIES = 4
+MAX_MELDS = 4
+
+
+def _build_zobrist_tables(seed=ZOBRIST_SEED):
+    """(손패 종류, 몇 번째 장) / (공개패 종류, 몇 번째 장) / 멜드 수 난수 테이블"""
+    rng = random.Random(seed)
+    hand_table = tuple(tuple(rng.getrandbits(64) for _ in range(MAX_TILE_COPIES))
+                       for _ in range(NUM_TILE_KINDS))
+    visible_table = tuple(tuple(rng.getrandbits(64) for _ in range(MAX_TILE_COPIES))
+                          for _ in range(NUM_TILE_KINDS))
+    meld_table = tuple(rng.getrandbits(64) for _ in range(MAX_MELDS + 1))
+    return hand_table, visible_table, meld_table
+
+
+HAND_TABLE, VISIBLE_TABLE, MELD_TABLE = _build_zobrist_tables()
+
+
+def hash_state(counts, meld_count=0, visible_counts=None):
+    """손패 개수/멜드 수/공개패 개수의 Zobrist 해시 (전체 계산)"""
+    key = MELD_TABLE[min(meld_count, MAX_MELDS)]
+    for kind in range(NUM_TILE_KINDS):
+        for copy in range(min(counts[kind], MAX_TILE_COPIES)):
+            key ^= HAND_TABLE[kind][copy]
+        if visible_counts:
+            for copy in range(min(visible_counts[kind], MAX_TILE_COPIES)):
+                key ^= VISIBLE_TABLE[kind][copy]
+    return key
+
+
+class ZobristKey:
+    """패 이벤트마다 O(1)로 갱신되는 좌석별 해시 키"""
+
+    def __init__(self, counts=None, meld_count=0, visible_counts=None):
+        self.counts = list(counts) if counts else [0] * NUM_TILE_KINDS
+        self.visible_counts = list(visible_counts) if visible_counts else [0] * NUM_TILE_KINDS
+        self.meld_count = meld_count
+        self.value = hash_state(self.counts, meld_count, self.visible_counts)
+
+    def add_hand_tile(self, kind):
+        """손패에 1장 추가"""
+        copy = self.counts[kind]
+        if copy < MAX_TILE_COPIES:
+            self.value ^= HAND_TABLE[kind][copy]
+        self.counts[kind] += 1
+
+    def remove_hand_tile(self, kind):
+        """손패에서 1장 제거"""
+        self.counts[kind] -= 1
+        copy = self.counts[kind]
+        if copy < MAX_TILE_COPIES:
+            self.value ^= HAND_TABLE[kind][copy]
+
+    def add_visible_tile(self, kind):
+        """공개패(버림패/멜드) 1장 추가"""
+        copy = self.visible_counts[kind]
+        if copy < MAX_TILE_COPIES:
+            self.value ^= VISIBLE_TABLE[kind][copy]
+        self.visible_counts[kind] += 1
+
+    def remove_visible_tile(self, kind):
+        """공개패 1장 제거 (펑으로 버림패가 옮겨질 때 등)"""
+        self.visible_counts[kind] -= 1
+        copy = self.visible_counts[kind]
+        if copy < MAX_TILE_COPIES:
+            self.value ^= VISIBLE_TABLE[kind][copy]
+
+    def set_meld_count(self, meld_count):
+        """멜드 수 변경"""
+        self.value ^= MELD_TABLE[min(self.meld_count, MAX_MELDS)] ^ MELD_TABLE[min(meld_count, MAX_MELDS)]
+        self.meld_count = meld_count
+
+    def sync(self, counts, meld_count, visible_counts):
+        """새 관측과의 차이만큼 갱신 (34종 비교 - 디버그 검사/이벤트 없는 복구용)"""
+        for kind in range(NUM_TILE_KINDS):
+            while self.counts[kind] < counts[kind]:
+                self.add_hand_tile(kind)
+            while self.counts[kind] > counts[kind]:
+                self.remove_hand_tile(kind)
+            while self.visible_counts[kind] < visible_counts[kind]:
+                self.add_visible_tile(kind)
+            while self.visible_counts[kind] > visible_counts[kind]:
+                self.remove_visible_tile(kind)
+        if meld_count != self.meld_count:
+            self.set_meld_count(meld_count)
+        return self.value
+
+
+class ZobristTracker:
+    """EventLog 구독자 - 좌석별 ZobristKey를 패 이벤트마다 O(1)로 갱신
+
+    판 시작 키프레임에서 전체 해시를 한 번 계산하고, 이후 쯔모는 손패 +1, 버림은 손패 -1 / 공개패 +1,
+    펑/깡은 손패에서 빠진 패만큼 손패 -1 / 공개패 +1 (가져온 버림패는 공개패 안에서 옮겨질 뿐) 갱신한다.
+    """
+
+    def __init__(self):
+        self.keys = None  # 판 시작 전에는 None
+        self.check = bool(os.environ.get(ZOBRIST_CHECK_ENV))
+        self.handlers = {EVENT_START: self.on_start, EVENT_DRAW: self.on_draw, EVENT_DISCARD: self.on_discard,
+                         EVENT_PENG: self.on_call, EVENT_GANG: self.on_call}
+
+    def attach(self, event_log):
+        event_log.subscribe(self.on_event, tuple(self.handlers))
+        if event_log.state is not None:
+            self.on_start(None, event_log.state)
+
+    def detach(self, event_log):
+        event_log.unsubscribe(self.on_event)
+        self.keys = None
+
+    def on_event(self, event, state):
+        self.handlers[event.kind](event, state)
+
+    def on_start(self, event, state):
+        visible = [0] * NUM_TILE_KINDS
+        for seat in state.seats:
+            for tile in seat.discards:
+                kind = tile_to_kind(tile)
+                if kind >= 0:
+                    visible[kind] += 1
+            for meld in seat.melds:
+                for tile in meld.tiles:
+                    kind = tile_to_kind(tile)
+                    if kind >= 0:
+                        visible[kind] += 1
+        self.keys = [ZobristKey(seat.counts, len(seat.melds), visible) for seat in state.seats]
+
+    def on_draw(self, event, state):
+        kind = tile_to_kind(event.tile)
+        if kind >= 0:  # 꽃패는 손패 개수에 없음
+            self.keys[event.seat].add_hand_tile(kind)
+
+    def on_discard(self, event, state):
+        kind = tile_to_kind(event.tile)
+        self.keys[event.seat].remove_hand_tile(kind)
+        for key in self.keys:
+            key.add_visible_tile(kind)
+
+    def on_call(self, event, state):
+        key = self.keys[event.seat]
+        for tile in event.detail.removed:
+            kind = tile_to_kind(tile)
+            key.remove_hand_tile(kind)
+            for other in self.keys:
+                other.add_visible_tile(kind)
+        key.set_meld_count(len(state.seats[event.seat].melds))
+
+    def key(self, seat, counts, meld_count, visible_counts):
+        """좌석의 현재 키 (판 시작 전이면 None) - 디버그 검사 시 관측과 다르면 경고 후 관측에 맞춤"""
+        if self.keys is None:
+            return None
+        key = self.keys[seat]
+        if self.check and key.value != hash_state(counts, meld_count, visible_counts):
+            print(f"⚠️ Zobrist 키 불일치 (좌석 {seat}) - 관측으로 다시 맞춤")
+            key.sync(counts, meld_count, visible_counts)
+        return key.value
+
+
+class DecisionCache:
+    """스레드 안전한 크기 제한 LRU 캐시"""
+
+    def __init__(self, maxsize=200000):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key, default=None):
+        """캐시 조회 (최근 사용으로 갱신)"""
+        with self.lock:
+            value = self.entries.get(key)
+            if value is None:
+                self.misses += 1
+                return default
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        """캐시 저장 (가득 차면 가장 오래된 항목 제거)"""
+        with self.lock:
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+    def get_or_compute(self, key, compute):
+        """캐시에 없으면 계산해서 저장 (계산은 잠금 밖에서 수행)"""
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        """캐시 비우기"""
+        with self.lock:
+            self.entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def get_stats(self):
+        """적중률 통계"""
+        with self.lock:
+            total = self.hits + self.misses
+            return {
+                'size': len(self.entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0,
+            }
+
+    def save(self, path):
+        """캐시를 고정 레이아웃 바이너리 파일로 저장 (임시 파일에 쓴 뒤 교체)"""
+        with self.lock:
+            entries = list(self.entries.items())
+        parts = [_CACHE_HEADER.pack(CACHE_MAGIC, CACHE_FORMAT_VERSION, len(entries))]
+        for key, scores in entries:
+            parts.append(_CACHE_ENTRY.pack(key, len(scores)))
+            parts.extend(_CACHE_SCORE.pack(*score) for score in scores)
+        temp_path = path + ".tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(b''.join(parts))
+        os.replace(temp_path, path)
+
+    def load(self, path):
+        """파일에서 캐시 불러오기 (없거나 형식/버전이 다르거나 잘렸으면 무시)"""
+        if not os.path.exists(path):
+            return 0
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            magic, version, count = _CACHE_HEADER.unpack_from(data, 0)
+            if magic != CACHE_MAGIC or version != CACHE_FORMAT_VERSION:
+                print(f"⚠️ AI 캐시 형식/버전 불일치: {magic!r} v{version}")
+                return 0
+            entries = []
+            offset = _CACHE_HEADER.size
+            for _ in range(count):
+                key, length = _CACHE_ENTRY.unpack_from(data, offset)
+                offset += _CACHE_ENTRY.size
+                entries.append((key, tuple(_CACHE_SCORE.unpack_from(data, offset + index * _CACHE_SCORE.size)
+                                           for index in range(length))))
+                offset += length * _CACHE_SCORE.size
+        except (OSError, struct.error) as e:
+            print(f"⚠️ AI 캐시 불러오기 실패: {e}")
+            return 0
+        for key, value in entries:
+            self.put(key, value)
+        return len(entries)
+
+
+# 모든 좌석/게임이 함께 쓰는 캐시
+SHARED_DECISION_CACHE = DecisionCache()
+
+
+def cached_evaluate_discards(counts, meld_count=0, visible_counts=None, key=None, cache=None):
+    """버림패 후보별 평가를 캐시를 거쳐 반환 (key가 없으면 전체 해시 계산)"""
+    if cache is None:
+        cache = SHARED_DECISION_CACHE
+    if key is None:
+        key = hash_state(counts, meld_count, visible_counts)
+    return cache.get_or_compute(key, lambda: evaluate_discards(counts, meld_count, visible_counts))
@@ -0,0 +1,424 @@
+"""
+AI 전략 모듈
+- 전략 인터페이스 (discard / react / self_action)
+- 전략 레지스트리 및 좌석별 생성
+- 좌석별 의사결정 시간 통계
+"""
+
+import random
+import time
+
+from mahjong_game import hand_to_counts, tile_to_kind, NUM_TILE_KINDS, WALL_KIND_COPIES
+from mahjong_ai import (ai_choose_discard, evaluate_call, evaluate_self_gang, call_yaku_potential,
+                        calculate_shanten, best_discard_state, evaluate_discards, MIN_OPEN_YAKU_POINTS)
+from ai_cache import SHARED_DECISION_CACHE, ZobristTracker, cached_evaluate_discards
+from bot_protocol import (BotConnection, legal_action_bits, DEFAULT_DEADLINE_MS,
+                          DEFAULT_RESTART_AFTER, DEFAULT_STARTUP_MS)
+from table_rules import ACTION_TYPE_IDS
+
+
+# 이름 -> 전략 클래스
+STRATEGY_REGISTRY = {}
+
+# 기본 좌석 구성 (0번 좌석은 항상 화면 하단의 사람 플레이어)
+DEFAULT_SEAT_CONFIG = ["human", "heuristic", "heuristic", "heuristic"]
+
+
+def register_strategy(name):
+    """전략 클래스를 레지스트리에 등록하는 데코레이터"""
+    def decorator(cls):
+        cls.name = name
+        STRATEGY_REGISTRY[name] = cls
+        return cls
+    return decorator
+
+
+def available_strategies():
+    """등록된 전략 이름 목록"""
+    return sorted(STRATEGY_REGISTRY)
+
+
+def create_strategy(name, **options):
+    """이름으로 전략 인스턴스 생성"""
+    if name not in STRATEGY_REGISTRY:
+        raise ValueError(f"알 수 없는 AI 전략: {name} (가능: {', '.join(available_strategies())})")
+    return STRATEGY_REGISTRY[name](**options)
+
+
+def build_seat_strategies(seat_config=None, event_log=None):
+    """좌석 구성으로 좌석별 전략 목록 생성 (사람 좌석은 None)
+
+    seat_config 항목은 전략 이름 문자열 또는 {'strategy': 이름, ...옵션} 딕셔너리.
+    event_log를 주면 각 전략을 테이블 이벤트에 연결한다 (AIStrategy.attach).
+    """
+    seat_config = list(seat_config or DEFAULT_SEAT_CONFIG)
+    if len(seat_config) != 4:
+        raise ValueError(f"좌석 구성은 4개여야 합니다: {seat_config}")
+
+    strategies = []
+    for seat, entry in enumerate(seat_config):
+        if isinstance(entry, dict):
+            options = dict(entry)
+            name = options.pop('strategy')
+        else:
+            name, options = entry, {}
+
+        if name == "human":
+            if seat != 0:
+                raise ValueError(f"사람 플레이어는 0번 좌석만 가능합니다: {seat}번")
+            strategies.append(None)
+        else:
+            if seat == 0:
+                raise ValueError("0번 좌석은 사람 플레이어여야 합니다")
+            strategy = create_strategy(name, **options)
+            if event_log is not None:
+                strategy.attach(event_log)
+            strategies.append(strategy)
+    return strategies
+
+
+class DecisionStats:
+    """좌석별 의사결정 시간 통계"""
+
+    def __init__(self):
+        self.counts = {}
+        self.total_time = {}
+        self.max_time = {}
+
+    def record(self, kind, elapsed):
+        """결정 1회 기록 (초 단위)"""
+        self.counts[kind] = self.counts.get(kind, 0) + 1
+        self.total_time[kind] = self.total_time.get(kind, 0.0) + elapsed
+        self.max_time[kind] = max(self.max_time.get(kind, 0.0), elapsed)
+
+    def summary(self):
+        """결정 종류별 횟수, 평균/최대 시간(ms)"""
+        result = {}
+        for kind, count in self.counts.items():
+            result[kind] = {
+                'count': count,
+                'mean_ms': self.total_time[kind] / count * 1000.0,
+                'max_ms': self.max_time[kind] * 1000.0,
+            }
+        return result
+
+    def reset(self):
+        """통계 초기화"""
+        self.counts.clear()
+        self.total_time.clear()
+        self.max_time.clear()
+
+
+class AIStrategy:
+    """AI 전략 기본 클래스
+
+    관측(observation)은 MahjongGame.build_ai_observation 이 만드는 딕셔너리:
+    seat, hand, drawn_tile, meld_tiles, flower_count, visible_counts,
+    discard_piles, scores, wall_remaining.
+    """
+
+    name = "base"
+    verbose = True  # False면 결정 디버그 출력 없음 (헤드리스 테이블/서버)
+
+    def __init__(self):
+        self.stats = DecisionStats()
+
+    # --- 하위 클래스가 구현하는 결정 함수 ---
+
+    def discard(self, observation):
+        """버릴 패 선택 (손패의 패 이름 반환)"""
+        raise NotImplementedError
+
+    def react(self, observation, actions):
+        """다른 플레이어 버림패에 대한 액션 선택 (액션 딕셔너리 또는 None=패스)"""
+        raise NotImplementedError
+
+    def self_action(self, observation, actions):
+        """자기 턴 액션(암깡/가깡/리치) 선택 (액션 딕셔너리 또는 None)"""
+        raise NotImplementedError
+
+    # --- 게임에서 호출하는 시간 측정 래퍼 ---
+
+    def choose_discard(self, observation):
+        """버림패 결정 (시간 측정)"""
+        start = time.perf_counter()
+        tile = self.discard(observation)
+        self.stats.record('discard', time.perf_counter() - start)
+        if tile not in observation['hand']:
+            return ai_choose_discard(observation['hand'], observation['seat'], self.verbose)
+        return tile
+
+    def choose_reaction(self, observation, actions):
+        """버림패 반응 결정 (시간 측정)"""
+        start = time.perf_counter()
+        action = self.react(observation, actions)
+        self.stats.record('react', time.perf_counter() - start)
+        return action if action in actions else None
+
+    def choose_self_action(self, observation, actions):
+        """자기 턴 액션 결정 (시간 측정)"""
+        start = time.perf_counter()
+        action = self.self_action(observation, actions)
+        self.stats.record('self_action', time.perf_counter() - start)
+        return action if action in actions else None
+
+    def attach(self, event_log):
+        """테이블 이벤트 로그 연결 (이벤트로 상태를 갱신하는 전략만 구현)"""
+        pass
+
+    def detach(self, event_log):
+        pass
+
+    def close(self):
+        """전략이 가진 외부 자원 정리"""
+        pass
+
+
+def _best_reaction(observation, actions):
+    """호출 평가 점수가 가장 높은 수락 액션 (론은 항상 최우선)"""
+    best_action = None
+    best_score = None
+    for action in actions:
+        if action['type'] == 'ron':
+            return action
+        if action['type'] not in ('peng', 'ming_gang'):
+            continue
+        # 역 부족 호출은 evaluate_call도 거절하므로 샹텐/유효패 계산 전에 거름
+        if call_yaku_potential(observation['hand'], action['tile'], action['type'],
+                               observation['meld_tiles']) < MIN_OPEN_YAKU_POINTS:
+            continue
+        evaluation = evaluate_call(observation['hand'], action['tile'], action['type'],
+                                   observation['meld_tiles'], observation['visible_counts'])
+        if evaluation['accept'] and (best_score is None or evaluation['score'] > best_score):
+            best_action = action
+            best_score = evaluation['score']
+    return best_action
+
+
+@register_strategy("random")
+class RandomStrategy(AIStrategy):
+    """무작위 전략 (기준선 비교용)"""
+
+    def __init__(self, seed=None, call_rate=0.5):
+        super().__init__()
+        self.rng = random.Random(seed)
+        self.call_rate = call_rate
+
+    def discard(self, observation):
+        return self.rng.choice(observation['hand'])
+
+    def react(self, observation, actions):
+        if actions and self.rng.random() < self.call_rate:
+            return self.rng.choice(actions)
+        return None
+
+    def self_action(self, observation, actions):
+        if actions and self.rng.random() < self.call_rate:
+            return self.rng.choice(actions)
+        return None
+
+
+@register_strategy("heuristic")
+class HeuristicStrategy(AIStrategy):
+    """기존 AI 동작 (자패 우선 버리기 + 호출 평가 + 첫 번째 자기 턴 액션)"""
+
+    def discard(self, observation):
+        return ai_choose_discard(observation['hand'], observation['seat'], self.verbose)
+
+    def react(self, observation, actions):
+        return _best_reaction(observation, actions)
+
+    def self_action(self, observation, actions):
+        return actions[0] if actions else None
+
+
+# 이미 불러온 캐시 파일 (여러 좌석이 같은 파일을 지정해도 한 번만 읽기)
+_loaded_cache_files = set()
+
+
+@register_strategy("efficiency")
+class EfficiencyStrategy(AIStrategy):
+    """패 효율 전략 - 샹텐 수 최소, 유효패 최대 버림패 선택 (공유 캐시 사용)"""
+
+    def __init__(self, use_cache=True, cache_file=None):
+        super().__init__()
+        self.cache = SHARED_DECISION_CACHE if use_cache else None
+        self.cache_file = cache_file
+        self.tracker = None  # 이벤트 로그에 연결되면 좌석별 증분 해시 키
+        self.event_log = None
+        if self.cache is not None and cache_file and cache_file not in _loaded_cache_files:
+            _loaded_cache_files.add(cache_file)
+            loaded = self.cache.load(cache_file)
+            print(f"💾 AI 캐시 {loaded}개 불러옴: {cache_file}")
+
+    def attach(self, event_log):
+        """이벤트 로그 연결 - 쯔모/버림/펑/깡 이벤트로 캐시 키를 갱신 (좌석 여러 개가 공유해도 한 번만)"""
+        if self.cache is None or self.event_log is event_log:
+            return
+        if self.event_log is not None:
+            self.detach(self.event_log)
+        self.tracker = ZobristTracker()
+        self.tracker.attach(event_log)
+        self.event_log = event_log
+
+    def detach(self, event_log):
+        if self.event_log is event_log:
+            self.tracker.detach(event_log)
+            self.tracker = self.event_log = None
+
+    def discard_scores(self, observation):
+        """버림패 후보별 (샹텐, 유효패 수, 패 인덱스) - 캐시 사용 시 이벤트로 갱신한 키로 조회
+
+        이벤트 로그에 연결되지 않았으면 키를 관측에서 전체 계산한다.
+        """
+        counts = hand_to_counts(observation['hand'])
+        meld_count = len(observation['meld_tiles'])
+        visible = observation['visible_counts']
+        if self.cache is None:
+            return evaluate_discards(counts, meld_count, visible)
+        key = None
+        if self.tracker is not None:
+            key = self.tracker.key(observation['seat'], counts, meld_count, visible)
+        return cached_evaluate_discards(counts, meld_count, visible, key=key, cache=self.cache)
+
+    def discard(self, observation):
+        _, _, kind = best_discard_state(None, discard_scores=self.discard_scores(observation))
+        return _tile_of_kind(observation['hand'], kind)
+
+    def close(self):
+        if self.cache is not None and self.cache_file:
+            self.cache.save(self.cache_file)
+            print(f"💾 AI 캐시 {len(self.cache)}개 저장: {self.cache_file}")
+
+    def react(self, observation, actions):
+        return _best_reaction(observation, actions)
+
+    def self_action(self, observation, actions):
+        for action in actions:
+            if action['type'] in ('an_gang', 'jia_gang') and action.get('tiles'):
+                evaluation = evaluate_self_gang(observation['hand'], action['tiles'][0], action['type'],
+                                                observation['meld_tiles'], observation['visible_counts'])
+                if evaluation['accept']:
+                    return action
+        for action in actions:
+            if action['type'] == 'riichi':
+                return action
+        return None
+
+
+@register_strategy("montecarlo")
+class MonteCarloStrategy(EfficiencyStrategy):
+    """몬테카를로 전략 - 상위 버림패 후보마다 무작위 쯔모를 시뮬레이션"""
+
+    def __init__(self, seed=None, candidates=4, rollouts=16, depth=5, use_cache=True, cache_file=None):
+        super().__init__(use_cache, cache_file)
+        self.rng = random.Random(seed)
+        self.candidates = candidates
+        self.rollouts = rollouts
+        self.depth = depth
+
+    def discard(self, observation):
+        hand = observation['hand']
+        counts = hand_to_counts(hand)
+        meld_count = len(observation['meld_tiles'])
+        visible = observation['visible_counts']
+
+        # 패 효율로 후보 추리기
+        ranked = self.discard_scores(observation)
+        if not ranked:
+            return ai_choose_discard(hand, observation['seat'], self.verbose)
+
+        # 남은 패 풀 (내 손패와 공개패 제외)
+        pool = []
+        for kind in range(NUM_TILE_KINDS):
+            remaining = WALL_KIND_COPIES[kind] - counts[kind] - visible[kind]
+            pool.extend([kind] * max(0, remaining))
+
+        best_kind = ranked[0][2]
+        best_value = None
+        for _, _, kind in ranked[:self.candidates]:
+            counts[kind] -= 1
+            value = self._rollout_value(counts, meld_count, pool)
+            counts[kind] += 1
+            if best_value is None or value > best_value:
+                best_kind = kind
+                best_value = value
+        return _tile_of_kind(hand, best_kind)
+
+    def _rollout_value(self, counts, meld_count, pool):
+        """무작위 쯔모 후 탐욕적 버리기를 반복한 평균 가치 (화료 1.0, 샹텐 감소 가산)"""
+        if not pool:
+            return 0.0
+        start_shanten = calculate_shanten(counts, meld_count)
+        total = 0.0
+        for _ in range(self.rollouts):
+            sim = list(counts)
+            shanten = start_shanten
+            for _ in range(self.depth):
+                drawn = self.rng.choice(pool)
+                sim[drawn] += 1
+                if calculate_shanten(sim, meld_count) < 0:
+                    shanten = -1
+                    break
+                best = None
+                for kind in range(NUM_TILE_KINDS):
+                    if sim[kind] == 0:
+                        continue
+                    sim[kind] -= 1
+                    candidate = calculate_shanten(sim, meld_count)
+                    sim[kind] += 1
+                    if best is None or candidate < best[0]:
+                        best = (candidate, kind)
+                sim[best[1]] -= 1
+                shanten = best[0]
+            total += 1.0 if shanten < 0 else (start_shanten - shanten) * 0.1
+        return total / self.rollouts
+
+
+@register_strategy("external")
+class ExternalStrategy(AIStrategy):
+    """외부 봇 전략 - bot_protocol 한 줄 프로토콜 (표준 입출력 command 또는 Unix 소켓 path)
+
+    결정마다 deadline_ms 기한, 기한 초과/통신 오류/잘못된 응답이면 bot_protocol.fallback_action
+    (버리기는 ai_improved_discard, 반응/자기 턴은 패스)으로 대신 결정한다.
+    봇을 (다시) 띄운 첫 결정에는 기동 시간 startup_ms를 더해 주고,
+    하위 프로세스 봇이 restart_after번 연속 기한을 넘기면 멈춘 것으로 보고 다시 띄운다.
+    론은 묻지 않고 항상 수락하고, 리치는 액션 번호가 없어 봇에게 넘기지 않는다.
+    """
+
+    def __init__(self, command=None, path=None, deadline_ms=DEFAULT_DEADLINE_MS,
+                 restart_after=DEFAULT_RESTART_AFTER, startup_ms=DEFAULT_STARTUP_MS):
+        super().__init__()
+        self.connection = BotConnection(command, path, deadline_ms, restart_after, startup_ms)
+
+    def _decide(self, decision_type, observation, actions=()):
+        """봇 결정 1건 (허용 액션 번호, 응답이 없으면 fallback_action)"""
+        legal_bits = legal_action_bits(decision_type, observation['hand'], actions)
+        return self.connection.decide([(decision_type, observation, legal_bits)])[0]
+
+    def _choose_action(self, decision_type, observation, actions):
+        action_id = self._decide(decision_type, observation, actions)
+        return next((action for action in actions if ACTION_TYPE_IDS.get(action['type']) == action_id), None)
+
+    def discard(self, observation):
+        return _tile_of_kind(observation['hand'], self._decide('d', observation))
+
+    def react(self, observation, actions):
+        ron = next((action for action in actions if action['type'] == 'ron'), None)
+        return ron or self._choose_action('r', observation, actions)
+
+    def self_action(self, observation, actions):
+        if not any(action['type'] in ACTION_TYPE_IDS for action in actions):
+            return None
+        return self._choose_action('s', observation, actions)
+
+    def close(self):
+        self.connection.close()
+
+
+def _tile_of_kind(hand, kind):
+    """손패에서 해당 종류의 실제 패 하나 찾기"""
+    for tile in hand:
+        if tile_to_kind(tile) == kind:
+            return tile
+    return hand[-1] if hand else None
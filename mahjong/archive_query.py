@@ -0,0 +1,359 @@
+"""
+판 기록 아카이브 색인/질의 (numpy 필요)
+- 색인 파일(index.mjix): 아카이브 전체를 한 번 훑어 만든 연속 열(결과/승자/방총/턴/점수 변화/전역 역 비트/리치 좌석)
+  + 역별, 결과별, 승자/방총/리치 좌석별 역색인(판 번호 u32 정렬 배열) - mmap으로 열어 복사 없이 사용
+- 청크가 늘어나면(판 수/청크 수가 다르면) 다시 만듦
+- HandQuery: 역색인은 교집합, 턴/점수 같은 범위 조건은 numpy 비교로 걸러 판 번호 배열을 만듦
+- aggregate: 결과 분포, 좌석별 화료/방총, 턴 통계, 평균 점수 변화, 역 빈도 (numpy)
+
+    python archive_query.py runs/ --yaku 청일색
+    python archive_query.py runs/ --result ron --loser 2 --winner-riichi
+    python archive_query.py runs/ --min-turns 61 --list 5
+"""
+
+import argparse
+import mmap
+import os
+import struct
+import sys
+import time
+
+import numpy as np
+
+from game_archive import ArchiveReader, ArchiveError, chunk_rows, list_chunks, MAX_YAKU, RESULT_TYPES
+from game_events import EVENT_RIICHI
+
+
+INDEX_NAME = 'index.mjix'
+INDEX_MAGIC = b'MJIX'
+INDEX_VERSION = 1
+
+_HEADER = struct.Struct('<4sHHQII')   # magic, version, 예약, 판 수, 청크 수, 배열 수
+_ENTRY = struct.Struct('<H4sQQ')      # 키 길이, numpy 타입, 시작 위치, 원소 수 (뒤에 키 utf-8)
+
+# 색인에 이어 붙여 두는 열 (아카이브 열 이름, numpy 타입)
+INDEX_COLUMNS = (('result', 'u1'), ('winner', 'i1'), ('loser', 'i1'), ('turns', '<u2'), ('game', '<u2'))
+
+
+def _posting(mask):
+    return np.flatnonzero(mask).astype('<u4')
+
+
+def _riichi_seats(chunk):
+    """판별 리치 선언 좌석 비트 (액션 열에서)"""
+    seats = np.zeros(len(chunk), dtype='u1')
+    actions = chunk.columns['actions']
+    rows = np.flatnonzero((actions[:, 0] & 0x0F) == EVENT_RIICHI)
+    if len(rows):
+        hands = np.searchsorted(chunk.columns['action_end'], rows, side='right')
+        np.bitwise_or.at(seats, hands, (1 << actions[rows, 1].astype('u1')).astype('u1'))
+    return seats
+
+
+def _global_yaku(chunk, yaku_bits):
+    """청크 역 비트 → 아카이브 전역 역 비트"""
+    masks = chunk.columns['yaku']
+    result = np.zeros(len(chunk), dtype='<u8')
+    for bit, name in enumerate(chunk.yaku_names):
+        if name not in yaku_bits:
+            if len(yaku_bits) >= MAX_YAKU:
+                raise ArchiveError(f"아카이브 전체 역 종류 초과: {name}")
+            yaku_bits[name] = len(yaku_bits)
+        has = (masks >> np.uint64(bit)) & np.uint64(1)
+        result |= has << np.uint64(yaku_bits[name])
+    return result
+
+
+def build_index(directory):
+    """아카이브를 훑어 색인 파일 작성 - 작성한 경로 반환"""
+    reader = ArchiveReader(directory)
+    try:
+        arrays = {'chunk_rows': np.array([len(chunk) for chunk in reader.chunks], dtype='<u8')}
+        for name, dtype in INDEX_COLUMNS:
+            arrays[name] = reader.column(name).astype(dtype)
+        arrays['deltas'] = reader.column('deltas').astype('<i2').reshape(-1)
+        yaku_bits = {}
+        parts = [_global_yaku(chunk, yaku_bits) for chunk in reader.chunks]
+        arrays['yaku'] = np.concatenate(parts) if parts else np.zeros(0, dtype='<u8')
+        parts = [_riichi_seats(chunk) for chunk in reader.chunks]
+        arrays['riichi'] = np.concatenate(parts) if parts else np.zeros(0, dtype='u1')
+        hands = len(reader)
+        chunks = len(reader.chunks)
+    finally:
+        reader.close()
+
+    yaku = arrays['yaku']
+    for name, bit in yaku_bits.items():
+        arrays[f'yaku:{name}'] = _posting(yaku & np.uint64(1 << bit))
+    for index, name in enumerate(RESULT_TYPES):
+        arrays[f'result:{name}'] = _posting(arrays['result'] == index)
+    for seat in range(4):
+        arrays[f'winner:{seat}'] = _posting(arrays['winner'] == seat)
+        arrays[f'loser:{seat}'] = _posting(arrays['loser'] == seat)
+        arrays[f'riichi:{seat}'] = _posting(arrays['riichi'] & (1 << seat))
+
+    path = os.path.join(directory, INDEX_NAME)
+    temp_path = path + '.tmp'
+    keys = list(arrays)
+    directory_size = sum(_ENTRY.size + len(key.encode('utf-8')) for key in keys)
+    offset = _HEADER.size + directory_size
+    entries = []
+    for key in keys:
+        offset += -offset % 8
+        data = np.ascontiguousarray(arrays[key])
+        entries.append((key, data, offset))
+        offset += data.nbytes
+    with open(temp_path, 'wb') as f:
+        f.write(_HEADER.pack(INDEX_MAGIC, INDEX_VERSION, 0, hands, chunks, len(keys)))
+        for key, data, start in entries:
+            encoded = key.encode('utf-8')
+            f.write(_ENTRY.pack(len(encoded), data.dtype.str.encode('ascii').ljust(4, b'\0'), start, data.size))
+            f.write(encoded)
+        for key, data, start in entries:
+            f.write(b'\0' * (start - f.tell()))
+            data.tofile(f)
+    os.replace(temp_path, path)
+    return path
+
+
+class ArchiveIndex:
+    """색인 파일 mmap - arrays[키]는 복사 없는 numpy 뷰"""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            self.mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, _, self.hands, self.chunks, count = _HEADER.unpack_from(self.mm, 0)
+        if magic != INDEX_MAGIC:
+            raise ArchiveError(f"색인 파일이 아닙니다: {path}")
+        if version != INDEX_VERSION:
+            raise ArchiveError(f"지원하지 않는 색인 버전: {version}")
+        self.arrays = {}
+        offset = _HEADER.size
+        for _ in range(count):
+            length, dtype, start, size = _ENTRY.unpack_from(self.mm, offset)
+            offset += _ENTRY.size
+            key = bytes(self.mm[offset:offset + length]).decode('utf-8')
+            offset += length
+            self.arrays[key] = np.frombuffer(self.mm, dtype.rstrip(b'\0').decode('ascii'), size, start)
+        self.arrays['deltas'] = self.arrays['deltas'].reshape(-1, 4)
+        self.yaku_names = [key[5:] for key in self.arrays if key.startswith('yaku:')]
+        self.chunk_starts = np.concatenate(([0], np.cumsum(self.arrays['chunk_rows'])))
+
+    def __len__(self):
+        return self.hands
+
+    def posting(self, key):
+        """역색인 (없는 키면 빈 배열)"""
+        return self.arrays.get(key, np.zeros(0, dtype='<u4'))
+
+    def locate(self, hand_id):
+        """전역 판 번호 → (청크 번호, 청크 안 행)"""
+        chunk = int(np.searchsorted(self.chunk_starts, hand_id, side='right')) - 1
+        return chunk, int(hand_id - self.chunk_starts[chunk])
+
+    def close(self):
+        self.arrays = {}
+        try:
+            self.mm.close()
+        except BufferError:
+            pass  # 밖에서 쓰는 배열이 있으면 마지막 참조가 사라질 때 닫힘
+
+
+def open_index(directory, rebuild=False):
+    """색인 열기 (없거나 아카이브와 청크 수/청크별 판 수가 다르면 새로 만듦)"""
+    if not os.path.isdir(directory):
+        raise ArchiveError(f"아카이브 디렉터리가 없습니다: {directory}")
+    path = os.path.join(directory, INDEX_NAME)
+    if not rebuild and os.path.exists(path):
+        index = ArchiveIndex(path)
+        rows = [chunk_rows(chunk_path) for chunk_path in list_chunks(directory)]
+        if index.chunks == len(rows) and index.hands == sum(rows) and index.arrays['chunk_rows'].tolist() == rows:
+            return index
+        index.close()
+    build_index(directory)
+    return ArchiveIndex(path)
+
+
+class HandQuery:
+    """판 조건 - 메서드를 이어 붙이고 ids()로 전역 판 번호 (정렬된 u4 배열)
+
+    역/결과/승자/방총/리치 조건은 역색인 교집합, 턴/판 번호/점수 변화 범위는 열 비교.
+    """
+
+    def __init__(self, index):
+        self.index = index
+        self.postings = []
+        self.predicates = []
+
+    def _posting(self, key):
+        self.postings.append(self.index.posting(key))
+        return self
+
+    def yaku(self, name):
+        return self._posting(f'yaku:{name}')
+
+    def result(self, result_type):
+        if result_type not in RESULT_TYPES:
+            raise ValueError(f"알 수 없는 결과: {result_type} (가능: {', '.join(RESULT_TYPES)})")
+        return self._posting(f'result:{result_type}')
+
+    def winner(self, seat):
+        return self._posting(f'winner:{seat}')
+
+    def loser(self, seat):
+        """seat가 방총(론 패를 버림)한 판"""
+        return self._posting(f'loser:{seat}')
+
+    def riichi(self, seat):
+        return self._posting(f'riichi:{seat}')
+
+    def winner_riichi(self):
+        """화료한 좌석이 리치를 선언했던 판"""
+        def check(arrays, ids):
+            winner = arrays['winner'][ids]
+            riichi = arrays['riichi'][ids]
+            return (winner >= 0) & ((riichi >> np.maximum(winner, 0).astype('u1')) & 1).astype(bool)
+        self.predicates.append(check)
+        return self
+
+    def min_turns(self, turns):
+        self.predicates.append(lambda arrays, ids: arrays['turns'][ids] >= turns)
+        return self
+
+    def max_turns(self, turns):
+        self.predicates.append(lambda arrays, ids: arrays['turns'][ids] <= turns)
+        return self
+
+    def game(self, game_number):
+        self.predicates.append(lambda arrays, ids: arrays['game'][ids] == game_number)
+        return self
+
+    def min_delta(self, seat, points):
+        """seat의 점수 변화가 points 이상인 판"""
+        self.predicates.append(lambda arrays, ids: arrays['deltas'][ids, seat] >= points)
+        return self
+
+    def ids(self):
+        ids = None
+        for posting in sorted(self.postings, key=len):  # 짧은 색인부터 교집합
+            ids = posting if ids is None else np.intersect1d(ids, posting, assume_unique=True)
+        if ids is None:
+            ids = np.arange(len(self.index), dtype='<u4')
+        for predicate in self.predicates:
+            ids = ids[predicate(self.index.arrays, ids)]
+        return ids
+
+    def count(self):
+        return len(self.ids())
+
+
+def aggregate(index, ids):
+    """판 번호 배열에 대한 집계 (numpy)"""
+    arrays = index.arrays
+    result = arrays['result'][ids]
+    winner = arrays['winner'][ids]
+    loser = arrays['loser'][ids]
+    turns = arrays['turns'][ids]
+    summary = {
+        'hands': int(len(ids)),
+        'results': {name: int(count) for name, count in zip(RESULT_TYPES, np.bincount(result, minlength=3))},
+        'wins_by_seat': np.bincount(winner[winner >= 0], minlength=4).tolist(),
+        'deal_ins_by_seat': np.bincount(loser[loser >= 0], minlength=4).tolist(),
+    }
+    if len(ids):
+        summary['turns'] = {'mean': float(turns.mean()), 'p50': float(np.percentile(turns, 50)),
+                            'p90': float(np.percentile(turns, 90)), 'max': int(turns.max())}
+        summary['mean_deltas'] = arrays['deltas'][ids].mean(axis=0).round(3).tolist()
+        yaku = arrays['yaku'][ids]
+        counts = {}
+        for bit, name in enumerate(index.yaku_names):  # 역색인 키 순서 = 전역 역 비트
+            count = int(((yaku >> np.uint64(bit)) & np.uint64(1)).sum())
+            if count:
+                counts[name] = count
+        summary['yaku'] = dict(sorted(counts.items(), key=lambda item: -item[1]))
+        summary['yaku_hands'] = int((yaku != 0).sum())
+    return summary
+
+
+def fetch_hands(directory, index, ids, limit):
+    """판 번호 앞쪽 limit개의 상세 기록 (game_archive 청크에서)"""
+    reader = ArchiveReader(directory)
+    try:
+        hands = []
+        for hand_id in ids[:limit]:
+            chunk, row = index.locate(int(hand_id))
+            hand = reader.chunks[chunk].hand(row)
+            hand['id'] = int(hand_id)
+            hands.append(hand)
+        return hands
+    finally:
+        reader.close()
+
+
+def build_query(index, args):
+    query = HandQuery(index)
+    for name in args.yaku or ():
+        query.yaku(name)
+    if args.result:
+        query.result(args.result)
+    if args.winner is not None:
+        query.winner(args.winner)
+    if args.loser is not None:
+        query.loser(args.loser)
+    for seat in args.riichi or ():
+        query.riichi(seat)
+    if args.winner_riichi:
+        query.winner_riichi()
+    if args.min_turns is not None:
+        query.min_turns(args.min_turns)
+    if args.max_turns is not None:
+        query.max_turns(args.max_turns)
+    if args.game is not None:
+        query.game(args.game)
+    return query
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog='python archive_query.py', description='판 기록 아카이브 질의')
+    parser.add_argument('directory', help='아카이브 디렉터리')
+    parser.add_argument('--reindex', action='store_true', help='색인 다시 만들기')
+    parser.add_argument('--yaku', action='append', help='이 역으로 화료한 판 (여러 번 지정 = 모두 포함)')
+    parser.add_argument('--result', choices=RESULT_TYPES, help='결과')
+    parser.add_argument('--winner', type=int, choices=range(4), help='화료 좌석')
+    parser.add_argument('--loser', type=int, choices=range(4), help='방총 좌석 (론 패를 버린 좌석)')
+    parser.add_argument('--riichi', type=int, action='append', choices=range(4), help='리치를 선언한 좌석')
+    parser.add_argument('--winner-riichi', action='store_true', help='화료 좌석이 리치 상태')
+    parser.add_argument('--min-turns', type=int, help='턴 수 이상')
+    parser.add_argument('--max-turns', type=int, help='턴 수 이하')
+    parser.add_argument('--game', type=int, help='매치 안 판 번호')
+    parser.add_argument('--list', type=int, default=0, metavar='N', help='조건에 맞는 판 앞쪽 N개 출력')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    started = time.perf_counter()
+    try:
+        index = open_index(args.directory, args.reindex)
+    except ArchiveError as e:
+        print(e, file=sys.stderr)
+        return 2
+    opened = time.perf_counter()
+    ids = build_query(index, args).ids()
+    summary = aggregate(index, ids)
+    elapsed = time.perf_counter() - opened
+    print(f"📚 {len(index)}판 중 {summary['hands']}판 (색인 {opened - started:.2f}초, 질의+집계 {elapsed * 1000:.1f}ms)")
+    for key, value in summary.items():
+        if key != 'hands':
+            print(f"  {key}: {value}")
+    for hand in fetch_hands(args.directory, index, ids, args.list):
+        actions = ' '.join(f"{seat}{name[0]}:{tile}" for name, seat, tile, _ in hand['actions'][:12])
+        print(f"  #{hand['id']} 판{hand['game_number']} {hand['result_type']} 승자={hand['winner']} "
+              f"방총={hand['loser']} 턴={hand['turns']} 역={hand['yaku_list']} 점수={hand['score_deltas']} | {actions} ...")
+    index.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
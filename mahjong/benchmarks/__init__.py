@@ -0,0 +1,7 @@
+"""
+마이크로벤치마크 패키지 (규칙 판정, AI, 패산, 프레임 렌더링 핫패스)
+- mahjong 폴더에서 `python -m benchmarks` 로 실행 (옵션은 __main__.py 참고)
+"""
+
+from .fixtures import build_fixtures
+from .runner import run_benchmarks, compare_results, load_results, save_results
@@ -0,0 +1,72 @@
+"""
+벤치마크 실행 스크립트 (mahjong 폴더에서 실행)
+
+    python -m benchmarks -o bench.json
+    python -m benchmarks --compare bench_base.json --threshold 0.1
+    python -m benchmarks --group rules --group ai
+    python -m benchmarks --compare-only bench_new.json bench_base.json
+
+기준 결과보다 threshold 이상 느려진 케이스가 있으면 종료 코드 1
+"""
+
+import argparse
+import os
+import sys
+
+# 렌더링 케이스는 창 없이 SDL dummy 드라이버에서 측정 (pygame import 전에 설정)
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+from .fixtures import DEFAULT_SEED, DEFAULT_COUNT
+from .runner import (run_benchmarks, save_results, load_results, compare_results, format_comparison,
+                     DEFAULT_REPEAT, DEFAULT_MIN_TIME, DEFAULT_THRESHOLD, METRICS)
+
+
+GROUPS = ('rules', 'ai', 'wall', 'game', 'render', 'sync')
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description='마작 핫패스 마이크로벤치마크')
+    parser.add_argument('-o', '--output', help='결과 JSON 저장 경로')
+    parser.add_argument('--compare', metavar='BASELINE', help='기준 결과 JSON과 비교')
+    parser.add_argument('--compare-only', nargs=2, metavar=('CURRENT', 'BASELINE'),
+                        help='실행 없이 저장된 두 결과 비교')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help=f'회귀 판정 비율 (기본 {DEFAULT_THRESHOLD} = 10%% 느려짐)')
+    parser.add_argument('--metric', choices=METRICS, default='median_us', help='비교 기준 값')
+    parser.add_argument('--group', action='append', choices=GROUPS, help='실행할 그룹 (여러 번 지정 가능)')
+    parser.add_argument('-k', '--filter', dest='name_filter', help='이름에 이 문자열이 있는 케이스만')
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT, help='샘플 수')
+    parser.add_argument('--min-time', type=float, default=DEFAULT_MIN_TIME, help='샘플 1개 최소 측정 시간 (초)')
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED, help='고정 입력 시드')
+    parser.add_argument('--count', type=int, default=DEFAULT_COUNT, help='입력 종류별 손패 수')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    if args.compare_only:
+        current = load_results(args.compare_only[0])
+        baseline = load_results(args.compare_only[1])
+    else:
+        current = run_benchmarks(args.seed, args.count, args.group, args.name_filter, args.repeat, args.min_time)
+        if args.output:
+            save_results(current, args.output)
+            print(f"📊 벤치마크 결과 저장: {args.output}")
+        if not args.compare:
+            return 0
+        baseline = load_results(args.compare)
+
+    rows = compare_results(current, baseline, args.threshold, args.metric)
+    print(format_comparison(rows, baseline.get('meta'), current.get('meta')))
+    regressions = [row['name'] for row in rows if row['status'] == 'regression']
+    if regressions:
+        print(f"❌ 회귀 {len(regressions)}건 (threshold {args.threshold:.0%}): {', '.join(regressions)}")
+        return 1
+    print(f"✅ 회귀 없음 (threshold {args.threshold:.0%})")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,277 @@
+"""
+벤치마크 대상 (규칙 판정, AI, 패산, 프레임 렌더링, 상태 동기화)
+- 각 케이스는 고정 입력 전체를 한 번 도는 함수, 결과는 입력 1개당 시간으로 환산
+- 렌더링/게임 상태 케이스는 SDL dummy 드라이버에서 MahjongGame을 만들어 측정
+"""
+
+import contextlib
+import io
+import random
+
+from mahjong_game import (check_basic_pattern, can_form_melds, check_yaku, is_winning_hand, count_tile_groups,
+                          hand_to_counts)
+from mahjong_ai import ai_improved_discard, evaluate_discards, _calculate_shanten_cached
+from table_rules import create_tiles
+from game_fsm import GamePhase
+from game_events import EVENT_TURN
+from wall_manager import WallManager
+
+from .fixtures import playable_tiles
+
+
+WALL_DIRECTIONS = {'bottom': '동', 'right': '남', 'top': '서', 'left': '북'}
+
+
+class BenchCase:
+    """벤치마크 케이스 1개 - run()은 items개 입력을 한 번씩 처리"""
+
+    def __init__(self, name, group, run, items):
+        self.name = name
+        self.group = group
+        self.run = run
+        self.items = items
+
+
+def _pair_removed_counts(hands):
+    """완성 손패에서 머리를 뺀 개수 딕셔너리 (can_form_melds 입력)"""
+    result = []
+    for hand in hands:
+        tile_count = count_tile_groups(hand)
+        for tile, count in tile_count.items():
+            if count < 2:
+                continue
+            remaining = dict(tile_count)
+            remaining[tile] -= 2
+            if remaining[tile] == 0:
+                del remaining[tile]
+            if can_form_melds(remaining, 4):
+                result.append(remaining)
+                break
+    return result
+
+
+def rule_cases(fixtures):
+    """mahjong_game 화료 판정 함수들"""
+    random_hands = fixtures['random']
+    complete_hands = fixtures['complete']
+    mixed_hands = random_hands + complete_hands
+    meld_counts = _pair_removed_counts(complete_hands)
+    random_counts = [count_tile_groups(hand[:12]) for hand in random_hands]
+
+    def run_check_basic_pattern():
+        for hand in mixed_hands:
+            check_basic_pattern(hand)
+
+    def run_can_form_melds():
+        for tile_count in meld_counts:
+            can_form_melds(tile_count, 4)
+        for tile_count in random_counts:
+            can_form_melds(tile_count, 4)
+
+    def run_check_yaku():
+        for hand in complete_hands:
+            check_yaku(hand, is_tsumo=True)
+
+    def run_is_winning_hand():
+        for hand in mixed_hands:
+            is_winning_hand(hand, is_tsumo=True)
+
+    return [
+        BenchCase('rules.check_basic_pattern', 'rules', run_check_basic_pattern, len(mixed_hands)),
+        BenchCase('rules.can_form_melds', 'rules', run_can_form_melds, len(meld_counts) + len(random_counts)),
+        BenchCase('rules.check_yaku', 'rules', run_check_yaku, len(complete_hands)),
+        BenchCase('rules.is_winning_hand', 'rules', run_is_winning_hand, len(mixed_hands)),
+    ]
+
+
+def ai_cases(fixtures):
+    """AI 버림패 선택 - 우선순위 휴리스틱과 샹텐 기반 평가 (캐시 적중 / 캐시 비운 상태)"""
+    rng = random.Random(len(fixtures['tenpai']))
+    tiles = playable_tiles()
+    # 텐파이 손패 + 남은 패 1장 (버림 직전 14장)
+    drawn_hands = [hand + [rng.choice([tile for tile in tiles if tile not in hand])]
+                   for hand in fixtures['tenpai']]
+    hands = fixtures['random'] + drawn_hands
+    counts = [hand_to_counts(hand) for hand in hands]
+
+    def run_ai_improved_discard():
+        for hand in hands:
+            ai_improved_discard(hand)
+
+    def run_evaluate_discards():
+        for hand_counts in counts:
+            evaluate_discards(hand_counts)
+
+    def run_evaluate_discards_cold():
+        _calculate_shanten_cached.cache_clear()
+        for hand_counts in counts:
+            evaluate_discards(hand_counts)
+
+    return [
+        BenchCase('ai.ai_improved_discard', 'ai', run_ai_improved_discard, len(hands)),
+        BenchCase('ai.evaluate_discards', 'ai', run_evaluate_discards, len(counts)),
+        BenchCase('ai.evaluate_discards_cold', 'ai', run_evaluate_discards_cold, len(counts)),
+    ]
+
+
+def wall_cases(seed):
+    """패산 일반패 뽑기 (배패~유국까지 한 바퀴)"""
+    wall_tiles = create_tiles()
+    random.Random(seed).shuffle(wall_tiles)
+
+    def run_draw_regular_tile():
+        wall = WallManager(wall_tiles, None)
+        wall.set_dice_start_position(7, WALL_DIRECTIONS)
+        while wall.draw_regular_tile() is not None:
+            pass
+
+    # 한 번 돌려서 뽑히는 장수 계산
+    wall = WallManager(wall_tiles, None)
+    wall.set_dice_start_position(7, WALL_DIRECTIONS)
+    draws = 0
+    while wall.draw_regular_tile() is not None:
+        draws += 1
+    return [BenchCase('wall.draw_regular_tile', 'wall', run_draw_regular_tile, draws)]
+
+
+def create_game(seed):
+    """SDL dummy 드라이버에서 배패까지 마친 MahjongGame (출력 숨김)"""
+    import main
+
+    random.seed(seed)
+    with contextlib.redirect_stdout(io.StringIO()):
+        game = main.MahjongGame()
+        game.profiler.uninstall_transform_counter()
+        steps = 0
+        # 주사위 입력/예약 단계/배패 애니메이션 대기 시간을 건너뛰며 배패 완료까지 진행
+        while game.fsm.state != GamePhase.PLAYING and steps < 5000:
+            steps += 1
+            if game.fsm.state == GamePhase.DICE and game.waiting_for_user_input:
+                game.handle_dice_input()
+            if game.next_turn_time > 0:
+                game.next_turn_time = 1
+            if game.fsm.state == GamePhase.DEAL_ANIM:
+                game.deal_anim_last_time = -10 ** 9
+            game.update()
+    if game.fsm.state != GamePhase.PLAYING:
+        raise RuntimeError(f"배패 완료 상태로 진행하지 못함 (phase={game.fsm.name})")
+    return game
+
+
+def game_cases(fixtures, seed):
+    """게임 객체가 필요한 케이스 (화료 힌트, 간방 후보, 프레임 렌더링)"""
+    game = create_game(seed)
+    player = game.player_index
+    tenpai_hands = fixtures['tenpai']
+    meld_hands = fixtures['melds']
+
+    def run_get_winning_hints():
+        """픽스처마다 캐시를 비우고 계산 (캐시 적중만 재지 않도록) - 픽스처별 힌트 목록"""
+        saved = (game.hands[player], game.melds[player])
+        results = []
+        try:
+            for hand, melds in [(hand, []) for hand in tenpai_hands] + list(meld_hands):
+                game.hands[player] = hand
+                game.melds[player] = melds
+                game.clear_winning_hints_cache()
+                results.append(game.get_winning_hints(player))
+        finally:
+            game.hands[player], game.melds[player] = saved
+            game.clear_winning_hints_cache()
+        return results
+
+    hints = run_get_winning_hints()
+    if len(hints) > 1 and all(result == hints[0] for result in hints):
+        raise RuntimeError("화료 힌트가 픽스처마다 같음 - 캐시가 비워지지 않음")
+
+    def run_get_available_tiles_for_tenpai():
+        game.get_available_tiles_for_tenpai()
+
+    def run_render_frame():
+        game.render()
+
+    def run_render_wall():
+        game.render_wall('bottom')
+        game.render_batch.end_frame()
+
+    return [
+        BenchCase('game.get_winning_hints', 'game', run_get_winning_hints, len(tenpai_hands) + len(meld_hands)),
+        BenchCase('game.get_available_tiles_for_tenpai', 'game', run_get_available_tiles_for_tenpai, 1),
+        BenchCase('render.frame_playing', 'render', run_render_frame, 1),
+        BenchCase('render.wall', 'render', run_render_wall, 1),
+    ]
+
+
+def record_hands(seed, hands=8):
+    """HeadlessTable을 AI끼리 진행해 판별 이벤트 목록 기록 (numpy 필요)"""
+    from mahjong_env import HeadlessTable
+
+    table = HeadlessTable(seed, agent_seats=(), total_games=hands, record_events=True)
+    recorded = []
+    table.reset_match()
+    while not table.match_done:
+        table.start_hand()
+        recorded.append(list(table.event_log.events))
+    return recorded
+
+
+def sync_cases(seed):
+    """table_sync 델타 인코딩/적용 (기록한 판의 이벤트 1건당 시간)"""
+    from game_events import EventLog
+    from table_sync import SyncEncoder, SyncClient
+
+    try:
+        recorded = record_hands(seed)
+    except ImportError:
+        # numpy가 없으면 동기화 케이스 생략
+        return []
+    events = sum(len(hand) for hand in recorded)
+    streams = []
+
+    def encode_all(viewer):
+        log = EventLog()
+        encoder = SyncEncoder(viewer)
+        encoder.attach(log)
+        chunks = []
+        for hand in recorded:
+            for event in hand:
+                log.emit(*event)
+                if event.kind == EVENT_TURN:
+                    chunks.append(encoder.flush())
+            chunks.append(encoder.flush())
+        return chunks
+
+    def run_encode():
+        encode_all(0)
+        encode_all(None)
+
+    def run_apply():
+        for viewer, chunks in streams:
+            client = SyncClient(viewer)
+            for data in chunks:
+                client.apply_bytes(data)
+
+    streams.extend((viewer, encode_all(viewer)) for viewer in (0, None))
+    return [
+        BenchCase('sync.encode_event', 'sync', run_encode, events * 2),
+        BenchCase('sync.apply_event', 'sync', run_apply, events * 2),
+    ]
+
+
+def build_cases(fixtures, seed, groups=None):
+    """전체 케이스 목록 (groups가 있으면 해당 그룹만 준비)"""
+    builders = [
+        ('rules', lambda: rule_cases(fixtures)),
+        ('ai', lambda: ai_cases(fixtures)),
+        ('wall', lambda: wall_cases(seed)),
+        ('game', lambda: game_cases(fixtures, seed)),
+        ('sync', lambda: sync_cases(seed)),
+    ]
+    cases = []
+    for group, build in builders:
+        if groups and group not in groups and not (group == 'game' and 'render' in groups):
+            continue
+        cases.extend(build())
+    if groups:
+        cases = [case for case in cases if case.group in groups]
+    return cases
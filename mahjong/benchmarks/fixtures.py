@@ -0,0 +1,125 @@
+"""
+벤치마크 고정 입력 (시드 고정, 실행마다 같은 손패)
+- 무작위 손패, 완성 손패(4몸통 1머리), 텐파이 손패(완성 손패 - 1장), 멜드가 있는 손패
+"""
+
+import random
+
+from mahjong_game import is_flower_tile
+from table_rules import create_tiles
+
+
+DEFAULT_SEED = 20240601
+DEFAULT_COUNT = 64
+
+SUITS = ('만', '통')
+HONORS = ('동', '남', '서', '북', '중', '발', '백')
+PLAYABLE_BASES = tuple(f"{num}{suit}" for suit in SUITS for num in range(1, 10)) + HONORS
+
+
+def playable_tiles():
+    """꽃패를 뺀 실제 손패용 패 목록"""
+    return [tile for tile in create_tiles() if not is_flower_tile(tile)]
+
+
+class _TilePool:
+    """기본 이름별 남은 복사본 (같은 패 4장 제한)"""
+
+    def __init__(self, rng):
+        self.rng = rng
+        self.copies = {base: [f"{base}_{copy}.png" for copy in range(1, 5)] for base in PLAYABLE_BASES}
+        for copies in self.copies.values():
+            rng.shuffle(copies)
+
+    def available(self, base, count=1):
+        return len(self.copies[base]) >= count
+
+    def take(self, base):
+        return self.copies[base].pop()
+
+
+def _random_meld(rng, pool):
+    """pool에서 꺼낼 수 있는 몸통 1개의 기본 이름 목록 (각자 또는 순자)"""
+    for _ in range(100):
+        if rng.random() < 0.5:
+            base = rng.choice(PLAYABLE_BASES)
+            if pool.available(base, 3):
+                return [base] * 3
+        else:
+            suit = rng.choice(SUITS)
+            start = rng.randint(1, 7)
+            bases = [f"{start + offset}{suit}" for offset in range(3)]
+            if all(pool.available(base) for base in bases):
+                return bases
+    return None
+
+
+def complete_hand(rng, meld_count=4):
+    """4몸통 1머리 완성 손패 (14장) 와 각 몸통의 기본 이름"""
+    while True:
+        pool = _TilePool(rng)
+        pair = rng.choice(PLAYABLE_BASES)
+        hand = [pool.take(pair), pool.take(pair)]
+        melds = []
+        for _ in range(meld_count):
+            bases = _random_meld(rng, pool)
+            if bases is None:
+                break
+            melds.append(bases)
+            hand.extend(pool.take(base) for base in bases)
+        if len(melds) == meld_count:
+            return hand, melds
+
+
+def random_hands(seed=DEFAULT_SEED, count=DEFAULT_COUNT, size=14):
+    """무작위 손패 (대부분 화료형 아님)"""
+    rng = random.Random(seed)
+    tiles = playable_tiles()
+    return [rng.sample(tiles, size) for _ in range(count)]
+
+
+def complete_hands(seed=DEFAULT_SEED, count=DEFAULT_COUNT):
+    """완성 손패 14장"""
+    rng = random.Random(seed + 1)
+    return [complete_hand(rng)[0] for _ in range(count)]
+
+
+def tenpai_hands(seed=DEFAULT_SEED, count=DEFAULT_COUNT):
+    """텐파이 손패 13장 (완성 손패에서 1장 제거)"""
+    rng = random.Random(seed + 2)
+    hands = []
+    for _ in range(count):
+        hand = complete_hand(rng)[0]
+        hand.pop(rng.randrange(len(hand)))
+        hands.append(hand)
+    return hands
+
+
+def meld_hands(seed=DEFAULT_SEED, count=DEFAULT_COUNT):
+    """멜드가 있는 텐파이 손패 - [(손패, 멜드 목록)], 멜드는 게임과 같은 {'type', 'tiles'} 형식"""
+    rng = random.Random(seed + 3)
+    result = []
+    while len(result) < count:
+        hand, meld_bases = complete_hand(rng)
+        triplets = [bases for bases in meld_bases if bases[0] == bases[1]]
+        if not triplets:
+            continue
+        melds = []
+        for bases in triplets[:rng.randint(1, len(triplets))]:
+            tiles = [tile for tile in hand if tile.startswith(bases[0] + '_')][:3]
+            for tile in tiles:
+                hand.remove(tile)
+            melds.append({'type': 'peng', 'tiles': tiles})
+        hand.pop(rng.randrange(len(hand)))
+        result.append((hand, melds))
+    return result
+
+
+def build_fixtures(seed=DEFAULT_SEED, count=DEFAULT_COUNT):
+    """벤치마크 전체에서 쓰는 고정 입력 묶음"""
+    return {
+        'random': random_hands(seed, count),
+        'complete': complete_hands(seed, count),
+        'tenpai': tenpai_hands(seed, count),
+        'melds': meld_hands(seed, count),
+    }
@@ -0,0 +1,161 @@
+"""
+벤치마크 실행 / 결과 저장 / 기준 결과와 비교
+- 케이스마다 최소 측정 시간을 넘도록 반복 횟수를 정하고 repeat번 측정
+- 결과는 JSON (입력 1개당 µs: min/median/mean, 샘플 목록, 실행 환경)
+- 기준 JSON과 비교해 threshold 이상 느려진 케이스를 회귀로 보고
+"""
+
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+from .cases import build_cases
+from .fixtures import build_fixtures, DEFAULT_SEED, DEFAULT_COUNT
+
+
+RESULT_FORMAT = 1
+DEFAULT_REPEAT = 5
+DEFAULT_MIN_TIME = 0.05   # 샘플 1개 최소 측정 시간 (초)
+DEFAULT_THRESHOLD = 0.10  # 10% 이상 느려지면 회귀
+METRICS = ('median_us', 'min_us', 'mean_us')
+
+
+def _git_commit():
+    """현재 커밋 (git이 없으면 None)"""
+    try:
+        output = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, timeout=5)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return output.stdout.strip() or None
+
+
+def _pygame_version():
+    module = sys.modules.get('pygame')
+    return getattr(getattr(module, 'version', None), 'ver', None)
+
+
+def measure(case, repeat=DEFAULT_REPEAT, min_time=DEFAULT_MIN_TIME):
+    """케이스 1개 측정 - 입력 1개당 시간 (µs)"""
+    case.run()  # 캐시/지연 초기화 워밍업
+
+    # 샘플 1개가 min_time 이상 걸리도록 반복 횟수 결정
+    loops = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(loops):
+            case.run()
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_time or loops >= 1 << 20:
+            break
+        loops *= 2 if elapsed == 0 else max(2, min(10, int(min_time / elapsed) + 1))
+
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(loops):
+            case.run()
+        elapsed = time.perf_counter() - started
+        samples.append(elapsed / (loops * case.items) * 1e6)
+
+    return {
+        'group': case.group,
+        'items': case.items,
+        'loops': loops,
+        'min_us': min(samples),
+        'median_us': statistics.median(samples),
+        'mean_us': statistics.fmean(samples),
+        'samples_us': samples,
+    }
+
+
+def run_benchmarks(seed=DEFAULT_SEED, count=DEFAULT_COUNT, groups=None, name_filter=None,
+                   repeat=DEFAULT_REPEAT, min_time=DEFAULT_MIN_TIME, log=print):
+    """전체 벤치마크 실행 - {'meta', 'results'} 반환"""
+    fixtures = build_fixtures(seed, count)
+    cases = build_cases(fixtures, seed, groups)
+    if name_filter:
+        cases = [case for case in cases if name_filter in case.name]
+
+    results = {}
+    for case in cases:
+        result = measure(case, repeat, min_time)
+        results[case.name] = result
+        if log:
+            log(f"{case.name:<40} {result['median_us']:12.2f} µs/item  (min {result['min_us']:.2f}, "
+                f"items {case.items}, loops {result['loops']})")
+
+    return {
+        'format': RESULT_FORMAT,
+        'meta': {
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'commit': _git_commit(),
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'platform': platform.platform(),
+            'pygame': _pygame_version(),
+            'seed': seed,
+            'count': count,
+            'repeat': repeat,
+            'min_time': min_time,
+        },
+        'results': results,
+    }
+
+
+def save_results(report, path):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+def load_results(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def compare_results(current, baseline, threshold=DEFAULT_THRESHOLD, metric='median_us'):
+    """기준 결과 대비 케이스별 비율 - [{'name', 'baseline', 'current', 'ratio', 'status'}]
+
+    status: 'regression' (threshold 이상 느려짐), 'improvement' (threshold 이상 빨라짐), 'ok', 'new', 'missing'
+    """
+    rows = []
+    current_results = current['results']
+    baseline_results = baseline['results']
+    for name in sorted(set(current_results) | set(baseline_results)):
+        if name not in baseline_results:
+            rows.append({'name': name, 'baseline': None, 'current': current_results[name][metric],
+                         'ratio': None, 'status': 'new'})
+            continue
+        if name not in current_results:
+            rows.append({'name': name, 'baseline': baseline_results[name][metric], 'current': None,
+                         'ratio': None, 'status': 'missing'})
+            continue
+        before = baseline_results[name][metric]
+        after = current_results[name][metric]
+        ratio = after / before if before > 0 else float('inf')
+        if ratio > 1 + threshold:
+            status = 'regression'
+        elif ratio < 1 / (1 + threshold):
+            status = 'improvement'
+        else:
+            status = 'ok'
+        rows.append({'name': name, 'baseline': before, 'current': after, 'ratio': ratio, 'status': status})
+    return rows
+
+
+def format_comparison(rows, baseline_meta=None, current_meta=None):
+    """비교 결과 표 (문자열)"""
+    lines = []
+    if baseline_meta and current_meta:
+        lines.append(f"기준 {baseline_meta.get('commit')} ({baseline_meta.get('created')}) → "
+                     f"현재 {current_meta.get('commit')} ({current_meta.get('created')})")
+    lines.append(f"{'케이스':<40} {'기준 µs':>12} {'현재 µs':>12} {'비율':>7}  상태")
+    for row in rows:
+        before = f"{row['baseline']:.2f}" if row['baseline'] is not None else '-'
+        after = f"{row['current']:.2f}" if row['current'] is not None else '-'
+        ratio = f"{row['ratio']:.2f}x" if row['ratio'] is not None else '-'
+        lines.append(f"{row['name']:<40} {before:>12} {after:>12} {ratio:>7}  {row['status']}")
+    return "\n".join(lines)
@@ -0,0 +1,397 @@
+"""
+외부 봇 프로토콜 (pygame/numpy 없이 사용 가능)
+- 봇 프로세스(표준 입출력) 또는 Unix 소켓에서 대기 중인 봇과 ASCII 한 줄 프로토콜로 결정 요청
+- 요청은 묶음(batch)으로 보냄 - 여러 테이블이 봇 하나를 공유하면 한 번의 왕복으로 모두 결정
+- 결정마다 기한 (deadline_ms), 기한 안에 올바른 응답이 없으면 ai_improved_discard / 패스로 대신 결정
+- BatchedBotDriver: 에이전트 좌석을 봇이 맡는 HeadlessTable 여러 개를 봇 하나로 진행
+- 상대 좌석은 ai_strategies의 "external" 전략이 BotConnection으로 같은 프로토콜을 사용
+- run_bot: 봇 쪽 루프 (묶음을 읽어 decide(requests)로 한 번에 결정)
+
+프로토콜 (공백 구분, 목록은 쉼표 구분, 빈 목록/없음은 -):
+    엔진 → 봇  B <묶음 번호> <요청 수> <deadline_ms>
+               Q <id> <type> <seat> <hand> <drawn> <melds> <flowers> <visible> <discards x4> <scores> <wall> <legal>
+    봇 → 엔진  A <id> <action>
+type은 d(버리기, 암깡/가깡 포함)/r(버림패 반응)/s(자기 턴 액션만), 패는 34종 번호, visible은 34종 공개 장수를
+한 글자씩, legal은 허용 액션 번호(table_rules 액션 번호) 비트의 16진수. 응답 순서는 자유이고 모르는 id는 무시한다.
+
+    python bot_protocol.py --bot                    (참고 봇, 표준 입출력)
+    python bot_protocol.py --bench 64 --latency-ms 2  (참고 봇 프로세스로 묶음/개별 요청 처리량 비교, numpy 필요)
+"""
+
+import argparse
+import contextlib
+import os
+import select
+import socket
+import subprocess
+import sys
+import time
+from collections import namedtuple
+
+from mahjong_game import tile_to_kind, TILE_KINDS
+from mahjong_ai import ai_improved_discard
+from table_rules import ACTION_PASS, ACTION_TYPE_IDS, NUM_ACTIONS
+
+
+DEFAULT_DEADLINE_MS = 1000
+DEFAULT_STARTUP_MS = 5000    # 봇을 (다시) 띄운 첫 묶음에 더해 주는 기동 시간
+DEFAULT_RESTART_AFTER = 3    # 외부 봇 전략: 이만큼 연속 기한 초과면 다시 띄움
+DECISION_CODES = {'discard': 'd', 'react': 'r', 'self_action': 's'}
+
+BotRequest = namedtuple('BotRequest', [
+    'id', 'type', 'seat', 'hand', 'drawn', 'melds', 'flowers', 'visible', 'discards', 'scores', 'wall', 'legal',
+])
+
+
+def legal_action_bits(decision_type, hand, actions=()):
+    """허용 액션 비트 (HeadlessTable.action_mask와 같은 구성) - 버리기면 손패 종류, 반응/자기 턴이면 패스 포함"""
+    bits = 0
+    if decision_type == 'd':
+        for tile in hand:
+            kind = tile_to_kind(tile)
+            if kind >= 0:
+                bits |= 1 << kind
+    else:
+        bits |= 1 << ACTION_PASS
+    for action in actions:
+        action_id = ACTION_TYPE_IDS.get(action['type'])
+        if action_id is not None:
+            bits |= 1 << action_id
+    return bits
+
+
+def _kinds(tiles):
+    return ','.join(str(tile_to_kind(tile)) for tile in tiles) or '-'
+
+
+def _parse_kinds(field):
+    return () if field == '-' else tuple(int(value) for value in field.split(','))
+
+
+def encode_request(request_id, decision_type, observation, legal_bits):
+    """관측 딕셔너리(build_observation / build_ai_observation) → 요청 한 줄"""
+    drawn = observation['drawn_tile']
+    visible = ''.join(str(min(count, 9)) for count in observation['visible_counts'])
+    discards = ' '.join(_kinds(pile) for pile in observation['discard_piles'])
+    scores = ','.join(str(score) for score in observation['scores'])
+    return (f"Q {request_id} {decision_type} {observation['seat']} {_kinds(observation['hand'])} "
+            f"{tile_to_kind(drawn) if drawn else '-'} {_kinds(observation['meld_tiles'])} "
+            f"{observation['flower_count']} {visible} {discards} {scores} {observation['wall_remaining']} "
+            f"{legal_bits:x}\n")
+
+
+def parse_request(line):
+    """요청 한 줄 → BotRequest (봇 쪽)"""
+    fields = line.split()
+    if len(fields) != 16 or fields[0] != 'Q':
+        raise ValueError(f"요청 형식 오류: {line!r}")
+    legal_bits = int(fields[15], 16)
+    return BotRequest(int(fields[1]), fields[2], int(fields[3]), _parse_kinds(fields[4]),
+                      None if fields[5] == '-' else int(fields[5]), _parse_kinds(fields[6]), int(fields[7]),
+                      tuple(int(digit) for digit in fields[8]), tuple(_parse_kinds(field) for field in fields[9:13]),
+                      tuple(int(score) for score in fields[13].split(',')), int(fields[14]),
+                      [action for action in range(NUM_ACTIONS) if legal_bits >> action & 1])
+
+
+def fallback_action(decision_type, hand):
+    """기한 초과/통신 오류 시 결정 - 버리기는 ai_improved_discard, 반응/자기 턴은 패스"""
+    if decision_type == 'd':
+        return tile_to_kind(ai_improved_discard(hand))
+    return ACTION_PASS
+
+
+class BotConnection:
+    """봇 하나와의 연결 (command면 표준 입출력 하위 프로세스, path면 Unix 소켓)
+
+    decide()는 요청 묶음을 한 번에 보내고 기한까지 응답을 모은다.
+    연결이 끊기면 남은 요청은 대신 결정하고, 하위 프로세스 봇은 다음 묶음에서 다시 띄운다.
+    기한이 지난 뒤 도착한 응답은 id가 맞지 않아 다음 묶음에서 버려진다.
+    기한은 연결을 연 뒤부터 재고, 봇을 새로 띄운 묶음에는 startup_ms를 더해 준다 (기동 시간은 기한에서 빼지 않음).
+    restart_after를 주면 그만큼 연속으로 기한을 넘긴 하위 프로세스 봇은 멈춘 것으로 보고 다시 띄운다.
+    """
+
+    def __init__(self, command=None, path=None, deadline_ms=DEFAULT_DEADLINE_MS, restart_after=None,
+                 startup_ms=DEFAULT_STARTUP_MS):
+        if not command and not path:
+            raise ValueError("봇 실행 명령(command) 또는 소켓 경로(path)가 필요합니다")
+        self.command = command if isinstance(command, list) or command is None else command.split()
+        self.path = path
+        self.deadline_ms = deadline_ms
+        self.restart_after = restart_after
+        self.startup_ms = startup_ms
+        self.process = None
+        self.sock = None
+        self.read_fd = None
+        self.write_fd = None
+        self.buffer = b''
+        self.next_id = 0
+        self.batches = 0
+        self.requests = 0
+        self.timeouts = 0
+        self.invalid = 0
+        self.missed_batches = 0
+        self.restarts = 0
+        self.wait_time = 0.0
+
+    def _ensure_open(self):
+        """연결이 없으면 열기 - 새로 열었으면 True"""
+        if self.read_fd is not None:
+            return False
+        if self.command:
+            self.process = subprocess.Popen(self.command, stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+            self.read_fd = self.process.stdout.fileno()
+            self.write_fd = self.process.stdin.fileno()
+        else:
+            self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.sock.connect(self.path)
+            self.read_fd = self.write_fd = self.sock.fileno()
+        self.buffer = b''
+        return True
+
+    def decide(self, decisions, deadline_ms=None, fallback=fallback_action):
+        """[(type, observation, legal_bits), ...] → 액션 번호 목록 (모두 허용 액션)
+
+        기한 초과/잘못된 응답은 fallback(type, hand)으로 대신 결정한다 (fallback=None이면 None을 그대로 돌려줌).
+        """
+        if not decisions:
+            return []
+        deadline_ms = self.deadline_ms if deadline_ms is None else deadline_ms
+        first_id = self.next_id
+        self.next_id += len(decisions)
+        self.batches += 1
+        self.requests += len(decisions)
+
+        lines = [f"B {self.batches} {len(decisions)} {deadline_ms}\n"]
+        lines.extend(encode_request(first_id + index, decision_type, observation, legal_bits)
+                     for index, (decision_type, observation, legal_bits) in enumerate(decisions))
+        started = time.perf_counter()
+        replies = {}
+        try:
+            allowance_ms = self.startup_ms if self._ensure_open() else 0
+            started = time.perf_counter()
+            self._write(''.join(lines).encode('ascii'))
+            self._read_replies(replies, first_id, len(decisions), started + (deadline_ms + allowance_ms) / 1000)
+        except OSError as e:
+            print(f"⚠️ 외부 봇 통신 실패: {e}")
+            self.close()
+        self.wait_time += time.perf_counter() - started
+        self.missed_batches = self.missed_batches + 1 if len(replies) < len(decisions) else 0
+        if self.restart_after is not None and self.missed_batches >= self.restart_after and self.process is not None:
+            print(f"⚠️ 외부 봇이 {self.missed_batches}번 연속 기한 초과 - 다시 띄웁니다")
+            self.process.kill()
+            self.close()
+            self.restarts += 1
+
+        actions = []
+        for index, (decision_type, observation, legal_bits) in enumerate(decisions):
+            action = replies.get(first_id + index)
+            if action is None:
+                self.timeouts += 1
+            elif not (0 <= action < NUM_ACTIONS and legal_bits >> action & 1):
+                self.invalid += 1
+                action = None
+            if action is None and fallback is not None:
+                action = fallback(decision_type, observation['hand'])
+            actions.append(action)
+        return actions
+
+    def _write(self, data):
+        while data:
+            written = os.write(self.write_fd, data)
+            data = data[written:]
+
+    def _read_replies(self, replies, first_id, count, deadline):
+        while len(replies) < count:
+            timeout = deadline - time.perf_counter()
+            if timeout <= 0 or not select.select([self.read_fd], [], [], timeout)[0]:
+                return
+            chunk = os.read(self.read_fd, 65536)
+            if not chunk:
+                raise ConnectionError("봇 연결이 끊어졌습니다")
+            self.buffer += chunk
+            *lines, self.buffer = self.buffer.split(b'\n')
+            for line in lines:
+                fields = line.split()
+                if len(fields) != 3 or fields[0] != b'A' or not fields[1].isdigit() or not fields[2].isdigit():
+                    continue
+                request_id, action = int(fields[1]), int(fields[2])
+                if first_id <= request_id < first_id + count:
+                    replies[request_id] = action
+
+    def summary(self):
+        """묶음/요청 수, 평균 묶음 크기, 시간 초과/잘못된 응답/재시작 수, 요청당 대기 시간(ms)"""
+        return {'batches': self.batches, 'requests': self.requests,
+                'mean_batch': self.requests / self.batches if self.batches else 0.0,
+                'timeouts': self.timeouts, 'invalid': self.invalid, 'restarts': self.restarts,
+                'wait_ms_per_request': self.wait_time / self.requests * 1000.0 if self.requests else 0.0}
+
+    def close(self):
+        if self.process is not None:
+            with contextlib.suppress(OSError):
+                self.process.stdin.close()
+            if self.process.poll() is None:
+                self.process.terminate()
+            try:
+                self.process.wait(timeout=1)
+            except subprocess.TimeoutExpired:
+                self.process.kill()  # 멈춘 봇이 종료 신호를 무시하는 경우
+                self.process.wait()
+            self.process.stdout.close()
+            self.process = None
+        if self.sock is not None:
+            self.sock.close()
+            self.sock = None
+        self.read_fd = self.write_fd = None
+
+
+class BatchedBotDriver:
+    """에이전트 좌석을 봇 하나가 맡는 HeadlessTable 여러 개를 진행
+
+    결정을 기다리는 모든 테이블의 요청을 한 묶음으로 보내므로 봇 왕복 1번에 테이블 수만큼 결정한다.
+    batch_size를 주면 그 개수씩 나눠 보낸다 (1이면 테이블마다 따로 요청).
+    """
+
+    def __init__(self, tables, connection, batch_size=None):
+        self.tables = tables
+        self.connection = connection
+        self.batch_size = batch_size
+        self.hands_played = 0
+        self.decisions = 0
+
+    def _next_decision(self, table):
+        """판이 끝났으면 다음 판을 시작해 결정 대기 상태로 (매치가 끝나면 False)"""
+        while table.hand_over:
+            self.hands_played += 1
+            if table.match_done:
+                return False
+            table.start_hand()
+        return True
+
+    def run(self):
+        """모든 테이블의 매치가 끝날 때까지 진행"""
+        active = []
+        for table in self.tables:
+            table.reset_match()
+            table.start_hand()
+            if self._next_decision(table):
+                active.append(table)
+        size = self.batch_size or len(self.tables)
+        while active:
+            for start in range(0, len(active), size):
+                chunk = active[start:start + size]
+                decisions = []
+                for table in chunk:
+                    decision = table.decision
+                    decision_type = DECISION_CODES[decision['type']]
+                    hand = table.hands[decision['seat']]
+                    decisions.append((decision_type, table.build_observation(decision['seat']),
+                                      legal_action_bits(decision_type, hand, decision['actions'])))
+                for table, action in zip(chunk, self.connection.decide(decisions)):
+                    table.apply_action(action)
+                self.decisions += len(decisions)
+            active = [table for table in active if self._next_decision(table)]
+
+
+# ----- 봇 쪽 -----
+
+def run_bot(decide, path=None, infile=None, outfile=None):
+    """묶음을 읽어 decide(requests) → 액션 번호 목록으로 응답 (입력이 끝날 때까지)
+
+    path를 주면 그 Unix 소켓에서 엔진 연결 1개를 기다리고, 아니면 표준 입출력을 쓴다.
+    """
+    server = None
+    if path:
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(path)
+        server.listen(1)
+        connection, _ = server.accept()
+        infile = connection.makefile('r', encoding='ascii')
+        outfile = connection.makefile('w', encoding='ascii')
+    infile = infile or sys.stdin
+    outfile = outfile or sys.stdout
+    try:
+        for header in infile:
+            fields = header.split()
+            if len(fields) != 4 or fields[0] != 'B':
+                continue
+            requests = [parse_request(infile.readline()) for _ in range(int(fields[2]))]
+            actions = decide(requests)
+            outfile.write(''.join(f"A {request.id} {action}\n" for request, action in zip(requests, actions)))
+            outfile.flush()
+    finally:
+        if server is not None:
+            server.close()
+            os.unlink(path)
+
+
+def reference_decide(requests):
+    """참고 봇 - 가능하면 깡, 버리기는 ai_improved_discard, 반응은 패스"""
+    actions = []
+    for request in requests:
+        gangs = [action for action in request.legal if action in (ACTION_TYPE_IDS['an_gang'],
+                                                                   ACTION_TYPE_IDS['jia_gang'])]
+        if gangs:
+            actions.append(gangs[0])
+        elif request.type == 'd':
+            actions.append(tile_to_kind(ai_improved_discard([TILE_KINDS[kind] for kind in request.hand])))
+        else:
+            actions.append(ACTION_PASS)
+    return actions
+
+
+def bench(num_tables, total_games=1, seed=0, latency_ms=0.0):
+    """참고 봇 프로세스 하나로 테이블 num_tables개 진행 - 묶음 요청과 테이블별 요청 비교
+
+    latency_ms는 봇이 묶음마다 쓰는 고정 비용 (모델 추론 1회 등) 흉내.
+    """
+    from mahjong_env import HeadlessTable
+
+    results = {}
+    for label, batch_size in (('batched', None), ('single', 1)):
+        tables = [HeadlessTable(seed + i, agent_seats=(0,), total_games=total_games) for i in range(num_tables)]
+        connection = BotConnection([sys.executable, os.path.abspath(__file__), '--bot', '--latency-ms', str(latency_ms)])
+        driver = BatchedBotDriver(tables, connection, batch_size)
+        started = time.perf_counter()
+        driver.run()
+        elapsed = time.perf_counter() - started
+        connection.close()
+        results[label] = dict(connection.summary(), hands=driver.hands_played, decisions=driver.decisions,
+                              elapsed_s=elapsed, decisions_per_s=driver.decisions / elapsed)
+    return results
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog='python bot_protocol.py', description='외부 봇 프로토콜')
+    parser.add_argument('--bot', action='store_true', help='참고 봇으로 실행 (표준 입출력)')
+    parser.add_argument('--unix', help='--bot을 이 Unix 소켓에서 실행')
+    parser.add_argument('--latency-ms', type=float, default=0.0, help='참고 봇의 묶음당 고정 지연')
+    parser.add_argument('--bench', type=int, metavar='TABLES', help='묶음/개별 요청 처리량 비교')
+    parser.add_argument('--games', type=int, default=1, help='테이블별 판 수 (--bench)')
+    parser.add_argument('--seed', type=int, default=0)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.bot or args.unix:
+        def decide(requests):
+            time.sleep(args.latency_ms / 1000)
+            return reference_decide(requests)
+
+        with contextlib.redirect_stdout(sys.stderr):  # 응답 외 출력은 표준 오류로
+            run_bot(decide, args.unix, outfile=sys.__stdout__ if not args.unix else None)
+        return 0
+    if args.bench:
+        results = bench(args.bench, args.games, args.seed, args.latency_ms)
+        for label, result in results.items():
+            print(f"{label}: {result['hands']}판 / {result['decisions']}결정, 묶음 {result['batches']}개 "
+                  f"(평균 {result['mean_batch']:.1f}), {result['elapsed_s']:.2f}초 "
+                  f"({result['decisions_per_s']:.0f}결정/s, 요청당 대기 {result['wait_ms_per_request']:.2f}ms), "
+                  f"시간 초과 {result['timeouts']}")
+        return 0
+    print("--bot, --unix 또는 --bench 중 하나를 지정하세요", file=sys.stderr)
+    return 2
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,12 +1,66 @@
 import pygame
 from mahjong_resources import TABLE_CENTER_X, TABLE_CENTER_Y, TILE_SIZE_DISCARD, SCREEN_WIDTH, SCREEN_HEIGHT
+from render_batch import RenderBatch
+
+
+# 화면 위치별 버림패 더미 기준점과 회전
+DISCARD_AREAS = {
+    "top": {"center_x": TABLE_CENTER_X, "center_y": TABLE_CENTER_Y - 188, "rotation": 180},
+    "right": {"center_x": TABLE_CENTER_X + 120, "center_y": TABLE_CENTER_Y - 24, "rotation": 90},
+    "bottom": {"center_x": TABLE_CENTER_X, "center_y": TABLE_CENTER_Y + 92, "rotation": 0},
+    "left": {"center_x": TABLE_CENTER_X - 168, "center_y": TABLE_CENTER_Y - 24, "rotation": -90}
+}
+DISCARD_TILE_SIZE = (36, 48)
+DISCARD_TILE_SPACING = 38
+DISCARD_ROW_HEIGHT = 48
+DISCARD_TILES_PER_ROW = 6
+
+# 미리 계산해 두는 자리 수 (6줄) - 넘으면 그때 계산
+DISCARD_TABLE_SIZE = DISCARD_TILES_PER_ROW * 6
+
+
+def _discard_tile_center(screen_pos, tile_index):
+    """버림패 더미에서 인덱스번째 패의 중심 좌표"""
+    area = DISCARD_AREAS[screen_pos]
+    row = tile_index // DISCARD_TILES_PER_ROW
+    col = tile_index % DISCARD_TILES_PER_ROW
+    
+    if area["rotation"] == 0:  # 하단 (플레이어)
+        start_x = area["center_x"] - (DISCARD_TILES_PER_ROW * DISCARD_TILE_SPACING) // 2
+        return (start_x + col * DISCARD_TILE_SPACING, area["center_y"] + row * DISCARD_ROW_HEIGHT)
+    elif area["rotation"] == 180:  # 상단 (AI2)
+        start_x = area["center_x"] - (DISCARD_TILES_PER_ROW * DISCARD_TILE_SPACING) // 2
+        return (start_x + (5 - col) * DISCARD_TILE_SPACING, area["center_y"] - row * DISCARD_ROW_HEIGHT)
+    elif area["rotation"] == 90:  # 우측 (AI1)
+        start_y = area["center_y"] - (DISCARD_TILES_PER_ROW * DISCARD_TILE_SPACING) // 2
+        return (area["center_x"] + row * DISCARD_ROW_HEIGHT, start_y + (5 - col) * DISCARD_TILE_SPACING)
+    else:  # rotation == -90, 좌측 (AI3)
+        start_y = area["center_y"] - (DISCARD_TILES_PER_ROW * DISCARD_TILE_SPACING) // 2
+        return (area["center_x"] - row * DISCARD_ROW_HEIGHT, start_y + col * DISCARD_TILE_SPACING)
+
+
+# 화면 위치별 패 중심 좌표 테이블
+DISCARD_POSITION_TABLE = {
+    screen_pos: tuple(_discard_tile_center(screen_pos, i) for i in range(DISCARD_TABLE_SIZE))
+    for screen_pos in DISCARD_AREAS
+}
+
+
+def discard_tile_position(screen_pos, tile_index):
+    """버림패 패 중심 좌표 (테이블 조회, 범위 밖이면 계산)"""
+    table = DISCARD_POSITION_TABLE[screen_pos]
+    if tile_index < len(table):
+        return table[tile_index]
+    return _discard_tile_center(screen_pos, tile_index)
+
 
 class DiscardManager:
     """버림패 그리기와 하이라이트 관리 클래스"""
     
-    def __init__(self, screen, resources):
+    def __init__(self, screen, resources, render_batch=None):
         self.screen = screen
         self.resources = resources
+        self.render_batch = render_batch if render_batch is not None else RenderBatch(screen)
         self.highlighted_tile = None
         self.highlight_positions = []
         
@@ -17,6 +71,12 @@ class DiscardManager:
         # key: (player_idx, tile_index), value: (x, y, rotation)
         self.tile_positions = {}
         
+        # 플레이어별 버림패 더미 캐시 (미리 합성한 서피스 + 패 → 인덱스 목록)
+        self.pile_caches = [None] * 4
+        
+        # 하이라이트 서피스 (회전 방향별로 한 번만 생성)
+        self.highlight_surfaces = {}
+        
     def get_discard_pile_center(self, player_idx, screen_to_player):
         """버림패 더미의 중앙 위치 반환"""
         pos = self.get_player_screen_position(player_idx, screen_to_player)
@@ -43,140 +103,123 @@ class DiscardManager:
     
     def calculate_discard_tile_position(self, screen_pos, tile_index):
         """버림패 더미에서 특정 인덱스의 패 위치 계산"""
-        discard_areas = {
-            "top": {"center_x": TABLE_CENTER_X, "center_y": TABLE_CENTER_Y - 188, "rotation": 180},
-            "right": {"center_x": TABLE_CENTER_X + 120, "center_y": TABLE_CENTER_Y - 24, "rotation": 90},
-            "bottom": {"center_x": TABLE_CENTER_X, "center_y": TABLE_CENTER_Y + 92, "rotation": 0},
-            "left": {"center_x": TABLE_CENTER_X - 168, "center_y": TABLE_CENTER_Y - 24, "rotation": -90}
-        }
-        
-        if screen_pos not in discard_areas:
+        if screen_pos not in DISCARD_AREAS:
             return None
-            
-        area = discard_areas[screen_pos]
-        tile_size = (36, 48)
-        tile_spacing = 38
-        
-        row = tile_index // 6
-        col = tile_index % 6
-        
-        if area["rotation"] == 0:  # 하단 (플레이어)
-            start_x = area["center_x"] - (6 * tile_spacing) // 2
-            tile_x = start_x + col * tile_spacing
-            tile_y = area["center_y"] + row * 48
-        elif area["rotation"] == 180:  # 상단 (AI2)
-            start_x = area["center_x"] - (6 * tile_spacing) // 2
-            tile_x = start_x + (5 - col) * tile_spacing
-            tile_y = area["center_y"] - row * 48
-        elif area["rotation"] == 90:  # 우측 (AI1)
-            start_y = area["center_y"] - (6 * tile_spacing) // 2
-            tile_x = area["center_x"] + row * 48
-            tile_y = start_y + (5 - col) * tile_spacing
-        else:  # rotation == -90, 좌측 (AI3)
-            start_y = area["center_y"] - (6 * tile_spacing) // 2
-            tile_x = area["center_x"] - row * 48
-            tile_y = start_y + col * tile_spacing
-        
-        return (tile_x, tile_y)
-    
-    def render_discard_pile(self, pos, discard_piles, screen_to_player):
-        """버림패 더미 렌더링 및 위치 저장"""
-        player_idx = screen_to_player.get(pos)
-        if player_idx is None:
-            return
+        return discard_tile_position(screen_pos, tile_index)
+    
+    def _new_pile_cache(self, screen_pos, capacity):
+        """빈 더미 캐시 - capacity장까지 들어가는 투명 서피스"""
+        rotation = DISCARD_AREAS[screen_pos]["rotation"]
+        width, height = DISCARD_TILE_SIZE
+        if rotation in (90, -90):
+            width, height = height, width
         
-        pile = discard_piles[player_idx]
-        if not pile:
-            return
+        # 패 중심 좌표에서 더미 전체 영역 계산
+        left = top = None
+        right = bottom = None
+        for i in range(capacity):
+            x, y = discard_tile_position(screen_pos, i)
+            tile_left, tile_top = x - width // 2, y - height // 2
+            left = tile_left if left is None else min(left, tile_left)
+            top = tile_top if top is None else min(top, tile_top)
+            right = tile_left + width if right is None else max(right, tile_left + width)
+            bottom = tile_top + height if bottom is None else max(bottom, tile_top + height)
         
-        discard_areas = {
-            "top": {"center_x": TABLE_CENTER_X, "center_y": TABLE_CENTER_Y - 188, "rotation": 180},
-            "right": {"center_x": TABLE_CENTER_X + 120, "center_y": TABLE_CENTER_Y - 24, "rotation": 90},
-            "bottom": {"center_x": TABLE_CENTER_X, "center_y": TABLE_CENTER_Y + 92, "rotation": 0},
-            "left": {"center_x": TABLE_CENTER_X - 168, "center_y": TABLE_CENTER_Y - 24, "rotation": -90}
+        return {
+            'screen_pos': screen_pos,
+            'rotation': rotation,
+            'capacity': capacity,
+            'tiles': [],
+            'by_tile': {},  # 패 → 더미 내 인덱스 목록
+            'surface': pygame.Surface((right - left, bottom - top), pygame.SRCALPHA),
+            'origin': (left, top),
         }
+    
+    def _sync_pile(self, player_idx, screen_pos, pile):
+        """더미 캐시를 실제 버림패 목록에 맞추기 - 뒤에 추가된 패만 합성 (펑 등으로 줄면 다시 생성)"""
+        cache = self.pile_caches[player_idx]
+        if (cache is None or cache['screen_pos'] != screen_pos or len(pile) < len(cache['tiles'])
+                or pile[:len(cache['tiles'])] != cache['tiles']):
+            for key in [key for key in self.tile_positions if key[0] == player_idx]:
+                del self.tile_positions[key]
+            cache = self._new_pile_cache(screen_pos, DISCARD_TABLE_SIZE)
+            self.pile_caches[player_idx] = cache
         
-        if pos not in discard_areas:
-            return
-            
-        area = discard_areas[pos]
-        tile_size = (36, 48)
-        tile_spacing = 38
+        tiles = cache['tiles']
+        if len(pile) == len(tiles):
+            return cache
         
-        for i, tile in enumerate(pile):
-            row = i // 6
-            col = i % 6
-            
-            if area["rotation"] == 0:  # 하단 (플레이어)
-                start_x = area["center_x"] - (6 * tile_spacing) // 2
-                tile_x = start_x + col * tile_spacing
-                tile_y = area["center_y"] + row * 48
-            elif area["rotation"] == 180:  # 상단 (AI2)
-                start_x = area["center_x"] - (6 * tile_spacing) // 2
-                tile_x = start_x + (5 - col) * tile_spacing
-                tile_y = area["center_y"] - row * 48
-            elif area["rotation"] == 90:  # 우측 (AI1)
-                start_y = area["center_y"] - (6 * tile_spacing) // 2
-                tile_x = area["center_x"] + row * 48
-                tile_y = start_y + (5 - col) * tile_spacing
-            else:  # rotation == -90, 좌측 (AI3)
-                start_y = area["center_y"] - (6 * tile_spacing) // 2
-                tile_x = area["center_x"] - row * 48
-                tile_y = start_y + col * tile_spacing
+        # 자리가 모자라면 더 큰 서피스로 다시 합성
+        if len(pile) > cache['capacity']:
+            capacity = cache['capacity']
+            while capacity < len(pile):
+                capacity += DISCARD_TABLE_SIZE
+            cache = self._new_pile_cache(screen_pos, capacity)
+            self.pile_caches[player_idx] = cache
+            tiles = cache['tiles']
+        
+        rotation = cache['rotation']
+        origin_x, origin_y = cache['origin']
+        for i in range(len(tiles), len(pile)):
+            tile = pile[i]
+            tile_x, tile_y = discard_tile_position(screen_pos, i)
             
             # 패 위치 저장 (하이라이트용)
-            self.tile_positions[(player_idx, i)] = (tile_x, tile_y, area["rotation"])
-            
-            # 패 이미지 렌더링
-            tile_surface = self.resources.get_tile_surface(tile, tile_size)
+            self.tile_positions[(player_idx, i)] = (tile_x, tile_y, rotation)
+            cache['by_tile'].setdefault(tile, []).append(i)
+            tiles.append(tile)
             
-            # 회전 적용
-            if area["rotation"] != 0:
-                tile_surface = pygame.transform.rotate(tile_surface, area["rotation"])
-            
-            # 중앙 정렬하여 렌더링
-            tile_rect = tile_surface.get_rect(center=(tile_x, tile_y))
-            self.screen.blit(tile_surface, tile_rect)
+            # 패 이미지 (회전 적용)를 중앙 정렬하여 더미 서피스에 합성
+            tile_surface = self.resources.get_tile_surface(tile, DISCARD_TILE_SIZE)
+            if rotation != 0:
+                tile_surface = pygame.transform.rotate(tile_surface, rotation)
+            tile_rect = tile_surface.get_rect(center=(tile_x - origin_x, tile_y - origin_y))
+            cache['surface'].blit(tile_surface, tile_rect)
+        return cache
     
-    def get_discarded_tile_positions(self, tile, discard_piles, screen_to_player):
-        """특정 패가 버림패 더미에서 위치한 모든 좌표 반환"""
-        positions = []
-        
+    def _sync_all_piles(self, discard_piles, screen_to_player):
+        """모든 플레이어 더미 캐시 갱신"""
         for player_idx, pile in enumerate(discard_piles):
             screen_pos = self.get_player_screen_position(player_idx, screen_to_player)
-            
-            for tile_index, discarded_tile in enumerate(pile):
-                if discarded_tile == tile:
-                    pos = self.calculate_discard_tile_position(screen_pos, tile_index)
-                    if pos:
-                        positions.append(pos)
+            if screen_pos in DISCARD_AREAS:
+                self._sync_pile(player_idx, screen_pos, pile)
+    
+    def render_discard_pile(self, pos, discard_piles, screen_to_player, in_flight=0):
+        """버림패 더미 렌더링 - 합성해 둔 더미 서피스 한 장만 그리기 (마지막 in_flight장은 아직 날아가는 중이라 제외)"""
+        player_idx = screen_to_player.get(pos)
+        if player_idx is None or pos not in DISCARD_AREAS:
+            return
+        
+        pile = discard_piles[player_idx]
+        if in_flight:
+            pile = pile[:max(0, len(pile) - in_flight)]
+        cache = self._sync_pile(player_idx, pos, pile)
+        if not pile:
+            return
         
-        return positions
+        self.render_batch.add('discard', cache['surface'], cache['origin'])
+        self.render_batch.flush('discard')
+    
+    def _find_tile(self, tile, discard_piles, screen_to_player):
+        """버림패 중 같은 패의 (x, y, rotation) 목록 - 더미별 패 인덱스 사용"""
+        self._sync_all_piles(discard_piles, screen_to_player)
+        found = []
+        for player_idx, cache in enumerate(self.pile_caches):
+            if cache is None or player_idx >= len(discard_piles):
+                continue
+            for tile_index in cache['by_tile'].get(tile, ()):
+                x, y = discard_tile_position(cache['screen_pos'], tile_index)
+                found.append((x, y, cache['rotation']))
+        return found
+    
+    def get_discarded_tile_positions(self, tile, discard_piles, screen_to_player):
+        """특정 패가 버림패 더미에서 위치한 모든 좌표 반환"""
+        return [(x, y) for x, y, rotation in self._find_tile(tile, discard_piles, screen_to_player)]
     
     def set_tile_highlight(self, tile, discard_piles, screen_to_player):
-        """패 하이라이트 설정 - 저장된 위치 정보 사용"""
+        """패 하이라이트 설정 - 패 → 위치 인덱스 사용"""
         self.highlighted_tile = tile
-        self.highlight_positions = []
-        
-        # 저장된 위치 정보에서 해당 패 찾기
-        for player_idx, pile in enumerate(discard_piles):
-            for tile_index, discarded_tile in enumerate(pile):
-                if discarded_tile == tile:
-                    position_key = (player_idx, tile_index)
-                    if position_key in self.tile_positions:
-                        x, y, rotation = self.tile_positions[position_key]
-                        self.highlight_positions.append((x, y, rotation))
-                    else:
-                        # 백업: 계산된 위치 사용
-                        screen_pos = self.get_player_screen_position(player_idx, screen_to_player)
-                        pos = self.calculate_discard_tile_position(screen_pos, tile_index)
-                        if pos:
-                            # 회전 정보 추가
-                            discard_areas = {
-                                "top": 180, "right": 90, "bottom": 0, "left": -90
-                            }
-                            rotation = discard_areas.get(screen_pos, 0)
-                            self.highlight_positions.append((pos[0], pos[1], rotation))
+        self.highlight_positions = self._find_tile(tile, discard_piles, screen_to_player)
     
     def clear_tile_highlight(self):
         """패 하이라이트 해제"""
@@ -200,26 +243,34 @@ class DiscardManager:
                 else:
                     continue
                 
-                # 회전에 따른 하이라이트 크기 결정
-                if rotation in [90, -90]:
-                    # 90도 회전된 패 - 가로세로 바뀜
-                    highlight_surface = pygame.Surface((65, 50), pygame.SRCALPHA)
-                    inner_rect = pygame.Rect(4, 4, 57, 42)
-                else:
-                    # 일반 패 (0도, 180도)
-                    highlight_surface = pygame.Surface((50, 65), pygame.SRCALPHA)
-                    inner_rect = pygame.Rect(4, 4, 42, 57)
-                
-                # 노란색 테두리 (두꺼운 테두리)
-                pygame.draw.rect(highlight_surface, (255, 255, 0, 180), 
-                               highlight_surface.get_rect(), 4)
-                
-                # 반투명 노란색 배경
-                pygame.draw.rect(highlight_surface, (255, 255, 0, 60), inner_rect)
+                highlight_surface = self._get_highlight_surface(rotation in [90, -90])
                 
                 # 중앙 정렬하여 렌더링
                 highlight_rect = highlight_surface.get_rect(center=(x, y))
-                self.screen.blit(highlight_surface, highlight_rect)
+                self.render_batch.add('highlight', highlight_surface, highlight_rect)
+        
+        self.render_batch.flush('highlight')
+    
+    def _get_highlight_surface(self, sideways):
+        """하이라이트 서피스 (노란 테두리 + 반투명 배경, 가로/세로별로 캐시)"""
+        if sideways not in self.highlight_surfaces:
+            if sideways:
+                # 90도 회전된 패 - 가로세로 바뀜
+                highlight_surface = pygame.Surface((65, 50), pygame.SRCALPHA)
+                inner_rect = pygame.Rect(4, 4, 57, 42)
+            else:
+                # 일반 패 (0도, 180도)
+                highlight_surface = pygame.Surface((50, 65), pygame.SRCALPHA)
+                inner_rect = pygame.Rect(4, 4, 42, 57)
+            
+            # 노란색 테두리 (두꺼운 테두리)
+            pygame.draw.rect(highlight_surface, (255, 255, 0, 180), 
+                           highlight_surface.get_rect(), 4)
+            
+            # 반투명 노란색 배경
+            pygame.draw.rect(highlight_surface, (255, 255, 0, 60), inner_rect)
+            self.highlight_surfaces[sideways] = highlight_surface
+        return self.highlight_surfaces[sideways]
     
     def get_discard_pile_next_position(self, player_idx, discard_piles, screen_to_player):
         """버림패 더미에서 다음 패가 놓일 정확한 위치 계산"""
@@ -243,4 +294,5 @@ class DiscardManager:
         """모든 버림패 더미 초기화"""
         self.discard_piles = [[] for _ in range(4)]
         self.tile_positions = {}  # 위치 정보도 초기화
+        self.pile_caches = [None] * 4
         print("🗂️ 모든 버림패 더미 초기화") 
\ No newline at end of file
@@ -0,0 +1,53 @@
+"""
+프레임 페이싱 모듈
+- 애니메이션 중에는 고정 FPS(60 또는 화면 주사율 중 낮은 값)로 루프
+- 대기 중(애니메이션/예약 없음)에는 pygame.event.wait로 다음 이벤트나 예약 시각까지 블록
+"""
+
+import pygame
+
+
+DEFAULT_ACTIVE_FPS = 60
+IDLE_MAX_WAIT_MS = 1000  # 대기 중에도 이 간격으로는 깨어나서 상태 확인
+
+
+def get_display_refresh_rate():
+    """현재 화면 주사율 (알 수 없으면 0)"""
+    getter = getattr(pygame.display, 'get_current_refresh_rate', None)
+    if getter is None:
+        return 0
+    try:
+        return getter() or 0
+    except pygame.error:
+        return 0
+
+
+class FramePacer:
+    """루프 대기 방식 결정 (바쁠 때 clock.tick, 한가할 때 event.wait)"""
+
+    def __init__(self, clock, active_fps=None):
+        self.clock = clock
+        if active_fps is None:
+            refresh_rate = get_display_refresh_rate()
+            active_fps = min(DEFAULT_ACTIVE_FPS, refresh_rate) if refresh_rate > 0 else DEFAULT_ACTIVE_FPS
+        self.active_fps = active_fps
+        self.active_frames = 0
+        self.idle_waits = 0
+
+    def poll(self, timeout_ms):
+        """이벤트 가져오기 - timeout_ms가 None/0 이하면 바로, 아니면 최대 timeout_ms까지 기다림"""
+        if timeout_ms is None or timeout_ms <= 0:
+            return pygame.event.get()
+        self.idle_waits += 1
+        event = pygame.event.wait(min(int(timeout_ms), IDLE_MAX_WAIT_MS))
+        if event.type == pygame.NOEVENT:
+            return []
+        return [event] + pygame.event.get()
+
+    def tick(self, active):
+        """프레임 끝 - 바쁠 때만 FPS 제한 (대기 시간은 poll에서 이미 보냄)"""
+        if active:
+            self.active_frames += 1
+            self.clock.tick(self.active_fps)
+        else:
+            self.clock.tick()
@@ -0,0 +1,301 @@
+"""
+프레임 프로파일러
+- 프레임마다 구간(이벤트 처리, update, render_* 메서드, display.flip)별 시간 측정
+- 최근 프레임 기준 p50/p95/p99 (HUD용)와 전체 실행 히스토그램 (종료 시 덤프용)
+- 블릿 수(RenderBatch 집계)와 pygame.transform 호출 수 집계
+- F3으로 화면 HUD 토글, 종료 시 CSV/JSON 덤프 (MAHJONG_PROFILE=경로)
+- 게임 이벤트 종류별 처리 시간 (event_log 지정 시 덤프에 포함)
+"""
+
+import csv
+import json
+import math
+import os
+import time
+from collections import deque
+from functools import wraps
+
+import pygame
+
+
+PROFILE_ENV = "MAHJONG_PROFILE"   # 덤프 경로 (.json이면 JSON, 그 외 CSV)
+WINDOW_FRAMES = 300               # HUD 퍼센타일 계산에 쓰는 최근 프레임 수
+HUD_REFRESH_FRAMES = 30           # HUD 글자는 이 프레임마다 다시 그리기
+HISTOGRAM_FLOOR_MS = 0.001        # 전체 실행 히스토그램 최소 칸 (1µs)
+LOG_GROWTH = math.log(1.01)       # 칸마다 1%씩 커짐
+PERCENTILES = (50, 95, 99)
+COUNTED_TRANSFORMS = ('rotate', 'scale', 'smoothscale', 'rotozoom', 'flip')
+CORE_SECTIONS = ('frame', 'wait', 'events', 'update', 'render', 'flip', 'capture', 'tick')
+
+
+def percentile(sorted_values, pct):
+    """정렬된 값 목록의 pct 퍼센타일 (최근접 순위)"""
+    if not sorted_values:
+        return 0.0
+    rank = min(len(sorted_values), max(1, math.ceil(pct / 100.0 * len(sorted_values))))
+    return sorted_values[rank - 1]
+
+
+class LatencyHistogram:
+    """희소 히스토그램 - 전체 실행 동안의 퍼센타일 (시간은 상대오차 1% 로그 칸, 개수는 값 그대로)"""
+
+    def __init__(self, log_scale=True):
+        self.log_scale = log_scale
+        self.buckets = {}
+        self.count = 0
+        self.total = 0.0
+        self.max_value = 0.0
+
+    def _bucket(self, value):
+        if not self.log_scale:
+            return value
+        if value <= HISTOGRAM_FLOOR_MS:
+            return 0
+        return int(math.log(value / HISTOGRAM_FLOOR_MS) / LOG_GROWTH) + 1
+
+    def _upper(self, bucket):
+        if not self.log_scale:
+            return bucket
+        return HISTOGRAM_FLOOR_MS * math.exp(bucket * LOG_GROWTH)
+
+    def add(self, value):
+        bucket = self._bucket(value)
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+        self.count += 1
+        self.total += value
+        if value > self.max_value:
+            self.max_value = value
+
+    def percentile(self, pct):
+        """칸 상단 값 기준 퍼센타일"""
+        if self.count == 0:
+            return 0.0
+        target = pct / 100.0 * self.count
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= target:
+                return min(self._upper(bucket), self.max_value)
+        return self.max_value
+
+    def summary(self):
+        result = {'count': self.count, 'mean': self.total / self.count if self.count else 0.0}
+        for pct in PERCENTILES:
+            result[f'p{pct}'] = self.percentile(pct)
+        result['max'] = self.max_value
+        return result
+
+
+class SectionStats:
+    """구간 하나의 최근 프레임 값 + 전체 히스토그램"""
+
+    def __init__(self, window=WINDOW_FRAMES, log_scale=True):
+        self.recent = deque(maxlen=window)
+        self.histogram = LatencyHistogram(log_scale)
+
+    def add(self, value):
+        self.recent.append(value)
+        self.histogram.add(value)
+
+    def recent_percentiles(self):
+        ordered = sorted(self.recent)
+        return [percentile(ordered, pct) for pct in PERCENTILES]
+
+
+class FrameProfiler:
+    """프레임 구간 시간 / 블릿 / 변환 수 계측"""
+
+    def __init__(self, render_batch=None, dump_path=None):
+        self.render_batch = render_batch
+        self.dump_path = dump_path
+        self.hud_visible = False
+        self.frames = 0
+        self.sections = {}        # {구간: SectionStats} (ms)
+        self.counters = {}        # {카운터: SectionStats} (프레임당 개수)
+        self.frame_times = {}     # 이번 프레임 구간별 누적 시간 (초)
+        self.open_sections = {}   # {구간: 시작 시각}
+        self.frame_start = None
+        self.transform_count = 0
+        self.installed_transforms = {}
+        self.hud_surface = None
+        self.event_log = None     # 게임 이벤트 로그 (지정 시 요약에 이벤트 종류별 처리 시간 포함)
+
+    # ----- 구간 측정 -----
+
+    def begin_frame(self):
+        self.frame_start = time.perf_counter()
+        self.frame_times = {}
+
+    def start(self, name):
+        self.open_sections[name] = time.perf_counter()
+
+    def stop(self, name):
+        started = self.open_sections.pop(name, None)
+        if started is not None:
+            self.frame_times[name] = self.frame_times.get(name, 0.0) + time.perf_counter() - started
+
+    def wrap(self, name, func):
+        """함수 호출 시간을 name 구간에 누적하는 래퍼 (재귀 호출은 바깥 호출만 측정)"""
+        profiler = self
+
+        @wraps(func)
+        def timed(*args, **kwargs):
+            if name in profiler.open_sections:
+                return func(*args, **kwargs)
+            profiler.start(name)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                profiler.stop(name)
+        return timed
+
+    def instrument(self, obj, prefix='render_'):
+        """obj의 prefix로 시작하는 메서드를 모두 측정 래퍼로 교체 (인스턴스 속성)"""
+        names = [name for name in dir(type(obj))
+                 if name.startswith(prefix) and callable(getattr(type(obj), name))]
+        for name in names:
+            setattr(obj, name, self.wrap(name, getattr(obj, name)))
+        return names
+
+    def install_transform_counter(self):
+        """pygame.transform 함수 호출 수 집계 (모듈 속성으로 호출하는 곳만 잡힘)"""
+        for name in COUNTED_TRANSFORMS:
+            original = getattr(pygame.transform, name, None)
+            if original is None or name in self.installed_transforms:
+                continue
+            self.installed_transforms[name] = original
+            setattr(pygame.transform, name, self._counting(original))
+
+    def uninstall_transform_counter(self):
+        for name, original in self.installed_transforms.items():
+            setattr(pygame.transform, name, original)
+        self.installed_transforms = {}
+
+    def _counting(self, func):
+        profiler = self
+
+        @wraps(func)
+        def counted(*args, **kwargs):
+            profiler.transform_count += 1
+            return func(*args, **kwargs)
+        return counted
+
+    def end_frame(self):
+        """프레임 종료 - 구간 시간과 카운터를 통계에 반영"""
+        if self.frame_start is None:
+            return
+        self.frame_times['frame'] = time.perf_counter() - self.frame_start
+        for name, seconds in self.frame_times.items():
+            stats = self.sections.get(name)
+            if stats is None:
+                stats = self.sections[name] = SectionStats()
+            stats.add(seconds * 1000.0)
+
+        counts = {'transforms': self.transform_count}
+        if self.render_batch is not None:
+            counts['blits'] = self.render_batch.get_total_count()
+            counts['flushes'] = self.render_batch.last_flush_count
+        for name, value in counts.items():
+            stats = self.counters.get(name)
+            if stats is None:
+                stats = self.counters[name] = SectionStats(log_scale=False)
+            stats.add(value)
+
+        self.transform_count = 0
+        self.frames += 1
+        self.frame_start = None
+        if self.hud_visible and self.frames % HUD_REFRESH_FRAMES == 0:
+            self.hud_surface = None
+
+    # ----- HUD -----
+
+    def toggle_hud(self):
+        self.hud_visible = not self.hud_visible
+        self.hud_surface = None
+        print(f"📊 프로파일러 HUD {'켜짐' if self.hud_visible else '꺼짐'}")
+
+    def hud_lines(self, top_render=5):
+        """HUD에 표시할 글줄 (최근 프레임 기준)"""
+        lines = []
+        frame = self.sections.get('frame')
+        if frame and frame.recent:
+            p50, p95, p99 = frame.recent_percentiles()
+            fps = 1000.0 / (sum(frame.recent) / len(frame.recent))
+            lines.append(f"FPS {fps:5.1f}  frame p50 {p50:5.2f}  p95 {p95:5.2f}  p99 {p99:5.2f} ms")
+        for name in CORE_SECTIONS[1:]:
+            stats = self.sections.get(name)
+            if stats and stats.recent:
+                p50, p95, p99 = stats.recent_percentiles()
+                lines.append(f"{name:<8} p50 {p50:5.2f}  p95 {p95:5.2f}  p99 {p99:5.2f}")
+        render_stats = [(stats.recent_percentiles(), name) for name, stats in self.sections.items()
+                        if name not in CORE_SECTIONS and stats.recent]
+        render_stats.sort(key=lambda item: item[0][1], reverse=True)
+        for (_, p95, p99), name in render_stats[:top_render]:
+            lines.append(f"  {name[:24]:<24} p95 {p95:5.2f}  p99 {p99:5.2f}")
+        counter_text = []
+        for name in ('blits', 'flushes', 'transforms'):
+            stats = self.counters.get(name)
+            if stats and stats.recent:
+                counter_text.append(f"{name} {stats.recent[-1]} (p95 {stats.recent_percentiles()[1]})")
+        if counter_text:
+            lines.append("  ".join(counter_text))
+        return lines
+
+    def draw_hud(self, screen):
+        """HUD 그리기 (글자 서피스는 HUD_REFRESH_FRAMES마다 다시 만듦)"""
+        if not self.hud_visible:
+            return
+        if self.hud_surface is None:
+            self.hud_surface = self._build_hud_surface()
+        if self.hud_surface is not None:
+            screen.blit(self.hud_surface, (8, 8))
+
+    def _build_hud_surface(self):
+        lines = self.hud_lines() or ["프레임 수집 중..."]
+        font = pygame.font.Font(None, 20)
+        rendered = [font.render(line, True, (255, 255, 120)) for line in lines]
+        width = max(surface.get_width() for surface in rendered) + 12
+        height = sum(surface.get_height() for surface in rendered) + 10
+        panel = pygame.Surface((width, height), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 170))
+        y = 5
+        for surface in rendered:
+            panel.blit(surface, (6, y))
+            y += surface.get_height()
+        return panel
+
+    # ----- 덤프 -----
+
+    def summary(self):
+        """전체 실행 요약 {'frames', 'sections', 'counters', 'events': {이름: 통계}} (시간은 ms)"""
+        return {
+            'frames': self.frames,
+            'sections': {name: stats.histogram.summary() for name, stats in sorted(self.sections.items())},
+            'counters': {name: stats.histogram.summary() for name, stats in sorted(self.counters.items())},
+            'events': self.event_log.timing_summary() if self.event_log is not None else {},
+        }
+
+    def dump(self, path=None):
+        """요약을 CSV/JSON으로 저장 (확장자로 형식 결정)"""
+        path = path or self.dump_path
+        if not path or self.frames == 0:
+            return None
+        summary = self.summary()
+        if path.lower().endswith('.json'):
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(summary, f, ensure_ascii=False, indent=2)
+        else:
+            fields = ['kind', 'name', 'count', 'mean'] + [f'p{pct}' for pct in PERCENTILES] + ['max']
+            with open(path, 'w', encoding='utf-8', newline='') as f:
+                writer = csv.DictWriter(f, fieldnames=fields, extrasaction='ignore')
+                writer.writeheader()
+                for kind in ('sections', 'counters', 'events'):
+                    for name, stats in summary[kind].items():
+                        writer.writerow(dict(stats, kind=kind, name=name))
+        print(f"📊 프레임 프로파일 저장: {path} ({self.frames}프레임)")
+        return path
+
+
+def create_profiler(render_batch=None):
+    """환경변수 MAHJONG_PROFILE이 있으면 종료 시 그 경로로 덤프하는 프로파일러"""
+    return FrameProfiler(render_batch, os.environ.get(PROFILE_ENV) or None)
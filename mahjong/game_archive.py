@@ -0,0 +1,463 @@
+"""
+판 기록 아카이브 (쓰기는 pygame/numpy 없이, 읽기는 numpy 필요)
+- ArchiveWriter: 판 1개 = 고정 폭 정수 열들의 한 행 (시드, 패산 104장, 결과, 역 비트, 점수 변화, 액션 끝 위치)
+  + 액션 열 (판마다 가변 길이, 액션 1개 = 코드/좌석/패 3바이트)
+- chunk_hands 판마다 청크 파일 1개 (열 블록 + 끝의 색인 푸터), 메모리에는 쓰는 중인 청크만 유지
+- 청크 파일은 임시 파일 + os.replace로 원자적 (쓰는 중 죽어도 완성된 청크만 남음)
+- HandRecorder: EventLog 구독자 - 판 시작에 패산, 버림/펑/깡/리치를 액션으로, 화료/유국에 행 추가
+- ArchiveReader: 청크를 mmap해서 열을 numpy 배열 뷰로 (복사 없음)
+- MAHJONG_ARCHIVE=디렉터리 지정 시 게임의 모든 판 기록
+
+    python game_archive.py runs/ --simulate 2000 --tables 16     (AI끼리 진행하며 기록, numpy 필요)
+    python game_archive.py runs/                                 (아카이브 요약)
+"""
+
+import argparse
+import mmap
+import os
+import random
+import struct
+import sys
+import time
+from array import array
+
+try:
+    import numpy as np
+except ImportError:
+    # 기록(ArchiveWriter/HandRecorder)만 쓰면 numpy 없이 동작
+    np = None
+
+from game_events import (EVENT_START, EVENT_DISCARD, EVENT_TURN, EVENT_PENG, EVENT_GANG, EVENT_RIICHI, EVENT_WIN,
+                         EVENT_DRAW_GAME, EVENT_NAMES)
+from table_protocol import tile_id, tile_name, RESULT_TYPES, TILE_NONE
+from table_state import MELD_TYPES
+
+
+ARCHIVE_ENV = "MAHJONG_ARCHIVE"
+ARCHIVE_MAGIC = b'MJAR'
+FOOTER_MAGIC = b'MJAI'
+ARCHIVE_VERSION = 1
+CHUNK_PATTERN = "chunk-{:06d}.mjar"
+DEFAULT_CHUNK_HANDS = 16384
+WALL_SIZE = 104
+MAX_YAKU = 64  # 역 비트 수 (청크별 이름 표)
+
+FLAG_REWOUND = 1  # 판 도중 무르기/복구로 다시 시작됨 (무른 액션은 잘라내고 최종 진행만 남김)
+
+# 열: (이름, array 타입 코드, 행당 개수) - 'actions' 외에는 판 1개 = 1행
+COLUMNS = (
+    ('seed', 'Q', 1),        # 테이블 시드 (없으면 0)
+    ('game', 'H', 1),        # 매치 안 판 번호
+    ('east', 'B', 1),        # 동가 좌석
+    ('dice', 'B', 1),        # 패산 주사위 합 (0 = 앞에서 쯔모, 뒤에서 보충하는 단순 배열)
+    ('result', 'B', 1),      # RESULT_TYPES 번호
+    ('winner', 'b', 1),      # 화료 좌석 (-1 없음)
+    ('loser', 'b', 1),       # 론 당한 좌석 (-1 없음)
+    ('flags', 'B', 1),
+    ('turns', 'H', 1),
+    ('deltas', 'h', 4),      # 좌석별 점수 변화
+    ('yaku', 'Q', 1),        # 역 비트 (청크 푸터의 이름 표 순서)
+    ('wall', 'B', WALL_SIZE),  # 판 시작 패산 (table_protocol 패 번호)
+    ('action_end', 'I', 1),  # 이 판 액션이 끝나는 actions 행 (청크 안 누적)
+    ('actions', 'B', 3),     # 액션 코드 (이벤트 종류 | 멜드 종류 << 4), 좌석, 패
+)
+COLUMN_INDEX = {name: index for index, (name, _, _) in enumerate(COLUMNS)}
+NUMPY_TYPES = {'Q': '<u8', 'H': '<u2', 'B': 'u1', 'b': 'i1', 'h': '<i2', 'I': '<u4'}
+
+ACTION_KINDS = (EVENT_DISCARD, EVENT_PENG, EVENT_GANG, EVENT_RIICHI)
+
+_HEADER = struct.Struct('<4sHH')        # magic, version, 예약
+_FOOTER = struct.Struct('<HIH')         # version, 판 수, 열 수
+_COLUMN = struct.Struct('<16scHIQ')     # 이름, 타입 코드, 행당 개수, 행 수, 시작 위치
+_TRAILER = struct.Struct('<Q4s')        # 푸터 시작 위치, magic
+
+
+class ArchiveError(ValueError):
+    """아카이브 형식/버전 오류"""
+
+
+def _optional_seat(seat):
+    return -1 if seat is None else seat
+
+
+class ArchiveWriter:
+    """판 기록을 청크 파일로 스트리밍 (청크 하나 분량만 메모리에 보관)"""
+
+    def __init__(self, directory, chunk_hands=DEFAULT_CHUNK_HANDS):
+        self.directory = directory
+        self.chunk_hands = chunk_hands
+        os.makedirs(directory, exist_ok=True)
+        self.chunk_index = len(list_chunks(directory))  # 기존 아카이브 뒤에 이어 쓰기
+        self.hands_written = 0
+        self.bytes_written = 0
+        self.write_time = 0.0
+        self._reset_chunk()
+
+    def _reset_chunk(self):
+        self.columns = [array(typecode) for _, typecode, _ in COLUMNS]
+        self.yaku_names = []
+        self.yaku_bits = {}
+        self.rows = 0
+
+    def _yaku_mask(self, yaku_list):
+        mask = 0
+        for name in yaku_list:
+            bit = self.yaku_bits.get(name)
+            if bit is None:
+                bit = len(self.yaku_names)
+                if bit >= MAX_YAKU:
+                    raise ArchiveError(f"청크당 역 종류 초과: {name}")
+                self.yaku_bits[name] = bit
+                self.yaku_names.append(name)
+            mask |= 1 << bit
+        return mask
+
+    def append(self, seed, game, east, dice, wall, actions, result_type, winner, loser, turns, yaku_list, deltas,
+               flags=0):
+        """판 1개 추가 - wall은 패 번호 바이트, actions는 3바이트씩 이어 붙인 액션 바이트"""
+        if len(wall) != WALL_SIZE:
+            raise ArchiveError(f"패산은 {WALL_SIZE}장이어야 합니다: {len(wall)}")
+        c = self.columns
+        c[0].append(seed & 0xFFFFFFFFFFFFFFFF)
+        c[1].append(game)
+        c[2].append(east)
+        c[3].append(dice)
+        c[4].append(RESULT_TYPES.index(result_type))
+        c[5].append(_optional_seat(winner))
+        c[6].append(_optional_seat(loser))
+        c[7].append(flags)
+        c[8].append(turns)
+        c[9].extend(deltas)
+        c[10].append(self._yaku_mask(yaku_list))
+        c[11].frombytes(wall)
+        c[13].frombytes(actions)
+        c[12].append(len(c[13]) // 3)
+        self.rows += 1
+        if self.rows >= self.chunk_hands:
+            self.flush()
+
+    def flush(self):
+        """쓰는 중인 청크를 파일로 (빈 청크는 건너뜀)"""
+        if not self.rows:
+            return None
+        started = time.perf_counter()
+        path = os.path.join(self.directory, CHUNK_PATTERN.format(self.chunk_index))
+        temp_path = path + '.tmp'
+        with open(temp_path, 'wb') as f:
+            f.write(_HEADER.pack(ARCHIVE_MAGIC, ARCHIVE_VERSION, 0))
+            entries = []
+            for (name, typecode, width), column in zip(COLUMNS, self.columns):
+                f.write(b'\0' * (-f.tell() % 8))  # 열 블록은 8바이트 정렬
+                entries.append(_COLUMN.pack(name.encode('ascii'), typecode.encode('ascii'), width,
+                                            len(column) // width, f.tell()))
+                if sys.byteorder == 'big':
+                    column.byteswap()
+                column.tofile(f)
+            footer_offset = f.tell()
+            f.write(_FOOTER.pack(ARCHIVE_VERSION, self.rows, len(COLUMNS)))
+            f.write(b''.join(entries))
+            names = [name.encode('utf-8') for name in self.yaku_names]
+            f.write(struct.pack('<H', len(names)) + b''.join(struct.pack('<H', len(name)) + name for name in names))
+            f.write(_TRAILER.pack(footer_offset, FOOTER_MAGIC))
+            size = f.tell()
+        os.replace(temp_path, path)
+        self.chunk_index += 1
+        self.hands_written += self.rows
+        self.bytes_written += size
+        self.write_time += time.perf_counter() - started
+        self._reset_chunk()
+        return path
+
+    def close(self):
+        self.flush()
+
+
+def list_chunks(directory):
+    """디렉터리의 청크 파일 경로 (번호 순)"""
+    try:
+        names = os.listdir(directory)
+    except FileNotFoundError:
+        return []
+    return [os.path.join(directory, name) for name in sorted(names)
+            if name.startswith('chunk-') and name.endswith('.mjar')]
+
+
+def chunk_rows(path):
+    """청크 파일의 판 수 (푸터만 읽음, numpy 불필요)"""
+    with open(path, 'rb') as f:
+        f.seek(-_TRAILER.size, os.SEEK_END)
+        footer_offset, footer_magic = _TRAILER.unpack(f.read(_TRAILER.size))
+        if footer_magic != FOOTER_MAGIC:
+            raise ArchiveError(f"아카이브 청크가 아닙니다: {path}")
+        f.seek(footer_offset)
+        return _FOOTER.unpack(f.read(_FOOTER.size))[1]
+
+
+# ----- 기록 -----
+
+def encode_action(event):
+    """버림/펑/깡/리치 이벤트 → 3바이트 (코드, 좌석, 패)"""
+    code = event.kind
+    if event.kind in (EVENT_PENG, EVENT_GANG):
+        code |= MELD_TYPES.index(event.detail.meld.type) << 4
+    return bytes((code, event.seat, tile_id(event.tile)))
+
+
+def decode_action(code, seat, tile):
+    """액션 3바이트 → (이벤트 이름, 좌석, 패 이름, 멜드 종류 또는 None)"""
+    kind = code & 0x0F
+    meld_type = MELD_TYPES[code >> 4] if kind in (EVENT_PENG, EVENT_GANG) else None
+    return EVENT_NAMES[kind], seat, tile_name(tile), meld_type
+
+
+class HandRecorder:
+    """EventLog 구독자 - 판마다 ArchiveWriter에 한 행 추가
+
+    table은 MahjongGame 또는 HeadlessTable (wall_tiles, east_player, current_game, turn_counter, game_results).
+    같은 패산으로 판이 다시 시작되면(무르기/스냅샷 복구) 되돌린 턴 이후 액션을 잘라내고 FLAG_REWOUND를 붙인다.
+    턴마다(EVENT_TURN) 그때까지의 액션 길이를 기억해 두고 되돌린 상태의 turn_counter로 자를 위치를 찾는다.
+    """
+
+    def __init__(self, writer, table, seed=None):
+        self.writer = writer
+        self.table = table
+        self.seed = seed or 0
+        self.wall = None
+        self.actions = bytearray()
+        self.flags = 0
+        self.turn_marks = {}  # {turn_counter: 그 턴 시작 시점의 액션 바이트 수}
+        self.handlers = {EVENT_START: self.on_start, EVENT_TURN: self.on_turn, EVENT_WIN: self.on_hand_end,
+                         EVENT_DRAW_GAME: self.on_hand_end}
+        for kind in ACTION_KINDS:
+            self.handlers[kind] = self.on_action
+
+    def attach(self, event_log):
+        event_log.subscribe(self.on_event, tuple(self.handlers))
+
+    def detach(self, event_log):
+        event_log.unsubscribe(self.on_event)
+
+    def on_event(self, event, state):
+        self.handlers[event.kind](event)
+
+    def on_start(self, event):
+        wall = bytes(tile_id(tile) for tile in self.table.wall_tiles)
+        if wall == self.wall:
+            self.flags |= FLAG_REWOUND
+            turn_counter = event.detail.turn_counter
+            mark = self.turn_marks.get(turn_counter)
+            if mark is not None:
+                del self.actions[mark:]
+                self.turn_marks = {turn: length for turn, length in self.turn_marks.items() if turn <= turn_counter}
+            return
+        self.wall = wall
+        self.actions.clear()
+        self.turn_marks = {event.detail.turn_counter: 0}
+        self.flags = 0
+
+    def on_turn(self, event):
+        self.turn_marks[event.detail] = len(self.actions)
+
+    def on_action(self, event):
+        self.actions += encode_action(event)
+
+    def on_hand_end(self, event):
+        if self.wall is None:
+            return
+        table = self.table
+        result = event.detail
+        yaku_list = table.game_results[-1].get('yaku_list', ()) if table.game_results else ()
+        dice = getattr(table, 'wall_dice_results', None)
+        self.writer.append(self.seed, table.current_game, table.east_player, dice[2] if dice else 0, self.wall,
+                           self.actions, result.result_type, event.seat, result.from_player, table.turn_counter,
+                           yaku_list, result.score_deltas, self.flags)
+        self.wall = None
+        self.actions.clear()
+        self.turn_marks = {}
+        self.flags = 0
+
+    def close(self):
+        self.writer.close()
+
+
+def create_hand_recorder(table):
+    """환경변수로 지정된 판 기록 (MAHJONG_ARCHIVE=디렉터리, 없으면 None) - table.event_log에 연결"""
+    directory = os.environ.get(ARCHIVE_ENV) or None
+    if directory is None:
+        return None
+    recorder = HandRecorder(ArchiveWriter(directory), table)
+    recorder.attach(table.event_log)
+    return recorder
+
+
+# ----- 읽기 (numpy) -----
+
+class ArchiveChunk:
+    """청크 파일 1개 - mmap 위의 열 배열 뷰 (columns[이름]: (행 수, 행당 개수) 또는 (행 수,))"""
+
+    def __init__(self, path):
+        if np is None:
+            raise ImportError("아카이브 읽기에는 numpy가 필요합니다")
+        self.path = path
+        with open(path, 'rb') as f:
+            self.mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, _ = _HEADER.unpack_from(self.mm, 0)
+        footer_offset, footer_magic = _TRAILER.unpack_from(self.mm, len(self.mm) - _TRAILER.size)
+        if magic != ARCHIVE_MAGIC or footer_magic != FOOTER_MAGIC:
+            raise ArchiveError(f"아카이브 청크가 아닙니다: {path}")
+        if version != ARCHIVE_VERSION:
+            raise ArchiveError(f"지원하지 않는 아카이브 버전: {version}")
+        _, self.rows, column_count = _FOOTER.unpack_from(self.mm, footer_offset)
+        offset = footer_offset + _FOOTER.size
+        self.columns = {}
+        for _ in range(column_count):
+            name, typecode, width, rows, start = _COLUMN.unpack_from(self.mm, offset)
+            offset += _COLUMN.size
+            name = name.rstrip(b'\0').decode('ascii')
+            values = np.frombuffer(self.mm, NUMPY_TYPES[typecode.decode('ascii')], rows * width, start)
+            self.columns[name] = values if width == 1 else values.reshape(rows, width)
+        count, = struct.unpack_from('<H', self.mm, offset)
+        offset += 2
+        self.yaku_names = []
+        for _ in range(count):
+            length, = struct.unpack_from('<H', self.mm, offset)
+            self.yaku_names.append(bytes(self.mm[offset + 2:offset + 2 + length]).decode('utf-8'))
+            offset += 2 + length
+
+    def __len__(self):
+        return self.rows
+
+    def actions(self, row):
+        """판 1개의 액션 배열 (n, 3)"""
+        ends = self.columns['action_end']
+        start = ends[row - 1] if row else 0
+        return self.columns['actions'][start:ends[row]]
+
+    def yaku_list(self, row):
+        mask = int(self.columns['yaku'][row])
+        return [name for bit, name in enumerate(self.yaku_names) if mask >> bit & 1]
+
+    def hand(self, row):
+        """판 1개를 딕셔너리로 (hand_result와 비슷한 키 + 패산/액션)"""
+        c = self.columns
+        winner, loser = int(c['winner'][row]), int(c['loser'][row])
+        return {
+            'seed': int(c['seed'][row]),
+            'game_number': int(c['game'][row]),
+            'east': int(c['east'][row]),
+            'dice': int(c['dice'][row]),
+            'result_type': RESULT_TYPES[c['result'][row]],
+            'winner': None if winner < 0 else winner,
+            'loser': None if loser < 0 else loser,
+            'flags': int(c['flags'][row]),
+            'turns': int(c['turns'][row]),
+            'score_deltas': [int(delta) for delta in c['deltas'][row]],
+            'yaku_list': self.yaku_list(row),
+            'wall': [tile_name(value) for value in c['wall'][row] if value != TILE_NONE],
+            'actions': [decode_action(*map(int, action)) for action in self.actions(row)],
+        }
+
+    def close(self):
+        """mmap 닫기 (밖에서 열 배열을 아직 쓰고 있으면 마지막 참조가 사라질 때 닫힘)"""
+        self.columns = {}
+        try:
+            self.mm.close()
+        except BufferError:
+            pass
+
+
+class ArchiveReader:
+    """아카이브 디렉터리 전체 - 청크별 mmap, 열은 청크 배열 목록 또는 이어 붙인 배열로"""
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.chunks = [ArchiveChunk(path) for path in list_chunks(directory)]
+
+    def __len__(self):
+        return sum(len(chunk) for chunk in self.chunks)
+
+    def column(self, name):
+        """열 전체 (청크를 이어 붙인 복사본)"""
+        parts = [chunk.columns[name] for chunk in self.chunks]
+        return np.concatenate(parts) if parts else np.zeros(0, NUMPY_TYPES[COLUMNS[COLUMN_INDEX[name]][1]])
+
+    def iter_hands(self):
+        for chunk in self.chunks:
+            for row in range(len(chunk)):
+                yield chunk.hand(row)
+
+    def close(self):
+        for chunk in self.chunks:
+            chunk.close()
+        self.chunks = []
+
+
+# ----- 실행 -----
+
+def simulate(directory, hands, num_tables=16, seed=0, chunk_hands=DEFAULT_CHUNK_HANDS):
+    """AI끼리 진행하며 hands판 기록 - 기록 비용 통계 반환"""
+    from mahjong_env import HeadlessTable
+
+    writer = ArchiveWriter(directory, chunk_hands)
+    seeds = random.Random(seed)
+    tables = []
+    for _ in range(num_tables):
+        table_seed = seeds.getrandbits(32)
+        table = HeadlessTable(table_seed, agent_seats=(), record_events=True)
+        HandRecorder(writer, table, table_seed).attach(table.event_log)
+        tables.append(table)
+
+    started = time.perf_counter()
+    played = 0
+    while played < hands:
+        for table in tables:
+            if table.match_done:
+                table.reset_match()
+            table.start_hand()
+            played += 1
+            if played >= hands:
+                break
+    writer.close()
+    elapsed = time.perf_counter() - started
+    return {'hands': writer.hands_written, 'chunks': writer.chunk_index, 'bytes': writer.bytes_written,
+            'elapsed_s': elapsed, 'write_s': writer.write_time,
+            'bytes_per_hand': writer.bytes_written / max(1, writer.hands_written)}
+
+
+def summarize(directory):
+    reader = ArchiveReader(directory)
+    try:
+        if not len(reader):
+            return {'hands': 0, 'chunks': len(reader.chunks)}
+        results = reader.column('result')
+        return {'hands': len(reader), 'chunks': len(reader.chunks),
+                'results': {name: int((results == index).sum()) for index, name in enumerate(RESULT_TYPES)},
+                'mean_turns': float(reader.column('turns').mean()),
+                'actions': int(sum(len(chunk.columns['actions']) for chunk in reader.chunks))}
+    finally:
+        reader.close()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog='python game_archive.py', description='판 기록 아카이브')
+    parser.add_argument('directory', help='아카이브 디렉터리')
+    parser.add_argument('--simulate', type=int, metavar='HANDS', help='AI끼리 진행하며 기록할 판 수')
+    parser.add_argument('--tables', type=int, default=16, help='동시에 돌릴 테이블 수')
+    parser.add_argument('--chunk-hands', type=int, default=DEFAULT_CHUNK_HANDS, help='청크당 판 수')
+    parser.add_argument('--seed', type=int, default=0)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.simulate:
+        result = simulate(args.directory, args.simulate, args.tables, args.seed, args.chunk_hands)
+        print(f"{result['hands']}판 기록: 청크 {result['chunks']}개, {result['bytes'] / 1e6:.2f}MB "
+              f"(판당 {result['bytes_per_hand']:.0f}바이트), 전체 {result['elapsed_s']:.2f}초 중 "
+              f"쓰기 {result['write_s'] * 1000:.1f}ms")
+    print(summarize(args.directory))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,168 @@
+"""
+게임 이벤트 로그 모듈 (pygame 없이 사용 가능)
+- GameEvent: 상태 변경 1건 (판 시작/쯔모/꽃패/버림/턴/펑/깡/리치/화료/유국)
+- reduce_table: TableState에 이벤트 1건을 적용한 새 TableState를 돌려주는 순수 리듀서 (종류별 함수 표)
+- EventLog: 이벤트 기록 + 리듀서로 상태 갱신 + 종류별 구독자 알림 + 종류별 처리 시간
+- replay: 판 시작 키프레임부터 이벤트를 다시 적용 (리플레이/동기화)
+
+손패 순서는 이벤트 순서 그대로이고 (화면 정렬은 반영하지 않음) 패산 포인터는 다루지 않는다 (wall=None).
+"""
+
+import time
+from collections import namedtuple
+
+from table_state import MeldState, TableState, meld_state_from_dict
+
+
+EVENT_START = 0       # 판 시작 (detail: 배패 후 TableState 키프레임)
+EVENT_DRAW = 1        # 패 1장 뽑음 (쯔모/꽃패·깡 보충)
+EVENT_FLOWER = 2      # 뽑은 꽃패를 꽃패 더미로
+EVENT_DISCARD = 3     # 손패에서 1장 버림
+EVENT_TURN = 4        # 턴 넘김 (detail: 넘긴 뒤 turn_counter)
+EVENT_PENG = 5        # 펑 (detail: MeldCall)
+EVENT_GANG = 6        # 명깡/암깡/가깡 (detail: MeldCall)
+EVENT_RIICHI = 7      # 리치 선언
+EVENT_WIN = 8         # 쯔모/론 화료 (detail: HandResult)
+EVENT_DRAW_GAME = 9   # 유국 (detail: HandResult)
+
+EVENT_NAMES = ('start', 'draw', 'flower', 'discard', 'turn', 'peng', 'gang', 'riichi', 'win', 'draw_game')
+NUM_EVENT_KINDS = len(EVENT_NAMES)
+
+GameEvent = namedtuple('GameEvent', ['kind', 'seat', 'tile', 'detail'])
+
+MeldCall = namedtuple('MeldCall', [
+    'meld',         # 새 멜드 (MeldState)
+    'removed',      # 손패에서 빠진 패 튜플
+    'from_player',  # 버림패를 가져온 좌석 (암깡/가깡은 None)
+])
+
+HandResult = namedtuple('HandResult', [
+    'result_type',   # tsumo / ron / draw
+    'from_player',   # 론 당한 좌석 (그 외 None)
+    'score_deltas',  # 좌석별 점수 변화 튜플
+])
+
+
+def meld_call(meld, removed, from_player=None):
+    """멜드 딕셔너리/MeldState로 MeldCall 생성"""
+    if not isinstance(meld, MeldState):
+        meld = meld_state_from_dict(meld)
+    return MeldCall(meld, tuple(removed), from_player)
+
+
+# ----- 리듀서 (종류별 순수 함수, 입력 상태는 바꾸지 않음) -----
+
+def _reduce_start(state, event):
+    return event.detail
+
+
+def _reduce_draw(state, event):
+    return state.draw(event.seat, event.tile)._replace(current_turn=event.seat)
+
+
+def _reduce_flower(state, event):
+    return state.with_seat(event.seat, state.seats[event.seat].add_flower(event.tile))
+
+
+def _reduce_discard(state, event):
+    return state.discard(event.seat, event.tile)._replace(after_peng=False)
+
+
+def _reduce_turn(state, event):
+    return state._replace(current_turn=event.seat, turn_counter=event.detail)
+
+
+def _reduce_call(state, event):
+    """펑/깡 - 버림패를 가져왔으면 그 더미에서 빼고, 가깡은 기존 펑을 바꿈"""
+    call = event.detail
+    if call.from_player is not None:
+        state = state.with_seat(call.from_player, state.seats[call.from_player].claim_discard(event.tile))
+    seat = state.seats[event.seat]
+    if call.meld.type == 'jia_gang':
+        seat = seat.upgrade_meld(call.meld, call.removed)
+    else:
+        seat = seat.add_meld(call.meld, call.removed)
+    return state.with_seat(event.seat, seat)._replace(current_turn=event.seat, after_peng=True,
+                                                      last_discard_player=None)
+
+
+def _reduce_riichi(state, event):
+    return state._replace(player_riichi=True)
+
+
+def _reduce_hand_end(state, event):
+    return state
+
+
+REDUCERS = (_reduce_start, _reduce_draw, _reduce_flower, _reduce_discard, _reduce_turn,
+            _reduce_call, _reduce_call, _reduce_riichi, _reduce_hand_end, _reduce_hand_end)
+
+
+def reduce_table(state, event):
+    """이벤트 1건을 적용한 새 TableState"""
+    return REDUCERS[event.kind](state, event)
+
+
+def replay(events, state=None):
+    """이벤트를 순서대로 적용한 최종 상태 (첫 이벤트가 EVENT_START면 state 없이 시작)"""
+    for event in events:
+        state = REDUCERS[event.kind](state, event)
+    return state
+
+
+class EventLog:
+    """현재 판의 이벤트 기록과 리듀서 상태
+
+    emit()은 리듀서로 state를 갱신한 뒤 그 종류를 구독한 핸들러를 handler(event, state)로 호출한다.
+    판 시작(start)마다 이전 판 이벤트는 버린다 - 여러 판을 보관하려면 EVENT_START 구독자가 옮겨 담는다.
+    리듀서 + 구독자 처리 시간은 종류별로 누적된다 (timing_summary).
+    """
+
+    def __init__(self):
+        self.events = []
+        self.state = None
+        self.subscribers = [[] for _ in range(NUM_EVENT_KINDS)]
+        self.counts = [0] * NUM_EVENT_KINDS
+        self.elapsed_ns = [0] * NUM_EVENT_KINDS
+
+    def subscribe(self, handler, kinds=None):
+        """handler(event, state) 등록 (kinds 생략 시 모든 종류)"""
+        for kind in (range(NUM_EVENT_KINDS) if kinds is None else kinds):
+            self.subscribers[kind].append(handler)
+
+    def unsubscribe(self, handler):
+        for handlers in self.subscribers:
+            if handler in handlers:
+                handlers.remove(handler)
+
+    def start(self, state):
+        """판 시작 키프레임 (패산 포인터는 빼고 기록)"""
+        self.events = []
+        self.emit(EVENT_START, detail=state._replace(wall=None))
+
+    def start_from_table(self, table):
+        self.start(TableState.from_table(table))
+
+    def emit(self, kind, seat=None, tile=None, detail=None):
+        """이벤트 1건 기록 및 적용 - 판 시작 전(state 없음) 이벤트는 무시"""
+        if self.state is None and kind != EVENT_START:
+            return None
+        started = time.perf_counter_ns()
+        event = GameEvent(kind, seat, tile, detail)
+        self.state = REDUCERS[kind](self.state, event)
+        self.events.append(event)
+        for handler in self.subscribers[kind]:
+            handler(event, self.state)
+        self.counts[kind] += 1
+        self.elapsed_ns[kind] += time.perf_counter_ns() - started
+        return event
+
+    def clear(self):
+        self.events = []
+        self.state = None
+
+    def timing_summary(self):
+        """종류별 {'count', 'mean', 'total'} (시간은 ms, 한 번도 없던 종류는 생략)"""
+        return {name: {'count': count, 'mean': self.elapsed_ns[kind] / count / 1e6,
+                       'total': self.elapsed_ns[kind] / 1e6}
+                for kind, (name, count) in enumerate(zip(EVENT_NAMES, self.counts)) if count}
@@ -0,0 +1,94 @@
+"""
+게임 단계 상태 기계
+- GamePhase: 단계 열거형 (IntEnum - 값이 곧 핸들러 표 인덱스)
+- PHASE_TRANSITIONS: 허용되는 단계 전환 표 (표에 없는 전환은 InvalidTransition)
+- PhaseMachine: 현재 단계 + 단계별 update/render/click/key 핸들러 표
+  (문자열 비교/hasattr 분기 대신 현재 단계로 표를 한 번 조회해서 호출)
+"""
+
+from enum import IntEnum
+
+
+class GamePhase(IntEnum):
+    DICE = 0        # 동가/패산 주사위 (입력 대기)
+    DEAL_ANIM = 1   # 배패 애니메이션
+    PLAYING = 2     # 대국 진행
+    WIN_DIALOG = 3  # 화료 역 다이얼로그 (닫으면 판 종료)
+    FINISHED = 4    # 판 종료 (다음 판 대기)
+
+
+PHASE_NAMES = ('dice', 'deal_anim', 'playing', 'win_dialog', 'finished')
+
+PHASE_TRANSITIONS = {
+    GamePhase.DICE: frozenset({GamePhase.DEAL_ANIM}),
+    GamePhase.DEAL_ANIM: frozenset({GamePhase.PLAYING}),
+    GamePhase.PLAYING: frozenset({GamePhase.WIN_DIALOG, GamePhase.FINISHED}),
+    GamePhase.WIN_DIALOG: frozenset({GamePhase.FINISHED}),
+    GamePhase.FINISHED: frozenset({GamePhase.DICE}),
+}
+
+
+class InvalidTransition(ValueError):
+    """전환 표에 없는 단계 전환"""
+
+
+class PhaseMachine:
+    """현재 게임 단계와 단계별 핸들러 표"""
+
+    def __init__(self, state=GamePhase.DICE):
+        self.state = state
+        self.transitions = 0
+        count = len(GamePhase)
+        self.update_handlers = [None] * count
+        self.render_handlers = [None] * count
+        self.click_handlers = [None] * count
+        self.key_handlers = [{} for _ in range(count)]
+
+    def on(self, state, update=None, render=None, click=None, keys=None):
+        """단계별 핸들러 등록 (keys: {pygame 키: 핸들러})"""
+        self.update_handlers[state] = update
+        self.render_handlers[state] = render
+        self.click_handlers[state] = click
+        self.key_handlers[state] = dict(keys or {})
+        return self
+
+    @property
+    def name(self):
+        return PHASE_NAMES[self.state]
+
+    def can_transition(self, state):
+        return state in PHASE_TRANSITIONS[self.state]
+
+    def transition(self, state):
+        """표에 있는 전환만 허용"""
+        if state not in PHASE_TRANSITIONS[self.state]:
+            raise InvalidTransition(f"허용되지 않는 단계 전환: {self.name} → {PHASE_NAMES[state]}")
+        self.state = state
+        self.transitions += 1
+
+    def reset(self, state=GamePhase.DICE):
+        """전환 표와 무관하게 단계 지정 (새 대국/판 시작, 스냅샷 복구)"""
+        self.state = state
+
+    def update(self):
+        handler = self.update_handlers[self.state]
+        if handler is not None:
+            handler()
+
+    def render(self):
+        handler = self.render_handlers[self.state]
+        if handler is not None:
+            handler()
+
+    def click(self, pos):
+        handler = self.click_handlers[self.state]
+        if handler is not None:
+            handler(pos)
+
+    def key(self, key):
+        """현재 단계에 등록된 키면 처리하고 True"""
+        handler = self.key_handlers[self.state].get(key)
+        if handler is None:
+            return False
+        handler()
+        return True
@@ -0,0 +1,478 @@
+"""
+멀티 테이블 게임 서버 (asyncio, numpy 필요 / pygame 불필요)
+- 한 프로세스에서 HeadlessTable 여러 개를 테이블별 태스크로 진행 (대부분 원격 좌석 응답 대기)
+- TCP 또는 Unix 소켓, table_protocol의 길이 접두 바이너리 프레임
+- 원격 좌석별 시간 제한 (기본 시간 + 결정마다 추가 시간, 테이블마다 따로 지정 가능), 초과/접속 끊김 시
+  heuristic 전략이 대신 결정
+- 관전자: 참가 요청 좌석을 SEAT_SPECTATOR로 보내면 table_sync 키프레임/델타 스트림 (손패는 모두 가림)
+- TableClient: 접속/참가/결정 응답용 비동기 클라이언트 (봇/렌더러용)
+
+    python game_server.py --unix /tmp/mahjong.sock --tables 100
+    python game_server.py --tables 4 --table-time 0=300000:10000 --table-time 1=10000:1000   (테이블별 시간)
+    python game_server.py --bench 200 --games 1     (같은 프로세스에 랜덤 봇을 붙여 처리량 측정)
+"""
+
+import argparse
+import asyncio
+import contextlib
+import os
+import random
+import sys
+import tempfile
+import time
+
+from mahjong_game import tile_to_kind
+from ai_strategies import create_strategy
+from mahjong_env import HeadlessTable, ACTION_PASS, NUM_ACTIONS
+from game_events import EVENT_START, EVENT_DRAW, EVENT_WIN, EVENT_DRAW_GAME
+from table_sync import SyncEncoder, SyncClient
+from table_protocol import (read_frame, ProtocolError, pack_welcome, pack_hand, pack_decision, pack_event,
+                            pack_hand_end, pack_match_end, pack_error, pack_join, pack_action, unpack_join,
+                            unpack_action, unpack_welcome, unpack_decision, mask_to_bits, bits_to_actions,
+                            MSG_JOIN, MSG_ACTION, MSG_WELCOME, MSG_DECISION, MSG_ERROR, DECISION_DISCARD,
+                            DECISION_REACT, ANY_TABLE, SEAT_SPECTATOR)
+
+
+DEFAULT_BASE_MS = 60000
+DEFAULT_INCREMENT_MS = 5000
+
+
+class TimeControl:
+    """좌석별 시간 - 기본 시간(base_ms)에서 시작해 결정마다 increment_ms 추가, 쓴 만큼 차감"""
+
+    def __init__(self, base_ms=DEFAULT_BASE_MS, increment_ms=DEFAULT_INCREMENT_MS):
+        self.base_ms = base_ms
+        self.increment_ms = increment_ms
+
+
+class RemoteSeat:
+    """원격 클라이언트가 맡는 좌석 (연결, 받은 액션 큐, 남은 시간)"""
+
+    def __init__(self, seat, time_control):
+        self.seat = seat
+        self.time_control = time_control
+        self.writer = None
+        self.name = ''
+        self.actions = asyncio.Queue()
+        self.remaining_ms = time_control.base_ms
+        self.timeouts = 0
+
+    @property
+    def connected(self):
+        return self.writer is not None
+
+    def send(self, data):
+        if self.writer is not None:
+            self.writer.write(data)
+
+
+class ServerTable:
+    """테이블 1개 - HeadlessTable 진행, 이벤트 중계, 원격 좌석 결정 대기"""
+
+    def __init__(self, table_id, remote_seats=(0,), opponent_strategy="heuristic", time_control=None,
+                 seed=None, matches=1, total_games=12, start_when_full=True):
+        self.table_id = table_id
+        self.time_control = time_control or TimeControl()
+        self.table = HeadlessTable(seed, agent_seats=remote_seats, opponent_strategy=opponent_strategy,
+                                   total_games=total_games, record_events=True)
+        self.table.event_log.subscribe(self.on_event)
+        self.seats = {seat: RemoteSeat(seat, self.time_control) for seat in remote_seats}
+        self.spectators = {}  # {writer: SyncEncoder}
+        self.fallback = create_strategy("heuristic")
+        self.fallback.verbose = False
+        self.matches = matches
+        self.start_when_full = start_when_full
+        self.ready = asyncio.Event()
+        self.done = False
+        self.seq = 0
+        self.hands_played = 0
+        self.decisions = 0
+
+    # --- 좌석 연결 ---
+
+    def free_seat(self, seat=None):
+        """비어 있는 원격 좌석 (seat 지정 시 그 좌석만, 없으면 None)"""
+        if self.done:
+            return None
+        candidates = [seat] if seat is not None else sorted(self.seats)
+        return next((s for s in candidates if s in self.seats and not self.seats[s].connected), None)
+
+    def attach(self, seat, writer, name):
+        remote = self.seats[seat]
+        remote.writer = writer
+        remote.name = name
+        if all(remote.connected for remote in self.seats.values()):
+            self.ready.set()
+
+    def detach(self, seat):
+        """접속 끊김 - 대기 중인 결정은 대신 결정"""
+        remote = self.seats[seat]
+        remote.writer = None
+        remote.actions.put_nowait(None)
+
+    def add_spectator(self, writer):
+        """관전자 연결 - 판 진행 중이면 현재 상태 키프레임부터 보냄"""
+        encoder = SyncEncoder(None)
+        encoder.attach(self.table.event_log)
+        self.spectators[writer] = encoder
+        writer.write(encoder.flush())
+
+    def remove_spectator(self, writer):
+        encoder = self.spectators.pop(writer, None)
+        if encoder is not None:
+            encoder.detach(self.table.event_log)
+
+    async def flush(self):
+        for writer, encoder in list(self.spectators.items()):
+            writer.write(encoder.flush())
+            try:
+                await writer.drain()
+            except ConnectionError:
+                self.remove_spectator(writer)
+        for remote in self.seats.values():
+            if remote.writer is None:
+                continue
+            try:
+                await remote.writer.drain()
+            except ConnectionError:
+                self.detach(remote.seat)
+
+    # --- 이벤트 중계 (다른 좌석이 뽑은 패는 가림) ---
+
+    def on_event(self, event, state):
+        if event.kind == EVENT_START:
+            for seat, remote in self.seats.items():
+                remote.send(pack_hand(self.table.current_game, self.table.east_player, state.seats[seat].hand))
+        elif event.kind in (EVENT_WIN, EVENT_DRAW_GAME):
+            result = event.detail
+            message = pack_hand_end(result.result_type, event.seat, result.from_player, result.score_deltas)
+            for remote in self.seats.values():
+                remote.send(message)
+        else:
+            for seat, remote in self.seats.items():
+                hidden = event.kind == EVENT_DRAW and event.seat != seat
+                remote.send(pack_event(event.kind, event.seat, None if hidden else event.tile))
+
+    # --- 진행 ---
+
+    async def run(self):
+        if self.start_when_full and self.seats:
+            await self.ready.wait()
+        table = self.table
+        for _ in range(self.matches):
+            table.reset_match()
+            while not table.match_done:
+                table.start_hand()
+                await self.flush()
+                while not table.hand_over:
+                    table.apply_action(await self.decide(table.decision))
+                    await self.flush()
+                self.hands_played += 1
+            message = pack_match_end(table.player_scores)
+            for remote in self.seats.values():
+                remote.send(message)
+            await self.flush()
+        self.done = True
+        for remote in self.seats.values():
+            if remote.writer is not None:
+                remote.writer.close()
+        for writer in list(self.spectators):
+            self.remove_spectator(writer)
+            writer.close()
+
+    async def decide(self, decision):
+        """원격 좌석 결정 대기 (시간 초과/끊김/잘못된 액션이면 대신 결정)"""
+        self.decisions += 1
+        remote = self.seats[decision['seat']]
+        mask = self.table.action_mask()
+        if not remote.connected:
+            return self.fallback_action(decision)
+
+        self.seq += 1
+        remote.remaining_ms += self.time_control.increment_ms
+        decision_type = DECISION_DISCARD if decision['type'] == 'discard' else DECISION_REACT
+        remote.send(pack_decision(self.seq, remote.remaining_ms, decision_type, decision['tile'], mask_to_bits(mask)))
+        await self.flush()
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        while True:
+            timeout = remote.remaining_ms / 1000 - (loop.time() - started)
+            try:
+                item = await asyncio.wait_for(remote.actions.get(), max(0.0, timeout))
+            except asyncio.TimeoutError:
+                remote.remaining_ms = 0
+                remote.timeouts += 1
+                return self.fallback_action(decision)
+            if item is None:
+                return self.fallback_action(decision)
+            seq, action = item
+            if seq != self.seq:
+                continue  # 이전 결정에 대한 늦은 응답
+            if action < NUM_ACTIONS and mask[action]:
+                remote.remaining_ms -= int((loop.time() - started) * 1000)
+                return action
+            remote.send(pack_error(f"불가능한 액션: {action}"))
+
+    def fallback_action(self, decision):
+        if decision['type'] == 'discard':
+            tile = self.fallback.choose_discard(self.table.build_observation(decision['seat']))
+            return tile_to_kind(tile)
+        return ACTION_PASS
+
+
+class GameServer:
+    """테이블 여러 개와 소켓 서버
+
+    time_control은 서버 기본 시간, table_time_controls({테이블 번호: TimeControl})로 테이블별 시간을 덮어쓴다.
+    """
+
+    def __init__(self, num_tables=1, remote_seats=(0,), opponent_strategy="heuristic", time_control=None,
+                 seed=None, matches=1, total_games=12, start_when_full=True, table_time_controls=None):
+        self.seeds = random.Random(seed)
+        self.remote_seats = remote_seats
+        self.opponent_strategy = opponent_strategy
+        self.time_control = time_control or TimeControl()
+        self.matches = matches
+        self.total_games = total_games
+        self.start_when_full = start_when_full
+        self.tables = []
+        self.server = None
+        self.tasks = []
+        table_time_controls = table_time_controls or {}
+        for table_id in range(num_tables):
+            self.add_table(table_time_controls.get(table_id))
+
+    def add_table(self, time_control=None):
+        """테이블 1개 추가 (time_control 생략 시 서버 기본 시간) - 서버 시작 후면 바로 진행 태스크 시작"""
+        table = ServerTable(len(self.tables), self.remote_seats, self.opponent_strategy,
+                            time_control or self.time_control, self.seeds.getrandbits(32), self.matches,
+                            self.total_games, self.start_when_full)
+        self.tables.append(table)
+        if self.server is not None:
+            self.tasks.append(asyncio.create_task(table.run()))
+        return table
+
+    async def start(self, host='127.0.0.1', port=0, path=None):
+        """TCP(host, port) 또는 Unix 소켓(path)으로 접속 대기 + 테이블 태스크 시작"""
+        if path:
+            self.server = await asyncio.start_unix_server(self.handle_client, path)
+        else:
+            self.server = await asyncio.start_server(self.handle_client, host, port)
+        self.tasks = [asyncio.create_task(table.run()) for table in self.tables]
+        return self.server
+
+    @property
+    def address(self):
+        return self.server.sockets[0].getsockname()
+
+    async def wait_tables(self):
+        await asyncio.gather(*self.tasks)
+
+    async def close(self):
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+
+    def assign(self, table_id, seat):
+        """참가 요청에 맞는 (테이블, 좌석) - 없으면 (None, None)"""
+        tables = self.tables if table_id == ANY_TABLE else self.tables[table_id:table_id + 1]
+        for table in tables:
+            free = table.free_seat(seat)
+            if free is not None:
+                return table, free
+        return None, None
+
+    async def handle_client(self, reader, writer):
+        table = seat = None
+        try:
+            msg_type, payload = await read_frame(reader)
+            if msg_type != MSG_JOIN:
+                raise ProtocolError(f"첫 메시지는 참가 요청이어야 합니다: {msg_type}")
+            table_id, requested_seat, name = unpack_join(payload)
+            if requested_seat == SEAT_SPECTATOR:
+                await self.spectate(table_id, reader, writer)
+                return
+            table, seat = self.assign(table_id, requested_seat)
+            if table is None:
+                writer.write(pack_error("빈 좌석이 없습니다"))
+                await writer.drain()
+                return
+            writer.write(pack_welcome(table.table_id, seat))
+            table.attach(seat, writer, name)
+            actions = table.seats[seat].actions
+            while True:
+                msg_type, payload = await read_frame(reader)
+                if msg_type == MSG_ACTION:
+                    actions.put_nowait(unpack_action(payload))
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        except ProtocolError as e:
+            writer.write(pack_error(str(e)))
+        finally:
+            if table is not None and table.seats[seat].writer is writer:
+                table.detach(seat)
+            writer.close()
+
+
+    async def spectate(self, table_id, reader, writer):
+        """관전 연결 - 끊길 때까지 동기화 스트림만 보냄 (받는 메시지는 무시)"""
+        table_id = 0 if table_id == ANY_TABLE else table_id
+        if table_id >= len(self.tables) or self.tables[table_id].done:
+            writer.write(pack_error("관전할 테이블이 없습니다"))
+            await writer.drain()
+            return
+        table = self.tables[table_id]
+        writer.write(pack_welcome(table_id, SEAT_SPECTATOR))
+        table.add_spectator(writer)
+        try:
+            while True:
+                await read_frame(reader)
+        finally:
+            table.remove_spectator(writer)
+
+
+class TableClient:
+    """서버 접속 클라이언트 - 메시지는 (종류, 본문)으로 받고 table_protocol.unpack_*로 해석"""
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.table = None
+        self.seat = None
+
+    @classmethod
+    async def connect(cls, host='127.0.0.1', port=None, path=None):
+        if path:
+            reader, writer = await asyncio.open_unix_connection(path)
+        else:
+            reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+
+    async def join(self, table=ANY_TABLE, seat=None, name=''):
+        """참가 후 (테이블, 좌석) - 거절되면 ConnectionError"""
+        self.writer.write(pack_join(table, seat, name))
+        await self.writer.drain()
+        msg_type, payload = await read_frame(self.reader)
+        if msg_type != MSG_WELCOME:
+            raise ConnectionError(payload.decode('utf-8', 'replace') if msg_type == MSG_ERROR else f"응답 오류: {msg_type}")
+        self.table, self.seat = unpack_welcome(payload)
+        return self.table, self.seat
+
+    async def receive(self):
+        """다음 메시지 (연결이 끊기면 None)"""
+        try:
+            return await read_frame(self.reader)
+        except asyncio.IncompleteReadError:
+            return None
+
+    async def act(self, seq, action):
+        self.writer.write(pack_action(seq, action))
+        await self.writer.drain()
+
+    async def close(self):
+        self.writer.close()
+        with contextlib.suppress(ConnectionError):
+            await self.writer.wait_closed()
+
+
+async def run_random_bot(client, seed=None):
+    """허용된 액션 중 무작위로 응답하는 봇 (연결이 끊길 때까지) - 응답한 결정 수 반환"""
+    rng = random.Random(seed)
+    answered = 0
+    while True:
+        message = await client.receive()
+        if message is None:
+            return answered
+        msg_type, payload = message
+        if msg_type == MSG_DECISION:
+            seq, _, _, _, mask_bits = unpack_decision(payload)
+            await client.act(seq, rng.choice(bits_to_actions(mask_bits)))
+            answered += 1
+
+
+async def run_spectator(client, sync_client=None):
+    """관전 스트림을 SyncClient에 적용 (연결이 끊길 때까지) - 마지막 SyncClient 반환"""
+    sync_client = sync_client or SyncClient(None)
+    while True:
+        message = await client.receive()
+        if message is None:
+            return sync_client
+        sync_client.apply_frame(*message)
+
+
+async def bench(num_tables, total_games=1, seed=0):
+    """Unix 소켓 서버 + 테이블마다 랜덤 봇 1개로 처리량 측정"""
+    path = os.path.join(tempfile.mkdtemp(), 'bench.sock')
+    server = GameServer(num_tables, seed=seed, total_games=total_games)
+    await server.start(path=path)
+    started = time.perf_counter()
+    clients = [await TableClient.connect(path=path) for _ in range(num_tables)]
+    for client in clients:
+        await client.join()
+    answered = await asyncio.gather(*(run_random_bot(client, seed + i) for i, client in enumerate(clients)))
+    elapsed = time.perf_counter() - started
+    await server.close()
+    os.unlink(path)
+    hands = sum(table.hands_played for table in server.tables)
+    return {'tables': num_tables, 'hands': hands, 'decisions': sum(answered), 'elapsed_s': elapsed,
+            'hands_per_s': hands / elapsed, 'decisions_per_s': sum(answered) / elapsed}
+
+
+def parse_time_control(text):
+    """'테이블=기본ms:추가ms' → (테이블 번호, TimeControl)"""
+    try:
+        table_id, times = text.split('=')
+        base_ms, increment_ms = times.split(':')
+        return int(table_id), TimeControl(int(base_ms), int(increment_ms))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"테이블 시간 형식 오류 (테이블=기본ms:추가ms): {text}") from None
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog='python game_server.py', description='멀티 테이블 마작 서버')
+    parser.add_argument('--tables', type=int, default=1, help='테이블 수')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=7777)
+    parser.add_argument('--unix', help='Unix 소켓 경로 (지정 시 TCP 대신 사용)')
+    parser.add_argument('--seats', default='0', help='원격 좌석 (쉼표 구분, 예: 0,2)')
+    parser.add_argument('--opponent', default='heuristic', help='나머지 좌석 AI 전략')
+    parser.add_argument('--base-ms', type=int, default=DEFAULT_BASE_MS, help='좌석별 기본 시간')
+    parser.add_argument('--increment-ms', type=int, default=DEFAULT_INCREMENT_MS, help='결정마다 추가 시간')
+    parser.add_argument('--table-time', type=parse_time_control, action='append', default=[],
+                        metavar='TABLE=BASE_MS:INCREMENT_MS', help='테이블별 시간 (여러 번 지정 가능, 나머지는 기본 시간)')
+    parser.add_argument('--matches', type=int, default=1, help='테이블별 매치 수')
+    parser.add_argument('--games', type=int, default=12, help='매치당 판 수')
+    parser.add_argument('--seed', type=int)
+    parser.add_argument('--bench', type=int, metavar='TABLES', help='랜덤 봇으로 처리량 측정')
+    return parser.parse_args(argv)
+
+
+async def serve(args):
+    server = GameServer(args.tables, tuple(int(seat) for seat in args.seats.split(',')), args.opponent,
+                        TimeControl(args.base_ms, args.increment_ms), args.seed, args.matches, args.games,
+                        table_time_controls=dict(args.table_time))
+    await server.start(args.host, args.port, args.unix)
+    print(f"🀄 테이블 {args.tables}개 대기 중: {args.unix or f'{args.host}:{args.port}'}")
+    try:
+        await server.wait_tables()
+    finally:
+        await server.close()
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.bench:
+        result = asyncio.run(bench(args.bench, args.games, args.seed or 0))
+        print(f"테이블 {result['tables']}개: {result['hands']}판 / {result['decisions']}결정, "
+              f"{result['elapsed_s']:.2f}초 ({result['hands_per_s']:.1f}판/s, {result['decisions_per_s']:.0f}결정/s)")
+        return 0
+    asyncio.run(serve(args))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
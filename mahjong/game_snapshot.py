@@ -0,0 +1,301 @@
+"""
+게임 상태 스냅샷 모듈
+- 12판 대국 진행(점수, 판 기록)과 현재 판 테이블 상태(패산 순서/포인터, 손패, 멜드, 버림패, 꽃패, 턴, 엎어)를
+  버전이 붙은 바이너리로 직렬화 (struct, 문자열 테이블 + 1바이트 패 코드)
+- 턴 경계/판 종료 시 자동 저장, 시작 시 복구 (MAHJONG_AUTOSAVE=경로 지정 시)
+- 파일 쓰기는 임시 파일 + os.replace로 원자적 (저장 중 죽어도 이전 스냅샷 유지)
+"""
+
+import os
+import struct
+
+
+AUTOSAVE_ENV = "MAHJONG_AUTOSAVE"
+SNAPSHOT_MAGIC = b'MJSS'
+SNAPSHOT_VERSION = 1
+
+SNAPSHOT_TURN = 0           # 판 진행 중 (턴 시작 직전)
+SNAPSHOT_BETWEEN_GAMES = 1  # 판 종료 후 다음 판 시작 전
+
+RESULT_TYPES = ('tsumo', 'ron', 'draw')
+MELD_TYPES = ('peng', 'ming_gang', 'an_gang', 'jia_gang')
+NO_CODE = 0xFF  # 패 없음 / 값 없음
+
+_HEADER = struct.Struct('<4sBB')        # magic, version, kind
+_MATCH = struct.Struct('<BB4hbbB')      # current_game, total_games, scores, game_winner, east_player, 결과 수
+_RESULT = struct.Struct('<BBb4h4h')     # game_number, result_type, winner, scores_before, scores_after
+_TABLE = struct.Struct('<BBBBBBBHBb')   # 주사위 3개, dealt_count, regular_head, wang_tail, current_turn, turn_counter, flags, last_discard_player
+_MELD = struct.Struct('<BBb')           # type, tile, from_player
+
+FLAG_RIICHI = 1
+FLAG_AFTER_PENG = 2
+
+
+class SnapshotError(ValueError):
+    """스냅샷 형식/버전 오류"""
+
+
+def _optional_int(value):
+    return -1 if value is None else value
+
+
+def _from_optional_int(value):
+    return None if value < 0 else value
+
+
+class _Writer:
+    """스냅샷 본문 작성 - 문자열은 테이블에 한 번만 넣고 1바이트 코드로 참조"""
+
+    def __init__(self):
+        self.parts = []
+        self.strings = []
+        self.codes = {}
+
+    def code(self, text):
+        if text is None:
+            return NO_CODE
+        code = self.codes.get(text)
+        if code is None:
+            code = len(self.strings)
+            if code >= NO_CODE:
+                raise SnapshotError("스냅샷 문자열 테이블 초과")
+            self.codes[text] = code
+            self.strings.append(text)
+        return code
+
+    def pack(self, packer, *values):
+        self.parts.append(packer.pack(*values))
+
+    def tiles(self, tiles):
+        code = self.code
+        self.parts.append(bytes((len(tiles),)) + bytes([code(tile) for tile in tiles]))
+
+    def text(self, text):
+        data = text.encode('utf-8')
+        self.parts.append(struct.pack('<H', len(data)) + data)
+
+    def finish(self, kind):
+        table = [struct.pack('<B', len(self.strings))]
+        for text in self.strings:
+            data = text.encode('utf-8')
+            table.append(bytes((len(data),)) + data)
+        return b''.join([_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, kind)] + table + self.parts)
+
+
+class _Reader:
+    """스냅샷 본문 읽기"""
+
+    def __init__(self, data, offset):
+        self.data = data
+        self.offset = offset
+        self.strings = ()
+
+    def unpack(self, packer):
+        values = packer.unpack_from(self.data, self.offset)
+        self.offset += packer.size
+        return values
+
+    def byte(self):
+        value = self.data[self.offset]
+        self.offset += 1
+        return value
+
+    def raw(self, size):
+        if self.offset + size > len(self.data):
+            raise SnapshotError("스냅샷이 잘렸습니다")
+        value = self.data[self.offset:self.offset + size]
+        self.offset += size
+        return value
+
+    def string_table(self):
+        count = self.byte()
+        strings = []
+        for _ in range(count):
+            strings.append(self.raw(self.byte()).decode('utf-8'))
+        self.strings = tuple(strings)
+
+    def tile(self, code):
+        return None if code == NO_CODE else self.strings[code]
+
+    def tiles(self):
+        strings = self.strings
+        return [strings[code] for code in self.raw(self.byte())]
+
+    def text(self):
+        size, = struct.unpack_from('<H', self.data, self.offset)
+        self.offset += 2
+        return self.raw(size).decode('utf-8')
+
+
+def encode_snapshot(game, kind=SNAPSHOT_TURN):
+    """게임 상태 → 스냅샷 바이트"""
+    writer = _Writer()
+
+    # 대국 진행 (12판 점수/기록, 좌석 설정)
+    results = game.game_results
+    writer.pack(_MATCH, game.current_game, game.total_games, *game.player_scores,
+                _optional_int(game.game_winner), _optional_int(game.east_player), len(results))
+    for result in results:
+        scores_after = result['scores_after'] or result['scores_before']
+        writer.pack(_RESULT, result['game_number'], RESULT_TYPES.index(result['result_type']),
+                    _optional_int(result['winner']), *result['scores_before'], *scores_after)
+    writer.parts.append(bytes((len(game.seat_config),)))
+    for seat_type in game.seat_config:
+        writer.text(seat_type)
+
+    if kind == SNAPSHOT_TURN:
+        wall = game.wall_manager
+        dice = getattr(game, 'wall_dice_results', None) or (0, 0, 0)
+        flags = (FLAG_RIICHI if game.player_riichi else 0) | (FLAG_AFTER_PENG if game.after_peng else 0)
+        writer.tiles(game.wall_tiles)
+        writer.pack(_TABLE, dice[0], dice[1], dice[2], wall.dealt_count, wall.regular_head, wall.wang_tail,
+                    game.current_turn, game.turn_counter, flags, _optional_int(game.last_discard_player))
+        mask_size = (len(game.wall_tiles) + 7) // 8
+        writer.parts.append(wall.dealt_mask.to_bytes(mask_size, 'little'))
+        for player_idx in range(4):
+            writer.tiles(game.hands[player_idx])
+            writer.tiles(game.flower_tiles[player_idx])
+            writer.tiles(game.discard_piles[player_idx])
+            melds = game.melds[player_idx]
+            writer.parts.append(bytes((len(melds),)))
+            for meld in melds:
+                writer.pack(_MELD, MELD_TYPES.index(meld['type']), writer.code(meld.get('tile')),
+                            _optional_int(meld.get('from_player')))
+                writer.tiles(meld['tiles'])
+
+    return writer.finish(kind)
+
+
+def decode_snapshot(data):
+    """스냅샷 바이트 → 상태 dict (형식/버전이 다르면 SnapshotError)"""
+    if len(data) < _HEADER.size:
+        raise SnapshotError("스냅샷이 너무 짧습니다")
+    magic, version, kind = _HEADER.unpack_from(data, 0)
+    if magic != SNAPSHOT_MAGIC:
+        raise SnapshotError("스냅샷 파일이 아닙니다")
+    if version != SNAPSHOT_VERSION:
+        raise SnapshotError(f"지원하지 않는 스냅샷 버전: {version} (현재 {SNAPSHOT_VERSION})")
+
+    try:
+        reader = _Reader(data, _HEADER.size)
+        reader.string_table()
+
+        current_game, total_games, s0, s1, s2, s3, game_winner, east_player, result_count = reader.unpack(_MATCH)
+        results = []
+        for _ in range(result_count):
+            values = reader.unpack(_RESULT)
+            results.append({
+                'game_number': values[0],
+                'result_type': RESULT_TYPES[values[1]],
+                'winner': _from_optional_int(values[2]),
+                'scores_before': list(values[3:7]),
+                'scores_after': list(values[7:11]),
+            })
+        seat_config = [reader.text() for _ in range(reader.byte())]
+        state = {
+            'kind': kind,
+            'current_game': current_game,
+            'total_games': total_games,
+            'player_scores': [s0, s1, s2, s3],
+            'game_winner': _from_optional_int(game_winner),
+            'east_player': _from_optional_int(east_player),
+            'game_results': results,
+            'seat_config': seat_config,
+        }
+        if kind != SNAPSHOT_TURN:
+            return state
+
+        wall_tiles = reader.tiles()
+        (dice1, dice2, dice_total, dealt_count, regular_head, wang_tail,
+         current_turn, turn_counter, flags, last_discard_player) = reader.unpack(_TABLE)
+        dealt_mask = int.from_bytes(reader.raw((len(wall_tiles) + 7) // 8), 'little')
+        hands, flower_tiles, discard_piles, melds = [], [], [], []
+        for _ in range(4):
+            hands.append(reader.tiles())
+            flower_tiles.append(reader.tiles())
+            discard_piles.append(reader.tiles())
+            player_melds = []
+            for _ in range(reader.byte()):
+                meld_type, tile_code, from_player = reader.unpack(_MELD)
+                meld = {'type': MELD_TYPES[meld_type], 'tiles': None, 'from_player': _from_optional_int(from_player)}
+                if tile_code != NO_CODE:
+                    meld['tile'] = reader.tile(tile_code)
+                meld['tiles'] = reader.tiles()
+                player_melds.append(meld)
+            melds.append(player_melds)
+    except (struct.error, IndexError, UnicodeDecodeError) as e:
+        raise SnapshotError(f"손상된 스냅샷: {e}")
+
+    state.update({
+        'wall_tiles': wall_tiles,
+        'wall_dice_results': (dice1, dice2, dice_total),
+        'dealt_mask': dealt_mask,
+        'dealt_count': dealt_count,
+        'regular_head': regular_head,
+        'wang_tail': wang_tail,
+        'current_turn': current_turn,
+        'turn_counter': turn_counter,
+        'player_riichi': bool(flags & FLAG_RIICHI),
+        'after_peng': bool(flags & FLAG_AFTER_PENG),
+        'last_discard_player': _from_optional_int(last_discard_player),
+        'hands': hands,
+        'flower_tiles': flower_tiles,
+        'discard_piles': discard_piles,
+        'melds': melds,
+    })
+    return state
+
+
+def write_snapshot(path, data):
+    """스냅샷을 원자적으로 저장 (임시 파일에 쓰고 교체)"""
+    temp_path = path + '.tmp'
+    with open(temp_path, 'wb') as f:
+        f.write(data)
+    os.replace(temp_path, path)
+
+
+def read_snapshot(path):
+    """스냅샷 파일 읽기 (없으면 None)"""
+    try:
+        with open(path, 'rb') as f:
+            return decode_snapshot(f.read())
+    except FileNotFoundError:
+        return None
+
+
+class Autosaver:
+    """턴 경계마다 스냅샷 자동 저장 / 시작 시 복구"""
+
+    def __init__(self, path):
+        self.path = path
+        self.saves = 0
+        self.last_size = 0
+
+    def save(self, game, kind=SNAPSHOT_TURN):
+        data = encode_snapshot(game, kind)
+        write_snapshot(self.path, data)
+        self.saves += 1
+        self.last_size = len(data)
+
+    def load(self):
+        """저장된 상태 (없거나 읽을 수 없으면 None)"""
+        try:
+            return read_snapshot(self.path)
+        except (OSError, SnapshotError) as e:
+            print(f"⚠️ 자동 저장 스냅샷을 읽을 수 없음 ({self.path}): {e}")
+            return None
+
+    def clear(self):
+        """대국이 끝나면 스냅샷 삭제 (다음 실행은 새 대국)"""
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+def create_autosaver():
+    """환경변수로 지정된 자동 저장 (MAHJONG_AUTOSAVE=경로, 없으면 None)"""
+    path = os.environ.get(AUTOSAVE_ENV) or None
+    if path is None:
+        return None
+    return Autosaver(path)
@@ -0,0 +1,166 @@
+"""
+손패 레이아웃 / 클릭 판정 모듈
+- 플레이어 손패(꽃패, 멜드, 손패, 뽑은 패) 위치를 손패가 바뀔 때만 계산
+- 렌더링과 클릭 처리가 같은 레이아웃을 사용
+- 구간 인덱스(bisect)로 클릭 위치의 패/버튼을 O(log n)에 찾기
+"""
+
+from bisect import bisect_right
+
+import pygame
+
+from mahjong_resources import SCREEN_WIDTH, SCREEN_HEIGHT, TABLE_CENTER_X, TILE_SIZE
+from mahjong_game import sort_hand_by_position
+
+
+# 플레이어 영역 배치
+PLAYER_AREA_X = TABLE_CENTER_X - 300  # 좌우 대칭을 위해 중앙에 더 가깝게 조정
+PLAYER_AREA_Y = SCREEN_HEIGHT - 150
+HAND_TILE_SPACING = 50
+FLOWER_SPACING = 35    # 꽃패 간격
+MELD_SPACING = 35      # 멜드 내 패 간격
+MELD_GAP = 10          # 멜드 간 간격
+SECTION_GAP = 20       # 섹션 간 간격
+DRAWN_TILE_GAP = 15    # 뽑은 패 간격
+
+# 액션 선택 버튼 배치 (화면 오른쪽 끝 가장 밑, 세로로)
+ACTION_BUTTON_WIDTH = 80
+ACTION_BUTTON_HEIGHT = 35
+ACTION_BUTTON_SPACING = 5
+ACTION_BUTTON_MARGIN = 10
+
+
+class HitIndex:
+    """한 축 방향으로 정렬한 사각형 구간 인덱스 - 클릭 위치의 항목을 bisect로 찾기"""
+
+    def __init__(self, entries, axis='x'):
+        # entries: [(pygame.Rect, payload), ...]
+        self.axis = axis
+        self.entries = sorted(entries, key=lambda entry: self._start(entry[0]))
+        self.starts = [self._start(rect) for rect, _ in self.entries]
+        self.max_span = max((self._span(rect) for rect, _ in self.entries), default=0)
+
+    def _start(self, rect):
+        return rect.x if self.axis == 'x' else rect.y
+
+    def _span(self, rect):
+        return rect.width if self.axis == 'x' else rect.height
+
+    def hit(self, pos, default=None):
+        """pos를 포함하는 항목의 payload (없으면 default)"""
+        coord = pos[0] if self.axis == 'x' else pos[1]
+        i = bisect_right(self.starts, coord) - 1
+        # 시작점이 coord 이하인 항목 중 닿을 수 있는 것만 거슬러 확인
+        # 사각형이 겹치면 앞쪽(시작점이 작은) 항목 우선 - 기존 순차 검사와 동일
+        found = default
+        while i >= 0 and self.starts[i] + self.max_span > coord:
+            rect, payload = self.entries[i]
+            if rect.collidepoint(pos):
+                found = payload
+            i -= 1
+        return found
+
+    def __len__(self):
+        return len(self.entries)
+
+
+class HandLayout:
+    """플레이어 손패 한 상태의 화면 배치 (손패가 바뀔 때마다 새로 생성)"""
+
+    def __init__(self, hand, flower_tiles, melds, drawn_tile=None):
+        start_y = PLAYER_AREA_Y
+        current_x = PLAYER_AREA_X
+
+        # 1. 꽃패 (가장 왼쪽)
+        self.flowers = []  # [(패, (x, y))]
+        if flower_tiles:
+            for tile in flower_tiles:
+                self.flowers.append((tile, (current_x, start_y)))
+                current_x += FLOWER_SPACING
+            current_x += SECTION_GAP
+
+        # 2. 멜드 (꽃패 다음) - 암깡의 둘째/셋째 패는 뒷면(None)
+        self.melds = []  # [{'type', 'label_pos', 'tiles': [(패 또는 None, (x, y))]}]
+        if melds:
+            for meld in melds:
+                tiles = []
+                for j, tile in enumerate(meld['tiles']):
+                    face = None if meld['type'] == 'an_gang' and j in [1, 2] else tile
+                    tiles.append((face, (current_x + j * MELD_SPACING, start_y)))
+                self.melds.append({'type': meld['type'], 'label_pos': (current_x, start_y - 20), 'tiles': tiles})
+                current_x += len(meld['tiles']) * MELD_SPACING + MELD_GAP
+            current_x += SECTION_GAP
+
+        # 3. 손패 (정렬된 순서) - 정렬된 패마다 원본 손패 인덱스 매핑
+        self.sorted_hand = sort_hand_by_position(hand, 'bottom')
+        remaining = list(hand)
+        self.tiles = []  # [(패, pygame.Rect, 원본 인덱스)]
+        for tile in self.sorted_hand:
+            original_index = remaining.index(tile)
+            remaining[original_index] = None  # 중복 방지
+            self.tiles.append((tile, pygame.Rect(current_x, start_y, TILE_SIZE[0], TILE_SIZE[1]), original_index))
+            current_x += HAND_TILE_SPACING
+
+        # 4. 뽑은 패 (손패 뒤 간격)
+        self.drawn_tile = drawn_tile
+        self.drawn_rect = None
+        if drawn_tile:
+            self.drawn_rect = pygame.Rect(current_x + DRAWN_TILE_GAP, start_y, TILE_SIZE[0], TILE_SIZE[1])
+
+        # 클릭 판정 인덱스 (손패 → ('hand', 정렬 인덱스), 뽑은 패 → ('drawn', None))
+        entries = [(rect, ('hand', i)) for i, (_, rect, _) in enumerate(self.tiles)]
+        if self.drawn_rect:
+            entries.append((self.drawn_rect, ('drawn', None)))
+        self.hit_index = HitIndex(entries, axis='x')
+
+    def hit_test(self, pos):
+        """클릭 위치의 패 - ('hand', 정렬 인덱스) / ('drawn', None) / None"""
+        return self.hit_index.hit(pos)
+
+
+def hand_layout_key(hand, flower_tiles, melds, drawn_tile):
+    """레이아웃 캐시 키 (손패/꽃패/멜드/뽑은 패가 같으면 같은 배치)"""
+    return (tuple(hand), tuple(flower_tiles),
+            tuple((meld['type'], tuple(meld['tiles'])) for meld in melds), drawn_tile)
+
+
+class ActionButtonLayout:
+    """액션 선택 버튼 배치 (액션 수마다 한 번 생성)"""
+
+    def __init__(self, action_count):
+        total_buttons = action_count + 1  # 액션들 + 패스
+        total_height = total_buttons * ACTION_BUTTON_HEIGHT + (total_buttons - 1) * ACTION_BUTTON_SPACING
+
+        # 오른쪽 끝에서 margin만큼 떨어진 위치
+        self.start_x = SCREEN_WIDTH - ACTION_BUTTON_WIDTH - ACTION_BUTTON_MARGIN
+        self.start_y = SCREEN_HEIGHT - total_height - ACTION_BUTTON_MARGIN
+
+        self.action_rects = []
+        for i in range(action_count):
+            button_y = self.start_y + i * (ACTION_BUTTON_HEIGHT + ACTION_BUTTON_SPACING)
+            self.action_rects.append(pygame.Rect(self.start_x, button_y, ACTION_BUTTON_WIDTH, ACTION_BUTTON_HEIGHT))
+        pass_button_y = self.start_y + action_count * (ACTION_BUTTON_HEIGHT + ACTION_BUTTON_SPACING)
+        self.pass_rect = pygame.Rect(self.start_x, pass_button_y, ACTION_BUTTON_WIDTH, ACTION_BUTTON_HEIGHT)
+
+        # 버튼 → 액션 인덱스 (패스는 'pass')
+        entries = [(rect, i) for i, rect in enumerate(self.action_rects)]
+        entries.append((self.pass_rect, 'pass'))
+        self.hit_index = HitIndex(entries, axis='y')
+
+    def hit_test(self, pos):
+        """클릭 위치의 버튼 - 액션 인덱스 / 'pass' / None"""
+        return self.hit_index.hit(pos)
+
+
+_action_button_layouts = {}
+
+
+def get_action_button_layout(action_count):
+    """액션 수별 버튼 배치 (캐시)"""
+    if action_count not in _action_button_layouts:
+        _action_button_layouts[action_count] = ActionButtonLayout(action_count)
+    return _action_button_layouts[action_count]
+
+
+# 화료 다이얼로그는 화면 아무 곳이나 클릭하면 닫힘
+WINNING_DIALOG_HITS = HitIndex([(pygame.Rect(0, 0, SCREEN_WIDTH, SCREEN_HEIGHT), 'close')], axis='y')
@@ -6,23 +6,382 @@
 """
 
 import random
-from mahjong_game import normalize_tile_name, can_pon, can_kan, is_winning_hand
+from functools import lru_cache
+from mahjong_game import (normalize_tile_name, can_pon, can_kan, is_winning_hand,
+                          tile_to_kind, hand_to_counts, NUM_TILE_KINDS, WALL_KIND_COPIES)
 
 
-def ai_choose_discard(hand, direction="AI"):
-    """AI가 버릴 패 선택"""
+# 멘젠이 깨진 상태에서 화료에 필요한 최소 역 점수 (is_winning_hand 기준)
+MIN_OPEN_YAKU_POINTS = 2
+
+# 역 점수 추정용 인덱스
+EAST_KIND = 27
+HONOR_KIND_START = 27
+DRAGON_KINDS = (31, 32, 33)
+TERMINAL_HONOR_KINDS = frozenset([0, 8, 9, 17, 18, 26] + list(range(27, 34)))
+
+
+@lru_cache(maxsize=None)
+def _suit_block_options(suit_counts):
+    """수패 개수 튜플(앞뒤 0 제거)에서 가능한 (몸통, 탑쯔, 머리) 조합 목록"""
+    if not suit_counts:
+        return ((0, 0, 0),)
+    counts = list(suit_counts)
+    size = len(counts)
+    results = set()
+
+    def collect(add_melds, add_partials, add_head, changes):
+        for idx, delta in changes:
+            counts[idx] -= delta
+        for melds, partials, head in _suit_block_options(_trim_counts(counts)):
+            if not (head and add_head):
+                results.add((melds + add_melds, partials + add_partials, head | add_head))
+        for idx, delta in changes:
+            counts[idx] += delta
+
+    # 첫 번째 패의 쓰임새: 고립패 / 커쯔 / 대자(탑쯔 또는 머리) / 순자 / 탑쯔
+    collect(0, 0, 0, ((0, 1),))
+    if counts[0] >= 3:
+        collect(1, 0, 0, ((0, 3),))
+    if counts[0] >= 2:
+        collect(0, 1, 0, ((0, 2),))
+        collect(0, 0, 1, ((0, 2),))
+    if size >= 3 and counts[1] and counts[2]:
+        collect(1, 0, 0, ((0, 1), (1, 1), (2, 1)))
+    for gap in (1, 2):
+        if gap < size and counts[gap]:
+            collect(0, 1, 0, ((0, 1), (gap, 1)))
+
+    return _pareto_options(results)
+
+
+def _trim_counts(counts):
+    """앞뒤 0을 제거한 튜플 (순자 모양은 위치 이동에 무관)"""
+    start = 0
+    end = len(counts)
+    while start < end and counts[start] == 0:
+        start += 1
+    while end > start and counts[end - 1] == 0:
+        end -= 1
+    return tuple(counts[start:end])
+
+
+def _honor_block_options(honor_counts):
+    """자패 7종의 (몸통, 탑쯔, 머리) 조합 - 자패는 커쯔/대자만 가능"""
+    triplets = sum(1 for count in honor_counts if count >= 3)
+    pairs = sum(1 for count in honor_counts if count == 2)
+    options = [(triplets, pairs, 0)]
+    if pairs:
+        options.append((triplets, pairs - 1, 1))
+    elif triplets:
+        options.append((triplets - 1, 0, 1))
+    return tuple(options)
+
+
+def _pareto_options(options):
+    """다른 조합에 완전히 지배되는 (몸통, 탑쯔, 머리) 조합 제거"""
+    kept = []
+    for option in options:
+        dominated = False
+        for other in options:
+            if other != option and other[0] >= option[0] and other[1] >= option[1] and other[2] >= option[2]:
+                dominated = True
+                break
+        if not dominated:
+            kept.append(option)
+    return tuple(kept)
+
+
+@lru_cache(maxsize=None)
+def _suit_options_for(suit_counts):
+    """수패 9칸 개수 튜플의 조합 목록 (캐시)"""
+    return _suit_block_options(_trim_counts(suit_counts))
+
+
+NO_BLOCK_OPTIONS = ((0, 0, 0),)
+
+# 샹텐 캐시 크기 - 셀프 플레이에서는 같은 손패가 거의 반복되지 않아 손패 캐시는 대부분 빗나가고,
+# 수패별 조합 목록(순서 무관)으로 묶은 조합 캐시가 실제 계산을 줄인다
+SHANTEN_CACHE_SIZE = 1 << 16
+
+
+@lru_cache(maxsize=SHANTEN_CACHE_SIZE)
+def _calculate_shanten_cached(counts, meld_count):
+    """34종 개수 bytes의 샹텐 수 (캐시)"""
+    suits = sorted((_suit_options_for(counts[0:9]), _suit_options_for(counts[9:18]),
+                    _suit_options_for(counts[18:27])))
+    return _combine_shanten(suits[0], suits[1], suits[2], _honor_block_options(counts[27:34]), meld_count)
+
+
+@lru_cache(maxsize=SHANTEN_CACHE_SIZE)
+def _combine_shanten(man, pin, sou, honors, meld_count):
+    """수패 3종/자패의 (몸통, 탑쯔, 머리) 조합 목록에서 최소 샹텐 (캐시)"""
+    combined = NO_BLOCK_OPTIONS
+    for options in (man, pin, sou, honors):
+        if options == NO_BLOCK_OPTIONS:
+            continue
+        combined = [(melds + add_melds, partials + add_partials, head | add_head)
+                    for melds, partials, head in combined
+                    for add_melds, add_partials, add_head in options
+                    if not (head and add_head)]
+
+    slots = 4 - meld_count
+    best = 8
+    for melds, partials, head in combined:
+        if melds > slots:
+            melds = slots
+        if partials > slots - melds:
+            partials = slots - melds
+        shanten = 8 - 2 * meld_count - 2 * melds - partials - head
+        if shanten < best:
+            best = shanten
+    return best
+
+
+def calculate_shanten(counts, meld_count=0):
+    """샹텐 수 계산 (-1: 화료형, 0: 텐파이) - 4몸통 1머리 기준"""
+    if not isinstance(counts, (list, tuple)):
+        counts = list(counts)  # numpy 배열을 bytes()에 넘기면 원소가 아닌 버퍼가 키가 됨
+    return _calculate_shanten_cached(bytes(counts), meld_count)
+
+
+def _related_kinds(counts):
+    """손패의 패와 이어질 수 있는 종류 (같은 자패, 같은 수패 ±2) - 나머지는 고립패라 샹텐을 못 줄임"""
+    related = set()
+    for kind in range(NUM_TILE_KINDS):
+        if counts[kind] == 0:
+            continue
+        if kind >= 27:
+            related.add(kind)
+            continue
+        base = kind - kind % 9
+        for near in range(max(base, kind - 2), min(base + 8, kind + 2) + 1):
+            related.add(near)
+    return sorted(related)
+
+
+def count_acceptance(counts, meld_count=0, visible_counts=None, shanten=None):
+    """샹텐을 줄이는 유효패의 남은 장수 계산 (손패 3n+1장 기준)"""
+    if shanten is None:
+        shanten = calculate_shanten(counts, meld_count)
+    counts = list(counts)
+    total = 0
+    for kind in _related_kinds(counts):
+        remaining = WALL_KIND_COPIES[kind] - counts[kind]
+        if visible_counts:
+            remaining -= visible_counts[kind]
+        if remaining <= 0:
+            continue
+        counts[kind] += 1
+        if calculate_shanten(counts, meld_count) < shanten:
+            total += remaining
+        counts[kind] -= 1
+    return total
+
+
+def evaluate_discards(counts, meld_count=0, visible_counts=None):
+    """손패 3n+2장의 버림패 후보별 (샹텐, 유효패 수, 패 인덱스) - 좋은 순서로 정렬"""
+    counts = list(counts)
+    scores = []
+    for kind in range(NUM_TILE_KINDS):
+        if counts[kind] == 0:
+            continue
+        counts[kind] -= 1
+        shanten = calculate_shanten(counts, meld_count)
+        acceptance = count_acceptance(counts, meld_count, visible_counts, shanten)
+        counts[kind] += 1
+        scores.append((shanten, acceptance, kind))
+    scores.sort(key=lambda score: (score[0], -score[1], score[2]))
+    return tuple(scores)
+
+
+def best_discard_state(counts, meld_count=0, visible_counts=None, discard_scores=None):
+    """손패 3n+2장에서 가장 좋은 버림패 후의 (샹텐, 유효패 수, 버릴 패 인덱스)"""
+    if discard_scores is None:
+        discard_scores = evaluate_discards(counts, meld_count, visible_counts)
+    if not discard_scores:
+        return 8, 0, -1
+    return discard_scores[0]
+
+
+def estimate_yaku_potential(counts, meld_kinds=()):
+    """멘젠이 깨진 손패의 역 점수 추정 (확정 역 + 대자로 노릴 수 있는 역패 0.5점)"""
+    total = list(counts)
+    for kind in meld_kinds:
+        total[kind] += 3
+
+    points = 0.0
+
+    # 동 커쯔는 자풍+장풍 (게임 기본값이 동/동)
+    if total[EAST_KIND] >= 3:
+        points += 2
+    elif counts[EAST_KIND] == 2:
+        points += 1
+
+    # 삼원패 커쯔
+    for kind in DRAGON_KINDS:
+        if total[kind] >= 3:
+            points += 1
+        elif counts[kind] == 2:
+            points += 0.5
+
+    # 탕야오
+    if not any(total[kind] for kind in TERMINAL_HONOR_KINDS):
+        points += 1
+
+    # 혼일색/청일색
+    man_count = sum(total[0:9])
+    tong_count = sum(total[9:18])
+    honor_count = sum(total[27:34])
+    if (man_count == 0) != (tong_count == 0):
+        points += 2 if honor_count else 8
+
+    # 돌돌이 (커쯔 4개, 멘젠 깨진 상태)
+    triplet_kinds = sum(1 for count in total if count >= 3)
+    if triplet_kinds >= 4:
+        points += 2
+    elif triplet_kinds == 3:
+        points += 1
+
+    return points
+
+
+def call_yaku_potential(hand, tile, call_type, meld_tiles=None):
+    """펑/명깡 후 역 점수 추정 - evaluate_call이 역 부족으로 거절할 호출을 샹텐 계산 없이 거르는 용도"""
+    kind = tile_to_kind(tile)
+    used = {'peng': 2, 'ming_gang': 3}.get(call_type)
+    counts = hand_to_counts(hand)
+    if kind < 0 or used is None or counts[kind] < used:
+        return 0.0
+    counts[kind] -= used
+    return estimate_yaku_potential(counts, [tile_to_kind(meld_tile) for meld_tile in meld_tiles or []] + [kind])
+
+
+def evaluate_call(hand, tile, call_type, meld_tiles=None, visible_counts=None):
+    """펑/명깡/론 호출의 기대 가치 평가 - 결정적으로 수락/거절 반환"""
+    meld_tiles = meld_tiles or []
+    meld_kinds = [tile_to_kind(meld_tile) for meld_tile in meld_tiles]
+    meld_count = len(meld_kinds)
+    kind = tile_to_kind(tile)
+    counts = hand_to_counts(hand)
+
+    shanten_before = calculate_shanten(counts, meld_count)
+    acceptance_before = count_acceptance(counts, meld_count, visible_counts, shanten_before)
+
+    result = {
+        'call_type': call_type,
+        'accept': False,
+        'shanten_before': shanten_before,
+        'shanten_after': shanten_before,
+        'acceptance_before': acceptance_before,
+        'acceptance_after': acceptance_before,
+        'yaku_potential': 0.0,
+        'score': 0.0,
+        'reason': "",
+    }
+
+    if kind < 0:
+        result['reason'] = "알 수 없는 패"
+        return result
+
+    # 론은 합법이면 항상 수락
+    if call_type == 'ron':
+        result.update(accept=True, shanten_after=-1, score=1000.0, reason="화료")
+        return result
+
+    used = {'peng': 2, 'ming_gang': 3}.get(call_type)
+    if used is None or counts[kind] < used:
+        result['reason'] = "호출 불가"
+        return result
+
+    after_counts = list(counts)
+    after_counts[kind] -= used
+    after_melds = meld_kinds + [kind]
+    after_visible = list(visible_counts) if visible_counts else [0] * NUM_TILE_KINDS
+    after_visible[kind] += used
+
+    if call_type == 'peng':
+        # 펑 후에는 1장 버려야 함 - 최선의 버림패 기준으로 평가
+        shanten_after, acceptance_after, _ = best_discard_state(after_counts, len(after_melds), after_visible)
+    else:
+        # 명깡 후에는 보충패를 뽑으므로 3n+1장 상태 그대로 평가
+        shanten_after = calculate_shanten(after_counts, len(after_melds))
+        acceptance_after = count_acceptance(after_counts, len(after_melds), after_visible, shanten_after)
+
+    yaku_potential = estimate_yaku_potential(after_counts, after_melds)
+    was_menzen = meld_count == 0
+    improved = shanten_after < shanten_before
+    kept = shanten_after == shanten_before
+
+    if yaku_potential < MIN_OPEN_YAKU_POINTS:
+        accept = False
+        reason = f"역 부족 ({yaku_potential}점)"
+    elif was_menzen and not improved:
+        accept = False
+        reason = "멘젠 유지가 유리"
+    elif improved:
+        accept = True
+        reason = f"샹텐 {shanten_before}→{shanten_after}"
+    elif kept and (call_type == 'ming_gang' or acceptance_after > acceptance_before):
+        accept = True
+        reason = f"유효패 {acceptance_before}→{acceptance_after}"
+    else:
+        accept = False
+        reason = "개선 없음"
+
+    result.update(
+        accept=accept,
+        shanten_after=shanten_after,
+        acceptance_after=acceptance_after,
+        yaku_potential=yaku_potential,
+        score=(shanten_before - shanten_after) * 100 + (acceptance_after - acceptance_before) + yaku_potential * 10,
+        reason=reason,
+    )
+    return result
+
+
+def evaluate_self_gang(hand, tile, gang_type, meld_tiles=None, visible_counts=None):
+    """자기 턴 암깡/가깡 평가 - 샹텐이 나빠지지 않고 역 조건을 지키면 수락"""
+    meld_tiles = meld_tiles or []
+    meld_kinds = [tile_to_kind(meld_tile) for meld_tile in meld_tiles]
+    kind = tile_to_kind(tile)
+    counts = hand_to_counts(hand)
+    used = {'an_gang': 4, 'jia_gang': 1}.get(gang_type)
+
+    if kind < 0 or used is None or counts[kind] < used:
+        return {'accept': False, 'reason': "깡 불가"}
+
+    # 깡 전: 3n+2장에서 최선의 버림패 기준
+    shanten_before, _, _ = best_discard_state(counts, len(meld_kinds), visible_counts)
+
+    after_counts = list(counts)
+    after_counts[kind] -= used
+    after_melds = meld_kinds if gang_type == 'jia_gang' else meld_kinds + [kind]
+    shanten_after = calculate_shanten(after_counts, len(after_melds))
+
+    # 이 게임에서는 암깡도 멜드로 기록되어 멘젠이 깨짐
+    yaku_potential = estimate_yaku_potential(after_counts, after_melds)
+    if shanten_after > shanten_before:
+        return {'accept': False, 'reason': f"샹텐 악화 {shanten_before}→{shanten_after}"}
+    if yaku_potential < MIN_OPEN_YAKU_POINTS:
+        return {'accept': False, 'reason': f"역 부족 ({yaku_potential}점)"}
+    return {'accept': True, 'reason': f"샹텐 {shanten_before}→{shanten_after}"}
+
+
+def ai_choose_discard(hand, direction="AI", verbose=True):
+    """AI가 버릴 패 선택 (verbose=False면 디버그 출력 없음 - 헤드리스/서버용)"""
     if not hand:
         return None
     
-    print(f"AI {direction} 패 선택 중... (손패: {len(hand)}장)")
+    if verbose:
+        print(f"AI {direction} 패 선택 중... (손패: {len(hand)}장)")
     
     # 간단한 AI 로직: 자패(풍패, 삼원패) 우선 버리기
     honor_tiles = []
     number_tiles = []
     
     for tile in hand:
-        normalized = normalize_tile_name(tile)
-        if any(wind in normalized for wind in ["동", "남", "서", "북", "중", "발", "백"]):
+        if tile_to_kind(tile) >= HONOR_KIND_START:  # 풍패/삼원패
             honor_tiles.append(tile)
         else:
             number_tiles.append(tile)
@@ -39,39 +398,22 @@ def ai_choose_discard(hand, direction="AI"):
     return random.choice(hand)
 
 
-def calculate_ai_pon_chance(hand, tile, direction="AI"):
-    """AI의 펑 확률 계산"""
+def calculate_ai_pon_chance(hand, tile, direction="AI", meld_tiles=None, visible_counts=None):
+    """AI의 펑 여부 (호출 평가 기준, 1.0 또는 0.0)"""
     if not can_pon(hand, tile):
         return 0.0
     
-    # 기본 펑 확률 50%
-    base_chance = 0.5
-    
-    # 손패가 적으면 펑 확률 증가
-    if len(hand) <= 10:
-        base_chance += 0.2
-    
-    # 자패는 펑 확률 낮춤
-    normalized = normalize_tile_name(tile)
-    if any(wind in normalized for wind in ["동", "남", "서", "북", "중", "발", "백"]):
-        base_chance -= 0.3
-    
-    return max(0.0, min(1.0, base_chance))
+    evaluation = evaluate_call(hand, tile, 'peng', meld_tiles, visible_counts)
+    return 1.0 if evaluation['accept'] else 0.0
 
 
-def calculate_ai_kan_chance(hand, tile, direction="AI"):
-    """AI의 깡 확률 계산"""
+def calculate_ai_kan_chance(hand, tile, direction="AI", meld_tiles=None, visible_counts=None):
+    """AI의 깡 여부 (호출 평가 기준, 1.0 또는 0.0)"""
     if not can_kan(hand, tile):
         return 0.0
     
-    # 깡은 펑보다 확률 낮춤
-    base_chance = 0.3
-    
-    # 손패가 많으면 깡 확률 증가
-    if len(hand) >= 12:
-        base_chance += 0.2
-    
-    return max(0.0, min(1.0, base_chance))
+    evaluation = evaluate_call(hand, tile, 'ming_gang', meld_tiles, visible_counts)
+    return 1.0 if evaluation['accept'] else 0.0
 
 
 def calculate_ai_ron_chance(hand, tile, direction="AI"):
@@ -89,34 +431,21 @@ def calculate_ai_ron_chance(hand, tile, direction="AI"):
     return 0.0
 
 
-def should_ai_react(hand, tile, direction="AI"):
-    """AI가 반응할지 결정"""
-    reactions = []
-    
+def should_ai_react(hand, tile, direction="AI", meld_tiles=None, visible_counts=None):
+    """AI가 반응할지 결정 (론 > 깡/펑 중 평가 점수가 높은 쪽)"""
     # 론 체크 (최우선)
-    ron_chance = calculate_ai_ron_chance(hand, tile, direction)
-    if ron_chance > 0 and random.random() < ron_chance:
-        reactions.append("론")
-    
-    # 깡 체크
-    kan_chance = calculate_ai_kan_chance(hand, tile, direction)
-    if kan_chance > 0 and random.random() < kan_chance:
-        reactions.append("깡")
-    
-    # 펑 체크
-    pon_chance = calculate_ai_pon_chance(hand, tile, direction)
-    if pon_chance > 0 and random.random() < pon_chance:
-        reactions.append("펑")
-    
-    # 우선순위: 론 > 깡 > 펑
-    if "론" in reactions:
+    if calculate_ai_ron_chance(hand, tile, direction) > 0:
         return "론"
-    elif "깡" in reactions:
-        return "깡"
-    elif "펑" in reactions:
-        return "펑"
     
-    return None
+    best_reaction = None
+    best_score = None
+    for reaction, call_type in (("깡", 'ming_gang'), ("펑", 'peng')):
+        evaluation = evaluate_call(hand, tile, call_type, meld_tiles, visible_counts)
+        if evaluation['accept'] and (best_score is None or evaluation['score'] > best_score):
+            best_reaction = reaction
+            best_score = evaluation['score']
+    
+    return best_reaction
 
 
 def ai_analyze_hand(hand):
@@ -1,294 +1,230 @@
 """
 마작 애니메이션 모듈
-- 패산 건설 애니메이션
-- 배패 애니메이션
-- AI 패 버리기 애니메이션
+- Timeline: 가상 시간(실제 시간 x 속도)으로 진행하는 타임라인, 빨리 감기 가능
+- TileTween: 패 1장 이동 트윈 (__slots__, 미리 계산한 이징 테이블로 위치/포물선/크기 계산)
+- TileSpriteCache: 방향별로 미리 회전한 패 + 크기 단계별 스케일 결과 캐시 (프레임마다 변환 없음)
 """
 
-import pygame
-import random
 import math
-from mahjong_resources import DIRECTIONS, TABLE_CENTER_X, TABLE_CENTER_Y
-
-
-class WallBuildingAnimation:
-    """패산 건설 애니메이션"""
-    
-    def __init__(self, wall_positions):
-        self.wall_positions = wall_positions
-        self.animation_frame = 0
-        self.animation_speed = 8
-        self.is_complete = False
-        self.current_direction = 0
-        self.current_stack = 0
-        self.current_layer = 0
-        
-        # 건설 순서: 북 -> 동 -> 남 -> 서 (시계방향)
-        self.build_order = ["북", "동", "남", "서"]
-        
-    def update(self):
-        """애니메이션 업데이트"""
-        if self.is_complete:
-            return
-            
-        self.animation_frame += 1
-        
-        if self.animation_frame % self.animation_speed == 0:
-            self._place_next_tile()
-    
-    def _place_next_tile(self):
-        """다음 타일 배치"""
-        # 현재 방향이 남(하단)이면 건설하지 않고 넘어감
-        current_dir = self.build_order[self.current_direction]
-        if current_dir == "남":
-            self._next_direction()
-            return
-            
-        if current_dir not in self.wall_positions:
-            self._next_direction()
-            return
-            
-        positions = self.wall_positions[current_dir]
-        
-        if self.current_stack < len(positions):
-            # 현재 스택의 다음 층 배치
-            self.current_layer += 1
-            
-            # 2층까지 쌓았으면 다음 스택으로
-            if self.current_layer >= 2:
-                self.current_layer = 0
-                self.current_stack += 1
-        else:
-            # 다음 방향으로
-            self._next_direction()
-    
-    def _next_direction(self):
-        """다음 방향으로 이동"""
-        self.current_direction += 1
-        self.current_stack = 0
-        self.current_layer = 0
-        
-        if self.current_direction >= len(self.build_order):
-            self.is_complete = True
-    
-    def get_visible_tiles(self):
-        """현재 보이는 타일들 반환"""
-        visible = {}
-        
-        for dir_idx in range(self.current_direction + 1):
-            if dir_idx >= len(self.build_order):
-                break
-                
-            direction = self.build_order[dir_idx]
-            if direction == "남":  # 하단은 건설하지 않음
-                continue
-                
-            if direction not in self.wall_positions:
-                continue
-                
-            positions = self.wall_positions[direction]
-            visible[direction] = []
-            
-            # 이전 방향들은 완전히 완성
-            if dir_idx < self.current_direction:
-                stack_count = len(positions)
-            else:
-                # 현재 방향은 부분 완성
-                stack_count = self.current_stack
-                if self.current_layer > 0:
-                    stack_count += 1
-            
-            visible[direction] = stack_count
-            
-        return visible
-
-
-class DealingAnimation:
-    """배패 애니메이션"""
-    
-    def __init__(self, wall_start_position, deal_order):
-        self.wall_start_position = wall_start_position
-        self.deal_order = deal_order
-        self.animation_step = 0
-        self.animation_frame = 0
-        self.animation_speed = 15
-        self.current_round = 0
-        self.max_rounds = 3
-        self.current_player_idx = 0
-        self.current_tile_in_group = 0
-        self.is_complete = False
-        
-        # 현재 애니메이션 중인 타일 정보
-        self.current_tile = None
-        self.current_start_pos = None
-        self.current_end_pos = None
-        self.current_direction = None
-        
-    def start_tile_animation(self, tile, direction, start_pos, end_pos):
-        """개별 타일 애니메이션 시작"""
-        self.current_tile = tile
-        self.current_direction = direction
-        self.current_start_pos = start_pos
-        self.current_end_pos = end_pos
-        self.animation_step = 0
-        
-    def update(self):
-        """애니메이션 업데이트"""
-        if self.is_complete:
-            return False
-            
-        if self.current_tile:
-            self.animation_step += 1
-            
-            if self.animation_step >= self.animation_speed:
-                # 타일 애니메이션 완료
-                self._complete_current_tile()
-                return True
-        
-        return False
-    
-    def _complete_current_tile(self):
-        """현재 타일 애니메이션 완료"""
-        self.current_tile = None
-        self.current_tile_in_group += 1
-        
-        if self.current_tile_in_group >= 4:
-            # 한 그룹(4장) 완료
-            self.current_tile_in_group = 0
-            self.current_player_idx += 1
-            
-            if self.current_player_idx >= 4:
-                # 한 라운드 완료
-                self.current_player_idx = 0
-                self.current_round += 1
-                
-                if self.current_round >= self.max_rounds:
-                    self.is_complete = True
-    
-    def get_current_tile_position(self):
-        """현재 타일의 애니메이션 위치 계산"""
-        if not self.current_tile or not self.current_start_pos or not self.current_end_pos:
-            return None
-            
-        progress = self.animation_step / self.animation_speed
-        progress = min(1.0, progress)
-        
-        # 포물선 궤적 계산
-        start_x, start_y = self.current_start_pos
-        end_x, end_y = self.current_end_pos
-        
-        # 중간점에서 위로 호를 그리기
-        mid_x = start_x + (end_x - start_x) * progress
-        arc_height = 50 * math.sin(math.pi * progress)
-        mid_y = start_y + (end_y - start_y) * progress - arc_height
-        
-        return (int(mid_x), int(mid_y))
-
-
-class DiscardAnimation:
-    """패 버리기 애니메이션"""
-    
-    def __init__(self, tile, direction, start_pos, end_pos):
+import os
+from collections import OrderedDict
+
+import pygame
+
+
+EASING_STEPS = 256          # 이징 테이블 칸 수
+SCALE_STEPS = 16            # 크기 변화 단계 수 (단계마다 스케일 1번, 이후 캐시)
+SPRITE_CACHE_SIZE = 512     # 스케일된 스프라이트 최대 보관 수
+ANIMATION_SPEED_ENV = "MAHJONG_ANIMATION_SPEED"  # 애니메이션 배속 (예: 4 = 4배 빠르게)
+DISCARD_TWEEN_END_SIZE = (36, 48)  # 버린 패가 날아가며 줄어드는 최종 크기
+
+# 화면 위치(플레이어 인덱스)별 패 회전 각도 - 0: 하단, 1: 우측, 2: 상단, 3: 좌측
+PLAYER_TILE_ROTATIONS = (0, -90, 180, 90)
+
+
+def _build_easing_table(func):
+    return tuple(func(i / (EASING_STEPS - 1)) for i in range(EASING_STEPS))
+
+
+EASING_TABLES = {
+    'linear': _build_easing_table(lambda t: t),
+    'ease_out_quad': _build_easing_table(lambda t: 1 - (1 - t) * (1 - t)),
+    'ease_in_out_sine': _build_easing_table(lambda t: 0.5 - 0.5 * math.cos(math.pi * t)),
+}
+ARC_TABLE = _build_easing_table(lambda t: math.sin(math.pi * t))  # 포물선 높이 (0 → 1 → 0)
+
+
+def ease(table, progress):
+    """진행도(0~1)를 이징 테이블로 변환"""
+    if progress <= 0.0:
+        return table[0]
+    if progress >= 1.0:
+        return table[-1]
+    return table[int(progress * (EASING_STEPS - 1) + 0.5)]
+
+
+class TimelineEvent:
+    """예약된 콜백 1개"""
+
+    __slots__ = ('time', 'callback', 'done')
+
+    def __init__(self, time, callback):
+        self.time = time
+        self.callback = callback
+        self.done = False
+
+
+class TileTween:
+    """패 1장 이동 트윈 - 직선 이동 + 포물선 + 크기 변화"""
+
+    __slots__ = ('tile', 'player_idx', 'start', 'duration', 'from_pos', 'to_pos', 'arc_height',
+                 'from_size', 'to_size', 'rotation', 'easing', 'on_complete', 'done')
+
+    def __init__(self, tile, from_pos, to_pos, duration, player_idx=0, from_size=None, to_size=None,
+                 arc_height=0, easing='linear', on_complete=None):
         self.tile = tile
-        self.direction = direction
-        self.start_pos = start_pos
-        self.end_pos = end_pos
-        self.animation_frame = 0
-        self.animation_speed = 20
-        self.is_complete = False
-        
-    def update(self):
-        """애니메이션 업데이트"""
-        if self.is_complete:
-            return False
-            
-        self.animation_frame += 1
-        
-        if self.animation_frame >= self.animation_speed:
-            self.is_complete = True
-            return True
-            
-        return False
-    
-    def get_current_position(self):
-        """현재 위치 계산"""
-        if self.is_complete:
-            return self.end_pos
-            
-        progress = self.animation_frame / self.animation_speed
-        start_x, start_y = self.start_pos
-        end_x, end_y = self.end_pos
-        
-        current_x = start_x + (end_x - start_x) * progress
-        current_y = start_y + (end_y - start_y) * progress
-        
-        return (int(current_x), int(current_y))
-    
-    def get_rotation(self):
-        """회전각 계산 (방향에 따라)"""
-        rotation_map = {
-            "동": 270,  # 우측 AI
-            "남": 180,  # 하단 플레이어
-            "서": 90,   # 좌측 AI
-            "북": 0     # 상단 AI
-        }
-        return rotation_map.get(self.direction, 0)
-
-
-class AnimationManager:
-    """애니메이션 매니저"""
-    
-    def __init__(self):
-        self.wall_building = None
-        self.dealing = None
-        self.discard_animations = []
-        
-    def start_wall_building(self, wall_positions):
-        """패산 건설 애니메이션 시작"""
-        self.wall_building = WallBuildingAnimation(wall_positions)
-        
-    def start_dealing(self, wall_start_position, deal_order):
-        """배패 애니메이션 시작"""
-        self.dealing = DealingAnimation(wall_start_position, deal_order)
-        
-    def start_discard(self, tile, direction, start_pos, end_pos):
-        """패 버리기 애니메이션 시작"""
-        discard_anim = DiscardAnimation(tile, direction, start_pos, end_pos)
-        self.discard_animations.append(discard_anim)
-        return discard_anim
-        
-    def update(self):
-        """모든 애니메이션 업데이트"""
-        # 패산 건설 애니메이션
-        if self.wall_building and not self.wall_building.is_complete:
-            self.wall_building.update()
-            
-        # 배패 애니메이션
-        if self.dealing and not self.dealing.is_complete:
-            self.dealing.update()
-            
-        # 버리기 애니메이션들
-        completed_discards = []
-        for i, discard_anim in enumerate(self.discard_animations):
-            if discard_anim.update():
-                completed_discards.append(i)
-                
-        # 완료된 애니메이션 제거
-        for i in reversed(completed_discards):
-            del self.discard_animations[i]
-    
-    def is_wall_building_complete(self):
-        """패산 건설 완료 여부"""
-        return self.wall_building is None or self.wall_building.is_complete
-        
-    def is_dealing_complete(self):
-        """배패 완료 여부"""
-        return self.dealing is None or self.dealing.is_complete
-        
-    def has_active_animations(self):
-        """활성 애니메이션 존재 여부"""
-        return (
-            (self.wall_building and not self.wall_building.is_complete) or
-            (self.dealing and not self.dealing.is_complete) or
-            len(self.discard_animations) > 0
-        ) 
\ No newline at end of file
+        self.player_idx = player_idx
+        self.start = 0.0
+        self.duration = duration
+        self.from_pos = from_pos
+        self.to_pos = to_pos
+        self.arc_height = arc_height
+        self.from_size = from_size
+        self.to_size = to_size or from_size
+        self.rotation = PLAYER_TILE_ROTATIONS[player_idx] if 0 <= player_idx < len(PLAYER_TILE_ROTATIONS) else 0
+        self.easing = EASING_TABLES[easing]
+        self.on_complete = on_complete
+        self.done = False
+
+    @property
+    def end(self):
+        return self.start + self.duration
+
+    def progress(self, now):
+        if self.duration <= 0:
+            return 1.0
+        return min(1.0, max(0.0, (now - self.start) / self.duration))
+
+    def position(self, progress):
+        """진행도에서 중심 좌표"""
+        eased = ease(self.easing, progress)
+        x = self.from_pos[0] + (self.to_pos[0] - self.from_pos[0]) * eased
+        y = self.from_pos[1] + (self.to_pos[1] - self.from_pos[1]) * eased
+        if self.arc_height:
+            y -= self.arc_height * ease(ARC_TABLE, progress)
+        return int(x), int(y)
+
+    def size(self, progress):
+        """진행도에서 (회전 전) 크기 - SCALE_STEPS 단계로 양자화해서 캐시 적중"""
+        if self.from_size is None:
+            return None
+        step = int(progress * SCALE_STEPS + 0.5) / SCALE_STEPS
+        width = int(self.from_size[0] + (self.to_size[0] - self.from_size[0]) * step)
+        height = int(self.from_size[1] + (self.to_size[1] - self.from_size[1]) * step)
+        return width, height
+
+
+class Timeline:
+    """가상 시간 타임라인 - 트윈과 예약 콜백을 같은 시계로 진행
+
+    clock(실제 ms)이 있으면 sync()가 지난 실제 시간 x speed만큼 진행한다.
+    fast_forward()는 남은 트윈/예약을 모두 끝까지 진행한다.
+    """
+
+    def __init__(self, clock=None, speed=1.0):
+        self.clock = clock
+        self.speed = speed
+        self.now = 0.0
+        self.last_real = None
+        self.tweens = []
+        self.events = []
+
+    def sync(self, real_ms=None):
+        """실제 시간에 맞춰 진행 (처음 호출은 기준 시각만 기록)"""
+        if real_ms is None:
+            if self.clock is None:
+                return
+            real_ms = self.clock()
+        if self.last_real is not None:
+            self.advance((real_ms - self.last_real) * self.speed)
+        self.last_real = real_ms
+
+    def advance(self, delta_ms):
+        """가상 시간을 delta_ms만큼 진행하고 끝난 트윈/도래한 콜백 처리"""
+        if delta_ms > 0:
+            self.now += delta_ms
+        now = self.now
+
+        if self.events:
+            due = [event for event in self.events if event.time <= now]
+            if due:
+                self.events = [event for event in self.events if event.time > now]
+                for event in sorted(due, key=lambda event: event.time):
+                    event.done = True
+                    event.callback()
+
+        if self.tweens:
+            finished = [tween for tween in self.tweens if tween.end <= now]
+            if finished:
+                self.tweens = [tween for tween in self.tweens if tween.end > now]
+                for tween in finished:
+                    tween.done = True
+                    if tween.on_complete:
+                        tween.on_complete()
+
+    def fast_forward(self):
+        """남은 트윈/예약 콜백을 시간 순서대로 모두 끝냄 (콜백이 새로 추가한 것까지)"""
+        for _ in range(10000):
+            ends = [tween.end for tween in self.tweens] + [event.time for event in self.events]
+            if not ends:
+                return
+            self.advance(min(ends) - self.now)
+
+    def add_tween(self, tween):
+        """트윈 시작 (현재 가상 시각 기준)"""
+        self.sync()
+        tween.start = self.now
+        self.tweens.append(tween)
+        return tween
+
+    def schedule(self, delay_ms, callback):
+        """delay_ms 후 콜백 예약"""
+        self.sync()
+        event = TimelineEvent(self.now + delay_ms, callback)
+        self.events.append(event)
+        return event
+
+    def has_active(self):
+        return bool(self.tweens)
+
+    def clear(self):
+        self.tweens = []
+        self.events = []
+
+
+class TileSpriteCache:
+    """방향별 회전 패 스프라이트 + 크기 단계별 스케일 캐시 (LRU)"""
+
+    def __init__(self, resources, base_size, max_entries=SPRITE_CACHE_SIZE):
+        self.resources = resources
+        self.base_size = base_size
+        self.max_entries = max_entries
+        self.rotated = {}               # {(패, 회전): 원래 크기로 회전한 서피스}
+        self.scaled = OrderedDict()     # {(패, 회전, 크기): 서피스}
+
+    def get_rotated(self, tile, rotation):
+        """원래 크기로 회전한 끝점 스프라이트"""
+        key = (tile, rotation)
+        surface = self.rotated.get(key)
+        if surface is None:
+            surface = self.resources.get_tile_surface(tile, self.base_size)
+            if rotation:
+                surface = pygame.transform.rotate(surface, rotation)
+            self.rotated[key] = surface
+        return surface
+
+    def get(self, tile, rotation, size=None):
+        """회전 + (회전 전 기준) size로 스케일한 스프라이트"""
+        if size is None or tuple(size) == tuple(self.base_size):
+            return self.get_rotated(tile, rotation)
+        key = (tile, rotation, size)
+        surface = self.scaled.get(key)
+        if surface is not None:
+            self.scaled.move_to_end(key)
+            return surface
+        width, height = size
+        if rotation % 180:
+            width, height = height, width
+        surface = pygame.transform.scale(self.get_rotated(tile, rotation), (width, height))
+        self.scaled[key] = surface
+        if len(self.scaled) > self.max_entries:
+            self.scaled.popitem(last=False)
+        return surface
+
+
+def create_timeline(clock=None):
+    """환경변수 배속(MAHJONG_ANIMATION_SPEED, 기본 1)을 적용한 타임라인"""
+    speed = float(os.environ.get(ANIMATION_SPEED_ENV) or 1.0)
+    if speed <= 0:
+        raise ValueError(f"{ANIMATION_SPEED_ENV}는 0보다 커야 합니다: {speed}")
+    return Timeline(clock, speed)
@@ -0,0 +1,494 @@
+"""
+학습용 벡터화 환경 모듈 (pygame 없이 실행, numpy 필요)
+- HeadlessTable: TableRules 규칙으로 한 테이블의 패산/배패/턴 진행
+- VectorMahjongEnv: K개 테이블을 reset/step 배열 API로 묶음
+- 고정 크기 관측 텐서와 get_available_actions 기반 액션 마스크
+- 판 종료 시 자동 리셋, 12판 점수 흐름(player_scores) 유지
+- record_events=True면 상태 변경을 EventLog 이벤트로 기록 (리플레이/동기화용)
+"""
+
+import random
+
+import numpy as np
+
+from mahjong_game import (is_flower_tile, check_yaku, tile_to_kind, hand_to_counts,
+                          NUM_TILE_KINDS, TILE_KINDS)
+from mahjong_ai import calculate_shanten
+from ai_strategies import create_strategy
+from table_rules import (TableRules, create_tiles, ACTION_PASS, ACTION_PENG, ACTION_MING_GANG, ACTION_AN_GANG,
+                         NUM_ACTIONS, ACTION_TYPE_IDS)
+from game_events import (EventLog, HandResult, meld_call, EVENT_DRAW, EVENT_FLOWER, EVENT_DISCARD, EVENT_TURN,
+                         EVENT_PENG, EVENT_GANG, EVENT_WIN, EVENT_DRAW_GAME)
+
+
+# 관측 평면: 손패, 좌석별 버림패 4, 좌석별 멜드 4, 대상 패, 스칼라
+NUM_OBS_PLANES = 11
+TOTAL_TILES = len(create_tiles())
+
+
+class HeadlessTable(TableRules):
+    """pygame 없이 한 테이블을 진행하는 엔진 (에이전트 좌석 결정에서 멈춤)
+
+    패산은 앞에서 일반 쯔모, 뒤에서 왕패(꽃패/깡 보충)를 뽑는 단순 배열이다.
+    리치는 사람 플레이어 전용 규칙이므로 헤드리스 테이블에서는 사용하지 않는다.
+    verbose=False면 상대 AI 결정 디버그 출력을 끈다 (배치 실행/서버 기본값).
+    """
+
+    def __init__(self, seed=None, agent_seats=(0,), opponent_strategy="heuristic",
+                 total_games=12, max_turns=200, record_events=False, verbose=False):
+        self.rng = random.Random(seed)
+        self.agent_seats = frozenset(agent_seats)
+        self.strategies = [None if seat in self.agent_seats else create_strategy(opponent_strategy)
+                           for seat in range(4)]
+        for strategy in self.strategies:
+            if strategy is not None:
+                strategy.verbose = verbose
+        self.total_games = total_games
+        self.max_turns = max_turns
+        self.player_index = None  # 리치 없음
+        self.player_riichi = False
+        self.event_log = EventLog() if record_events else None
+        if self.event_log is not None:
+            for strategy in self.strategies:
+                if strategy is not None:
+                    strategy.attach(self.event_log)
+        self.reset_match()
+
+    # --- 매치/판 시작 ---
+
+    def reset_match(self):
+        """12판 매치 초기화 (시작 점수 50점)"""
+        self.player_scores = [50, 50, 50, 50]
+        self.game_results = []
+        self.current_game = 1
+        self.east_player = self.rng.randrange(4)
+        self.match_done = False
+
+    def start_hand(self):
+        """한 판 시작 - 패산 섞기, 배패 후 첫 결정까지 진행"""
+        self.hands = [[] for _ in range(4)]
+        self.counts = [[0] * NUM_TILE_KINDS for _ in range(4)]
+        self.melds = [[] for _ in range(4)]
+        self.discard_piles = [[] for _ in range(4)]
+        self.flower_tiles = [[] for _ in range(4)]
+        self.wall_tiles = create_tiles()
+        self.rng.shuffle(self.wall_tiles)
+        self.wall_head = 0
+        self.wall_tail = len(self.wall_tiles)
+        self.drawn_tile = None
+        self.turn_counter = 0
+        self.last_discard_player = None
+        self.after_call = False
+        self.hand_over = False
+        self.hand_result = None
+        self.decision = None
+        self.pending_callers = []  # 에이전트가 패스한 뒤 펑/깡을 물어볼 남은 좌석
+        if self.event_log is not None:
+            self.event_log.clear()  # 배패 중 꽃패는 기록하지 않음 (키프레임에 포함)
+
+        # 배패: 동가부터 4장씩 3바퀴, 1장씩 1바퀴, 동가 1장 추가
+        order = [(self.east_player + i) % 4 for i in range(4)]
+        deal_order = [seat for _ in range(3) for seat in order for _ in range(4)] + order + [self.east_player]
+        for seat in deal_order:
+            tile = self._draw_with_flowers(seat, self._draw_live())
+            if tile is not None:
+                self._add_tile(seat, tile)
+
+        self.current_turn = self.east_player
+        self.need_draw = False  # 동가는 14장으로 시작
+        if self.event_log is not None:
+            self.event_log.start_from_table(self)
+        self._advance()
+
+    # --- 패산 ---
+
+    def wall_remaining(self):
+        """남은 패산 장수"""
+        return self.wall_tail - self.wall_head
+
+    def _draw_live(self):
+        if self.wall_head >= self.wall_tail:
+            return None
+        tile = self.wall_tiles[self.wall_head]
+        self.wall_head += 1
+        return tile
+
+    def _draw_wang(self):
+        if self.wall_head >= self.wall_tail:
+            return None
+        self.wall_tail -= 1
+        return self.wall_tiles[self.wall_tail]
+
+    def _draw_with_flowers(self, seat, tile):
+        """꽃패면 꽃패 더미에 두고 왕패에서 보충"""
+        while tile is not None and is_flower_tile(tile):
+            self.flower_tiles[seat].append(tile)
+            self._emit(EVENT_FLOWER, seat, tile)
+            tile = self._draw_wang()
+        return tile
+
+    def _emit(self, kind, seat=None, tile=None, detail=None):
+        if self.event_log is not None:
+            self.event_log.emit(kind, seat, tile, detail)
+
+    # --- 손패 변경 (34종 개수 동시 갱신) ---
+
+    def _add_tile(self, seat, tile):
+        self.hands[seat].append(tile)
+        self.counts[seat][tile_to_kind(tile)] += 1
+
+    def _remove_tile(self, seat, tile):
+        self.hands[seat].remove(tile)
+        self.counts[seat][tile_to_kind(tile)] -= 1
+
+    def _remove_kind(self, seat, kind, count):
+        removed = []
+        for tile in list(self.hands[seat]):
+            if len(removed) >= count:
+                break
+            if tile_to_kind(tile) == kind:
+                self._remove_tile(seat, tile)
+                removed.append(tile)
+        return removed
+
+    # --- 진행 ---
+
+    def _advance(self):
+        """에이전트 결정이 필요하거나 판이 끝날 때까지 진행"""
+        while not self.hand_over and self.decision is None:
+            seat = self.current_turn
+            if self.need_draw:
+                tile = self._draw_with_flowers(seat, self._draw_live())
+                if tile is None:
+                    self._end_hand("draw", None)
+                    return
+                self._add_tile(seat, tile)
+                self._emit(EVENT_DRAW, seat, tile)
+                self.drawn_tile = tile
+                self.need_draw = False
+
+                # 쯔모 체크 (화료형일 때만 역 확인)
+                if (calculate_shanten(self.counts[seat], len(self.melds[seat])) < 0 and
+                        self.check_winning_hand_with_melds(seat, is_tsumo=True)):
+                    self._end_hand("tsumo", seat)
+                    return
+
+            self_actions = self.get_available_actions(seat, None, is_self_turn=True)
+            if seat in self.agent_seats:
+                self.decision = {'seat': seat, 'type': 'discard', 'tile': self.drawn_tile, 'actions': self_actions}
+                return
+
+            strategy = self.strategies[seat]
+            if self_actions:
+                action = strategy.choose_self_action(self.build_observation(seat), self_actions)
+                if action and action['type'] in ('an_gang', 'jia_gang'):
+                    self._execute_gang(seat, action['type'], action['tiles'][0])
+                    continue
+            self._discard(seat, strategy.choose_discard(self.build_observation(seat)))
+
+    def _discard(self, seat, tile):
+        """패 버리기 후 론/펑/깡 체크"""
+        self._remove_tile(seat, tile)
+        self.discard_piles[seat].append(tile)
+        self._emit(EVENT_DISCARD, seat, tile)
+        self.drawn_tile = None
+        self.last_discard_player = seat
+
+        # 펑/깡 후 버림패는 다른 플레이어 액션 체크 없이 다음 턴 (게임 규칙과 동일)
+        if self.after_call:
+            self.after_call = False
+            self._next_turn()
+            return
+
+        kind = tile_to_kind(tile)
+        reacting = []
+        for player_idx in range(4):
+            if player_idx == seat:
+                continue
+            counts = self.counts[player_idx]
+            counts[kind] += 1
+            shape_ok = calculate_shanten(counts, len(self.melds[player_idx])) < 0
+            counts[kind] -= 1
+            if shape_ok and self.can_ron_with_tile(player_idx, tile):
+                self._end_hand("ron", player_idx, ron_tile=tile)
+                return
+            if counts[kind] >= 2:
+                reacting.append(player_idx)
+
+        self._offer_calls(tile, sorted(reacting, key=lambda idx: (idx - seat) % 4))
+
+    def _offer_calls(self, tile, callers):
+        """버린 사람 다음 순서부터 펑/깡 묻기 - 에이전트 좌석이면 남은 좌석을 두고 결정에서 멈춤"""
+        for position, player_idx in enumerate(callers):
+            # get_available_actions의 펑/명깡 체크만 (론은 _discard에서 이미 확인)
+            actions = [{'type': call_type, 'tile': tile}
+                       for call_type, check in (('peng', self.can_peng), ('ming_gang', self.can_ming_gang))
+                       if check(player_idx, tile)]
+            if not actions:
+                continue
+            if player_idx in self.agent_seats:
+                self.pending_callers = callers[position + 1:]
+                self.decision = {'seat': player_idx, 'type': 'react', 'tile': tile, 'actions': actions}
+                return
+            action = self.strategies[player_idx].choose_reaction(self.build_observation(player_idx), actions)
+            if action:
+                self._execute_call(player_idx, action['type'], tile)
+                return
+
+        self._next_turn()
+
+    def _next_turn(self):
+        """다음 턴으로 (최대 턴 수/패산 소진 시 유국)"""
+        self.turn_counter += 1
+        if self.turn_counter > self.max_turns or self.wall_remaining() <= 0:
+            self._end_hand("draw", None)
+            return
+        self.current_turn = (self.current_turn + 1) % 4
+        self.need_draw = True
+        self._emit(EVENT_TURN, self.current_turn, detail=self.turn_counter)
+
+    def _execute_call(self, seat, call_type, tile):
+        """다른 플레이어 버림패로 펑/명깡"""
+        pile = self.discard_piles[self.last_discard_player]
+        if pile and pile[-1] == tile:
+            pile.pop()
+        if call_type == 'peng':
+            removed = self._remove_kind(seat, tile_to_kind(tile), 2)
+            meld = {'type': 'peng', 'tiles': [tile] * 3, 'from_player': self.last_discard_player}
+            self.melds[seat].append(meld)
+            self._emit(EVENT_PENG, seat, tile, meld_call(meld, removed, self.last_discard_player))
+            self.current_turn = seat
+            self.need_draw = False
+            self.after_call = True
+        else:
+            self._execute_gang(seat, 'ming_gang', tile)
+
+    def _execute_gang(self, seat, gang_type, tile):
+        """명깡/암깡/가깡 후 왕패에서 보충"""
+        kind = tile_to_kind(tile)
+        from_player = None
+        if gang_type == 'ming_gang':
+            removed = self._remove_kind(seat, kind, 3)
+            from_player = self.last_discard_player
+            meld = {'type': 'ming_gang', 'tile': tile, 'tiles': [tile] * 4, 'from_player': from_player}
+            self.melds[seat].append(meld)
+        elif gang_type == 'an_gang':
+            removed = self._remove_kind(seat, kind, 4)
+            meld = {'type': 'an_gang', 'tile': TILE_KINDS[kind], 'tiles': [TILE_KINDS[kind]] * 4, 'from_player': None}
+            self.melds[seat].append(meld)
+        else:
+            removed = self._remove_kind(seat, kind, 1)
+            for meld in self.melds[seat]:
+                if meld['type'] == 'peng' and tile_to_kind(meld['tiles'][0]) == kind:
+                    meld['type'] = 'jia_gang'
+                    meld['tile'] = meld['tiles'][0]
+                    meld['tiles'] = [meld['tile']] * 4
+                    break
+        self._emit(EVENT_GANG, seat, tile, meld_call(meld, removed, from_player))
+
+        self.current_turn = seat
+        self.need_draw = False
+        self.after_call = True
+        replacement = self._draw_with_flowers(seat, self._draw_wang())
+        if replacement is None:
+            self._end_hand("draw", None)
+            return
+        self._add_tile(seat, replacement)
+        self._emit(EVENT_DRAW, seat, replacement)
+        self.drawn_tile = replacement
+
+    def _end_hand(self, result_type, winner_idx, ron_tile=None):
+        """판 종료 - 점수 정산, 다음 동가 결정, 매치 진행"""
+        scores_before = list(self.player_scores)
+        yaku_list = []
+        if winner_idx is not None:
+            hand = self.hands[winner_idx] + ([ron_tile] if ron_tile else [])
+            virtual_hand = list(hand)
+            for meld_tile in self.get_meld_tiles(winner_idx):
+                virtual_hand.extend([TILE_KINDS[tile_to_kind(meld_tile)]] * 3)
+            is_menzen = len(self.melds[winner_idx]) == 0
+            flower_count = len(self.flower_tiles[winner_idx])
+            yaku_list = check_yaku(virtual_hand, result_type == "tsumo", is_menzen, "동", "동", flower_count)
+            points = self.calculate_win_points(result_type, yaku_list, flower_count, is_menzen)
+
+            if result_type == "tsumo":
+                for i in range(4):
+                    if i != winner_idx:
+                        self.player_scores[i] -= points
+                        self.player_scores[winner_idx] += points
+            elif self.last_discard_player is not None:
+                self.player_scores[self.last_discard_player] -= points
+                self.player_scores[winner_idx] += points
+
+        self.hand_result = {
+            'game_number': self.current_game,
+            'result_type': result_type,
+            'winner': winner_idx,
+            'loser': self.last_discard_player if result_type == "ron" else None,
+            'yaku_list': yaku_list,
+            'turns': self.turn_counter,
+            'scores_before': scores_before,
+            'scores_after': list(self.player_scores),
+        }
+        self.game_results.append(self.hand_result)
+        deltas = tuple(after - before for after, before in zip(self.player_scores, scores_before))
+        self._emit(EVENT_WIN if winner_idx is not None else EVENT_DRAW_GAME, winner_idx, ron_tile,
+                   HandResult(result_type, self.hand_result['loser'], deltas))
+        self.hand_over = True
+        self.decision = None
+
+        # 승자가 다음 판 동가, 유국이면 유지
+        if winner_idx is not None:
+            self.east_player = winner_idx
+        self.current_game += 1
+        self.match_done = self.current_game > self.total_games
+
+    # --- 에이전트 인터페이스 ---
+
+    def build_observation(self, seat):
+        """AI 전략용 관측 딕셔너리 (MahjongGame.build_ai_observation과 같은 형식)"""
+        return {
+            'seat': seat,
+            'hand': list(self.hands[seat]),
+            'drawn_tile': self.drawn_tile if seat == self.current_turn else None,
+            'meld_tiles': self.get_meld_tiles(seat),
+            'flower_count': len(self.flower_tiles[seat]),
+            'visible_counts': self.get_visible_tile_counts(),
+            'discard_piles': [list(pile) for pile in self.discard_piles],
+            'scores': list(self.player_scores),
+            'wall_remaining': self.wall_remaining(),
+        }
+
+    def action_mask(self):
+        """현재 결정의 합법 액션 마스크 (NUM_ACTIONS,)"""
+        mask = np.zeros(NUM_ACTIONS, dtype=bool)
+        if self.decision is None:
+            return mask
+        if self.decision['type'] == 'discard':
+            counts = self.counts[self.decision['seat']]
+            mask[:NUM_TILE_KINDS] = np.asarray(counts) > 0
+        else:
+            mask[ACTION_PASS] = True
+        for action in self.decision['actions']:
+            if action['type'] in ACTION_TYPE_IDS:
+                mask[ACTION_TYPE_IDS[action['type']]] = True
+        return mask
+
+    def write_observation(self, out):
+        """현재 결정 좌석 기준 관측을 (NUM_OBS_PLANES, 34) 배열에 기록"""
+        out[:] = 0
+        if self.decision is None:
+            return out
+        seat = self.decision['seat']
+        out[0] = self.counts[seat]
+        for rel in range(4):
+            other = (seat + rel) % 4
+            out[1 + rel] = hand_to_counts(self.discard_piles[other])
+            for meld in self.melds[other]:
+                out[5 + rel, tile_to_kind(meld['tiles'][0])] += len(meld['tiles'])
+        if self.decision['tile']:
+            out[9, tile_to_kind(self.decision['tile'])] = 1
+
+        scalars = out[10]
+        scalars[0] = self.decision['type'] == 'discard'
+        scalars[1] = self.decision['type'] == 'react'
+        scalars[2] = self.wall_remaining() / TOTAL_TILES
+        scalars[3] = self.current_game / self.total_games
+        scalars[4] = self.turn_counter / self.max_turns
+        for rel in range(4):
+            other = (seat + rel) % 4
+            scalars[5 + rel] = len(self.flower_tiles[other]) / 4.0
+            scalars[9 + rel] = self.player_scores[other] / 100.0
+            scalars[13 + rel] = other == self.east_player
+        return out
+
+    def apply_action(self, action_id):
+        """에이전트 액션 적용 후 다음 결정까지 진행"""
+        decision = self.decision
+        if decision is None:
+            raise ValueError("대기 중인 결정이 없습니다")
+        if not self.action_mask()[action_id]:
+            raise ValueError(f"불가능한 액션: {action_id} ({decision['type']})")
+
+        seat = decision['seat']
+        self.decision = None
+        if action_id < NUM_TILE_KINDS:
+            tile = next(tile for tile in self.hands[seat] if tile_to_kind(tile) == action_id)
+            self._discard(seat, tile)
+        elif action_id == ACTION_PASS:
+            callers, self.pending_callers = self.pending_callers, []
+            self._offer_calls(decision['tile'], callers)
+        elif action_id in (ACTION_PENG, ACTION_MING_GANG):
+            self._execute_call(seat, 'peng' if action_id == ACTION_PENG else 'ming_gang', decision['tile'])
+        else:
+            gang_type = 'an_gang' if action_id == ACTION_AN_GANG else 'jia_gang'
+            action = next(action for action in decision['actions'] if action['type'] == gang_type)
+            self._execute_gang(seat, gang_type, action['tiles'][0])
+        self._advance()
+
+
+class VectorMahjongEnv:
+    """K개 독립 테이블 벡터화 환경
+
+    reset() -> (obs, masks), step(actions) -> (obs, rewards, dones, masks, infos)
+    obs: (K, NUM_OBS_PLANES, 34) float32, masks: (K, NUM_ACTIONS) bool,
+    rewards: (K, 4) 이번 스텝 동안의 좌석별 점수 변화, dones: (K,) 판 종료 여부.
+    판이 끝나면 자동으로 다음 판(12판이 끝나면 새 매치)을 시작한다.
+    """
+
+    def __init__(self, num_tables=8, seed=None, agent_seats=(0,), opponent_strategy="heuristic",
+                 total_games=12, max_turns=200, record_events=False, verbose=False):
+        seeds = random.Random(seed)
+        self.tables = [HeadlessTable(seeds.getrandbits(32), agent_seats, opponent_strategy, total_games, max_turns,
+                                     record_events, verbose)
+                       for _ in range(num_tables)]
+        self.num_tables = num_tables
+        self.obs = np.zeros((num_tables, NUM_OBS_PLANES, NUM_TILE_KINDS), dtype=np.float32)
+        self.masks = np.zeros((num_tables, NUM_ACTIONS), dtype=bool)
+        self.seats = np.zeros(num_tables, dtype=np.int64)
+
+    def reset(self):
+        """모든 테이블 새 매치 시작"""
+        for table in self.tables:
+            table.reset_match()
+        rewards = np.zeros((self.num_tables, 4), dtype=np.float32)
+        for i, table in enumerate(self.tables):
+            self._start_until_decision(i, table, rewards, [])
+            self._write(i, table)
+        return self.obs.copy(), self.masks.copy()
+
+    def step(self, actions):
+        """테이블별 액션 1개씩 적용"""
+        rewards = np.zeros((self.num_tables, 4), dtype=np.float32)
+        dones = np.zeros(self.num_tables, dtype=bool)
+        infos = []
+        for i, (table, action_id) in enumerate(zip(self.tables, actions)):
+            before = list(table.player_scores)
+            table.apply_action(int(action_id))
+            results = []
+            if table.hand_over:
+                rewards[i] += np.subtract(table.player_scores, before)
+                results.append(table.hand_result)
+                dones[i] = True
+                self._start_until_decision(i, table, rewards, results)
+            infos.append({'seat': table.decision['seat'], 'results': results,
+                          'match_scores': list(table.player_scores)})
+            self._write(i, table)
+        return self.obs.copy(), rewards, dones, self.masks.copy(), infos
+
+    def _start_until_decision(self, i, table, rewards, results):
+        """판 시작 후 에이전트 결정이 나올 때까지 (결정 없이 끝난 판도 정산)"""
+        while True:
+            if table.match_done:
+                table.reset_match()
+            before = list(table.player_scores)
+            table.start_hand()
+            if not table.hand_over:
+                return
+            rewards[i] += np.subtract(table.player_scores, before)
+            results.append(table.hand_result)
+
+    def _write(self, i, table):
+        table.write_observation(self.obs[i])
+        self.masks[i] = table.action_mask()
+        self.seats[i] = table.decision['seat']
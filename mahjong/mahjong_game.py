@@ -6,6 +6,7 @@
 """
 
 import unicodedata
+from functools import lru_cache
 
 
 def get_tile_sort_key(tile):
@@ -138,6 +139,35 @@ def count_tile_groups(hand):
     return tile_count
 
 
+# 34종 패 인덱스 (만 0-8, 통 9-17, 삭 18-26, 자패 27-33)
+HONOR_TILES = ["동", "남", "서", "북", "중", "발", "백"]
+TILE_KINDS = ([f"{num}만" for num in range(1, 10)] +
+              [f"{num}통" for num in range(1, 10)] +
+              [f"{num}삭" for num in range(1, 10)] +
+              HONOR_TILES)
+TILE_KIND_INDEX = {name: idx for idx, name in enumerate(TILE_KINDS)}
+NUM_TILE_KINDS = len(TILE_KINDS)
+
+# 패산에 실제로 들어있는 종류별 장수 (2-9삭 없음, 1삭은 꽃패로만 사용)
+WALL_KIND_COPIES = tuple(0 if '삭' in name else 4 for name in TILE_KINDS)
+
+
+@lru_cache(maxsize=1024)
+def tile_to_kind(tile):
+    """패 이름을 34종 인덱스로 변환 (알 수 없는 패는 -1, 패 이름 수가 적어 캐시)"""
+    return TILE_KIND_INDEX.get(normalize_tile_name(tile), -1)
+
+
+def hand_to_counts(hand):
+    """손패를 34종 개수 벡터로 변환"""
+    counts = [0] * NUM_TILE_KINDS
+    for tile in hand:
+        kind = tile_to_kind(tile)
+        if kind >= 0:
+            counts[kind] += 1
+    return counts
+
+
 def check_basic_pattern(hand):
     """기본 마작 패턴 체크 (4 몸통 + 1 머리) - 순자 포함"""
     if len(hand) != 14:
@@ -7,49 +7,40 @@ import pygame
 import random
 import json
 import os
-import math
+import struct
 from mahjong_resources import ResourceManager, SCREEN_WIDTH, SCREEN_HEIGHT, COLORS, TABLE_CENTER_X, TABLE_CENTER_Y, TILE_SIZE, TILE_SIZE_DISCARD, TILE_SIZE_WALL, get_resource_path
-from mahjong_game import sort_hand, sort_hand_by_position, is_flower_tile, is_winning_hand
-from mahjong_ai import ai_choose_discard
+from mahjong_game import sort_hand, sort_hand_by_position, is_flower_tile, hand_to_counts, tile_to_kind
+from mahjong_ai import ai_choose_discard, evaluate_call
+from ai_strategies import build_seat_strategies, DEFAULT_SEAT_CONFIG
+try:
+    from ai_batch import evaluate_table_reactions
+except ImportError:
+    # numpy가 없으면 좌석별 개별 체크 사용
+    evaluate_table_reactions = None
 from discard_manager import DiscardManager
 from wall_manager import WallManager
+from render_batch import RenderBatch
+from frame_profiler import create_profiler
+from offscreen import create_frame_recorder
+from frame_pacing import FramePacer, IDLE_MAX_WAIT_MS
+from mahjong_animation import TileTween, TileSpriteCache, create_timeline, DISCARD_TWEEN_END_SIZE
+from game_snapshot import create_autosaver, SNAPSHOT_TURN, SNAPSHOT_BETWEEN_GAMES
+from game_archive import create_hand_recorder
+from table_state import TableHistory
+from game_fsm import GamePhase, PhaseMachine
+from game_events import (EventLog, HandResult, meld_call, EVENT_START, EVENT_DRAW, EVENT_FLOWER, EVENT_DISCARD,
+                         EVENT_TURN, EVENT_PENG, EVENT_GANG, EVENT_RIICHI, EVENT_WIN, EVENT_DRAW_GAME)
+from hand_layout import (HandLayout, hand_layout_key, get_action_button_layout, WINNING_DIALOG_HITS,
+                         PLAYER_AREA_Y, ACTION_BUTTON_WIDTH, ACTION_BUTTON_HEIGHT)
+from table_rules import TableRules, create_tiles
 import time
 
-def create_tiles():
-    """마작 타일 생성 - 실제 파일 존재 여부 확인"""
-    tiles = []
-    
-    # 수패: 만자, 통자 각각 1-9 * 4장
-    suits = ['만', '통']
-    for suit in suits:
-        for num in range(1, 10):
-            for copy in range(1, 5):
-                tiles.append(f"{num}{suit}_{copy}.png")
-    
-    # 1삭은 꽃패로 사용하므로 포함 (2-9삭 이미지는 없음)
-    for copy in range(1, 5):
-        tiles.append(f"1삭_{copy}.png")
-    
-    # 풍패: 동남서북 각 4장
-    winds = ['동', '남', '서', '북']
-    for wind in winds:
-        for copy in range(1, 5):
-            tiles.append(f"{wind}_{copy}.png")
-    
-    # 삼원패: 중발백 각 4장
-    dragons = ['중', '발', '백']
-    for dragon in dragons:
-        for copy in range(1, 5):
-            tiles.append(f"{dragon}_{copy}.png")
-    
-    return tiles
-
-class MahjongGame:
+class MahjongGame(TableRules):
     # 논리 방향 <-> 화면 위치 매핑 상수
     DIRECTIONS = ['E', 'S', 'W', 'N']
     SCREENS = ['bottom', 'right', 'top', 'left']
 
-    def __init__(self):
+    def __init__(self, seat_config=None):
         pygame.init()
         pygame.mixer.init()  # 소리 시스템 초기화
         self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
@@ -68,7 +59,41 @@ class MahjongGame:
         self.resources = ResourceManager()
         
         # 버림패 관리자 초기화
-        self.discard_manager = DiscardManager(self.screen, self.resources)
+        self.render_batch = RenderBatch(self.screen)
+        self.hand_layout_cache = None  # (키, HandLayout)
+        self.discard_manager = DiscardManager(self.screen, self.resources, self.render_batch)
+        
+        # 프레임 프로파일러 (F3: HUD, MAHJONG_PROFILE=경로: 종료 시 덤프)
+        self.profiler = create_profiler(self.render_batch)
+        self.profiler.instrument(self)
+        self.profiler.install_transform_counter()
+        
+        # 프레임 캡처 (MAHJONG_CAPTURE_DIR / MAHJONG_CAPTURE_PIPE 지정 시)
+        self.frame_recorder = create_frame_recorder()
+        
+        # 프레임 페이싱 (애니메이션 중에만 고정 FPS, 대기 중에는 이벤트 대기)
+        self.frame_pacer = FramePacer(self.clock)
+        self.needs_redraw = True
+        
+        # 애니메이션 타임라인 (가상 시간, MAHJONG_ANIMATION_SPEED로 배속) + 회전/스케일 스프라이트 캐시
+        self.timeline = create_timeline(pygame.time.get_ticks)
+        self.tile_sprites = TileSpriteCache(self.resources, TILE_SIZE)
+        
+        # 무르기용 턴 시작 상태 (불변 TableState라 참조만 보관)
+        self.table_history = TableHistory()
+        
+        # 게임 단계 상태 기계 (단계별 update/render/입력 핸들러 표)
+        self.fsm = self.build_phase_machine()
+        self.last_debug_time = 0  # 10초 주기 상태 출력
+        
+        # 상태 변경 이벤트 로그 (리듀서 상태 = 리플레이/동기화 기준, 이벤트마다 다시 그림)
+        self.event_log = EventLog()
+        self.event_log.subscribe(self.on_table_event)
+        self.event_log.subscribe(self.on_discard_event, (EVENT_DISCARD, EVENT_PENG, EVENT_GANG))
+        self.event_log.subscribe(self.on_hint_event, (EVENT_START, EVENT_DRAW, EVENT_FLOWER, EVENT_DISCARD,
+                                                      EVENT_PENG, EVENT_GANG, EVENT_RIICHI))
+        self.winning_hints = None  # 플레이어 화료 힌트 (플레이어 좌석 이벤트가 오면 무효화)
+        self.profiler.event_log = self.event_log
         
         # 12게임 시스템 변수 초기화
         self.total_games = 12
@@ -77,8 +102,20 @@ class MahjongGame:
         self.game_results = []  # 게임 결과 기록
         self.game_winner = None
         
-        # 첫 게임 시작
-        self.start_new_game()
+        # 좌석별 AI 전략 (0번 좌석은 사람, 전략 통계는 12게임 동안 유지)
+        self.seat_config = list(seat_config or DEFAULT_SEAT_CONFIG)
+        self.seat_strategies = build_seat_strategies(self.seat_config, self.event_log)
+        
+        # 자동 저장 (MAHJONG_AUTOSAVE=경로 지정 시 턴마다 저장, 시작 시 이어서 진행)
+        self.autosaver = create_autosaver()
+        snapshot = self.autosaver.load() if self.autosaver else None
+        
+        # 판 기록 아카이브 (MAHJONG_ARCHIVE=디렉터리 지정 시 모든 판을 청크 파일로)
+        self.hand_recorder = create_hand_recorder(self)
+        
+        # 첫 게임 시작 (저장된 대국이 있으면 복구)
+        if snapshot is None or not self.restore_snapshot(snapshot):
+            self.start_new_game()
     
     def play_click_sound(self):
         """클릭 소리 재생"""
@@ -89,29 +126,23 @@ class MahjongGame:
                 pass  # 소리 재생 실패 시 무시
     
     def get_winning_hints(self, player_idx):
-        """화료 가능한 패 힌트 반환 - 캐싱 적용"""
+        """화료 가능한 패 힌트 반환 - 다음 플레이어 좌석 이벤트까지 캐시 (on_hint_event)"""
         if player_idx != self.player_index:
             return []  # 플레이어만 힌트 제공
         
-        # 캐시 키 생성 (손패 + 멜드 + 꽃패)
-        hand = self.hands[player_idx]
-        melds = self.melds[player_idx]
-        flower_count = len(self.flower_tiles[player_idx])
-        
-        # 캐시 키 생성
-        cache_key = (tuple(sorted(hand)), len(melds), flower_count)
-        
         # 캐시된 결과가 있으면 반환
-        if hasattr(self, 'winning_hints_cache') and cache_key in self.winning_hints_cache:
-            return self.winning_hints_cache[cache_key]
+        if self.winning_hints is not None:
+            return self.winning_hints
+        
+        hand = self.hands[player_idx]
         
         # 실제 게임에서 사용 가능한 패들만 체크 (144장 대신 실제 가능한 패만)
         available_tiles = self.get_available_tiles_for_tenpai()
         
         winning_tiles = []
         
-        # 각 패를 추가해서 화료 가능한지 체크
-        for tile in available_tiles:
+        # 개수 벡터로 형태상 화료가 되는 패만 추려서 정식 체크 (역/멘젠 조건)
+        for tile in self.get_seat_state(player_idx).winning_candidates(available_tiles):
             # 이미 손패에 있는 패는 제외 (같은 패 5장은 불가능)
             if hand.count(tile) >= 4:
                 continue
@@ -125,9 +156,7 @@ class MahjongGame:
         result = self.organize_winning_hints(winning_tiles)
         
         # 캐시에 저장
-        if not hasattr(self, 'winning_hints_cache'):
-            self.winning_hints_cache = {}
-        self.winning_hints_cache[cache_key] = result
+        self.winning_hints = result
         
         return result
     
@@ -148,119 +177,6 @@ class MahjongGame:
         
         return organized_hints
     
-    def can_riichi(self, player_idx):
-        """엎어 가능 여부 체크 - 론이 가능한 상태에서만 엎어 가능"""
-        if player_idx != self.player_index:
-            return False  # 플레이어만 엎어 가능
-        
-        # 이미 엎어했으면 불가능
-        if self.player_riichi:
-            return False
-        
-        # 멜드가 있으면 엎어 불가능 (멘젠이 아니므로)
-        if len(self.melds[player_idx]) > 0:
-            return False
-        
-        # 론이 가능한 상태인지 체크 (다른 플레이어가 버린 패로 화료 가능)
-        return self.can_ron_for_riichi(player_idx)
-    
-    def can_ron_for_riichi(self, player_idx):
-        """엎어를 위한 론 가능 여부 체크 - 실제 게임에서 사용 가능한 패로 론이 가능한지"""
-        hand = self.hands[player_idx]
-        flower_count = len(self.flower_tiles[player_idx])
-        
-        # 실제 게임에서 사용 가능한 패들만 체크
-        available_tiles = self.get_available_tiles_for_tenpai()
-        
-        for tile in available_tiles:
-            # 임시로 패를 추가해서 론 가능한지 체크
-            temp_hand = hand + [tile]
-            
-            # 멘젠 상태에서 론 가능한지 체크
-            if self.check_winning_hand_with_melds_temp(player_idx, temp_hand, is_tsumo=False):
-                return True
-        
-        return False
-    
-    def is_tenpai(self, player_idx):
-        """간방 상태 체크 - 한 장만 들어오면 화료되는 상태"""
-        hand = self.hands[player_idx]
-        flower_count = len(self.flower_tiles[player_idx])
-        
-        # 현재 손패로 화료 가능한지 먼저 체크
-        if self.check_winning_hand_with_melds(player_idx, is_tsumo=True):
-            return True
-        
-        # 간방 상태 체크: 실제 게임에서 사용 가능한 패들만 체크
-        # (패산에 남아있는 패들 + 다른 플레이어가 버린 패들)
-        available_tiles = self.get_available_tiles_for_tenpai()
-        
-        for tile in available_tiles:
-            # 임시로 패를 추가해서 화료 가능한지 체크
-            temp_hand = hand + [tile]
-            
-            # 멜드를 포함한 화료 체크
-            if self.check_winning_hand_with_melds_temp(player_idx, temp_hand, is_tsumo=True):
-                return True
-        
-        return False
-    
-    def get_available_tiles_for_tenpai(self):
-        """간방 체크용 사용 가능한 패 목록 반환 - 버려진 패 제외"""
-        # 버려진 패들을 수집
-        discarded_tiles = []
-        for discard_pile in self.discard_piles:
-            discarded_tiles.extend(discard_pile)
-        
-        # 각 플레이어의 손패와 멜드에서 사용된 패들 수집
-        used_tiles = []
-        for i in range(4):
-            used_tiles.extend(self.hands[i])
-            for meld in self.melds[i]:
-                if 'tiles' in meld:
-                    used_tiles.extend(meld['tiles'])
-        
-        # 꽃패들도 제외
-        for flower_tiles in self.flower_tiles:
-            used_tiles.extend(flower_tiles)
-        
-        # 사용된 패들의 기본 이름 추출 (복사본 제거)
-        used_base_tiles = set()
-        for tile in used_tiles + discarded_tiles:
-            base_name = tile.split('_')[0] if '_' in tile else tile.replace('.png', '')
-            used_base_tiles.add(base_name)
-        
-        # 사용 가능한 패들 생성 (사용되지 않은 패들만)
-        available_tiles = []
-        all_base_tiles = []
-        
-        # 숫자패 (1-9만, 1-9삭, 1-9통)
-        for number in range(1, 10):
-            for suit in ['만', '삭', '통']:
-                base_name = f"{number}{suit}"
-                all_base_tiles.append(base_name)
-        
-        # 바람패 (동, 남, 서, 북)
-        for wind in ['동', '남', '서', '북']:
-            all_base_tiles.append(wind)
-        
-        # 삼원패 (중, 발, 백)
-        for dragon in ['중', '발', '백']:
-            all_base_tiles.append(dragon)
-        
-        # 각 기본 패 타입에 대해 남은 개수 계산
-        for base_name in all_base_tiles:
-            # 해당 패가 몇 개 사용되었는지 계산
-            used_count = sum(1 for used in used_base_tiles if used == base_name)
-            
-            # 4개 미만으로 사용되었다면 남은 개수만큼 추가
-            remaining = 4 - used_count
-            if remaining > 0:
-                for i in range(remaining):
-                    available_tiles.append(f"{base_name}_1.png")
-        
-        return available_tiles
-    
     def get_all_possible_tiles(self):
         """모든 가능한 패 목록 반환"""
         tiles = []
@@ -292,8 +208,7 @@ class MahjongGame:
         self.player_positions = [0, 1, 2, 3]  # 플레이어 위치 (동남서북)
         
         # 게임 상태
-        self.phase = 'dice'  # 'dice', 'deal_anim', 'playing', 'finished'
-        self.game_phase = "dice_rolling"
+        self.fsm.reset(GamePhase.DICE)
         self.current_turn = 0
         self.turn_counter = 0
         self.waiting_for_player = False
@@ -317,6 +232,10 @@ class MahjongGame:
         # 동가 관련
         self.east_player = None
         self.dice_results = []
+        self.dice_step = 'east'
+        self.wall_dice_results = None
+        self.waiting_for_user_input = False
+        self.next_turn_time = 0  # 배패 자동 시작 예약 시각 (0 = 없음)
         
         # 펑/깡 관련
         self.pending_action = None
@@ -327,24 +246,22 @@ class MahjongGame:
         self.after_peng = False  # 펑/깡 후 플래그 초기화
         
         # 애니메이션 관련
-        self.discard_animations = []
+        self.timeline.clear()
         self.waiting_for_animation = False
         self.animation_callback = None
+        self.table_history.clear()
+        self.event_log.clear()
         
         # 화료 다이얼로그 관련
-        self.winning_dialog_active = False
         self.winning_yaku_info = None
         self.winning_player_idx = None
         self.winning_result_type = None
+        self.ron_tile = None
         
         # 엎어 관련
         self.player_riichi = False  # 플레이어가 엎어했는지
         self.riichi_bonus = 1  # 엎어 보너스 점수
         
-        # 예약된 페이즈 전환
-        self.scheduled_phase = None
-        self.scheduled_time = None
-        
         # 화면 위치 매핑 업데이트
         self.update_screen_positions()
         
@@ -388,7 +305,7 @@ class MahjongGame:
         
         # 플레이어 이름 설정
         self.player_names = ["플레이어", "김민수", "박지영", "이준호"]
-        self.players = ["human", "ai", "ai", "ai"]
+        self.players = self.get_seat_types()
         
         # 화면 위치 매핑 (플레이어는 항상 하단)
         self.screen_to_player = {
@@ -425,16 +342,11 @@ class MahjongGame:
         print(f"[DEBUG] self.wall_tiles after shuffle -> {len(self.wall_tiles)}장")
         
         # 패산 관리자 초기화 (패산 생성 후)
-        self.wall_manager = WallManager(self.wall_tiles, self.screen)
+        self.wall_manager = WallManager(self.wall_tiles, self.screen, render_batch=self.render_batch)
         
-        # 4단계: 주사위 단계 또는 배패 시작
-        if self.current_game == 1:
-            # 첫 게임: 주사위 단계부터 시작
-            self.phase = 'dice'
-            # 주사위는 이미 start_dice_rolling()에서 던져짐
-        else:
+        # 4단계: 주사위 단계 (첫 게임은 start_dice_rolling()에서 이미 동가 주사위를 던짐)
+        if self.current_game > 1:
             # 2판부터는 패산 주사위만 던지고 시작
-            self.phase = 'dice'
             self.dice_step = 'wall_only'
             self.roll_dice_for_wall_position()
             self.waiting_for_user_input = True
@@ -543,7 +455,7 @@ class MahjongGame:
     
     def handle_dice_input(self):
         """주사위 단계에서 사용자 입력 처리"""
-        if not hasattr(self, 'waiting_for_user_input') or not self.waiting_for_user_input:
+        if not self.waiting_for_user_input:
             return
             
         self.waiting_for_user_input = False
@@ -556,7 +468,6 @@ class MahjongGame:
         elif self.dice_step == 'wall' or self.dice_step == 'wall_only':
             # 패산 주사위 후 배패 시작
             self.dice_step = 'complete'
-            self.phase = 'deal_anim'  # phase도 변경
             self.start_deal_animation()
     
     def schedule_next_phase(self, delay_ms):
@@ -565,15 +476,11 @@ class MahjongGame:
     
     def check_scheduled_phase(self):
         """예약된 단계 확인"""
-        if hasattr(self, 'next_turn_time') and self.next_turn_time > 0 and pygame.time.get_ticks() >= self.next_turn_time:
+        if self.next_turn_time > 0 and pygame.time.get_ticks() >= self.next_turn_time:
             self.next_turn_time = 0
-            
-            if self.phase == 'dice':
-                # 주사위 → 배패 애니메이션 시작
-                print(f"⏰ === 배패 애니메이션 자동 시작 ===")
-                self.phase = 'deal_anim'
-                self.game_phase = 'deal_anim'
-                self.start_deal_animation()
+            # 주사위 → 배패 애니메이션 시작 (주사위 단계의 update 핸들러)
+            print(f"⏰ === 배패 애니메이션 자동 시작 ===")
+            self.start_deal_animation()
     
     def start_deal_animation(self):
         """배패 애니메이션 시작"""
@@ -590,9 +497,10 @@ class MahjongGame:
         print(f"  - wang_position: {debug_info['wang_position']}")
         
         # 배패 애니메이션 상태 초기화
-        self.phase = 'deal_anim'
+        self.fsm.transition(GamePhase.DEAL_ANIM)
         self.deal_anim_index = 0
-        self.deal_anim_last_time = pygame.time.get_ticks()
+        self.timeline.sync()
+        self.deal_anim_last_time = self.timeline.now
         self.temp_hands = [[] for _ in range(4)]
         self.temp_flower_tiles = [[] for _ in range(4)]
         
@@ -673,14 +581,15 @@ class MahjongGame:
         player_name = self.player_names[player_idx]
         
         # 배패 중에는 디버그 메시지 줄이기
-        if self.game_phase != "dice_rolling":
+        verbose = self.fsm.state == GamePhase.PLAYING
+        if verbose:
             print(f"🎴 {player_name}에게 패 할당: {tile}")
         
         # 무한 루프 방지를 위한 추가 체크
         original_tile = tile
         
         while is_flower_tile(tile) and attempts < max_attempts:
-            if self.game_phase != "dice_rolling":
+            if verbose:
                 print(f"🌸 {player_name}이 꽃패 받음: {tile} (시도: {attempts + 1}/{max_attempts})")
             self.flower_tiles[player_idx].append(tile)
             attempts += 1
@@ -689,27 +598,27 @@ class MahjongGame:
             replacement_tile = self.draw_tile_from_wall()
             if replacement_tile:
                 tile = replacement_tile
-                if self.game_phase != "dice_rolling":
+                if verbose:
                     print(f"🎴 대체 패 뽑음: {tile}")
                 
                 # 같은 패가 반복되면 강제 중단
                 if tile == original_tile:
-                    if self.game_phase != "dice_rolling":
+                    if verbose:
                         print(f"⚠️ 같은 패 반복됨, 강제 중단: {tile}")
                     break
             else:
-                if self.game_phase != "dice_rolling":
+                if verbose:
                     print("⚠️ 패산이 비어서 꽃패 대체 중단")
                 break
         
         # 최종적으로 받은 패가 꽃패가 아니면 손패에 추가
         if not is_flower_tile(tile):
             self.hands[player_idx].append(tile)
-            if self.game_phase != "dice_rolling":
+            if verbose:
                 print(f"✅ {player_name} 손패에 추가: {tile}")
         else:
             # 최대 시도 횟수를 초과했지만 여전히 꽃패라면 강제로 손패에 추가
-            if self.game_phase != "dice_rolling":
+            if verbose:
                 print(f"⚠️ 꽃패 처리 중 최대 시도 횟수 초과 또는 반복: {tile}")
             self.hands[player_idx].append(tile)
     
@@ -765,6 +674,7 @@ class MahjongGame:
         # 다음 플레이어로 턴 변경
         old_turn = self.current_turn
         self.current_turn = (self.current_turn + 1) % 4
+        self.event_log.emit(EVENT_TURN, self.current_turn, detail=self.turn_counter)
         current_name = self.player_names[self.current_turn]
         
         print(f"🔄 턴 변경: {old_turn} → {self.current_turn}")
@@ -777,6 +687,13 @@ class MahjongGame:
 
     def start_turn(self):
         """현재 플레이어의 턴 시작"""
+        # 턴 경계 자동 저장 (크래시 후 이 턴부터 다시 시작)
+        self.autosave()
+        
+        # 플레이어 턴 시작 상태 기록 (무르기)
+        if self.current_turn == self.player_index:
+            self.table_history.push(self.get_table_state())
+        
         current_name = self.player_names[self.current_turn]
         print(f"\n⭐ === {current_name} 턴 시작 ===")
         
@@ -834,6 +751,7 @@ class MahjongGame:
         while is_flower_tile(drawn):
             print(f"🌸 꽃패 받음: {drawn}")
             self.flower_tiles[self.player_index].append(drawn)
+            self.event_log.emit(EVENT_FLOWER, self.player_index, drawn)
             drawn = self.draw_flower_replacement_tile()
             if drawn is None:
                 print("🚫 왕패가 비어서 유국!")
@@ -843,6 +761,7 @@ class MahjongGame:
         
         # 뜬 패를 손패에 바로 추가하지 않고 따로 보관
         self.drawn_tile = drawn
+        self.event_log.emit(EVENT_DRAW, self.player_index, drawn)
         self.player_waiting = True  # 플레이어가 뜬 패 처리 대기 중
         print(f"✅ 패 뽑음: {drawn}")
         
@@ -898,11 +817,14 @@ class MahjongGame:
             # 자기 턴 액션 체크 (암깡, 가깡)
             self_actions = self.get_available_actions(self.current_turn, None, is_self_turn=True)
             if self_actions:
-                # AI가 액션을 선택 (간단하게 첫 번째 액션 선택)
-                action = self_actions[0]
-                print(f"🤖 {ai_name}이 {action['type']} 실행")
+                # 좌석 전략이 액션 선택 (None이면 액션 없이 패 버리기)
+                action = self.choose_ai_self_action(self.current_turn, self_actions)
+                if action:
+                    print(f"🤖 {ai_name}이 {action['type']} 실행")
                 
-                if action['type'] == 'an_gang':
+                if action is None:
+                    self.ai_discard_and_continue()
+                elif action['type'] == 'an_gang':
                     # 암깡 실행 - tiles 배열에서 첫 번째 타일 사용
                     if 'tiles' in action and action['tiles']:
                         self.execute_gang(self.current_turn, action['type'], action['tiles'][0])
@@ -935,6 +857,7 @@ class MahjongGame:
             while is_flower_tile(drawn):
                 print(f"🌸 꽃패 받음: {drawn}")
                 self.flower_tiles[self.current_turn].append(drawn)
+                self.event_log.emit(EVENT_FLOWER, self.current_turn, drawn)
                 
                 # 왕패에서 보충
                 replacement = self.draw_flower_replacement_tile()
@@ -947,6 +870,7 @@ class MahjongGame:
                 print(f"🎴 꽃패 보충패 (왕패에서): {drawn}")
             
             self.hands[self.current_turn].append(drawn)
+            self.event_log.emit(EVENT_DRAW, self.current_turn, drawn)
             print(f"✅ {ai_name}이 {drawn} 뽑음")
             
             # 쯔모 체크
@@ -959,11 +883,14 @@ class MahjongGame:
             # 자기 턴 액션 체크 (암깡, 가깡)
             self_actions = self.get_available_actions(self.current_turn, None, is_self_turn=True)
             if self_actions:
-                # AI가 액션을 선택 (간단하게 첫 번째 액션 선택)
-                action = self_actions[0]
-                print(f"🤖 {ai_name}이 {action['type']} 실행")
+                # 좌석 전략이 액션 선택 (None이면 액션 없이 패 버리기)
+                action = self.choose_ai_self_action(self.current_turn, self_actions)
+                if action:
+                    print(f"🤖 {ai_name}이 {action['type']} 실행")
                 
-                if action['type'] == 'an_gang':
+                if action is None:
+                    self.ai_discard_and_continue()
+                elif action['type'] == 'an_gang':
                     # 암깡 실행 - tiles 배열에서 첫 번째 타일 사용
                     if 'tiles' in action and action['tiles']:
                         self.execute_gang(self.current_turn, action['type'], action['tiles'][0])
@@ -994,14 +921,15 @@ class MahjongGame:
             self.advance_turn()
             return
         
-        discarded = ai_choose_discard(hand, self.current_turn)
+        discarded = self.choose_ai_discard(self.current_turn)
         if discarded and discarded in hand:
             hand.remove(discarded)
             
-            # 패 버리기 애니메이션 추가 (버림패 더미에는 애니메이션 완료 후 추가)
+            # 패 버리기 애니메이션 추가 (버림패 더미는 이벤트로 바로 갱신, 날아가는 동안은 더미에서 숨김)
             ai_position = self.get_player_screen_position(self.current_turn)
             from_pos = self.get_ai_hand_position(self.current_turn)
             to_pos = self.get_discard_pile_next_position(self.current_turn)  # 정확한 다음 위치로
+            self.event_log.emit(EVENT_DISCARD, self.current_turn, discarded)
             self.add_discard_animation(discarded, from_pos, to_pos, self.current_turn)
             
             print(f"✅ {ai_name}가 {discarded} 버림 (펑 후)")
@@ -1026,14 +954,15 @@ class MahjongGame:
             self.advance_turn()
             return
         
-        discarded = ai_choose_discard(hand, self.current_turn)
+        discarded = self.choose_ai_discard(self.current_turn)
         if discarded and discarded in hand:
             hand.remove(discarded)
             
-            # 패 버리기 애니메이션 추가 (버림패 더미에는 애니메이션 완료 후 추가)
+            # 패 버리기 애니메이션 추가 (버림패 더미는 이벤트로 바로 갱신, 날아가는 동안은 더미에서 숨김)
             ai_position = self.get_player_screen_position(self.current_turn)
             from_pos = self.get_ai_hand_position(self.current_turn)
             to_pos = self.get_discard_pile_next_position(self.current_turn)  # 정확한 다음 위치로
+            self.event_log.emit(EVENT_DISCARD, self.current_turn, discarded)
             self.add_discard_animation(discarded, from_pos, to_pos, self.current_turn)
             
             print(f"✅ {ai_name}가 {discarded} 버림")
@@ -1051,18 +980,14 @@ class MahjongGame:
     
     def complete_ai_discard_after_peng(self, discarded_tile):
         """펑 후 AI 패 버리기 완료 처리 (애니메이션 후 호출) - 다른 플레이어 액션 체크 없이 다음 턴으로"""
-        # 버림패 더미에 추가
-        self.discard_piles[self.current_turn].append(discarded_tile)
-        print(f"🎬 애니메이션 완료: {discarded_tile}이 버림패 더미에 추가됨 (펑 후)")
+        print(f"🎬 애니메이션 완료: {discarded_tile}이 버림패 더미에 놓임 (펑 후)")
         
         # 펑 후에는 다른 플레이어 액션 체크 없이 바로 다음 턴으로 진행
         self.advance_turn()
 
     def complete_ai_discard(self, discarded_tile):
-        """AI 패 버리기 완료 처리 (애니메이션 후 호출)"""
-        # 버림패 더미에 추가
-        self.discard_piles[self.current_turn].append(discarded_tile)
-        print(f"🎬 애니메이션 완료: {discarded_tile}이 버림패 더미에 추가됨")
+        """AI 패 버리기 완료 처리 (애니메이션 후 호출) - 버림패 더미는 EVENT_DISCARD에서 이미 갱신됨"""
+        print(f"🎬 애니메이션 완료: {discarded_tile}이 버림패 더미에 놓임")
         
         # 액션 체크
         self.check_actions_after_discard(self.current_turn, discarded_tile)
@@ -1102,28 +1027,54 @@ class MahjongGame:
         self.render()
         pygame.display.flip()
     
-    def handle_click(self, pos):
-        """마우스 클릭 처리"""
-        # 화료 다이얼로그가 활성화된 경우
-        if self.winning_dialog_active:
+    def build_phase_machine(self):
+        """단계별 update/render/클릭/키 핸들러 표 구성"""
+        fsm = PhaseMachine()
+        fsm.on(GamePhase.DICE,
+               update=self.check_scheduled_phase,
+               render=self.render_dice_phase,
+               click=self.handle_dice_click,
+               keys={pygame.K_SPACE: self.handle_dice_input})
+        fsm.on(GamePhase.DEAL_ANIM,
+               update=self.update_deal_anim,
+               render=self.render_deal_anim_phase)
+        fsm.on(GamePhase.PLAYING,
+               render=self.render_game,
+               click=self.handle_click,
+               keys={pygame.K_SPACE: self.debug_force_ai_turn,
+                     pygame.K_r: self.debug_fix_game_state,
+                     pygame.K_d: self.debug_print_detailed_state})
+        fsm.on(GamePhase.WIN_DIALOG,
+               render=self.render_winning_dialog_phase,
+               click=self.handle_winning_dialog_click)
+        fsm.on(GamePhase.FINISHED,
+               render=self.render_finished_phase,
+               click=self.handle_finished_click,
+               keys={pygame.K_SPACE: self.continue_after_finish})
+        return fsm
+    
+    def handle_dice_click(self, pos):
+        """주사위 단계 클릭 - 위치와 무관하게 다음 단계 진행"""
+        self.handle_dice_input()
+    
+    def handle_winning_dialog_click(self, pos):
+        """화료 다이얼로그 단계 클릭 - 닫기 버튼만 처리"""
+        if WINNING_DIALOG_HITS.hit(pos) == 'close':
             self.close_winning_dialog()
-            return
-        
-        if self.game_phase == "finished":
-            if self.current_game <= self.total_games:
-                self.start_next_game()
-            else:
-                print("🏁 모든 게임이 완료되었습니다!")
-            return
-        
-        # 주사위 phase 처리
-        if self.phase == 'dice' or self.phase == 'wall_dice':
-            self.handle_dice_input()
-            return
-        
-        if self.game_phase != "playing":
-            return
-        
+    
+    def handle_finished_click(self, pos):
+        """판 종료 단계 클릭 - 다음 판 시작"""
+        self.continue_after_finish()
+    
+    def continue_after_finish(self):
+        """판 종료 후 다음 판 시작 (스페이스/클릭)"""
+        if self.current_game <= self.total_games:
+            self.start_next_game()
+        else:
+            print("🏁 모든 게임이 완료되었습니다!")
+    
+    def handle_click(self, pos):
+        """대국 진행 단계 마우스 클릭 처리"""
         # 애니메이션 대기 중일 때 클릭 무시
         if self.waiting_for_animation:
             print("🎬 애니메이션 진행 중, 클릭 무시")
@@ -1148,8 +1099,6 @@ class MahjongGame:
     
     def close_winning_dialog(self):
         """화료 다이얼로그 닫기"""
-        self.winning_dialog_active = False
-        
         # 실제 게임 종료 처리 진행
         self.complete_game_finish(self.winning_result_type, self.winning_player_idx)
         
@@ -1180,83 +1129,31 @@ class MahjongGame:
         else:
             expected_hand_size = 13 - (meld_count * 3)
         
-        # 손패에서 클릭된 패 찾기 - render_player_area와 완전히 동일한 로직 사용
+        # 손패에서 클릭된 패 찾기 - render_player_area와 같은 레이아웃 사용
         clicked_tile_pos = None
         discarded_tile = None
-        
-        # 렌더링과 완전히 동일한 위치 계산
         idx = self.player_index
-        start_x = TABLE_CENTER_X - 300  # render_player_area와 동일하게 수정
-        start_y = SCREEN_HEIGHT - 150
-        tile_spacing = 50
-        flower_spacing = 35
-        meld_spacing = 35
-        section_gap = 20
-        
-        current_x = start_x
-        
-        # 1. 꽃패 영역 건너뛰기
-        player_flower_tiles = self.flower_tiles[idx]
-        flower_count = len(player_flower_tiles)
-        if flower_count > 0:
-            current_x += flower_count * flower_spacing + section_gap
-        
-        # 2. 멜드 영역 건너뛰기
-        melds = self.melds[idx]
-        if melds:
-            for meld in melds:
-                meld_width = len(meld['tiles']) * meld_spacing
-                current_x += meld_width + 10  # 멜드 간 10px 간격
-            current_x += section_gap
-        
-        # 3. 손패 영역에서 클릭 체크 - 정렬된 손패와 원본 손패의 정확한 매핑
-        sorted_hand = sort_hand_by_position(self.hands[self.player_index], 'bottom')
-        
-        # 정렬된 손패의 각 패에 대해 원본 손패에서의 인덱스를 미리 계산
-        sorted_to_original_indices = []
-        original_hand_copy = self.hands[self.player_index][:]  # 원본 손패 복사본
+        layout = self.get_player_hand_layout()
         
         print(f"🔍 원본 손패: {self.hands[self.player_index]}")
-        print(f"🔍 정렬된 손패: {sorted_hand}")
-        
-        for sorted_tile in sorted_hand:
-            # 원본 손패에서 해당 패의 첫 번째 인덱스 찾기
-            for orig_idx, orig_tile in enumerate(original_hand_copy):
-                if orig_tile == sorted_tile:
-                    sorted_to_original_indices.append(orig_idx)
-                    original_hand_copy[orig_idx] = None  # 중복 방지를 위해 None으로 마킹
-                    break
-        
-        print(f"🔍 정렬->원본 인덱스 매핑: {sorted_to_original_indices}")
-        
-        # 클릭 체크
+        print(f"🔍 정렬된 손패: {layout.sorted_hand}")
         print(f"🔍 클릭 위치: {pos}")
-        for i, tile in enumerate(sorted_hand):
-            tile_x = current_x + i * tile_spacing
-            tile_rect = pygame.Rect(tile_x, start_y, TILE_SIZE[0], TILE_SIZE[1])
-            print(f"🔍 패 {i}: {tile}, 위치=({tile_x}, {start_y}), 영역={tile_rect}")
-            
-            if tile_rect.collidepoint(pos):
-                print(f"🎯 손패에서 클릭: 정렬된_인덱스={i}, 패={tile}")
-                # 정렬된 인덱스에 해당하는 원본 인덱스 사용
-                original_index = sorted_to_original_indices[i]
-                discarded_tile = self.hands[self.player_index].pop(original_index)
-                clicked_tile_pos = (tile_x + TILE_SIZE[0]//2, start_y + TILE_SIZE[1]//2)
-                print(f"🎯 원본 손패에서 제거: 원본_인덱스={original_index}, 패={discarded_tile}")
-                break
         
-        # 4. 뽑은 패 영역에서 클릭 체크
-        if not discarded_tile and self.drawn_tile and self.current_turn == idx:
-            drawn_x = current_x + len(sorted_hand) * tile_spacing + 15
-            drawn_rect = pygame.Rect(drawn_x, start_y, TILE_SIZE[0], TILE_SIZE[1])
-            print(f"🔍 뽑은 패: {self.drawn_tile}, 위치=({drawn_x}, {start_y}), 영역={drawn_rect}")
-            
-            if drawn_rect.collidepoint(pos):
-                print(f"🎯 뽑은 패 클릭: {self.drawn_tile}")
-                discarded_tile = self.drawn_tile
-                self.drawn_tile = None
-                self.player_waiting = False
-                clicked_tile_pos = (drawn_x + TILE_SIZE[0]//2, start_y + TILE_SIZE[1]//2)
+        hit = layout.hit_test(pos)
+        if hit and hit[0] == 'hand':
+            tile, tile_rect, original_index = layout.tiles[hit[1]]
+            print(f"🎯 손패에서 클릭: 정렬된_인덱스={hit[1]}, 패={tile}")
+            # 정렬된 인덱스에 해당하는 원본 인덱스 사용
+            discarded_tile = self.hands[self.player_index].pop(original_index)
+            clicked_tile_pos = tile_rect.center
+            print(f"🎯 원본 손패에서 제거: 원본_인덱스={original_index}, 패={discarded_tile}")
+        elif hit and hit[0] == 'drawn':
+            # 뽑은 패 영역 클릭
+            print(f"🎯 뽑은 패 클릭: {self.drawn_tile}")
+            discarded_tile = self.drawn_tile
+            self.drawn_tile = None
+            self.player_waiting = False
+            clicked_tile_pos = layout.drawn_rect.center
         
         # 손패를 버렸을 때는 뜬 패를 손패에 추가
         if discarded_tile and discarded_tile != self.drawn_tile and self.drawn_tile:
@@ -1275,9 +1172,10 @@ class MahjongGame:
             # 패를 실제로 버릴 때만 클릭 소리 재생
             self.play_click_sound()
             
-            # 패 버리기 애니메이션 추가 (버림패 더미에는 애니메이션 완료 후 추가)
+            # 패 버리기 애니메이션 추가 (버림패 더미는 이벤트로 바로 갱신, 날아가는 동안은 더미에서 숨김)
+            to_pos = self.get_discard_pile_next_position(self.player_index)  # 정확한 다음 위치로
+            self.event_log.emit(EVENT_DISCARD, self.player_index, discarded_tile)
             if clicked_tile_pos:
-                to_pos = self.get_discard_pile_next_position(self.player_index)  # 정확한 다음 위치로
                 self.add_discard_animation(discarded_tile, clicked_tile_pos, to_pos, self.player_index)
             
             # 애니메이션 완료 후 버림패 더미에 추가하고 액션 체크하도록 설정
@@ -1287,13 +1185,11 @@ class MahjongGame:
             print("❌ 클릭된 패 없음")
     
     def complete_player_discard(self, discarded_tile):
-        """플레이어 패 버리기 완료 처리 (애니메이션 후 호출)"""
-        # 버림패 더미에 추가
-        self.discard_piles[self.player_index].append(discarded_tile)
-        print(f"🎬 애니메이션 완료: {discarded_tile}이 버림패 더미에 추가됨")
+        """플레이어 패 버리기 완료 처리 (애니메이션 후 호출) - 버림패 더미는 EVENT_DISCARD에서 이미 갱신됨"""
+        print(f"🎬 애니메이션 완료: {discarded_tile}이 버림패 더미에 놓임")
         
         # 펑 후인지 확인
-        if hasattr(self, 'after_peng') and self.after_peng:
+        if self.after_peng:
             print("🎯 펑 후 패 버리기 - 다른 플레이어 액션 체크 없이 다음 턴으로")
             self.after_peng = False  # 플래그 초기화
             self.advance_turn()
@@ -1301,36 +1197,50 @@ class MahjongGame:
             # 일반적인 패 버리기 - 다른 플레이어 액션 체크
             self.check_actions_after_discard(self.player_index, discarded_tile)
 
+    def get_idle_timeout(self):
+        """입력 없이 기다려도 되는 시간 (ms) - 애니메이션 중이면 None (매 프레임 갱신)"""
+        if self.fsm.state == GamePhase.DEAL_ANIM or self.timeline.has_active() or self.waiting_for_animation:
+            return None
+        timeout = IDLE_MAX_WAIT_MS
+        if self.next_turn_time > 0:
+            timeout = min(timeout, self.next_turn_time - pygame.time.get_ticks())
+        if self.frame_recorder is not None:
+            timeout = min(timeout, self.frame_recorder.interval)
+        return max(0, timeout)
+    
     def render(self):
         """화면 렌더링"""
-        self.screen.fill(COLORS["bg"])
-        
-        if self.phase == 'dice' or self.phase == 'wall_dice':
-            self.render_dice_phase()
-        elif self.phase == 'deal_anim':
-            self.render_deal_anim_phase()
-        elif self.phase == 'playing':
-            self.render_game()
-        elif self.phase == 'finished':
-            self.render_game()
-            # 게임 종료 메시지와 점수 표시
-            self.render_game_finished_ui()
-        
+        self.draw_frame()
+        self.profiler.start('flip')
         pygame.display.flip()
+        self.profiler.stop('flip')
+    
+    def draw_frame(self):
+        """현재 상태를 self.screen에 그리기 (flip 없음 - 오프스크린 캡처에서도 사용)"""
+        self.screen.fill(COLORS["bg"])
+        self.fsm.render()
+        self.render_batch.end_frame()
+        self.profiler.draw_hud(self.screen)
+    
+    def render_winning_dialog_phase(self):
+        """화료 다이얼로그 단계 - 대국 화면 위에 역 다이얼로그"""
+        self.render_game()
+        self.render_winning_dialog()
+    
+    def render_finished_phase(self):
+        """판 종료 단계 - 대국 화면 위에 종료 메시지와 점수"""
+        self.render_game()
+        self.render_game_finished_ui()
     
     def render_dice_phase(self):
         """주사위 던지기 화면 렌더링"""
         # 배경 색칠
         self.screen.fill(COLORS["bg"])
         
-        # 현재 주사위 단계에 따른 제목 표시
-        if not hasattr(self, 'dice_step'):
-            self.dice_step = 'east'
-        
         # 상단 영역 (화면의 상단 50%) - 동가 결정
         upper_area_height = SCREEN_HEIGHT // 2
         
-        if self.dice_step == 'east' or (hasattr(self, 'dice_results') and self.dice_results and self.dice_step != 'wall_only'):
+        if self.dice_step == 'east' or (self.dice_results and self.dice_step != 'wall_only'):
             # 동가 결정 제목
             title_text = self.resources.render_text_with_emoji("[1단계] 동가 결정", "small", COLORS["highlight"])
             title_rect = title_text.get_rect(center=(SCREEN_WIDTH//2, 50))
@@ -1339,7 +1249,7 @@ class MahjongGame:
         # 하단 영역 (화면의 하단 50%) - 패산 위치 결정
         lower_area_start = upper_area_height
         
-        if self.dice_step in ['wall', 'wall_only'] or hasattr(self, 'wall_dice_results'):
+        if self.dice_step in ['wall', 'wall_only'] or self.wall_dice_results is not None:
             # 패산 위치 결정 제목
             if self.dice_step == 'wall_only':
                 wall_title_text = self.resources.render_text_with_emoji(f"[{self.current_game}판] 패산 시작 위치 결정", "medium", COLORS["highlight"])
@@ -1411,7 +1321,7 @@ class MahjongGame:
                 self.screen.blit(total_surface, (total_x, total_y))
             
             # 동가 결정 결과 메시지 (주사위 영역 아래로 이동)
-            if hasattr(self, 'east_player') and self.east_player is not None:
+            if self.east_player is not None:
                 result_text = f"[결과] {self.player_names[self.east_player]}이 동가가 되었습니다!"
                 text = self.resources.render_text_with_emoji(result_text, "small", COLORS["highlight"])
                 # 주사위 영역 아래로 충분히 내림 (4줄 * 50px + 여백 30px)
@@ -1419,7 +1329,7 @@ class MahjongGame:
                 self.screen.blit(text, text_rect)
         
         # 패산 주사위 결과 표시 (하단 영역)
-        if hasattr(self, 'wall_dice_results') and (self.dice_step == 'wall' or self.dice_step == 'wall_only' or self.dice_step == 'complete'):
+        if self.wall_dice_results is not None and (self.dice_step == 'wall' or self.dice_step == 'wall_only' or self.dice_step == 'complete'):
             dice1, dice2, total = self.wall_dice_results
             
             wall_text = f"패산 주사위: {dice1} + {dice2} = {total}"
@@ -1459,21 +1369,20 @@ class MahjongGame:
             self.draw_dice_dots(dice2_rect, dice2)
             
             # 패산 위치 결과 (주사위 아래로 충분히 내림)
-            if hasattr(self, 'wall_start_position'):
-                position_text = f"패산 시작: {self.wall_start_position}번 플레이어 앞"
-                text = self.resources.render_text_with_emoji(position_text, "small", COLORS["text"])
+            position_text = f"패산 시작: {self.wall_start_position}번 플레이어 앞"
+            text = self.resources.render_text_with_emoji(position_text, "small", COLORS["text"])
+            
+            if self.dice_step == 'wall_only':
+                # 주사위 2개 높이 + 간격 + 여백 (50 + 10 + 50 + 40)
+                text_rect = text.get_rect(center=(SCREEN_WIDTH//2, dice_y + dice_size * 2 + 50))
+            else:
+                # 하단 영역에서도 주사위 아래로 충분히 내림
+                text_rect = text.get_rect(center=(SCREEN_WIDTH//2, lower_area_start + 240))
                 
-                if self.dice_step == 'wall_only':
-                    # 주사위 2개 높이 + 간격 + 여백 (50 + 10 + 50 + 40)
-                    text_rect = text.get_rect(center=(SCREEN_WIDTH//2, dice_y + dice_size * 2 + 50))
-                else:
-                    # 하단 영역에서도 주사위 아래로 충분히 내림
-                    text_rect = text.get_rect(center=(SCREEN_WIDTH//2, lower_area_start + 240))
-                    
-                self.screen.blit(text, text_rect)
+            self.screen.blit(text, text_rect)
         
         # 사용자 입력 안내 메시지 (하단)
-        if hasattr(self, 'waiting_for_user_input') and self.waiting_for_user_input:
+        if self.waiting_for_user_input:
             if self.dice_step == 'east':
                 instruction_text = "스페이스바 또는 마우스 클릭으로 패산 주사위 던지기"
             elif self.dice_step == 'wall' or self.dice_step == 'wall_only':
@@ -1586,14 +1495,10 @@ class MahjongGame:
         # 액션 선택 UI 렌더링
         if self.pending_action == 'choice' and self.action_choices:
             self.render_action_choice_ui()
-        
-        # 화료 다이얼로그 렌더링
-        if self.winning_dialog_active:
-            self.render_winning_dialog()
     
     def render_wall(self, pos):
         # WallManager를 사용하여 패산 렌더링
-        if hasattr(self, 'wall_manager') and self.wall_manager:
+        if self.wall_manager:
             # 플레이어 방향 정보 생성
             directions = ['동', '남', '서', '북']  # 시계방향 순서
             screen_positions = ['bottom', 'right', 'top', 'left']  # 시계방향 화면 순서
@@ -1628,123 +1533,58 @@ class MahjongGame:
         return wall_colors[color_index]
     
     def get_wall_tile_position(self, tile_index):
-        """패산에서 특정 타일의 화면 위치 반환 (나중에 패 뽑기용)"""
-        # 타일 인덱스를 기반으로 어느 면의 몇 번째 스택, 몇 층인지 계산
-        tiles_per_stack = 2
-        stacks_per_side = 13
-        tiles_per_side = stacks_per_side * tiles_per_stack
-        
-        side_index = tile_index // tiles_per_side
-        side_tile_index = tile_index % tiles_per_side
-        stack_index = side_tile_index // tiles_per_stack
-        layer = side_tile_index % tiles_per_stack
-        
-        # 동남서북 → 화면 위치 매핑
-        direction_to_screen = {
-            0: "bottom",  # 동가
-            1: "left",   # 남가  
-            2: "top",     # 서가
-            3: "right"     # 북가
-        }
-        
-        screen_pos = direction_to_screen[side_index]
-        
-        # 해당 위치의 좌표 계산 (render_wall과 동일한 로직)
-        wall_tile_size = TILE_SIZE_DISCARD
-        
-        if screen_pos == "bottom":
-            start_x = TABLE_CENTER_X - (stacks_per_side * (wall_tile_size[0] + 1)) // 2
-            start_y = SCREEN_HEIGHT - 220  # 플레이어 패와 버림패 사이
-            tile_x = start_x + stack_index * (wall_tile_size[0] + 1) - layer * 2
-            tile_y = start_y - layer * 4
-            
-        elif screen_pos == "right":
-            start_x = SCREEN_WIDTH - 280 - wall_tile_size[1]  # 좌측과 대칭으로 조정
-            start_y = TABLE_CENTER_Y - (stacks_per_side * (wall_tile_size[0] + 1)) // 2
-            tile_x = start_x - layer * 2
-            tile_y = start_y + stack_index * (wall_tile_size[0] + 1) - layer * 4
-            
-        elif screen_pos == "top":
-            start_x = TABLE_CENTER_X - (stacks_per_side * (wall_tile_size[0] + 1)) // 2
-            start_y = 120  # AI 패와 버림패 사이
-            tile_x = start_x + stack_index * (wall_tile_size[0] + 1) - layer * 2
-            tile_y = start_y - layer * 4
-            
-        elif screen_pos == "left":
-            start_x = 280  # 기준 위치 유지
-            start_y = TABLE_CENTER_Y - (stacks_per_side * (wall_tile_size[0] + 1)) // 2
-            tile_x = start_x - layer * 2
-            tile_y = start_y + stack_index * (wall_tile_size[0] + 1) - layer * 4
-        
-        return tile_x, tile_y, screen_pos
+        """패산에서 특정 타일의 화면 위치 반환 (나중에 패 뽑기용) - 렌더러와 같은 좌표 테이블 사용"""
+        return self.wall_manager.get_tile_screen_position(tile_index)
     
     def render_discard_pile(self, pos):
-        """버림패 렌더링 - DiscardManager 사용"""
-        self.discard_manager.render_discard_pile(pos, self.discard_piles, self.screen_to_player)
+        """버림패 렌더링 - DiscardManager 사용 (날아가는 중인 패는 도착 후 그림)"""
+        player_idx = self.screen_to_player.get(pos)
+        in_flight = self.discards_in_flight(player_idx) if player_idx is not None else 0
+        self.discard_manager.render_discard_pile(pos, self.discard_piles, self.screen_to_player, in_flight)
+    
+    def get_player_hand_layout(self):
+        """플레이어 손패 레이아웃 - 손패/꽃패/멜드/뽑은 패가 바뀔 때만 다시 계산"""
+        idx = self.player_index
+        drawn_tile = self.drawn_tile if self.drawn_tile and self.current_turn == idx else None
+        key = hand_layout_key(self.hands[idx], self.flower_tiles[idx], self.melds[idx], drawn_tile)
+        if self.hand_layout_cache is None or self.hand_layout_cache[0] != key:
+            layout = HandLayout(self.hands[idx], self.flower_tiles[idx], self.melds[idx], drawn_tile)
+            self.hand_layout_cache = (key, layout)
+        return self.hand_layout_cache[1]
     
     def render_player_area(self):
         idx = self.player_index
-        start_x = TABLE_CENTER_X - 300  # 좌우 대칭을 위해 중앙에 더 가깝게 조정
-        start_y = SCREEN_HEIGHT - 150
-        tile_spacing = 50
-        flower_spacing = 35  # 꽃패 간격
-        meld_spacing = 35    # 멜드 내 패 간격
-        section_gap = 20     # 섹션 간 간격
-        
-        current_x = start_x
+        batch = self.render_batch
+        start_y = PLAYER_AREA_Y
+        layout = self.get_player_hand_layout()
         
         # 1. 꽃패 렌더링 (가장 왼쪽)
-        player_flower_tiles = self.flower_tiles[idx]
-        flower_count = len(player_flower_tiles)
-        if flower_count > 0:
-            for i in range(flower_count):
-                flower_surface = self.resources.get_tile_surface(player_flower_tiles[i], TILE_SIZE)
-                self.screen.blit(flower_surface, (current_x, start_y))
-                current_x += flower_spacing
-            
-            # 꽃패와 멜드 사이 간격
-            current_x += section_gap
+        flower_count = len(self.flower_tiles[idx])
+        for tile, tile_pos in layout.flowers:
+            batch.add('player', self.resources.get_tile_surface(tile, TILE_SIZE), tile_pos)
         
         # 2. 멜드 렌더링 (꽃패 다음)
-        melds = self.melds[idx]
-        if melds:
-            for i, meld in enumerate(melds):
-                # 각 멜드의 패들을 가로로 배치
-                for j, tile in enumerate(meld['tiles']):
-                    # 암깡의 경우 첫째(0)와 네째(3) 패만 보여주고, 둘째(1)와 세째(2)는 뒷면
-                    if meld['type'] == 'an_gang' and j in [1, 2]:
-                        # 뒷면 렌더링
-                        back_surface = self.create_ai_back_surface(TILE_SIZE)
-                        self.screen.blit(back_surface, (current_x + j * meld_spacing, start_y))
-                    else:
-                        # 일반 패 렌더링
-                        tile_surface = self.resources.get_tile_surface(tile, TILE_SIZE)
-                        self.screen.blit(tile_surface, (current_x + j * meld_spacing, start_y))
-                
-                # 멜드 타입 표시 (패 위쪽)
-                meld_type_text = {'peng': '펑', 'ming_gang': '명깡', 'an_gang': '암깡', 'jia_gang': '가깡'}.get(meld['type'], meld['type'])
-                type_surface = self.resources.render_text_with_emoji(meld_type_text, "small", COLORS["highlight"])
-                self.screen.blit(type_surface, (current_x, start_y - 20))
-                
-                # 다음 멜드 위치 계산
-                meld_width = len(meld['tiles']) * meld_spacing
-                current_x += meld_width + 10  # 멜드 간 10px 간격
+        for meld in layout.melds:
+            for tile, tile_pos in meld['tiles']:
+                if tile is None:
+                    # 암깡 둘째/셋째 패는 뒷면
+                    batch.add('player', self.create_ai_back_surface(TILE_SIZE), tile_pos)
+                else:
+                    batch.add('player', self.resources.get_tile_surface(tile, TILE_SIZE), tile_pos)
             
-            # 멜드와 손패 사이 간격
-            current_x += section_gap
+            # 멜드 타입 표시 (패 위쪽)
+            meld_type_text = {'peng': '펑', 'ming_gang': '명깡', 'an_gang': '암깡', 'jia_gang': '가깡'}.get(meld['type'], meld['type'])
+            type_surface = self.resources.render_text_with_emoji(meld_type_text, "small", COLORS["highlight"])
+            batch.add('player', type_surface, meld['label_pos'])
         
         # 3. 손패 렌더링 (정렬된 순서로)
-        sorted_hand = sort_hand_by_position(self.hands[idx], 'bottom')
-        for tile in sorted_hand:
-            tile_surface = self.resources.get_tile_surface(tile, TILE_SIZE)
-            self.screen.blit(tile_surface, (current_x, start_y))
-            current_x += tile_spacing
+        for tile, tile_rect, _ in layout.tiles:
+            batch.add('player', self.resources.get_tile_surface(tile, TILE_SIZE), tile_rect.topleft)
             
         # 4. 뽑은 패 렌더링 (15픽셀 간격)
-        if self.drawn_tile and self.current_turn == idx:
-            drawn_x = current_x + 15
-            drawn_surface = self.resources.get_tile_surface(self.drawn_tile, TILE_SIZE)
-            self.screen.blit(drawn_surface, (drawn_x, start_y))
+        if layout.drawn_rect:
+            drawn_surface = self.resources.get_tile_surface(layout.drawn_tile, TILE_SIZE)
+            batch.add('player', drawn_surface, layout.drawn_rect.topleft)
         
         # 정보 텍스트
         total_tiles = len(self.hands[idx]) + (1 if self.drawn_tile and self.current_turn == idx else 0)
@@ -1762,11 +1602,12 @@ class MahjongGame:
         info_surface = self.resources.render_text_with_emoji(info_text, "small", COLORS["text"])
         info_x = TABLE_CENTER_X - info_surface.get_width() // 2
         info_y = start_y + TILE_SIZE[1] + 5
-        self.screen.blit(info_surface, (info_x, info_y))
+        batch.add('player', info_surface, (info_x, info_y))
+        batch.flush('player')
         
         # 화료 힌트 표시 (플레이어 턴이고 게임 진행 중일 때만)
         if (self.current_turn == self.player_index and 
-            self.game_phase == "playing" and 
+            self.fsm.state == GamePhase.PLAYING and 
             self.waiting_for_player):
             
             winning_hints = self.get_winning_hints(self.player_index)
@@ -1793,14 +1634,14 @@ class MahjongGame:
                 hint_bg_surface = pygame.Surface((actual_width, actual_height))
                 hint_bg_surface.set_alpha(180)
                 hint_bg_surface.fill((40, 40, 40))
-                self.screen.blit(hint_bg_surface, (hint_area_x, hint_area_y))
+                batch.add('hint', hint_bg_surface, (hint_area_x, hint_area_y))
                 
                 # 화료 힌트 텍스트
                 hint_text = f"화료 가능: {hint_count}개 패"
                 hint_surface = self.resources.render_text_with_emoji(hint_text, "small", COLORS["highlight"])
                 hint_x = hint_area_x + 10
                 hint_y = hint_area_y + 10
-                self.screen.blit(hint_surface, (hint_x, hint_y))
+                batch.add('hint', hint_surface, (hint_x, hint_y))
                 
                 # 화료 가능한 패들을 실제 마작패 이미지로 표시
                 if hint_count <= 12:  # 최대 12개까지 표시
@@ -1811,7 +1652,8 @@ class MahjongGame:
                         # AI 패 크기로 마작패 이미지 렌더링
                         tile_surface = self.resources.get_tile_surface(hint_tile, tile_size)
                         tile_x = hint_tiles_x + i * tile_spacing
-                        self.screen.blit(tile_surface, (tile_x, hint_tiles_y))
+                        batch.add('hint', tile_surface, (tile_x, hint_tiles_y))
+        batch.flush('hint')
 
     def render_ai_area(self, pos):
         idx = self.screen_to_player[pos]
@@ -1825,8 +1667,9 @@ class MahjongGame:
             x, y, horizontal, rotation = 210, TABLE_CENTER_Y - 150 - (tile_width * 2) - 40, False, -90
         else:
             return
+        batch = self.render_batch
         hand = self.hands[idx]
-        game_finished = (self.game_phase == "finished")
+        game_finished = (self.fsm.state == GamePhase.FINISHED)
         spacing = tile_width + 1  # AI 패 간격을 1픽셀로 설정
         flower_spacing = 25   # 꽃패 간격
         meld_spacing = 25     # 멜드 내 패 간격
@@ -1845,7 +1688,7 @@ class MahjongGame:
                 for i, flower_tile in enumerate(flower_tiles):
                     flower_surface = self.resources.get_tile_surface(flower_tile, TILE_SIZE_DISCARD)
                     flower_surface = pygame.transform.rotate(flower_surface, 180)
-                    self.screen.blit(flower_surface, (x + current_pos + i * flower_spacing, y))
+                    batch.add('ai', flower_surface, (x + current_pos + i * flower_spacing, y))
                 current_pos += flower_count * flower_spacing + section_gap
                 
             elif pos == 'right':
@@ -1853,7 +1696,7 @@ class MahjongGame:
                 for i, flower_tile in enumerate(flower_tiles):
                     flower_surface = self.resources.get_tile_surface(flower_tile, TILE_SIZE_DISCARD)
                     flower_surface = pygame.transform.rotate(flower_surface, 90)
-                    self.screen.blit(flower_surface, (x, y + current_pos + i * flower_spacing))
+                    batch.add('ai', flower_surface, (x, y + current_pos + i * flower_spacing))
                 current_pos += flower_count * flower_spacing + section_gap
                 
             elif pos == 'left':
@@ -1861,7 +1704,7 @@ class MahjongGame:
                 for i, flower_tile in enumerate(flower_tiles):
                     flower_surface = self.resources.get_tile_surface(flower_tile, TILE_SIZE_DISCARD)
                     flower_surface = pygame.transform.rotate(flower_surface, -90)
-                    self.screen.blit(flower_surface, (x, y + current_pos + i * flower_spacing))
+                    batch.add('ai', flower_surface, (x, y + current_pos + i * flower_spacing))
                 current_pos += flower_count * flower_spacing + section_gap
         
         # 2. 멜드 렌더링
@@ -1878,12 +1721,12 @@ class MahjongGame:
                             # 뒷면 렌더링
                             back_surface = self.create_ai_back_surface(TILE_SIZE_DISCARD)
                             back_surface = pygame.transform.rotate(back_surface, 180)
-                            self.screen.blit(back_surface, (x + current_pos + j * meld_spacing, y))
+                            batch.add('ai', back_surface, (x + current_pos + j * meld_spacing, y))
                         else:
                             # 일반 패 렌더링
                             tile_surface = self.resources.get_tile_surface(tile, TILE_SIZE_DISCARD)
                             tile_surface = pygame.transform.rotate(tile_surface, 180)
-                            self.screen.blit(tile_surface, (x + current_pos + j * meld_spacing, y))
+                            batch.add('ai', tile_surface, (x + current_pos + j * meld_spacing, y))
                     current_pos += meld_size * meld_spacing + 10  # 멜드 간 간격
                     
                 elif pos == 'right':
@@ -1894,12 +1737,12 @@ class MahjongGame:
                             # 뒷면 렌더링
                             back_surface = self.create_ai_back_surface(TILE_SIZE_DISCARD)
                             back_surface = pygame.transform.rotate(back_surface, 90)
-                            self.screen.blit(back_surface, (x, y + current_pos + j * meld_spacing))
+                            batch.add('ai', back_surface, (x, y + current_pos + j * meld_spacing))
                         else:
                             # 일반 패 렌더링
                             tile_surface = self.resources.get_tile_surface(tile, TILE_SIZE_DISCARD)
                             tile_surface = pygame.transform.rotate(tile_surface, 90)
-                            self.screen.blit(tile_surface, (x, y + current_pos + j * meld_spacing))
+                            batch.add('ai', tile_surface, (x, y + current_pos + j * meld_spacing))
                     current_pos += meld_size * meld_spacing + 10  # 멜드 간 간격
                     
                 elif pos == 'left':
@@ -1910,12 +1753,12 @@ class MahjongGame:
                             # 뒷면 렌더링
                             back_surface = self.create_ai_back_surface(TILE_SIZE_DISCARD)
                             back_surface = pygame.transform.rotate(back_surface, -90)
-                            self.screen.blit(back_surface, (x, y + current_pos + j * meld_spacing))
+                            batch.add('ai', back_surface, (x, y + current_pos + j * meld_spacing))
                         else:
                             # 일반 패 렌더링
                             tile_surface = self.resources.get_tile_surface(tile, TILE_SIZE_DISCARD)
                             tile_surface = pygame.transform.rotate(tile_surface, -90)
-                            self.screen.blit(tile_surface, (x, y + current_pos + j * meld_spacing))
+                            batch.add('ai', tile_surface, (x, y + current_pos + j * meld_spacing))
                     current_pos += meld_size * meld_spacing + 10  # 멜드 간 간격
             
             # 멜드와 손패 사이 간격 추가
@@ -1944,12 +1787,12 @@ class MahjongGame:
                 tile_surface = self.resources.get_tile_surface(tile, TILE_SIZE_DISCARD)
                 if rotation != 0:
                     tile_surface = pygame.transform.rotate(tile_surface, rotation)
-                self.screen.blit(tile_surface, (tile_x, tile_y))
+                batch.add('ai', tile_surface, (tile_x, tile_y))
             else:
                 back_surface = self.create_ai_back_surface(TILE_SIZE_DISCARD)
                 if rotation != 0:
                     back_surface = pygame.transform.rotate(back_surface, rotation)
-                self.screen.blit(back_surface, (tile_x, tile_y))
+                batch.add('ai', back_surface, (tile_x, tile_y))
         # 플레이어 정보 텍스트 (상단은 한 줄, 좌우는 두 줄)
         flower_count = len(self.flower_tiles[idx])
         meld_count = len(self.melds[idx])
@@ -1968,7 +1811,7 @@ class MahjongGame:
             info_surface = self.resources.render_text_with_emoji(info_text, "small", COLORS["text"])
             info_x = x
             info_y = y - 25
-            self.screen.blit(info_surface, (info_x, info_y))
+            batch.add('ai', info_surface, (info_x, info_y))
         else:
             # 좌우 플레이어는 두 줄로 표시
             line1 = f"{name}({player_type})"
@@ -1990,7 +1833,8 @@ class MahjongGame:
                 info_y = y
             
             for j, surface in enumerate(info_surfaces):
-                self.screen.blit(surface, (info_x, info_y + j * 18))
+                batch.add('ai', surface, (info_x, info_y + j * 18))
+        batch.flush('ai')
     
     def create_ai_back_surface(self, size):
         """AI 플레이어용 패 뒷면 생성"""
@@ -2076,41 +1920,36 @@ class MahjongGame:
 
     def update(self):
         """게임 상태 업데이트"""
-        # 배패 애니메이션 업데이트
-        if self.phase == 'deal_anim':
-            self.update_deal_anim()
+        # 애니메이션 타임라인 진행 (끝난 트윈 제거)
+        self.timeline.sync()
+        
+        # 단계별 업데이트 (주사위: 예약된 배패 시작, 배패: 배패 애니메이션)
+        self.fsm.update()
         
         # 패 버리기 애니메이션 업데이트
         self.update_discard_animations()
         
-        # 예약된 페이즈 체크
-        self.check_scheduled_phase()
-        
         # 게임 상태 모니터링
         current_time = pygame.time.get_ticks()
-        if not hasattr(self, 'last_debug_time'):
-            self.last_debug_time = 0
-        
         if current_time - self.last_debug_time > 10000:  # 10초마다
             print(f"🔄 === 게임 상태 (10초마다) ===")
-            print(f"게임단계: {self.game_phase}")
-            if hasattr(self, 'player_names') and len(self.player_names) > self.current_turn:
+            print(f"게임단계: {self.fsm.name}")
+            if len(self.player_names) > self.current_turn:
                 print(f"현재턴: {self.current_turn} ({self.player_names[self.current_turn]})")
             print(f"플레이어 대기중: {self.waiting_for_player}")
             print(f"뽑은패: {self.drawn_tile}")
             print(f"총 턴 수: {self.turn_counter}")
             print(f"패산: {self.wall_manager.get_remaining_tiles_count()}장 남음")
-            if hasattr(self, 'hands') and hasattr(self, 'player_names'):
-                for i in range(min(4, len(self.hands), len(self.player_names))):
-                    print(f"  {self.player_names[i]}: 손패 {len(self.hands[i])}장, 버림패 {len(self.discard_piles[i])}장")
+            for i in range(min(4, len(self.hands), len(self.player_names))):
+                print(f"  {self.player_names[i]}: 손패 {len(self.hands[i])}장, 버림패 {len(self.discard_piles[i])}장")
             print(f"=== 게임 상태 끝 ===\n")
             self.last_debug_time = current_time
     
     def update_deal_anim(self):
-        now = pygame.time.get_ticks()
+        now = self.timeline.now  # 타임라인 가상 시간 (배속/빨리 감기 적용)
         if now - self.deal_anim_last_time < 120:
             return
-        print(f"[DEBUG] deal_anim_index={self.deal_anim_index}, temp_deal_order_len={len(self.temp_deal_order)}, wall_tiles_len={len(self.wall_tiles)}, dealt_tiles_len={len(self.wall_manager.dealt_tiles)}")
+        print(f"[DEBUG] deal_anim_index={self.deal_anim_index}, temp_deal_order_len={len(self.temp_deal_order)}, wall_tiles_len={len(self.wall_tiles)}, dealt_tiles_len={self.wall_manager.dealt_count}")
         if self.deal_anim_index >= len(self.temp_deal_order):
             print('[DEBUG] 패 배분 완료:', [len(h) for h in self.temp_hands], '패산:', self.wall_manager.get_remaining_tiles_count())
             
@@ -2131,9 +1970,9 @@ class MahjongGame:
                 flower_count = len(self.flower_tiles[i])
                 print(f"{name}: {len(hand)}장 + 꽃패 {flower_count}장")
             
-            # 게임 시작
-            self.phase = 'playing'
-            self.game_phase = 'playing'
+            # 게임 시작 (이벤트 로그 키프레임)
+            self.fsm.transition(GamePhase.PLAYING)
+            self.event_log.start_from_table(self)
             self.begin_first_turn()
             return
 
@@ -2354,145 +2193,91 @@ class MahjongGame:
     def run(self):
         """게임 실행"""
         running = True
+        profiler = self.profiler
+        pacer = self.frame_pacer
+        fsm = self.fsm
         while running:
-            for event in pygame.event.get():
+            profiler.begin_frame()
+            
+            # 애니메이션이 없으면 다음 이벤트/예약 시각까지 대기
+            idle_timeout = self.get_idle_timeout()
+            profiler.start('wait')
+            events = pacer.poll(idle_timeout)
+            profiler.stop('wait')
+            
+            redraw = idle_timeout is None or self.needs_redraw
+            profiler.start('events')
+            for event in events:
+                if event.type != pygame.MOUSEMOTION:
+                    redraw = True  # 마우스 이동 외 입력은 화면을 바꿀 수 있음 (호버 UI 없음)
                 if event.type == pygame.QUIT:
                     running = False
                 elif event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_ESCAPE:
                         running = False
-                    elif event.key == pygame.K_SPACE:
-                        if (self.phase == 'dice' or self.phase == 'wall_dice') and hasattr(self, 'waiting_for_user_input') and self.waiting_for_user_input:
-                            # 주사위 단계에서 스페이스바로 다음 단계 진행
-                            self.handle_dice_input()
-                        elif self.game_phase == "finished":
-                            # 게임 종료 후 스페이스로 다음 게임 시작
-                            if self.current_game <= self.total_games:
-                                self.start_next_game()
-                            else:
-                                print("🏁 모든 게임이 완료되었습니다!")
-                        elif self.game_phase == "playing" and self.current_turn != 0:
-                            # 스페이스바로 AI 턴 강제 시작 (디버그용)
-                            print(f"🔧 [디버그] 스페이스바로 AI 턴 강제 시작: {self.player_names[self.current_turn]}")
-                            self.ai_turn(self.current_turn)
-                    elif event.key == pygame.K_r:
-                        # R키로 게임 상태 복구 (디버그용)
-                        if self.game_phase == "playing":
-                            print(f"🔧 [디버그] R키로 게임 상태 복구 시도")
-                            self.debug_fix_game_state()
-                    elif event.key == pygame.K_d:
-                        # D키로 상세 디버그 정보 출력
-                        if self.game_phase == "playing":
-                            print(f"🔧 [디버그] D키로 상세 상태 출력")
-                            self.debug_print_detailed_state()
+                    elif fsm.key(event.key):
+                        # 단계별 키 (주사위/판 종료: 스페이스로 진행, 대국 중: 디버그 키)
+                        pass
+                    elif event.key == pygame.K_F3:
+                        # F3키로 프레임 프로파일러 HUD 토글
+                        profiler.toggle_hud()
+                    elif event.key == pygame.K_u:
+                        # U키로 무르기 (직전 내 턴 시작 상태로)
+                        self.take_back()
+                    elif event.key == pygame.K_f:
+                        # F키로 진행 중인 애니메이션 빨리 감기 (디버그용)
+                        self.timeline.fast_forward()
 
                 elif event.type == pygame.MOUSEBUTTONDOWN:
-                    if (self.phase == 'dice' or self.phase == 'wall_dice') and hasattr(self, 'waiting_for_user_input') and self.waiting_for_user_input:
-                        # 주사위 단계에서 마우스 클릭으로 다음 단계 진행
-                        self.handle_dice_input()
-                    else:
-                        self.handle_click(event.pos)
+                    fsm.click(event.pos)
+            profiler.stop('events')
             
-            # 게임 상태 업데이트
+            # 게임 상태 업데이트 (예약 시각이 지났으면 이번 update에서 처리되므로 다시 그림)
+            if self.next_turn_time > 0 and pygame.time.get_ticks() >= self.next_turn_time:
+                redraw = True
+            profiler.start('update')
             self.update()
-            
-            # 화면 렌더링
-            self.render()
-            pygame.display.flip()
-            
-            # 프레임 레이트 제한
-            self.clock.tick(60)
-        
+            profiler.stop('update')
+            active = self.get_idle_timeout() is None
+            
+            # 화면 렌더링 (대기 중 변화가 없으면 생략)
+            if redraw or active:
+                profiler.start('render')
+                self.render()
+                profiler.stop('render')
+                self.needs_redraw = False
+            
+            # 프레임 캡처 (마지막으로 그린 화면 사용)
+            if self.frame_recorder is not None:
+                profiler.start('capture')
+                self.frame_recorder.capture(self)
+                profiler.stop('capture')
+            
+            # 프레임 레이트 제한 (애니메이션 중에만)
+            profiler.start('tick')
+            pacer.tick(active)
+            profiler.stop('tick')
+            profiler.end_frame()
+        
+        # 프레임 캡처 정리
+        if self.frame_recorder is not None:
+            self.frame_recorder.close()
+            print(f"📼 프레임 캡처 {self.frame_recorder.frames_written}장: {self.frame_recorder.describe()}")
+        
+        # 쓰는 중인 아카이브 청크 저장
+        if self.hand_recorder is not None:
+            self.hand_recorder.close()
+        
+        # 프레임 프로파일 덤프
+        profiler.dump()
+        profiler.uninstall_transform_counter()
+        
+        # 외부 프로세스 전략 등 정리
+        for strategy in self.seat_strategies:
+            if strategy is not None:
+                strategy.close()
         pygame.quit()
 
-    def can_peng(self, player_idx, tile):
-        """펑 가능 여부 체크 - 같은 패 2장 이상 보유"""
-        if not tile:
-            return False
-        tile_base = tile.split('_')[0]  # 패 이름만 추출
-        count = sum(1 for t in self.hands[player_idx] if t.split('_')[0] == tile_base)
-        return count >= 2
-    
-    def can_ming_gang(self, player_idx, tile):
-        """명깡 가능 여부 체크 - 같은 패 3장 이상 보유"""
-        if not tile:
-            return False
-        tile_base = tile.split('_')[0]  # 패 이름만 추출
-        count = sum(1 for t in self.hands[player_idx] if t.split('_')[0] == tile_base)
-        return count >= 3
-    
-    def can_an_gang(self, player_idx):
-        """암깡 가능 여부 체크 - 같은 패 4장 보유"""
-        tile_counts = {}
-        for tile in self.hands[player_idx]:
-            tile_base = tile.split('_')[0]
-            tile_counts[tile_base] = tile_counts.get(tile_base, 0) + 1
-        
-        # 4장 이상인 패들 반환
-        return [tile_base for tile_base, count in tile_counts.items() if count >= 4]
-    
-    def can_jia_gang(self, player_idx, tile):
-        """가깡 가능 여부 체크"""
-        if not tile:
-            return []
-        
-        tile_base = tile.replace('.png', '').split('_')[0]
-        available_jia_gang = []
-        
-        for meld in self.melds[player_idx]:
-            if meld['type'] == 'peng':
-                # 멜드에서 타일 정보 가져오기
-                if 'tile' in meld:
-                    meld_tile_base = meld['tile'].split('_')[0]
-                elif 'tiles' in meld and meld['tiles']:
-                    # tiles 배열에서 첫 번째 타일 사용
-                    meld_tile_base = meld['tiles'][0].replace('.png', '').split('_')[0]
-                else:
-                    continue  # 타일 정보가 없으면 건너뛰기
-                
-                if meld_tile_base == tile_base:
-                    available_jia_gang.append(tile)
-        
-        return available_jia_gang
-    
-    def get_available_actions(self, player_idx, discarded_tile, is_self_turn=False):
-        """플레이어가 사용할 수 있는 액션 목록 반환"""
-        actions = []
-        
-        if is_self_turn:
-            # 자기 턴에서 가능한 액션들
-            if self.drawn_tile:
-                # 암깡 체크
-                available_an_gang = self.can_an_gang(player_idx)
-                if available_an_gang:
-                    actions.append({'type': 'an_gang', 'tiles': available_an_gang})
-                
-                # 가깡 체크
-                available_jia_gang = self.can_jia_gang(player_idx, self.drawn_tile)
-                if available_jia_gang:
-                    actions.append({'type': 'jia_gang', 'tiles': available_jia_gang})
-            
-            # 엎어 체크 (뽑은 패가 있을 때만)
-            if self.drawn_tile and self.can_riichi(player_idx):
-                print(f"🎯 리치 가능! 간방 상태 확인됨")
-                actions.append({'type': 'riichi'})
-        else:
-            # 다른 플레이어가 버린 패에 대한 액션들
-            if discarded_tile:
-                # 론 체크
-                if self.can_ron_with_tile(player_idx, discarded_tile):
-                    actions.append({'type': 'ron', 'tile': discarded_tile})
-                
-                # 펑 체크
-                if self.can_peng(player_idx, discarded_tile):
-                    actions.append({'type': 'peng', 'tile': discarded_tile})
-                
-                # 명깡 체크
-                if self.can_ming_gang(player_idx, discarded_tile):
-                    actions.append({'type': 'ming_gang', 'tile': discarded_tile})
-        
-        return actions
-    
     def execute_peng(self, player_idx, tile):
         """펑 실행"""
         print(f"🎯 {self.player_names[player_idx]}이 {tile}로 펑!")
@@ -2500,25 +2285,18 @@ class MahjongGame:
         # 하이라이트 해제
         self.clear_tile_highlight()
         
-        # 버린 패를 버림패 더미에서 제거
-        if self.last_discard_player is not None:
-            discard_pile = self.discard_piles[self.last_discard_player]
-            if discard_pile and discard_pile[-1] == tile:
-                discard_pile.pop()
-                print(f"✅ {tile}을 버림패에서 제거")
-        
         # 플레이어 손패에서 같은 패 2장 제거
         hand = self.hands[player_idx]
         tile_base = tile.replace('.png', '').split('_')[0]
-        removed_count = 0
+        removed_tiles = []
         
         for i in range(len(hand) - 1, -1, -1):
-            if removed_count >= 2:
+            if len(removed_tiles) >= 2:
                 break
             hand_tile_base = hand[i].replace('.png', '').split('_')[0]
             if hand_tile_base == tile_base:
                 removed_tile = hand.pop(i)
-                removed_count += 1
+                removed_tiles.append(removed_tile)
                 print(f"✅ 손패에서 {removed_tile} 제거")
         
         # 멜드에 펑 추가
@@ -2528,6 +2306,7 @@ class MahjongGame:
             'from_player': self.last_discard_player
         }
         self.melds[player_idx].append(peng_meld)
+        self.event_log.emit(EVENT_PENG, player_idx, tile, meld_call(peng_meld, removed_tiles, self.last_discard_player))
         print(f"✅ 펑 멜드 추가: {peng_meld}")
         
         # 펑한 플레이어가 다음 턴
@@ -2566,14 +2345,18 @@ class MahjongGame:
         
         tile_base = tile.split('_')[0] if tile else gang_type
         meld = None  # meld 변수 초기화
+        upgraded_meld = None  # 가깡으로 바뀐 기존 펑
+        
+        removed_tiles = []
+        from_player = None
         
         if gang_type == 'ming_gang':
             # 명깡: 손패에서 3장 제거
-            removed_count = 0
+            from_player = self.last_discard_player
             new_hand = []
             for t in self.hands[player_idx]:
-                if t.split('_')[0] == tile_base and removed_count < 3:
-                    removed_count += 1
+                if t.split('_')[0] == tile_base and len(removed_tiles) < 3:
+                    removed_tiles.append(t)
                 else:
                     new_hand.append(t)
             
@@ -2588,11 +2371,10 @@ class MahjongGame:
             
         elif gang_type == 'an_gang':
             # 암깡: 손패에서 4장 제거
-            removed_count = 0
             new_hand = []
             for t in self.hands[player_idx]:
-                if t.split('_')[0] == tile_base and removed_count < 4:
-                    removed_count += 1
+                if t.split('_')[0] == tile_base and len(removed_tiles) < 4:
+                    removed_tiles.append(t)
                 else:
                     new_hand.append(t)
             
@@ -2608,10 +2390,9 @@ class MahjongGame:
         elif gang_type == 'jia_gang':
             # 가깡: 손패에서 1장 제거하고 기존 펑을 깡으로 변경
             new_hand = []
-            removed = False
             for t in self.hands[player_idx]:
-                if t.split('_')[0] == tile_base and not removed:
-                    removed = True
+                if t.split('_')[0] == tile_base and not removed_tiles:
+                    removed_tiles.append(t)
                 else:
                     new_hand.append(t)
             
@@ -2635,12 +2416,15 @@ class MahjongGame:
                         if 'tile' not in existing_meld and 'tiles' in existing_meld:
                             existing_meld['tile'] = existing_meld['tiles'][0]
                         existing_meld['tiles'] = [existing_meld['tile']] * 4
+                        upgraded_meld = existing_meld
                         break
             
             meld = None  # 이미 기존 멜드를 수정했으므로
         
         if meld:
             self.melds[player_idx].append(meld)
+        if meld or upgraded_meld:
+            self.event_log.emit(EVENT_GANG, player_idx, tile, meld_call(meld or upgraded_meld, removed_tiles, from_player))
         
         print(f"🀄 {self.player_names[player_idx]}이 {tile_base} {gang_type}!")
         
@@ -2648,6 +2432,7 @@ class MahjongGame:
         replacement_tile = self.draw_flower_replacement_tile()
         if replacement_tile:
             self.hands[player_idx].append(replacement_tile)
+            self.event_log.emit(EVENT_DRAW, player_idx, replacement_tile)
             print(f"🎴 깡 보충패: {replacement_tile}")
             
             # 보충패를 drawn_tile로 설정 (플레이어가 버릴 수 있도록)
@@ -2700,6 +2485,7 @@ class MahjongGame:
         
         # 리치 상태로 설정
         self.player_riichi = True
+        self.event_log.emit(EVENT_RIICHI, player_idx)
         
         # 뽑은 패를 손패에 추가
         if self.drawn_tile:
@@ -2726,6 +2512,54 @@ class MahjongGame:
     def check_actions_after_discard(self, discard_player, discarded_tile):
         """패를 버린 후 다른 플레이어들의 액션 가능 여부 체크"""
         self.last_discard_player = discard_player
+        ron_player, available_actions = self.collect_discard_reactions(discard_player, discarded_tile)
+        
+        # 론 체크 (최우선)
+        if ron_player is not None:
+            print(f"🎉 {self.player_names[ron_player]}이 {discarded_tile}로 론!")
+            self.game_winner = ron_player
+            self.finish_game("ron", ron_player)
+            return
+        
+        if available_actions:
+            # 플레이어가 포함된 액션이 있으면 플레이어에게 먼저 물어보기
+            player_actions = [action for action in available_actions if action['player'] == self.player_index]
+            if player_actions:
+                self.show_action_choice_ui(player_actions, discarded_tile)
+            else:
+                # AI만 가능한 액션들 처리
+                self.process_ai_actions(available_actions, discarded_tile)
+        else:
+            # 아무도 액션할 수 없으면 다음 턴 진행
+            self.continue_after_discard()
+    
+    def collect_discard_reactions(self, discard_player, discarded_tile):
+        """버림패에 대한 론 플레이어(첫 번째)와 펑/깡 액션 목록 - 4좌석 한 번에 판정"""
+        if evaluate_table_reactions is None:
+            return self.collect_discard_reactions_per_seat(discard_player, discarded_tile)
+        
+        kind = tile_to_kind(discarded_tile)
+        if kind < 0:
+            return None, []
+        
+        reactions = evaluate_table_reactions(
+            [hand_to_counts(self.hands[idx]) for idx in range(4)],
+            [hand_to_counts(self.get_meld_tiles(idx)) for idx in range(4)],
+            [len(self.flower_tiles[idx]) for idx in range(4)],
+            kind, discard_player, score_calls=False)
+        
+        available_actions = []
+        for player_idx in range(4):
+            if reactions['ron'][player_idx]:
+                return player_idx, []
+            if reactions['peng'][player_idx]:
+                available_actions.append({'type': 'peng', 'tile': discarded_tile, 'player': player_idx})
+            if reactions['ming_gang'][player_idx]:
+                available_actions.append({'type': 'ming_gang', 'tile': discarded_tile, 'player': player_idx})
+        return None, available_actions
+    
+    def collect_discard_reactions_per_seat(self, discard_player, discarded_tile):
+        """버림패 반응 판정 - 좌석별 개별 체크 (numpy 없을 때)"""
         available_actions = []
         
         # 다른 플레이어들 체크 (버린 플레이어 제외)
@@ -2733,30 +2567,16 @@ class MahjongGame:
             if player_idx == discard_player:
                 continue
             
-            # 론 체크 (최우선)
             if self.can_ron_with_tile(player_idx, discarded_tile):
-                print(f"🎉 {self.player_names[player_idx]}이 {discarded_tile}로 론!")
-                self.game_winner = player_idx
-                self.finish_game("ron", player_idx)
-                return
-                
+                return player_idx, []
+            
             # 펑/깡 체크
             actions = self.get_available_actions(player_idx, discarded_tile, is_self_turn=False)
             for action in actions:
                 action['player'] = player_idx
                 available_actions.append(action)
         
-        if available_actions:
-            # 플레이어가 포함된 액션이 있으면 플레이어에게 먼저 물어보기
-            player_actions = [action for action in available_actions if action['player'] == self.player_index]
-            if player_actions:
-                self.show_action_choice_ui(player_actions, discarded_tile)
-            else:
-                # AI만 가능한 액션들 처리
-                self.process_ai_actions(available_actions, discarded_tile)
-        else:
-            # 아무도 액션할 수 없으면 다음 턴 진행
-            self.continue_after_discard()
+        return None, available_actions
     
     def show_action_choice_ui(self, actions, discarded_tile):
         """플레이어에게 액션 선택 UI 표시"""
@@ -2797,23 +2617,86 @@ class MahjongGame:
         self.discard_manager.clear_tile_highlight()
         print("🔄 패 하이라이트 해제")
 
+    def get_seat_types(self):
+        """좌석별 플레이어 종류 (human 또는 AI 전략 이름)"""
+        return ["human" if strategy is None else strategy.name for strategy in self.seat_strategies]
+    
+    def build_ai_observation(self, player_idx, visible_counts=None):
+        """AI 전략에 넘길 관측 정보"""
+        if visible_counts is None:
+            visible_counts = self.get_visible_tile_counts()
+        wall_remaining = 0
+        if self.wall_manager:
+            wall_remaining = self.wall_manager.get_remaining_tiles_count()
+        return {
+            'seat': player_idx,
+            'hand': list(self.hands[player_idx]),
+            'drawn_tile': self.drawn_tile if player_idx == self.player_index else None,
+            'meld_tiles': self.get_meld_tiles(player_idx),
+            'flower_count': len(self.flower_tiles[player_idx]),
+            'visible_counts': visible_counts,
+            'discard_piles': [list(pile) for pile in self.discard_piles],
+            'scores': list(self.player_scores),
+            'wall_remaining': wall_remaining,
+        }
+    
+    def choose_ai_discard(self, player_idx):
+        """좌석 전략으로 AI 버림패 선택"""
+        strategy = self.seat_strategies[player_idx]
+        if strategy is None:
+            return ai_choose_discard(self.hands[player_idx], player_idx)
+        return strategy.choose_discard(self.build_ai_observation(player_idx))
+    
+    def choose_ai_self_action(self, player_idx, actions):
+        """좌석 전략으로 AI 자기 턴 액션 선택"""
+        strategy = self.seat_strategies[player_idx]
+        if strategy is None:
+            return actions[0] if actions else None
+        return strategy.choose_self_action(self.build_ai_observation(player_idx), actions)
+    
+    def get_seat_decision_stats(self):
+        """좌석별 AI 의사결정 시간 통계"""
+        return {idx: {'strategy': strategy.name, 'decisions': strategy.stats.summary()}
+                for idx, strategy in enumerate(self.seat_strategies) if strategy is not None}
+    
+    def evaluate_ai_action(self, action, discarded_tile, visible_counts=None):
+        """AI 펑/깡 액션의 기대 가치 평가"""
+        player_idx = action['player']
+        if visible_counts is None:
+            visible_counts = self.get_visible_tile_counts()
+        return evaluate_call(self.hands[player_idx], action.get('tile', discarded_tile), action['type'],
+                             self.get_meld_tiles(player_idx), visible_counts)
+    
     def process_ai_actions(self, actions, discarded_tile):
-        """AI 액션들 처리 (우선순위: 깡 > 펑)"""
-        # 깡이 있으면 깡 우선
-        gang_actions = [action for action in actions if 'gang' in action['type']]
-        if gang_actions:
-            action = gang_actions[0]  # 첫 번째 깡 액션 선택
-            self.execute_action(action, discarded_tile)
-            return
-        
-        # 펑이 있으면 펑 실행
-        peng_actions = [action for action in actions if action['type'] == 'peng']
-        if peng_actions:
-            action = peng_actions[0]  # 첫 번째 펑 액션 선택
-            self.execute_action(action, discarded_tile)
+        """AI 액션들 처리 - 좌석 전략이 고른 액션 중 평가 점수가 가장 높은 것 실행"""
+        visible_counts = self.get_visible_tile_counts()
+        best_action = None
+        best_score = None
+        
+        # 버린 플레이어 다음 순서부터 좌석별로 전략에 물어보기
+        players = sorted({action['player'] for action in actions},
+                         key=lambda idx: (idx - self.current_turn) % 4)
+        for player_idx in players:
+            player_actions = [action for action in actions
+                              if action['player'] == player_idx and action['type'] in ('peng', 'ming_gang')]
+            if not player_actions:
+                continue
+            observation = self.build_ai_observation(player_idx, visible_counts)
+            action = self.seat_strategies[player_idx].choose_reaction(observation, player_actions)
+            if action is None:
+                print(f"🤖 {self.player_names[player_idx]} 패스")
+                continue
+            evaluation = self.evaluate_ai_action(action, discarded_tile, visible_counts)
+            print(f"🤖 {self.player_names[player_idx]} {action['type']} 선택 ({evaluation['reason']})")
+            if best_score is None or evaluation['score'] > best_score:
+                best_action = action
+                best_score = evaluation['score']
+        
+        if best_action:
+            self.execute_action(best_action, discarded_tile)
             return
         
-        # 아무 액션도 없으면 다음 턴
+        # 선택된 액션이 없으면 다음 턴
         self.continue_after_discard()
     
     def execute_action(self, action, discarded_tile):
@@ -2831,6 +2714,8 @@ class MahjongGame:
             action_player = self.player_index
             action_tile = discarded_tile
         
+        # 펑/깡/리치를 실행하면 그 좌석이 패를 버리고, 버림 완료 처리에서 다음 턴으로 진행
+        executed = True
         if action_type == "peng":
             self.execute_peng(action_player, action_tile or self.pending_tile)
         elif action_type == "ming_gang":
@@ -2841,6 +2726,8 @@ class MahjongGame:
             if available_an_gang:
                 # 첫 번째 가능한 암깡 실행 (실제로는 UI에서 선택해야 함)
                 self.execute_gang(action_player, "an_gang", available_an_gang[0])
+            else:
+                executed = False
         elif action_type == "jia_gang":
             # 가깡: action에서 tiles 정보 사용
             if 'tiles' in action and action['tiles']:
@@ -2849,12 +2736,14 @@ class MahjongGame:
                 self.execute_gang(action_player, "jia_gang", tile_to_gang)
             else:
                 print(f"❌ 가깡 타일 정보가 없음: {action}")
+                executed = False
         elif action_type == "riichi":
             # 엎어 실행
             self.execute_riichi(action_player)
-        elif action_type == "pass":
-            print("👤 패스 선택")
-            self.continue_after_discard()
+        else:
+            if action_type == "pass":
+                print("👤 패스 선택")
+            executed = False
         
         # 액션 UI 숨기기
         self.action_choices = []
@@ -2862,8 +2751,8 @@ class MahjongGame:
         self.pending_tile = None
         self.pending_player = None
         
-        # 액션 실행 후 다음 턴으로 진행 (패스가 아닌 경우)
-        if action_type != "pass":
+        # 패스했거나 실행하지 못한 액션이면 다음 턴으로 진행
+        if not executed:
             self.continue_after_discard()
     
     def continue_after_discard(self):
@@ -2873,7 +2762,7 @@ class MahjongGame:
         # 애니메이션 대기 중이면 애니메이션 완료 후 진행하도록 설정
         if self.waiting_for_animation:
             print("🎬 애니메이션 대기 중, 완료 후 다음 턴 진행")
-            self.animation_callback = self.advance_turn
+            self.chain_animation_callback(self.advance_turn)
             return
         
         # 즉시 다음 턴 진행
@@ -2919,19 +2808,12 @@ class MahjongGame:
         if not self.action_choices:
             return
         
-        # 다이얼로그 위치 (화면 오른쪽 끝 가장 밑)
-        button_width = 80
-        button_height = 35
-        button_spacing = 5
-        margin = 10
-        
-        # 전체 버튼들의 높이 계산 (세로로 배치)
-        total_buttons = len(self.action_choices) + 1  # 액션들 + 패스
-        total_height = total_buttons * button_height + (total_buttons - 1) * button_spacing
-        
-        # 오른쪽 끝에서 margin만큼 떨어진 위치
-        start_x = SCREEN_WIDTH - button_width - margin
-        start_y = SCREEN_HEIGHT - total_height - margin
+        # 다이얼로그 위치 (화면 오른쪽 끝 가장 밑) - 클릭 처리와 같은 버튼 배치
+        buttons = get_action_button_layout(len(self.action_choices))
+        button_width = ACTION_BUTTON_WIDTH
+        button_height = ACTION_BUTTON_HEIGHT
+        start_x = buttons.start_x
+        start_y = buttons.start_y
         
         # 제목 텍스트 (버튼 위에)
         if self.pending_tile:
@@ -2948,8 +2830,8 @@ class MahjongGame:
         
         # 액션 버튼들 렌더링 (세로로 배치)
         for i, action in enumerate(self.action_choices):
-            button_y = start_y + i * (button_height + button_spacing)
-            button_rect = pygame.Rect(start_x, button_y, button_width, button_height)
+            button_rect = buttons.action_rects[i]
+            button_y = button_rect.y
             
             # 버튼 배경
             pygame.draw.rect(self.screen, (70, 130, 180), button_rect)  # 스틸 블루
@@ -2972,8 +2854,8 @@ class MahjongGame:
             self.screen.blit(text_surface, (text_x, text_y))
         
         # 패스 버튼
-        pass_button_y = start_y + len(self.action_choices) * (button_height + button_spacing)
-        pass_button_rect = pygame.Rect(start_x, pass_button_y, button_width, button_height)
+        pass_button_rect = buttons.pass_rect
+        pass_button_y = pass_button_rect.y
         
         # 패스 버튼 배경 (다른 색상)
         pygame.draw.rect(self.screen, (128, 128, 128), pass_button_rect)  # 회색
@@ -2986,119 +2868,6 @@ class MahjongGame:
         pass_text_y = pass_button_y + (button_height - pass_surface.get_height()) // 2
         self.screen.blit(pass_surface, (pass_text_x, pass_text_y))
 
-    def check_winning_hand_with_melds(self, player_idx, is_tsumo=False):
-        """멜드를 포함한 화료 체크"""
-        hand = self.hands[player_idx]
-        melds = self.melds[player_idx]
-        flower_count = len(self.flower_tiles[player_idx])
-        
-        # 멘젠 여부 확인 (멜드가 없으면 멘젠)
-        is_menzen = len(melds) == 0
-        
-        # 멜드를 가상의 패로 변환하여 전체 패 구성 만들기
-        virtual_hand = hand.copy()
-        
-        # 각 멜드를 손패에 추가 (화료 체크용)
-        for meld in melds:
-            if meld['type'] in ['peng', 'ming_gang', 'an_gang', 'jia_gang']:
-                # 멜드에서 타일 정보 가져오기
-                if 'tile' in meld:
-                    tile_base = meld['tile'].split('_')[0] if '_' in meld['tile'] else meld['tile']
-                elif 'tiles' in meld and meld['tiles']:
-                    # tiles 배열의 첫 번째 패에서 타일 정보 가져오기
-                    tile_base = meld['tiles'][0].split('_')[0] if '_' in meld['tiles'][0] else meld['tiles'][0]
-                else:
-                    continue  # 타일 정보가 없으면 스킵
-                
-                if meld['type'] in ['ming_gang', 'an_gang', 'jia_gang']:
-                    # 깡은 4장이지만 화료 체크에서는 3장으로 계산
-                    virtual_hand.extend([tile_base + '_1.png'] * 3)
-                else:
-                    # 펑은 3장
-                    virtual_hand.extend([tile_base + '_1.png'] * 3)
-        
-        # 표준 화료 체크 실행 (멘젠 여부 전달)
-        result = is_winning_hand(virtual_hand, is_tsumo=is_tsumo, is_menzen=is_menzen, flower_count=flower_count)
-        return result
-    
-    def check_winning_hand_with_melds_temp(self, player_idx, temp_hand, is_tsumo=False):
-        """임시 손패로 멜드를 포함한 화료 체크"""
-        melds = self.melds[player_idx]
-        flower_count = len(self.flower_tiles[player_idx])
-        
-        # 멘젠 여부 확인 (멜드가 없으면 멘젠)
-        is_menzen = len(melds) == 0
-        
-        # 멜드를 가상의 패로 변환하여 전체 패 구성 만들기
-        virtual_hand = temp_hand.copy()
-        
-        # 각 멜드를 손패에 추가 (화료 체크용)
-        for meld in melds:
-            if meld['type'] in ['peng', 'ming_gang', 'an_gang', 'jia_gang']:
-                # 멜드에서 타일 정보 가져오기
-                if 'tile' in meld:
-                    tile_base = meld['tile'].split('_')[0] if '_' in meld['tile'] else meld['tile']
-                elif 'tiles' in meld and meld['tiles']:
-                    # tiles 배열의 첫 번째 패에서 타일 정보 가져오기
-                    tile_base = meld['tiles'][0].split('_')[0] if '_' in meld['tiles'][0] else meld['tiles'][0]
-                else:
-                    continue  # 타일 정보가 없으면 스킵
-                
-                if meld['type'] in ['ming_gang', 'an_gang', 'jia_gang']:
-                    # 깡은 4장이지만 화료 체크에서는 3장으로 계산
-                    virtual_hand.extend([tile_base + '_1.png'] * 3)
-                else:
-                    # 펑은 3장
-                    virtual_hand.extend([tile_base + '_1.png'] * 3)
-        
-        # 표준 화료 체크 실행 (멘젠 여부 전달)
-        result = is_winning_hand(virtual_hand, is_tsumo=is_tsumo, is_menzen=is_menzen, flower_count=flower_count)
-        return result
-
-    def can_ron_with_tile(self, player_idx, discarded_tile):
-        """론 가능 여부 체크 - 버린 패를 받아서 화료할 수 있는지"""
-        # 임시로 버린 패를 손패에 추가
-        temp_hand = self.hands[player_idx] + [discarded_tile]
-        
-        # 멜드를 포함한 화료 체크
-        hand = temp_hand
-        melds = self.melds[player_idx]
-        flower_count = len(self.flower_tiles[player_idx])
-        
-        # 멘젠 여부 확인 (멜드가 없으면 멘젠)
-        is_menzen = len(melds) == 0
-        
-        # 론 체크 시점에서 손패 수 계산 (버린 패를 받은 상태)
-        expected_hand_size = 14 - (len(melds) * 3)
-        if len(hand) != expected_hand_size:
-            return False
-        
-        # 멜드를 가상의 패로 변환하여 전체 패 구성 만들기
-        virtual_hand = hand.copy()
-        
-        # 각 멜드를 손패에 추가 (화료 체크용)
-        for meld in melds:
-            if meld['type'] in ['peng', 'ming_gang', 'an_gang', 'jia_gang']:
-                # 멜드에서 타일 정보 가져오기
-                if 'tile' in meld:
-                    tile_base = meld['tile'].split('_')[0] if '_' in meld['tile'] else meld['tile']
-                elif 'tiles' in meld and meld['tiles']:
-                    # tiles 배열의 첫 번째 패에서 타일 정보 가져오기
-                    tile_base = meld['tiles'][0].split('_')[0] if '_' in meld['tiles'][0] else meld['tiles'][0]
-                else:
-                    continue  # 타일 정보가 없으면 스킵
-                
-                if meld['type'] in ['ming_gang', 'an_gang', 'jia_gang']:
-                    # 깡은 4장이지만 화료 체크에서는 3장으로 계산
-                    virtual_hand.extend([tile_base + '_1.png'] * 3)
-                else:
-                    # 펑은 3장
-                    virtual_hand.extend([tile_base + '_1.png'] * 3)
-        
-        # 표준 화료 체크 실행 (멘젠 여부 전달)
-        result = is_winning_hand(virtual_hand, is_tsumo=False, is_menzen=is_menzen, flower_count=flower_count)
-        return result
-
     def handle_action_choice_click(self, pos):
         """액션 선택 UI에서 마우스 클릭 처리"""
         # 클릭 소리 재생
@@ -3107,41 +2876,26 @@ class MahjongGame:
         if not self.action_choices:
             return False
         
-        button_width = 80
-        button_height = 35
-        button_spacing = 5
-        margin = 10
-        
-        total_buttons = len(self.action_choices) + 1
-        total_height = total_buttons * button_height + (total_buttons - 1) * button_spacing
-        
-        start_x = SCREEN_WIDTH - button_width - margin
-        start_y = SCREEN_HEIGHT - total_height - margin
+        hit = get_action_button_layout(len(self.action_choices)).hit_test(pos)
         
         # 액션 버튼들 체크
-        for i, action in enumerate(self.action_choices):
-            button_y = start_y + i * (button_height + button_spacing)
-            button_rect = pygame.Rect(start_x, button_y, button_width, button_height)
+        if hit is not None and hit != 'pass':
+            action = self.action_choices[hit]
+            print(f"👤 액션 선택: {action['type']}")
             
-            if button_rect.collidepoint(pos):
-                print(f"👤 액션 선택: {action['type']}")
-                
-                # 액션 선택 시 클릭 소리 재생
-                self.play_click_sound()
-                
-                self.pending_action = None
-                self.pending_tile = None
-                self.action_choices = []
-                self.waiting_for_player = False
-                
-                self.execute_action(action, self.pending_tile)
-                return True
+            # 액션 선택 시 클릭 소리 재생
+            self.play_click_sound()
+            
+            self.pending_action = None
+            self.pending_tile = None
+            self.action_choices = []
+            self.waiting_for_player = False
+            
+            self.execute_action(action, self.pending_tile)
+            return True
         
         # 패스 버튼 체크
-        pass_button_y = start_y + len(self.action_choices) * (button_height + button_spacing)
-        pass_button_rect = pygame.Rect(start_x, pass_button_y, button_width, button_height)
-        
-        if pass_button_rect.collidepoint(pos):
+        if hit == 'pass':
             print("👤 패스 클릭")
             
             # 패스 선택 시 클릭 소리 재생
@@ -3230,7 +2984,7 @@ class MahjongGame:
                 }
         
         # 다이얼로그 정보 저장
-        self.winning_dialog_active = True
+        self.fsm.transition(GamePhase.WIN_DIALOG)
         self.winning_yaku_info = {
             'yaku_list': yaku_list,
             'yaku_points': yaku_points,
@@ -3255,56 +3009,18 @@ class MahjongGame:
             'game_number': self.current_game,
             'result_type': result_type,
             'winner': winner_idx,
+            'yaku_list': [],
             'scores_before': self.player_scores.copy(),
             'scores_after': None
         }
         
         # 점수 계산 (한국 마작 기준 - 멘젠쯔모, 겐쇼 포함)
-        if hasattr(self, 'winning_yaku_info') and self.winning_yaku_info:
+        if self.winning_yaku_info:
             yaku_list = self.winning_yaku_info['yaku_list']
+            game_result['yaku_list'] = list(yaku_list)
             flower_count = self.winning_yaku_info['flower_count']
             is_menzen = self.winning_yaku_info.get('is_menzen', True)
             
-            # 기본 점수 설정
-            if result_type == "tsumo":
-                base_points = 10  # 쯔모: 10점
-            elif not is_menzen:
-                base_points = 2   # 멘젠이 깨진 상태: 2점
-            else:
-                base_points = 5   # 론 (멘젠): 5점
-            
-            # 역 보너스 계산
-            yaku_bonus = 0
-            for yaku in yaku_list:
-                if "탕야오" in yaku or "핀후" in yaku or "자풍" in yaku or "장풍" in yaku or "역패" in yaku or "멘젠쯔모" in yaku:
-                    yaku_bonus += 1
-                elif "혼일색" in yaku or "이깡자" in yaku:
-                    yaku_bonus += 2
-                elif "삼앙꼬" in yaku or "일기통관" in yaku or "칠대작" in yaku:
-                    yaku_bonus += 4
-                elif "부지부" in yaku:
-                    yaku_bonus += 5
-                elif "소삼원" in yaku:
-                    yaku_bonus += 6
-                elif "청일색" in yaku or "대삼원" in yaku or "사앙꼬" in yaku or "소사희" in yaku:
-                    yaku_bonus += 8
-                elif "천화" in yaku or "지화" in yaku or "인화" in yaku:
-                    yaku_bonus += 16
-                elif "구려보등" in yaku:
-                    yaku_bonus += 24
-                else:
-                    yaku_bonus += 1
-            
-            # 멘젠쯔모 보너스
-            menzen_tsumo_bonus = 0
-            if result_type == "tsumo" and is_menzen:
-                menzen_tsumo_bonus = 1
-            
-            # 겐쇼 보너스
-            gensho_bonus = 0
-            if result_type == "tsumo":
-                gensho_bonus = 1  # 쯔모한 패 1장
-            
             # 엎어 보너스
             riichi_bonus = 0
             if winner_idx == self.player_index and self.player_riichi:
@@ -3312,7 +3028,7 @@ class MahjongGame:
                 print(f"🎯 엎어 보너스: +{riichi_bonus}점")
             
             # 총 점수 계산
-            points = base_points + yaku_bonus + menzen_tsumo_bonus + gensho_bonus + flower_count + riichi_bonus
+            points = self.calculate_win_points(result_type, yaku_list, flower_count, is_menzen, riichi_bonus)
         else:
             points = 10  # 기본 점수
         
@@ -3340,6 +3056,10 @@ class MahjongGame:
         # 점수 결과 기록
         game_result['scores_after'] = self.player_scores.copy()
         self.game_results.append(game_result)
+        deltas = tuple(after - before for after, before in zip(game_result['scores_after'], game_result['scores_before']))
+        loser_idx = self.last_discard_player if result_type == "ron" else None
+        self.event_log.emit(EVENT_WIN if winner_idx is not None else EVENT_DRAW_GAME, winner_idx, None,
+                            HandResult(result_type, loser_idx, deltas))
         
         # 현재 점수 출력
         print("\n📊 현재 점수:")
@@ -3347,8 +3067,7 @@ class MahjongGame:
             print(f"  {self.player_names[i]}: {score}점")
         
         # 게임 상태를 finished로 변경
-        self.phase = 'finished'
-        self.game_phase = "finished"
+        self.fsm.transition(GamePhase.FINISHED)
         
         print(f"🎮 {self.current_game}/{self.total_games}판 완료")
         
@@ -3356,8 +3075,11 @@ class MahjongGame:
         self.current_game += 1
         
         if self.current_game <= self.total_games:
+            self.autosave(SNAPSHOT_BETWEEN_GAMES)
             print("⏳ 스페이스 키나 화면 클릭으로 다음 게임 시작")
         else:
+            if self.autosaver is not None:
+                self.autosaver.clear()  # 대국 종료 - 다음 실행은 새 대국
             print("🏆 모든 게임 완료! 최종 결과:")
             self.show_final_results()
 
@@ -3389,6 +3111,12 @@ class MahjongGame:
         print("\n🎯 승리 횟수:")
         for i in range(4):
             print(f"  {self.player_names[i]}: {wins_count[i]}승")
+        
+        print("\n⏱️ AI 의사결정 시간:")
+        for idx, info in self.get_seat_decision_stats().items():
+            for kind, stat in info['decisions'].items():
+                print(f"  {self.player_names[idx]}[{info['strategy']}] {kind}: "
+                      f"{stat['count']}회, 평균 {stat['mean_ms']:.2f}ms, 최대 {stat['max_ms']:.2f}ms")
 
     def render_game_finished_ui(self):
         """게임 종료 UI 렌더링"""
@@ -3494,8 +3222,7 @@ class MahjongGame:
         backup_total_games = self.total_games
         
         # 게임 상태 리셋 (점수와 게임 기록은 유지)
-        self.game_phase = "dice_rolling"
-        self.phase = 'dice'
+        self.fsm.reset(GamePhase.DICE)
         self.current_turn = 0
         self.turn_counter = 0
         self.waiting_for_player = False
@@ -3518,13 +3245,14 @@ class MahjongGame:
         self.after_peng = False  # 펑/깡 후 플래그 초기화
         
         # 캐시 초기화
-        self.winning_hints_cache = {}
+        self.winning_hints = None
         
         # 애니메이션 관련 초기화
-        self.discard_animations = []
+        self.timeline.clear()
         self.waiting_for_animation = False
         self.animation_callback = None
-        self.discard_animations = []
+        self.table_history.clear()
+        self.event_log.clear()
 
         
         # 버림패 관리자 초기화
@@ -3540,7 +3268,7 @@ class MahjongGame:
         
         # 플레이어 이름 설정 (위치 정보 포함)
         self.player_names = ["플레이어", "김민수", "박지영", "이준호"]
-        self.players = ["human", "ai", "ai", "ai"]
+        self.players = self.get_seat_types()
         
         # 화면 위치 매핑 (플레이어는 항상 하단)
         self.screen_to_player = {
@@ -3577,7 +3305,7 @@ class MahjongGame:
         print(f"[DEBUG] self.wall_tiles after shuffle -> {len(self.wall_tiles)}장")
         
         # 새로운 WallManager 생성
-        self.wall_manager = WallManager(self.wall_tiles, self.screen)
+        self.wall_manager = WallManager(self.wall_tiles, self.screen, render_batch=self.render_batch)
         
         # WallManager 상태 확인 (디버그)
         print(f"[DEBUG] 새 WallManager 생성 후:")
@@ -3586,7 +3314,6 @@ class MahjongGame:
         print(f"  - remaining_tiles: {debug_info['remaining_tiles']}장")
         
         # 패산 위치 결정 주사위 굴리기
-        self.phase = 'dice'
         self.dice_step = 'wall_only'
         self.waiting_for_user_input = True
         self.roll_dice_for_wall_position()
@@ -3594,57 +3321,137 @@ class MahjongGame:
         print("=== 게임 시작 ===")
     
     def get_discard_pile_next_position(self, player_idx):
-        """버림패 더미에서 다음 패가 놓일 정확한 위치 계산"""
+        """버림패 더미에서 다음 패가 놓일 정확한 위치 계산 - DiscardManager 위치 테이블 사용"""
         pos = self.get_player_screen_position(player_idx)
-        pile = self.discard_piles[player_idx]
-        next_index = len(pile)  # 현재 더미 크기가 다음 인덱스
-        
-        discard_areas = {
-            "top": {"center_x": TABLE_CENTER_X, "center_y": TABLE_CENTER_Y - 188, "rotation": 180},
-            "right": {"center_x": TABLE_CENTER_X + 120, "center_y": TABLE_CENTER_Y - 24, "rotation": 90},
-            "bottom": {"center_x": TABLE_CENTER_X, "center_y": TABLE_CENTER_Y + 92, "rotation": 0},
-            "left": {"center_x": TABLE_CENTER_X - 168, "center_y": TABLE_CENTER_Y - 24, "rotation": -90}
-        }
-        
-        if pos not in discard_areas:
+        next_index = len(self.discard_piles[player_idx])  # 현재 더미 크기가 다음 인덱스
+        position = self.discard_manager.calculate_discard_tile_position(pos, next_index)
+        if position is None:
             return self.get_discard_pile_center(player_idx)
-            
-        area = discard_areas[pos]
-        tile_size = (36, 48)
-        tile_spacing = 38
-        
-        row = next_index // 6
-        col = next_index % 6
-        
-        if area["rotation"] == 0:  # 하단 (플레이어)
-            start_x = area["center_x"] - (6 * tile_spacing) // 2
-            tile_x = start_x + col * tile_spacing
-            tile_y = area["center_y"] + row * 48
-        elif area["rotation"] == 180:  # 상단 (AI2)
-            start_x = area["center_x"] - (6 * tile_spacing) // 2
-            tile_x = start_x + (5 - col) * tile_spacing
-            tile_y = area["center_y"] - row * 48
-        elif area["rotation"] == 90:  # 우측 (AI1)
-            start_y = area["center_y"] - (6 * tile_spacing) // 2
-            tile_x = area["center_x"] + row * 48
-            tile_y = start_y + (5 - col) * tile_spacing
-        else:  # rotation == -90, 좌측 (AI3)
-            start_y = area["center_y"] - (6 * tile_spacing) // 2
-            tile_x = area["center_x"] - row * 48
-            tile_y = start_y + col * tile_spacing
-            
-        return (tile_x, tile_y)
+        return position
 
+    def autosave(self, kind=SNAPSHOT_TURN):
+        """자동 저장 (MAHJONG_AUTOSAVE 지정 시) - 저장 실패해도 게임은 계속 진행"""
+        if self.autosaver is None:
+            return
+        try:
+            self.autosaver.save(self, kind)
+        except (OSError, ValueError, struct.error) as e:  # 파일 쓰기 / 인코딩 실패 (SnapshotError는 ValueError)
+            print(f"⚠️ 자동 저장 실패: {e}")
+    
+    def on_table_event(self, event, state):
+        """이벤트 로그 구독자 - 테이블이 바뀌었으니 대기 중이어도 다음 프레임을 다시 그림"""
+        self.needs_redraw = True
+    
+    def on_discard_event(self, event, state):
+        """버림패 레이어 - 버림(추가)/펑·명깡(가져감) 이벤트의 리듀서 상태로 버림패 더미 갱신"""
+        seat = event.seat if event.kind == EVENT_DISCARD else event.detail.from_player
+        if seat is not None:
+            self.discard_piles[seat][:] = state.seats[seat].discards
+    
+    def on_hint_event(self, event, state):
+        """화료 힌트 캐시 - 판 시작이나 플레이어 손패/멜드/꽃패가 바뀌는 이벤트에서 무효화"""
+        if event.kind == EVENT_START or event.seat == self.player_index:
+            self.winning_hints = None
+    
+    def take_back(self):
+        """무르기 - 직전 플레이어 턴 시작 상태로 되돌림 (패를 고르는 중일 때만)"""
+        if (self.fsm.state != GamePhase.PLAYING or not self.waiting_for_player or self.waiting_for_animation
+                or self.pending_action):
+            return False
+        state = self.table_history.undo()
+        if state is None:
+            print("↩️ 무를 수 있는 턴이 없습니다")
+            return False
+        print(f"↩️ 무르기: 턴 #{state.turn_counter} 시작 상태로 되돌림")
+        state.apply_to(self)
+        self.event_log.start(state)  # 되돌린 턴부터 새 키프레임
+        self.drawn_tile = None
+        self.player_waiting = False
+        self.waiting_for_player = False
+        self.action_choices = []
+        self.pending_tile = None
+        self.timeline.clear()
+        self.clear_tile_highlight()
+        self.start_turn()
+        return True
+    
+    def restore_snapshot(self, state):
+        """스냅샷 상태로 대국 복구 (이미 끝난 대국이면 False)"""
+        if state['current_game'] > state['total_games']:
+            return False
+        print(f"💾 === 저장된 대국 복구: {state['current_game']}/{state['total_games']}판, 점수 {state['player_scores']} ===")
+        
+        if state['seat_config'] != self.seat_config:
+            self.seat_config = list(state['seat_config'])
+            for strategy in self.seat_strategies:
+                if strategy is not None:
+                    strategy.detach(self.event_log)
+            self.seat_strategies = build_seat_strategies(self.seat_config, self.event_log)
+        
+        # 대국 진행 상태
+        self.init_game_state()
+        self.total_games = state['total_games']
+        self.current_game = state['current_game']
+        self.player_scores = state['player_scores']
+        self.game_results = state['game_results']
+        self.game_winner = state['game_winner']
+        self.east_player = state['east_player']
+        
+        if state['kind'] == SNAPSHOT_BETWEEN_GAMES:
+            # 판 종료 후 저장된 경우 - 다음 판 시작 (판 번호는 이미 증가됨)
+            self.start_next_game()
+            return True
+        
+        # 플레이어 이름/화면 위치 (start_new_game과 동일)
+        self.player_names = ["플레이어", "김민수", "박지영", "이준호"]
+        self.players = self.get_seat_types()
+        self.screen_to_player = {'bottom': 0, 'right': 1, 'top': 2, 'left': 3}
+        self.update_player_names_with_positions()
+        
+        # 패산 - 같은 순서와 주사위로 레이아웃을 다시 고르고 뽑기 포인터 복구
+        self.wall_tiles = state['wall_tiles']
+        self.wall_manager = WallManager(self.wall_tiles, self.screen, render_batch=self.render_batch)
+        self.wall_dice_results = state['wall_dice_results']
+        self.set_wall_start_position(self.wall_dice_results[2])
+        self.wall_manager.dealt_mask = state['dealt_mask']
+        self.wall_manager.dealt_count = state['dealt_count']
+        self.wall_manager.regular_head = state['regular_head']
+        self.wall_manager.wang_tail = state['wang_tail']
+        
+        # 테이블 상태
+        self.hands = state['hands']
+        self.flower_tiles = state['flower_tiles']
+        self.discard_piles = state['discard_piles']
+        self.melds = state['melds']
+        self.current_turn = state['current_turn']
+        self.turn_counter = state['turn_counter']
+        self.player_riichi = state['player_riichi']
+        self.after_peng = state['after_peng']
+        self.last_discard_player = state['last_discard_player']
+        
+        self.dice_step = 'complete'
+        self.waiting_for_user_input = False
+        self.fsm.reset(GamePhase.PLAYING)
+        self.event_log.start_from_table(self)
+        self.start_turn()
+        return True
+    
     def clear_winning_hints_cache(self):
         """화료 힌트 캐시 클리어"""
-        if hasattr(self, 'winning_hints_cache'):
-            self.winning_hints_cache.clear()
+        self.winning_hints = None
     
     def clear_click_buffer(self):
         """클릭 이벤트 버퍼 초기화"""
         self.click_buffer = []
         print("🧹 클릭 버퍼 초기화")
     
+    def debug_force_ai_turn(self):
+        """스페이스바로 AI 턴 강제 시작 (디버그용)"""
+        if self.current_turn == self.player_index:
+            return
+        print(f"🔧 [디버그] 스페이스바로 AI 턴 강제 시작: {self.player_names[self.current_turn]}")
+        self.ai_turn(self.current_turn)
+
     def debug_fix_game_state(self):
         """게임 상태 복구 (디버그용)"""
         print(f"🔧 === 게임 상태 복구 시작 ===")
@@ -3659,7 +3466,7 @@ class MahjongGame:
             print("🔧 애니메이션 대기 상태 해제")
             self.waiting_for_animation = False
             self.animation_callback = None
-            self.discard_animations = []
+            self.timeline.clear()
         
         # 액션 상태 초기화
         if self.pending_action or self.action_choices:
@@ -3694,7 +3501,7 @@ class MahjongGame:
     def debug_print_detailed_state(self):
         """상세 디버그 정보 출력"""
         print(f"🔧 === 상세 게임 상태 ===")
-        print(f"게임 단계: {self.game_phase}")
+        print(f"게임 단계: {self.fsm.name}")
         print(f"현재 턴: {self.current_turn} ({self.player_names[self.current_turn]})")
         print(f"턴 카운터: {self.turn_counter}")
         print(f"waiting_for_player: {self.waiting_for_player}")
@@ -3703,7 +3510,7 @@ class MahjongGame:
         print(f"pending_action: {self.pending_action}")
         print(f"pending_tile: {self.pending_tile}")
         print(f"action_choices: {len(self.action_choices)}개")
-        print(f"discard_animations: {len(self.discard_animations)}개")
+        print(f"애니메이션 트윈: {len(self.timeline.tweens)}개")
         print(f"highlighted_tile: {self.highlighted_tile}")
         
         # 각 플레이어 상태
@@ -3718,125 +3525,65 @@ class MahjongGame:
         print(f"🔧 === 상세 상태 끝 ===")
     
     def add_discard_animation(self, tile, from_pos, to_pos, player_idx):
-        """패 버리기 애니메이션 추가"""
-        animation = {
-            'tile': tile,
-            'from_pos': from_pos,
-            'to_pos': to_pos,
-            'player_idx': player_idx,
-            'start_time': pygame.time.get_ticks(),
-            'duration': 400,  # 0.4초로 30% 늦춤 (300ms -> 400ms)
-            'active': True
-        }
-        self.discard_animations.append(animation)
+        """패 버리기 애니메이션 추가 - 0.4초 동안 포물선(30px)으로 날아가며 버림패 크기로 작아짐"""
+        self.timeline.add_tween(TileTween(tile, from_pos, to_pos, 400, player_idx,
+                                          from_size=TILE_SIZE, to_size=DISCARD_TWEEN_END_SIZE, arc_height=30))
         print(f"🎬 패 버리기 애니메이션 시작: {tile}")
     
-    def update_discard_animations(self):
-        """패 버리기 애니메이션 업데이트"""
-        current_time = pygame.time.get_ticks()
-        completed_animations = []
-        
-        for i, anim in enumerate(self.discard_animations):
-            if not anim['active']:
-                continue
-                
-            elapsed = current_time - anim['start_time']
-            if elapsed >= anim['duration']:
-                anim['active'] = False
-                completed_animations.append(i)
-        
-        # 완료된 애니메이션 제거
-        for i in reversed(completed_animations):
-            del self.discard_animations[i]
+    def chain_animation_callback(self, callback):
+        """애니메이션 완료 콜백 등록 - 이미 대기 중인 콜백이 있으면 덮어쓰지 않고 그 뒤에 이어서 실행"""
+        pending = self.animation_callback
+        if pending is None:
+            self.animation_callback = callback
+            return
         
-        # 모든 애니메이션이 완료되고 콜백이 있으면 실행
-        if self.waiting_for_animation and len(self.discard_animations) == 0 and self.animation_callback:
+        def chained():
+            pending()
+            callback()
+        self.animation_callback = chained
+    
+    def discards_in_flight(self, player_idx):
+        """버림패 더미로 날아가는 중인 패 수 (이벤트로 더미에 이미 들어갔지만 아직 그리지 않을 패)"""
+        return sum(1 for tween in self.timeline.tweens if tween.player_idx == player_idx and not tween.done)
+    
+    def update_discard_animations(self):
+        """패 버리기 애니메이션이 모두 끝났으면 대기 중인 콜백 실행 (진행은 update의 timeline.sync)"""
+        if self.waiting_for_animation and not self.timeline.has_active() and self.animation_callback:
             print("🎬 애니메이션 완료, 콜백 실행")
             callback = self.animation_callback
             self.waiting_for_animation = False
             self.animation_callback = None
             callback()
     
-    def get_discard_animation_position(self, anim):
-        """패 버리기 애니메이션의 현재 위치 계산 - 더 직선화된 포물선"""
-        current_time = pygame.time.get_ticks()
-        elapsed = current_time - anim['start_time']
-        progress = min(1.0, elapsed / anim['duration'])
-        
-        # 시작점과 끝점
-        start_x, start_y = anim['from_pos']
-        end_x, end_y = anim['to_pos']
-        
-        # 선형 보간으로 x, y 위치 계산
-        current_x = start_x + (end_x - start_x) * progress
-        current_y = start_y + (end_y - start_y) * progress
-        
-        # 포물선 효과를 더 약하게 적용 (높이를 30픽셀로 줄임)
-        arc_height = 30  # 기존 60에서 30으로 줄임
-        arc_offset = arc_height * math.sin(math.pi * progress)
-        current_y -= arc_offset
-        
-        return (int(current_x), int(current_y))
-    
     def render_discard_animations(self):
-        """패 버리기 애니메이션 렌더링 - 개선된 포물선 애니메이션"""
-        for anim in self.discard_animations:
-            if not anim['active']:
-                continue
-                
-            current_pos = self.get_discard_animation_position(anim)
-            
-            # 애니메이션 진행도 계산
-            current_time = pygame.time.get_ticks()
-            elapsed = current_time - anim['start_time']
-            progress = min(1.0, elapsed / anim['duration'])
-            
-            # 크기 변화 (시작: 원래 크기, 끝: 작아짐)
-            start_size = TILE_SIZE
-            end_size = (36, 48)  # 버림패 크기
-            current_width = int(start_size[0] + (end_size[0] - start_size[0]) * progress)
-            current_height = int(start_size[1] + (end_size[1] - start_size[1]) * progress)
-            
-            # 패 이미지 가져오기 및 크기 조정
-            tile_image = self.resources.get_tile_surface(anim['tile'], TILE_SIZE)
-            if tile_image:
-                # 플레이어별 회전 각도 결정 (회전 없이 원래 모양 유지)
-                player_idx = anim['player_idx']
-                
-                # 플레이어 위치에 따른 패 방향 결정
-                if player_idx == 0:  # 플레이어 (하단) - 세로
-                    rotated_surface = pygame.transform.scale(tile_image, (current_width, current_height))
-                elif player_idx == 1:  # AI1 (우측) - 가로 (90도 회전)
-                    rotated_surface = pygame.transform.rotate(tile_image, -90)
-                    rotated_surface = pygame.transform.scale(rotated_surface, (current_height, current_width))
-                elif player_idx == 2:  # AI2 (상단) - 세로 (180도 회전)
-                    rotated_surface = pygame.transform.rotate(tile_image, 180)
-                    rotated_surface = pygame.transform.scale(rotated_surface, (current_width, current_height))
-                elif player_idx == 3:  # AI3 (좌측) - 가로 (270도 회전)
-                    rotated_surface = pygame.transform.rotate(tile_image, 90)
-                    rotated_surface = pygame.transform.scale(rotated_surface, (current_height, current_width))
-                else:
-                    # 기본값 (세로)
-                    rotated_surface = pygame.transform.scale(tile_image, (current_width, current_height))
-                
-                # 중심점 계산하여 렌더링
-                rotated_rect = rotated_surface.get_rect(center=current_pos)
-                self.screen.blit(rotated_surface, rotated_rect)
+        """패 버리기 애니메이션 렌더링 - 캐시된 회전/스케일 스프라이트를 한 번에 블릿"""
+        if not self.timeline.tweens:
+            return
+        batch = self.render_batch
+        now = self.timeline.now
+        for tween in self.timeline.tweens:
+            progress = tween.progress(now)
+            surface = self.tile_sprites.get(tween.tile, tween.rotation, tween.size(progress))
+            batch.add('animation', surface, surface.get_rect(center=tween.position(progress)))
+        batch.flush('animation')
 
 
     def render_winning_dialog(self):
         """화료 다이얼로그 렌더링 - 개선된 UI와 동적 배치"""
-        if not self.winning_dialog_active or not self.winning_yaku_info:
+        if not self.winning_yaku_info:
             return
         
+        batch = self.render_batch
+        
         # 반투명 배경
         overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
         overlay.set_alpha(180)
         overlay.fill((0, 0, 0))
-        self.screen.blit(overlay, (0, 0))
+        batch.add('dialog', overlay, (0, 0))
+        batch.flush('dialog')
         
         # 론한 패 하이라이트 (다이얼로그 뒤에서)
-        if self.winning_result_type == "ron" and hasattr(self, 'ron_tile'):
+        if self.winning_result_type == "ron" and self.ron_tile is not None:
             self.discard_manager.set_tile_highlight(self.ron_tile, self.discard_piles, self.screen_to_player)
             self.discard_manager.render_tile_highlights(self.discard_piles, self.screen_to_player)
         
@@ -3860,7 +3607,7 @@ class MahjongGame:
         title_surface = self.resources.render_text_with_emoji(title_text, "medium", (255, 215, 0))
         title_x = panel_x + (panel_width - title_surface.get_width()) // 2
         title_y = panel_y + 15
-        self.screen.blit(title_surface, (title_x, title_y))
+        batch.add('dialog', title_surface, (title_x, title_y))
         
         current_y = title_y + 30  # 40 → 30으로 줄임
         
@@ -3869,7 +3616,7 @@ class MahjongGame:
             hand_title = f"[완성패] {winner_name}의 완성패"
             hand_title_surface = self.resources.render_text_with_emoji(hand_title, "small", COLORS["highlight"])
             hand_title_x = panel_x + (panel_width - hand_title_surface.get_width()) // 2
-            self.screen.blit(hand_title_surface, (hand_title_x, current_y))
+            batch.add('dialog', hand_title_surface, (hand_title_x, current_y))
             current_y += 20  # 25 → 20으로 줄임
             
             # 패 표시 (버림패 크기)
@@ -3885,7 +3632,7 @@ class MahjongGame:
                 
                 # 멜드 타입 표시 (더 아래로)
                 type_surface = self.resources.render_text_with_emoji(f"[{meld_type_text}]", "small", COLORS["highlight"])
-                self.screen.blit(type_surface, (current_x, current_y - 18))
+                batch.add('dialog', type_surface, (current_x, current_y - 18))
                 
                 # 멜드 패들 표시 (더 아래로)
                 meld_y = current_y + 5  # 패를 더 아래로
@@ -3894,11 +3641,11 @@ class MahjongGame:
                     if meld['type'] == 'an_gang' and j in [1, 2]:
                         # 뒷면 렌더링
                         back_surface = self.create_ai_back_surface(tile_size)
-                        self.screen.blit(back_surface, (current_x, meld_y))
+                        batch.add('dialog', back_surface, (current_x, meld_y))
                     else:
                         # 일반 패 렌더링
                         tile_surface = self.resources.get_tile_surface(tile, tile_size)
-                        self.screen.blit(tile_surface, (current_x, meld_y))
+                        batch.add('dialog', tile_surface, (current_x, meld_y))
                     current_x += tile_size[0] + 1
                 current_x += 8  # 멜드 간 간격
             
@@ -3907,25 +3654,26 @@ class MahjongGame:
             if hand:
                 if melds:  # 멜드가 있으면 구분선
                     separator_surface = self.resources.render_text_with_emoji("|", "small", COLORS["text"])
-                    self.screen.blit(separator_surface, (current_x, current_y + 15))
+                    batch.add('dialog', separator_surface, (current_x, current_y + 15))
                     current_x += 15
                 
                 for tile in hand:
                     tile_surface = self.resources.get_tile_surface(tile, tile_size)
-                    self.screen.blit(tile_surface, (current_x, meld_y if melds else current_y))
+                    batch.add('dialog', tile_surface, (current_x, meld_y if melds else current_y))
                     current_x += tile_size[0] + 1
             
             # 론한 패 별도 표시
-            if self.winning_result_type == "ron" and hasattr(self, 'ron_tile'):
+            if self.winning_result_type == "ron" and self.ron_tile is not None:
                 current_x += 10
                 ron_label = self.resources.render_text_with_emoji("[론]", "small", (255, 100, 100))
-                self.screen.blit(ron_label, (current_x, current_y - 18))
+                batch.add('dialog', ron_label, (current_x, current_y - 18))
                 
                 ron_tile_surface = self.resources.get_tile_surface(self.ron_tile, tile_size)
                 # 론한 패에 빨간 테두리
                 ron_y = meld_y if melds else current_y
+                batch.flush('dialog')
                 pygame.draw.rect(self.screen, (255, 100, 100), (current_x, ron_y, tile_size[0], tile_size[1]), 3)
-                self.screen.blit(ron_tile_surface, (current_x, ron_y))
+                batch.add('dialog', ron_tile_surface, (current_x, ron_y))
             
             current_y += tile_size[1] + 20  # 더 많은 간격
         
@@ -3935,7 +3683,7 @@ class MahjongGame:
             ron_text = f"[론] {ron_info['from_player_name']}의 {ron_info['tile']}로 론!"
             ron_surface = self.resources.render_text_with_emoji(ron_text, "small", COLORS["highlight"])
             ron_x = panel_x + (panel_width - ron_surface.get_width()) // 2
-            self.screen.blit(ron_surface, (ron_x, current_y))
+            batch.add('dialog', ron_surface, (ron_x, current_y))
             current_y += 25
         
         # AI 패 공개는 이미 위에서 처리했으므로 제거
@@ -3946,7 +3694,7 @@ class MahjongGame:
         # 역 정보 표시 (작게)
         yaku_title = self.resources.render_text_with_emoji("[역] 완성된 역", "small", COLORS["highlight"])
         yaku_title_x = panel_x + (panel_width - yaku_title.get_width()) // 2
-        self.screen.blit(yaku_title, (yaku_title_x, current_y))
+        batch.add('dialog', yaku_title, (yaku_title_x, current_y))
         current_y += 25
         
         yaku_list = self.winning_yaku_info['yaku_list']
@@ -3955,13 +3703,13 @@ class MahjongGame:
                 yaku_text = f"• {yaku}"
                 yaku_surface = self.resources.render_text_with_emoji(yaku_text, "small", COLORS["text"])
                 yaku_x = panel_x + 30
-                self.screen.blit(yaku_surface, (yaku_x, current_y))
+                batch.add('dialog', yaku_surface, (yaku_x, current_y))
                 current_y += 22  # 18 → 22로 증가 (역 정보 행간 증가)
         else:
             no_yaku_text = "• 역 없음 (기본 화료)"
             no_yaku_surface = self.resources.render_text_with_emoji(no_yaku_text, "small", COLORS["text"])
             no_yaku_x = panel_x + 30
-            self.screen.blit(no_yaku_surface, (no_yaku_x, current_y))
+            batch.add('dialog', no_yaku_surface, (no_yaku_x, current_y))
             current_y += 22  # 18 → 22로 증가 (역 정보 행간 증가)
         
         current_y += 15  # 더 많은 간격
@@ -3969,7 +3717,7 @@ class MahjongGame:
         # 점수 정보 (한국 마작 기준) - 작게
         points_title = self.resources.render_text_with_emoji("[점수] 점수 계산", "small", COLORS["highlight"])
         points_title_x = panel_x + (panel_width - points_title.get_width()) // 2
-        self.screen.blit(points_title, (points_title_x, current_y))
+        batch.add('dialog', points_title, (points_title_x, current_y))
         current_y += 25
         
         # 점수 세부 계산
@@ -4043,7 +3791,7 @@ class MahjongGame:
             color = COLORS["highlight"] if i == len(points_info) - 1 else COLORS["text"]
             info_surface = self.resources.render_text_with_emoji(info, "small", color)
             info_x = panel_x + 30
-            self.screen.blit(info_surface, (info_x, current_y))
+            batch.add('dialog', info_surface, (info_x, current_y))
             current_y += 22  # 18 → 22로 증가 (점수 정보 행간 증가)
         
         # 안내 메시지 (작게) - 패널 높이에 맞춰 조정
@@ -4051,8 +3799,12 @@ class MahjongGame:
         guide_surface = self.resources.render_text_with_emoji(guide_text, "small", COLORS["highlight"])
         guide_x = panel_x + (panel_width - guide_surface.get_width()) // 2
         guide_y = panel_y + panel_height - 30  # 패널 높이 증가에 맞춰 조정
-        self.screen.blit(guide_surface, (guide_x, guide_y))
+        batch.add('dialog', guide_surface, (guide_x, guide_y))
+        batch.flush('dialog')
 
 if __name__ == "__main__":
-    game = MahjongGame()
+    import sys
+    # 예: python main.py human,heuristic,efficiency,montecarlo
+    seat_config = sys.argv[1].split(',') if len(sys.argv) > 1 else None
+    game = MahjongGame(seat_config)
     game.run() 
\ No newline at end of file
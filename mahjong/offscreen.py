@@ -0,0 +1,178 @@
+"""
+오프스크린 렌더링 / 프레임 캡처 모듈
+- SDL dummy 드라이버로 창 없이 MahjongGame 실행 (디스플레이 없는 리눅스 서버용)
+- 현재 게임 상태를 PNG 파일 또는 raw 버퍼로 캡처 (배율 지정)
+- FrameRecorder: 게임 시간 기준 N FPS로 폴더(PNG) 또는 파이프(raw 스트림)에 프레임 저장
+- 두 화면의 다른 픽셀 수 비교 (시각 회귀 테스트용)
+"""
+
+import os
+
+import pygame
+
+
+CAPTURE_DIR_ENV = "MAHJONG_CAPTURE_DIR"     # PNG 프레임 저장 폴더
+CAPTURE_PIPE_ENV = "MAHJONG_CAPTURE_PIPE"   # raw 프레임 스트림 경로 (FIFO 등)
+CAPTURE_FPS_ENV = "MAHJONG_CAPTURE_FPS"
+CAPTURE_SCALE_ENV = "MAHJONG_CAPTURE_SCALE"
+DEFAULT_CAPTURE_FPS = 10
+RAW_FORMATS = ('RGB', 'RGBA', 'RGBX', 'ARGB', 'BGRA')
+
+
+def use_dummy_video():
+    """pygame 초기화 전에 호출 - 창/사운드 장치 없이 실행하도록 SDL dummy 드라이버 지정"""
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+
+def create_offscreen_game(seat_config=None):
+    """SDL dummy 드라이버 위에서 MahjongGame 생성 (화면은 메모리 서피스)"""
+    use_dummy_video()
+    from main import MahjongGame
+    return MahjongGame(seat_config)
+
+
+def _scaled_size(size, scale):
+    return max(1, int(round(size[0] * scale))), max(1, int(round(size[1] * scale)))
+
+
+def _frame_surface(game, scale, redraw):
+    """캡처할 서피스 (배율 1이면 화면 서피스 그대로 - 복사 없음)"""
+    if redraw:
+        game.draw_frame()
+    surface = game.screen
+    if scale == 1.0:
+        return surface
+    return pygame.transform.smoothscale(surface, _scaled_size(surface.get_size(), scale))
+
+
+def capture_surface(game, scale=1.0, redraw=True):
+    """게임 화면을 그려서 (필요하면 배율 적용한) 서피스 사본으로 반환"""
+    surface = _frame_surface(game, scale, redraw)
+    return surface.copy() if surface is game.screen else surface
+
+
+def save_png(game, path, scale=1.0, redraw=True):
+    """게임 화면을 PNG로 저장"""
+    pygame.image.save(_frame_surface(game, scale, redraw), path)
+    return path
+
+
+def capture_raw(game, scale=1.0, fmt='RGB', redraw=True):
+    """게임 화면 raw 버퍼 - (bytes, (width, height), fmt)"""
+    if fmt not in RAW_FORMATS:
+        raise ValueError(f"지원하지 않는 raw 형식: {fmt} (가능: {', '.join(RAW_FORMATS)})")
+    surface = _frame_surface(game, scale, redraw)
+    return pygame.image.tobytes(surface, fmt), surface.get_size(), fmt
+
+
+def count_different_pixels(surface_a, surface_b, tolerance=0):
+    """두 서피스에서 채널 차이가 tolerance를 넘는 픽셀 수 (크기가 다르면 ValueError)"""
+    if surface_a.get_size() != surface_b.get_size():
+        raise ValueError(f"서피스 크기가 다름: {surface_a.get_size()} != {surface_b.get_size()}")
+    threshold = (tolerance + 1, tolerance + 1, tolerance + 1, 255)
+    same = pygame.mask.from_threshold(surface_a, (0, 0, 0), threshold, surface_b, 1)
+    width, height = surface_a.get_size()
+    return width * height - same.count()
+
+
+class FrameRecorder:
+    """게임 시간 기준 N FPS 프레임 저장 (폴더: PNG, 파이프: raw 연속 스트림)
+
+    파이프 모드는 프레임 간격을 일정하게 유지하도록 밀린 프레임을 반복해서 쓰고,
+    폴더 모드는 밀린 만큼 프레임 번호를 건너뛴다 (frame_000012.png = 12번째 슬롯).
+    """
+
+    def __init__(self, fps=DEFAULT_CAPTURE_FPS, directory=None, pipe=None, scale=1.0, fmt='RGB'):
+        if (directory is None) == (pipe is None):
+            raise ValueError("directory와 pipe 중 하나만 지정해야 합니다")
+        if fps <= 0:
+            raise ValueError(f"fps는 0보다 커야 합니다: {fps}")
+        if fmt not in RAW_FORMATS:
+            raise ValueError(f"지원하지 않는 raw 형식: {fmt} (가능: {', '.join(RAW_FORMATS)})")
+        self.fps = fps
+        self.interval = 1000.0 / fps
+        self.directory = directory
+        self.scale = scale
+        self.fmt = fmt
+        self.start_time = None
+        self.next_slot = 0      # 다음에 채울 프레임 슬롯 번호
+        self.frames_written = 0
+        self.frame_size = None
+
+        self.pipe = pipe
+        self.owns_pipe = False
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+        elif isinstance(pipe, str):
+            self.pipe = open(pipe, 'wb')
+            self.owns_pipe = True
+
+    def capture(self, game, now_ms=None, redraw=False):
+        """프레임이 필요한 시점이면 저장 (저장한 프레임 수 반환)
+
+        run 루프에서는 draw_frame 직후에 redraw=False로 호출해서 이미 그린 화면을 사용한다.
+        """
+        if now_ms is None:
+            now_ms = pygame.time.get_ticks()
+        if self.start_time is None:
+            self.start_time = now_ms
+        due_slot = int((now_ms - self.start_time) // self.interval)
+        if due_slot < self.next_slot:
+            return 0
+
+        surface = _frame_surface(game, self.scale, redraw)
+        self.frame_size = surface.get_size()
+        if self.directory is not None:
+            pygame.image.save(surface, os.path.join(self.directory, f"frame_{due_slot:06d}.png"))
+            written = 1
+        else:
+            data = pygame.image.tobytes(surface, self.fmt)
+            written = due_slot - self.next_slot + 1
+            for _ in range(written):
+                self.pipe.write(data)
+        self.next_slot = due_slot + 1
+        self.frames_written += written
+        return written
+
+    def describe(self):
+        """raw 스트림을 읽는 쪽에 필요한 정보 (예: ffmpeg 옵션)"""
+        if self.directory is not None:
+            return f"PNG {self.fps}fps → {self.directory}"
+        width, height = self.frame_size or (0, 0)
+        pix_fmt = {'RGB': 'rgb24', 'RGBA': 'rgba', 'RGBX': 'rgb0', 'ARGB': 'argb', 'BGRA': 'bgra'}[self.fmt]
+        return f"raw {self.fmt} {width}x{height} {self.fps}fps (ffmpeg -f rawvideo -pix_fmt {pix_fmt} -s {width}x{height} -r {self.fps} -i ...)"
+
+    def close(self):
+        if self.pipe is not None:
+            self.pipe.flush()
+            if self.owns_pipe:
+                self.pipe.close()
+            self.pipe = None
+
+
+def create_frame_recorder():
+    """환경변수로 지정된 프레임 캡처 (MAHJONG_CAPTURE_DIR 또는 MAHJONG_CAPTURE_PIPE, 없으면 None)"""
+    directory = os.environ.get(CAPTURE_DIR_ENV) or None
+    pipe = os.environ.get(CAPTURE_PIPE_ENV) or None
+    if directory is None and pipe is None:
+        return None
+    fps = float(os.environ.get(CAPTURE_FPS_ENV) or DEFAULT_CAPTURE_FPS)
+    scale = float(os.environ.get(CAPTURE_SCALE_ENV) or 1.0)
+    return FrameRecorder(fps, directory=directory, pipe=None if directory else pipe, scale=scale)
+
+
+def run_offscreen(game, duration_ms, recorder=None, step=None, fps=60):
+    """창 없이 duration_ms 동안 게임 루프 실행 (step(game)으로 입력 대신 진행, recorder로 프레임 저장)"""
+    started = pygame.time.get_ticks()
+    while pygame.time.get_ticks() - started < duration_ms:
+        pygame.event.pump()
+        if step is not None:
+            step(game)
+        game.update()
+        game.draw_frame()
+        if recorder is not None:
+            recorder.capture(game)
+        game.clock.tick(fps)
+    if recorder is not None:
+        recorder.close()
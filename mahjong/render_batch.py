@@ -0,0 +1,67 @@
+"""
+렌더링 명령 버퍼
+- 렌더러가 (surface, dest) 블릿 명령을 레이어별로 모아 두었다가 Surface.blits로 한 번에 그리기
+- pygame.draw 등 블릿이 아닌 그리기 전에는 해당 레이어를 먼저 flush해서 그리는 순서 유지
+- 레이어별 프레임당 블릿 수 집계 (계측용)
+"""
+
+
+class RenderBatch:
+    """레이어별 블릿 명령 버퍼"""
+
+    def __init__(self, target):
+        self.target = target
+        self.layers = {}             # {레이어: [(surface, dest), ...]}
+        self.frame_counts = {}       # 이번 프레임 레이어별 블릿 수
+        self.last_frame_counts = {}  # 직전 프레임 레이어별 블릿 수
+        self.flush_count = 0
+        self.last_flush_count = 0
+
+    def add(self, layer, surface, dest):
+        """블릿 명령 1개 추가"""
+        commands = self.layers.get(layer)
+        if commands is None:
+            commands = self.layers[layer] = []
+        commands.append((surface, dest))
+
+    def extend(self, layer, commands):
+        """블릿 명령 여러 개 추가"""
+        existing = self.layers.get(layer)
+        if existing is None:
+            existing = self.layers[layer] = []
+        existing.extend(commands)
+
+    def flush(self, layer):
+        """레이어에 쌓인 명령을 한 번에 그리고 비우기 (그린 수 반환)"""
+        commands = self.layers.get(layer)
+        if not commands:
+            return 0
+        self.target.blits(commands, doreturn=False)
+        count = len(commands)
+        self.frame_counts[layer] = self.frame_counts.get(layer, 0) + count
+        self.flush_count += 1
+        commands.clear()
+        return count
+
+    def flush_all(self):
+        """남은 레이어 모두 그리기 (추가된 순서)"""
+        total = 0
+        for layer in list(self.layers):
+            total += self.flush(layer)
+        return total
+
+    def end_frame(self):
+        """프레임 끝 - 남은 명령을 그리고 집계를 직전 프레임 값으로 넘김"""
+        self.flush_all()
+        self.last_frame_counts = self.frame_counts
+        self.last_flush_count = self.flush_count
+        self.frame_counts = {}
+        self.flush_count = 0
+
+    def get_layer_counts(self):
+        """직전 프레임 레이어별 블릿 수"""
+        return dict(self.last_frame_counts)
+
+    def get_total_count(self):
+        """직전 프레임 전체 블릿 수"""
+        return sum(self.last_frame_counts.values())
@@ -0,0 +1,195 @@
+"""
+테이블 서버 통신 프로토콜 (pygame 없이 사용 가능)
+- 프레임: [길이 u32][종류 u8][본문] (빅엔디언, 길이 = 종류 1바이트 + 본문)
+- 패 번호: create_tiles() 순서의 0-103, 종류 이름(암깡 멜드 등)은 128 + 종류, 모르는/가린 패는 255
+- 메시지별 pack/unpack 함수와 asyncio 스트림 읽기/쓰기
+"""
+
+import struct
+
+from mahjong_game import TILE_KINDS
+from table_rules import create_tiles
+
+
+FRAME_HEADER = struct.Struct('!IB')
+MAX_FRAME_SIZE = 1 << 20
+
+TILES = tuple(create_tiles())
+TILE_IDS = {tile: index for index, tile in enumerate(TILES)}
+TILE_IDS.update({kind: 128 + index for index, kind in enumerate(TILE_KINDS)})
+TILE_NONE = 255
+SEAT_NONE = 255
+SEAT_SPECTATOR = 254  # 참가 요청 좌석 - 관전
+ANY_TABLE = 0xFFFFFFFF
+
+# 클라이언트 → 서버
+MSG_JOIN = 0x01       # table u32 (ANY_TABLE=아무 테이블), seat u8 (SEAT_NONE=아무 좌석, SEAT_SPECTATOR=관전), 이름 utf-8
+MSG_ACTION = 0x02     # seq u32, action u8 (mahjong_env 액션 번호)
+
+# 서버 → 클라이언트
+MSG_WELCOME = 0x81    # table u32, seat u8
+MSG_HAND = 0x82       # 판 시작 - game u8, east u8, 내 손패 패 번호들
+MSG_DECISION = 0x83   # seq u32, deadline_ms u32, type u8, tile u8, mask u64 (액션 번호별 비트)
+MSG_EVENT = 0x84      # kind u8, seat u8, tile u8 (game_events 종류, 다른 좌석이 뽑은 패는 가림)
+MSG_HAND_END = 0x85   # result u8, winner u8, loser u8, 좌석별 점수 변화 i16 x4
+MSG_MATCH_END = 0x86  # 좌석별 최종 점수 i16 x4
+MSG_SYNC_KEYFRAME = 0x87  # seq u32, 전체 TableState (table_sync)
+MSG_SYNC_DELTA = 0x88     # seq u32, 이벤트 델타 레코드들 (table_sync)
+MSG_ERROR = 0x8F      # 메시지 utf-8
+
+DECISION_DISCARD = 0
+DECISION_REACT = 1
+DECISION_TYPES = ('discard', 'react')
+RESULT_TYPES = ('tsumo', 'ron', 'draw')
+
+_JOIN = struct.Struct('!IB')
+_ACTION = struct.Struct('!IB')
+_WELCOME = struct.Struct('!IB')
+_HAND = struct.Struct('!BB')
+_DECISION = struct.Struct('!IIBBQ')
+_EVENT = struct.Struct('!BBB')
+_HAND_END = struct.Struct('!BBB4h')
+_MATCH_END = struct.Struct('!4h')
+
+
+class ProtocolError(ValueError):
+    """잘못된 프레임/메시지"""
+
+
+def tile_id(tile):
+    return TILE_IDS.get(tile, TILE_NONE) if tile is not None else TILE_NONE
+
+
+def tile_name(tile_id_value):
+    if tile_id_value < len(TILES):
+        return TILES[tile_id_value]
+    if 128 <= tile_id_value < 128 + len(TILE_KINDS):
+        return TILE_KINDS[tile_id_value - 128]
+    return None
+
+
+def _seat_byte(seat):
+    return SEAT_NONE if seat is None else seat
+
+
+def _seat_value(seat_byte):
+    return None if seat_byte == SEAT_NONE else seat_byte
+
+
+def _unpack(layout, payload, prefix=False):
+    """본문 해석 - 길이가 맞지 않으면 ProtocolError (prefix면 고정 부분 뒤에 가변 길이 본문 허용)"""
+    if len(payload) < layout.size or (not prefix and len(payload) != layout.size):
+        raise ProtocolError(f"본문 길이 오류: {len(payload)}바이트 (필요 {layout.size}바이트)")
+    return layout.unpack_from(payload)
+
+
+def frame(msg_type, payload=b''):
+    return FRAME_HEADER.pack(len(payload) + 1, msg_type) + payload
+
+
+async def read_frame(reader):
+    """(종류, 본문) 한 개 읽기 - 연결이 끊기면 asyncio.IncompleteReadError"""
+    length, msg_type = FRAME_HEADER.unpack(await reader.readexactly(FRAME_HEADER.size))
+    if length < 1 or length > MAX_FRAME_SIZE:
+        raise ProtocolError(f"프레임 길이 오류: {length}")
+    payload = await reader.readexactly(length - 1) if length > 1 else b''
+    return msg_type, payload
+
+
+# ----- 메시지 -----
+
+def pack_join(table=ANY_TABLE, seat=None, name=''):
+    return frame(MSG_JOIN, _JOIN.pack(table, _seat_byte(seat)) + name.encode('utf-8'))
+
+
+def unpack_join(payload):
+    table, seat = _unpack(_JOIN, payload, prefix=True)
+    return table, _seat_value(seat), payload[_JOIN.size:].decode('utf-8', 'replace')
+
+
+def pack_action(seq, action):
+    return frame(MSG_ACTION, _ACTION.pack(seq, action))
+
+
+def unpack_action(payload):
+    return _unpack(_ACTION, payload)
+
+
+def pack_welcome(table, seat):
+    return frame(MSG_WELCOME, _WELCOME.pack(table, seat))
+
+
+def unpack_welcome(payload):
+    return _unpack(_WELCOME, payload)
+
+
+def pack_hand(game_number, east, hand):
+    return frame(MSG_HAND, _HAND.pack(game_number, east) + bytes(tile_id(tile) for tile in hand))
+
+
+def unpack_hand(payload):
+    game_number, east = _unpack(_HAND, payload, prefix=True)
+    return game_number, east, [tile_name(value) for value in payload[_HAND.size:]]
+
+
+def pack_decision(seq, deadline_ms, decision_type, tile, mask_bits):
+    return frame(MSG_DECISION, _DECISION.pack(seq, deadline_ms, decision_type, tile_id(tile), mask_bits))
+
+
+def unpack_decision(payload):
+    seq, deadline_ms, decision_type, tile, mask_bits = _unpack(_DECISION, payload)
+    return seq, deadline_ms, decision_type, tile_name(tile), mask_bits
+
+
+def pack_event(kind, seat, tile):
+    return frame(MSG_EVENT, _EVENT.pack(kind, _seat_byte(seat), tile_id(tile)))
+
+
+def unpack_event(payload):
+    kind, seat, tile = _unpack(_EVENT, payload)
+    return kind, _seat_value(seat), tile_name(tile)
+
+
+def pack_hand_end(result_type, winner, loser, deltas):
+    return frame(MSG_HAND_END, _HAND_END.pack(RESULT_TYPES.index(result_type), _seat_byte(winner),
+                                              _seat_byte(loser), *deltas))
+
+
+def unpack_hand_end(payload):
+    result, winner, loser, *deltas = _unpack(_HAND_END, payload)
+    if result >= len(RESULT_TYPES):
+        raise ProtocolError(f"결과 종류 오류: {result}")
+    return RESULT_TYPES[result], _seat_value(winner), _seat_value(loser), deltas
+
+
+def pack_match_end(scores):
+    return frame(MSG_MATCH_END, _MATCH_END.pack(*scores))
+
+
+def unpack_match_end(payload):
+    return list(_unpack(_MATCH_END, payload))
+
+
+def pack_error(message):
+    return frame(MSG_ERROR, message.encode('utf-8'))
+
+
+def mask_to_bits(mask):
+    """불리언 액션 마스크 → 정수 비트"""
+    bits = 0
+    for index, allowed in enumerate(mask):
+        if allowed:
+            bits |= 1 << index
+    return bits
+
+
+def bits_to_actions(bits):
+    """비트 → 허용된 액션 번호 목록"""
+    actions = []
+    index = 0
+    while bits:
+        if bits & 1:
+            actions.append(index)
+        bits >>= 1
+        index += 1
+    return actions
@@ -0,0 +1,451 @@
+"""
+테이블 규칙 모듈 (pygame 없이 사용 가능)
+- 패 생성
+- 펑/깡/론/리치 가능 여부 및 액션 목록
+- 멜드를 포함한 화료 체크
+- 화료 점수 계산
+- 액션 번호 (학습 환경/서버/외부 봇 공통)
+"""
+
+from mahjong_game import is_winning_hand, hand_to_counts, NUM_TILE_KINDS
+from table_state import SeatState, TableState
+
+
+# 액션 번호: 0-33 버릴 패 종류, 이후 패스/펑/명깡/암깡/가깡
+ACTION_PASS = NUM_TILE_KINDS
+ACTION_PENG = NUM_TILE_KINDS + 1
+ACTION_MING_GANG = NUM_TILE_KINDS + 2
+ACTION_AN_GANG = NUM_TILE_KINDS + 3
+ACTION_JIA_GANG = NUM_TILE_KINDS + 4
+NUM_ACTIONS = NUM_TILE_KINDS + 5
+
+ACTION_TYPE_IDS = {
+    'peng': ACTION_PENG,
+    'ming_gang': ACTION_MING_GANG,
+    'an_gang': ACTION_AN_GANG,
+    'jia_gang': ACTION_JIA_GANG,
+}
+
+
+def create_tiles():
+    """마작 타일 생성 - 실제 파일 존재 여부 확인"""
+    tiles = []
+    
+    # 수패: 만자, 통자 각각 1-9 * 4장
+    suits = ['만', '통']
+    for suit in suits:
+        for num in range(1, 10):
+            for copy in range(1, 5):
+                tiles.append(f"{num}{suit}_{copy}.png")
+    
+    # 1삭은 꽃패로 사용하므로 포함 (2-9삭 이미지는 없음)
+    for copy in range(1, 5):
+        tiles.append(f"1삭_{copy}.png")
+    
+    # 풍패: 동남서북 각 4장
+    winds = ['동', '남', '서', '북']
+    for wind in winds:
+        for copy in range(1, 5):
+            tiles.append(f"{wind}_{copy}.png")
+    
+    # 삼원패: 중발백 각 4장
+    dragons = ['중', '발', '백']
+    for dragon in dragons:
+        for copy in range(1, 5):
+            tiles.append(f"{dragon}_{copy}.png")
+    
+    return tiles
+
+
+class TableRules:
+    """MahjongGame과 헤드리스 테이블이 함께 쓰는 규칙 메서드
+
+    사용하는 클래스는 hands, melds, flower_tiles, discard_piles, drawn_tile,
+    player_index, player_riichi 속성을 가져야 한다.
+    """
+
+    def can_riichi(self, player_idx):
+        """엎어 가능 여부 체크 - 론이 가능한 상태에서만 엎어 가능"""
+        if player_idx != self.player_index:
+            return False  # 플레이어만 엎어 가능
+        
+        # 이미 엎어했으면 불가능
+        if self.player_riichi:
+            return False
+        
+        # 멜드가 있으면 엎어 불가능 (멘젠이 아니므로)
+        if len(self.melds[player_idx]) > 0:
+            return False
+        
+        # 론이 가능한 상태인지 체크 (다른 플레이어가 버린 패로 화료 가능)
+        return self.can_ron_for_riichi(player_idx)
+
+    def can_ron_for_riichi(self, player_idx):
+        """엎어를 위한 론 가능 여부 체크 - 실제 게임에서 사용 가능한 패로 론이 가능한지"""
+        hand = self.hands[player_idx]
+        
+        # 실제 게임에서 사용 가능한 패 중 형태상 화료가 되는 패만 체크
+        available_tiles = self.get_available_tiles_for_tenpai()
+        
+        for tile in self.get_seat_state(player_idx).winning_candidates(available_tiles):
+            # 임시로 패를 추가해서 론 가능한지 체크
+            temp_hand = hand + [tile]
+            
+            # 멘젠 상태에서 론 가능한지 체크
+            if self.check_winning_hand_with_melds_temp(player_idx, temp_hand, is_tsumo=False):
+                return True
+        
+        return False
+
+    def is_tenpai(self, player_idx):
+        """간방 상태 체크 - 한 장만 들어오면 화료되는 상태"""
+        hand = self.hands[player_idx]
+        flower_count = len(self.flower_tiles[player_idx])
+        
+        # 현재 손패로 화료 가능한지 먼저 체크
+        if self.check_winning_hand_with_melds(player_idx, is_tsumo=True):
+            return True
+        
+        # 간방 상태 체크: 실제 게임에서 사용 가능한 패들 중 형태상 화료가 되는 패만 체크
+        # (패산에 남아있는 패들 + 다른 플레이어가 버린 패들)
+        available_tiles = self.get_available_tiles_for_tenpai()
+        
+        for tile in self.get_seat_state(player_idx).winning_candidates(available_tiles):
+            # 임시로 패를 추가해서 화료 가능한지 체크
+            temp_hand = hand + [tile]
+            
+            # 멜드를 포함한 화료 체크
+            if self.check_winning_hand_with_melds_temp(player_idx, temp_hand, is_tsumo=True):
+                return True
+        
+        return False
+
+    def get_available_tiles_for_tenpai(self):
+        """간방 체크용 사용 가능한 패 목록 반환 - 버려진 패 제외"""
+        # 버려진 패들을 수집
+        discarded_tiles = []
+        for discard_pile in self.discard_piles:
+            discarded_tiles.extend(discard_pile)
+        
+        # 각 플레이어의 손패와 멜드에서 사용된 패들 수집
+        used_tiles = []
+        for i in range(4):
+            used_tiles.extend(self.hands[i])
+            for meld in self.melds[i]:
+                if 'tiles' in meld:
+                    used_tiles.extend(meld['tiles'])
+        
+        # 꽃패들도 제외
+        for flower_tiles in self.flower_tiles:
+            used_tiles.extend(flower_tiles)
+        
+        # 사용된 패들의 기본 이름 추출 (복사본 제거)
+        used_base_tiles = set()
+        for tile in used_tiles + discarded_tiles:
+            base_name = tile.split('_')[0] if '_' in tile else tile.replace('.png', '')
+            used_base_tiles.add(base_name)
+        
+        # 사용 가능한 패들 생성 (사용되지 않은 패들만)
+        available_tiles = []
+        all_base_tiles = []
+        
+        # 숫자패 (1-9만, 1-9삭, 1-9통)
+        for number in range(1, 10):
+            for suit in ['만', '삭', '통']:
+                base_name = f"{number}{suit}"
+                all_base_tiles.append(base_name)
+        
+        # 바람패 (동, 남, 서, 북)
+        for wind in ['동', '남', '서', '북']:
+            all_base_tiles.append(wind)
+        
+        # 삼원패 (중, 발, 백)
+        for dragon in ['중', '발', '백']:
+            all_base_tiles.append(dragon)
+        
+        # 각 기본 패 타입에 대해 남은 개수 계산
+        for base_name in all_base_tiles:
+            # 해당 패가 몇 개 사용되었는지 계산
+            used_count = sum(1 for used in used_base_tiles if used == base_name)
+            
+            # 4개 미만으로 사용되었다면 남은 개수만큼 추가
+            remaining = 4 - used_count
+            if remaining > 0:
+                for i in range(remaining):
+                    available_tiles.append(f"{base_name}_1.png")
+        
+        return available_tiles
+
+    def can_peng(self, player_idx, tile):
+        """펑 가능 여부 체크 - 같은 패 2장 이상 보유"""
+        if not tile:
+            return False
+        tile_base = tile.split('_')[0]  # 패 이름만 추출
+        count = sum(1 for t in self.hands[player_idx] if t.split('_')[0] == tile_base)
+        return count >= 2
+
+    def can_ming_gang(self, player_idx, tile):
+        """명깡 가능 여부 체크 - 같은 패 3장 이상 보유"""
+        if not tile:
+            return False
+        tile_base = tile.split('_')[0]  # 패 이름만 추출
+        count = sum(1 for t in self.hands[player_idx] if t.split('_')[0] == tile_base)
+        return count >= 3
+
+    def can_an_gang(self, player_idx):
+        """암깡 가능 여부 체크 - 같은 패 4장 보유"""
+        tile_counts = {}
+        for tile in self.hands[player_idx]:
+            tile_base = tile.split('_')[0]
+            tile_counts[tile_base] = tile_counts.get(tile_base, 0) + 1
+        
+        # 4장 이상인 패들 반환
+        return [tile_base for tile_base, count in tile_counts.items() if count >= 4]
+
+    def can_jia_gang(self, player_idx, tile):
+        """가깡 가능 여부 체크"""
+        if not tile:
+            return []
+        
+        tile_base = tile.replace('.png', '').split('_')[0]
+        available_jia_gang = []
+        
+        for meld in self.melds[player_idx]:
+            if meld['type'] == 'peng':
+                # 멜드에서 타일 정보 가져오기
+                if 'tile' in meld:
+                    meld_tile_base = meld['tile'].split('_')[0]
+                elif 'tiles' in meld and meld['tiles']:
+                    # tiles 배열에서 첫 번째 타일 사용
+                    meld_tile_base = meld['tiles'][0].replace('.png', '').split('_')[0]
+                else:
+                    continue  # 타일 정보가 없으면 건너뛰기
+                
+                if meld_tile_base == tile_base:
+                    available_jia_gang.append(tile)
+        
+        return available_jia_gang
+
+    def get_available_actions(self, player_idx, discarded_tile, is_self_turn=False):
+        """플레이어가 사용할 수 있는 액션 목록 반환"""
+        actions = []
+        
+        if is_self_turn:
+            # 자기 턴에서 가능한 액션들
+            if self.drawn_tile:
+                # 암깡 체크
+                available_an_gang = self.can_an_gang(player_idx)
+                if available_an_gang:
+                    actions.append({'type': 'an_gang', 'tiles': available_an_gang})
+                
+                # 가깡 체크
+                available_jia_gang = self.can_jia_gang(player_idx, self.drawn_tile)
+                if available_jia_gang:
+                    actions.append({'type': 'jia_gang', 'tiles': available_jia_gang})
+            
+            # 엎어 체크 (뽑은 패가 있을 때만)
+            if self.drawn_tile and self.can_riichi(player_idx):
+                print(f"🎯 리치 가능! 간방 상태 확인됨")
+                actions.append({'type': 'riichi'})
+        else:
+            # 다른 플레이어가 버린 패에 대한 액션들
+            if discarded_tile:
+                # 론 체크
+                if self.can_ron_with_tile(player_idx, discarded_tile):
+                    actions.append({'type': 'ron', 'tile': discarded_tile})
+                
+                # 펑 체크
+                if self.can_peng(player_idx, discarded_tile):
+                    actions.append({'type': 'peng', 'tile': discarded_tile})
+                
+                # 명깡 체크
+                if self.can_ming_gang(player_idx, discarded_tile):
+                    actions.append({'type': 'ming_gang', 'tile': discarded_tile})
+        
+        return actions
+
+    def get_seat_state(self, player_idx):
+        """좌석 불변 상태 (손패 튜플 + 34종 개수 벡터) - 가정 체크/탐색용"""
+        return SeatState.create(self.hands[player_idx], self.melds[player_idx],
+                                self.flower_tiles[player_idx], self.discard_piles[player_idx])
+
+    def get_table_state(self):
+        """테이블 전체 불변 상태 (무르기/탐색용)"""
+        return TableState.from_table(self)
+
+    def get_meld_tiles(self, player_idx):
+        """플레이어 멜드별 대표 패 목록"""
+        meld_tiles = []
+        for meld in self.melds[player_idx]:
+            if 'tile' in meld:
+                meld_tiles.append(meld['tile'])
+            elif 'tiles' in meld and meld['tiles']:
+                meld_tiles.append(meld['tiles'][0])
+        return meld_tiles
+
+    def get_visible_tile_counts(self):
+        """모든 플레이어에게 공개된 패(버림패 + 멜드)의 34종 개수"""
+        visible_tiles = []
+        for player_idx in range(4):
+            visible_tiles.extend(self.discard_piles[player_idx])
+            for meld in self.melds[player_idx]:
+                visible_tiles.extend(meld.get('tiles', []))
+        return hand_to_counts(visible_tiles)
+
+    def check_winning_hand_with_melds(self, player_idx, is_tsumo=False):
+        """멜드를 포함한 화료 체크"""
+        hand = self.hands[player_idx]
+        melds = self.melds[player_idx]
+        flower_count = len(self.flower_tiles[player_idx])
+        
+        # 멘젠 여부 확인 (멜드가 없으면 멘젠)
+        is_menzen = len(melds) == 0
+        
+        # 멜드를 가상의 패로 변환하여 전체 패 구성 만들기
+        virtual_hand = hand.copy()
+        
+        # 각 멜드를 손패에 추가 (화료 체크용)
+        for meld in melds:
+            if meld['type'] in ['peng', 'ming_gang', 'an_gang', 'jia_gang']:
+                # 멜드에서 타일 정보 가져오기
+                if 'tile' in meld:
+                    tile_base = meld['tile'].split('_')[0] if '_' in meld['tile'] else meld['tile']
+                elif 'tiles' in meld and meld['tiles']:
+                    # tiles 배열의 첫 번째 패에서 타일 정보 가져오기
+                    tile_base = meld['tiles'][0].split('_')[0] if '_' in meld['tiles'][0] else meld['tiles'][0]
+                else:
+                    continue  # 타일 정보가 없으면 스킵
+                
+                if meld['type'] in ['ming_gang', 'an_gang', 'jia_gang']:
+                    # 깡은 4장이지만 화료 체크에서는 3장으로 계산
+                    virtual_hand.extend([tile_base + '_1.png'] * 3)
+                else:
+                    # 펑은 3장
+                    virtual_hand.extend([tile_base + '_1.png'] * 3)
+        
+        # 표준 화료 체크 실행 (멘젠 여부 전달)
+        result = is_winning_hand(virtual_hand, is_tsumo=is_tsumo, is_menzen=is_menzen, flower_count=flower_count)
+        return result
+
+    def check_winning_hand_with_melds_temp(self, player_idx, temp_hand, is_tsumo=False):
+        """임시 손패로 멜드를 포함한 화료 체크"""
+        melds = self.melds[player_idx]
+        flower_count = len(self.flower_tiles[player_idx])
+        
+        # 멘젠 여부 확인 (멜드가 없으면 멘젠)
+        is_menzen = len(melds) == 0
+        
+        # 멜드를 가상의 패로 변환하여 전체 패 구성 만들기
+        virtual_hand = temp_hand.copy()
+        
+        # 각 멜드를 손패에 추가 (화료 체크용)
+        for meld in melds:
+            if meld['type'] in ['peng', 'ming_gang', 'an_gang', 'jia_gang']:
+                # 멜드에서 타일 정보 가져오기
+                if 'tile' in meld:
+                    tile_base = meld['tile'].split('_')[0] if '_' in meld['tile'] else meld['tile']
+                elif 'tiles' in meld and meld['tiles']:
+                    # tiles 배열의 첫 번째 패에서 타일 정보 가져오기
+                    tile_base = meld['tiles'][0].split('_')[0] if '_' in meld['tiles'][0] else meld['tiles'][0]
+                else:
+                    continue  # 타일 정보가 없으면 스킵
+                
+                if meld['type'] in ['ming_gang', 'an_gang', 'jia_gang']:
+                    # 깡은 4장이지만 화료 체크에서는 3장으로 계산
+                    virtual_hand.extend([tile_base + '_1.png'] * 3)
+                else:
+                    # 펑은 3장
+                    virtual_hand.extend([tile_base + '_1.png'] * 3)
+        
+        # 표준 화료 체크 실행 (멘젠 여부 전달)
+        result = is_winning_hand(virtual_hand, is_tsumo=is_tsumo, is_menzen=is_menzen, flower_count=flower_count)
+        return result
+
+    def can_ron_with_tile(self, player_idx, discarded_tile):
+        """론 가능 여부 체크 - 버린 패를 받아서 화료할 수 있는지"""
+        # 임시로 버린 패를 손패에 추가
+        temp_hand = self.hands[player_idx] + [discarded_tile]
+        
+        # 멜드를 포함한 화료 체크
+        hand = temp_hand
+        melds = self.melds[player_idx]
+        flower_count = len(self.flower_tiles[player_idx])
+        
+        # 멘젠 여부 확인 (멜드가 없으면 멘젠)
+        is_menzen = len(melds) == 0
+        
+        # 론 체크 시점에서 손패 수 계산 (버린 패를 받은 상태)
+        expected_hand_size = 14 - (len(melds) * 3)
+        if len(hand) != expected_hand_size:
+            return False
+        
+        # 멜드를 가상의 패로 변환하여 전체 패 구성 만들기
+        virtual_hand = hand.copy()
+        
+        # 각 멜드를 손패에 추가 (화료 체크용)
+        for meld in melds:
+            if meld['type'] in ['peng', 'ming_gang', 'an_gang', 'jia_gang']:
+                # 멜드에서 타일 정보 가져오기
+                if 'tile' in meld:
+                    tile_base = meld['tile'].split('_')[0] if '_' in meld['tile'] else meld['tile']
+                elif 'tiles' in meld and meld['tiles']:
+                    # tiles 배열의 첫 번째 패에서 타일 정보 가져오기
+                    tile_base = meld['tiles'][0].split('_')[0] if '_' in meld['tiles'][0] else meld['tiles'][0]
+                else:
+                    continue  # 타일 정보가 없으면 스킵
+                
+                if meld['type'] in ['ming_gang', 'an_gang', 'jia_gang']:
+                    # 깡은 4장이지만 화료 체크에서는 3장으로 계산
+                    virtual_hand.extend([tile_base + '_1.png'] * 3)
+                else:
+                    # 펑은 3장
+                    virtual_hand.extend([tile_base + '_1.png'] * 3)
+        
+        # 표준 화료 체크 실행 (멘젠 여부 전달)
+        result = is_winning_hand(virtual_hand, is_tsumo=False, is_menzen=is_menzen, flower_count=flower_count)
+        return result
+
+    def calculate_win_points(self, result_type, yaku_list, flower_count, is_menzen, riichi_bonus=0):
+        """화료 점수 계산 (한국 마작 기준 - 멘젠쯔모, 겐쇼 포함)"""
+        # 기본 점수 설정
+        if result_type == "tsumo":
+            base_points = 10  # 쯔모: 10점
+        elif not is_menzen:
+            base_points = 2   # 멘젠이 깨진 상태: 2점
+        else:
+            base_points = 5   # 론 (멘젠): 5점
+        
+        # 역 보너스 계산
+        yaku_bonus = 0
+        for yaku in yaku_list:
+            if "탕야오" in yaku or "핀후" in yaku or "자풍" in yaku or "장풍" in yaku or "역패" in yaku or "멘젠쯔모" in yaku:
+                yaku_bonus += 1
+            elif "혼일색" in yaku or "이깡자" in yaku:
+                yaku_bonus += 2
+            elif "삼앙꼬" in yaku or "일기통관" in yaku or "칠대작" in yaku:
+                yaku_bonus += 4
+            elif "부지부" in yaku:
+                yaku_bonus += 5
+            elif "소삼원" in yaku:
+                yaku_bonus += 6
+            elif "청일색" in yaku or "대삼원" in yaku or "사앙꼬" in yaku or "소사희" in yaku:
+                yaku_bonus += 8
+            elif "천화" in yaku or "지화" in yaku or "인화" in yaku:
+                yaku_bonus += 16
+            elif "구려보등" in yaku:
+                yaku_bonus += 24
+            else:
+                yaku_bonus += 1
+        
+        # 멘젠쯔모 보너스
+        menzen_tsumo_bonus = 0
+        if result_type == "tsumo" and is_menzen:
+            menzen_tsumo_bonus = 1
+        
+        # 겐쇼 보너스
+        gensho_bonus = 0
+        if result_type == "tsumo":
+            gensho_bonus = 1  # 쯔모한 패 1장
+        
+        # 총 점수 계산
+        return base_points + yaku_bonus + menzen_tsumo_bonus + gensho_bonus + flower_count + riichi_bonus
@@ -0,0 +1,258 @@
+"""
+불변 테이블 상태 모듈 (pygame 없이 사용 가능)
+- SeatState: 좌석 1개 (손패/꽃패/버림패 튜플 + 34종 개수 벡터 + 멜드), 변경 시 새 객체 반환
+- TableState: 4좌석 + 턴/엎어/패산 포인터, 바뀐 좌석만 새로 만들고 나머지는 공유 (분기 비용 = 바뀐 부분)
+- 개수 벡터 기반 화료 형태 판정 (힌트/텐파이 체크의 빠른 사전 필터)
+- TableHistory: 턴 시작 상태 스택 (무르기)
+"""
+
+from collections import namedtuple
+from functools import lru_cache
+
+from mahjong_game import NUM_TILE_KINDS, tile_to_kind
+
+
+MELD_TYPES = ('peng', 'ming_gang', 'an_gang', 'jia_gang')
+HISTORY_LIMIT = 64  # 무르기용으로 보관하는 턴 수
+
+
+def _bump(counts, kind, delta):
+    """개수 벡터에서 kind 하나만 바꾼 새 튜플 (알 수 없는 패는 그대로)"""
+    if kind < 0:
+        return counts
+    return counts[:kind] + (counts[kind] + delta,) + counts[kind + 1:]
+
+
+def _counts_of(tiles):
+    counts = [0] * NUM_TILE_KINDS
+    for tile in tiles:
+        kind = tile_to_kind(tile)
+        if kind >= 0:
+            counts[kind] += 1
+    return tuple(counts)
+
+
+@lru_cache(maxsize=8192)
+def _can_form_sets(counts):
+    """남은 개수로 몸통(커쯔/슌쯔)만 만들 수 있는지 - 가장 앞 종류부터 분해"""
+    kind = next((i for i, count in enumerate(counts) if count), -1)
+    if kind < 0:
+        return True
+    count = counts[kind]
+    if count >= 3:
+        if _can_form_sets(_bump(counts, kind, -3)):
+            return True
+    # 순자는 수패(만/통/삭, 자패 27 이전)에서 같은 색 연속 3장
+    if kind < 27 and kind % 9 <= 6 and counts[kind + 1] and counts[kind + 2]:
+        rest = counts[:kind] + (count - 1, counts[kind + 1] - 1, counts[kind + 2] - 1) + counts[kind + 3:]
+        if _can_form_sets(rest):
+            return True
+    return False
+
+
+@lru_cache(maxsize=8192)
+def is_complete_counts(counts):
+    """14장 개수 벡터가 머리 1 + 몸통 4 형태인지 (check_basic_pattern과 같은 판정)"""
+    if sum(counts) != 14:
+        return False
+    for kind, count in enumerate(counts):
+        if count >= 2 and _can_form_sets(_bump(counts, kind, -2)):
+            return True
+    return False
+
+
+MeldState = namedtuple('MeldState', [
+    'type',         # peng / ming_gang / an_gang / jia_gang
+    'tile',         # 대표 패 (원래 멜드에 'tile' 키가 없으면 None)
+    'tiles',        # 패 튜플
+    'from_player',  # 펑/명깡 상대 (없으면 None)
+])
+
+
+def meld_state_from_dict(meld):
+    return MeldState(meld['type'], meld.get('tile'), tuple(meld.get('tiles') or ()), meld.get('from_player'))
+
+
+def meld_state_to_dict(meld):
+    result = {'type': meld.type, 'tiles': list(meld.tiles), 'from_player': meld.from_player}
+    if meld.tile is not None:
+        result['tile'] = meld.tile
+    return result
+
+
+def _meld_kind(meld):
+    """화료 체크에서 멜드를 대신하는 패 종류 (대표 패 → 첫 패 순)"""
+    tile = meld.tile or (meld.tiles[0] if meld.tiles else None)
+    return tile_to_kind(tile) if tile else -1
+
+
+class SeatState(namedtuple('SeatState', ['hand', 'counts', 'melds', 'flowers', 'discards'])):
+    """좌석 1개의 불변 상태 - 모든 변경 메서드는 새 SeatState 반환"""
+
+    __slots__ = ()
+
+    @classmethod
+    def create(cls, hand=(), melds=(), flowers=(), discards=()):
+        hand = tuple(hand)
+        melds = tuple(meld if isinstance(meld, MeldState) else meld_state_from_dict(meld) for meld in melds)
+        return cls(hand, _counts_of(hand), melds, tuple(flowers), tuple(discards))
+
+    @property
+    def is_menzen(self):
+        return not self.melds
+
+    def draw(self, tile):
+        """패 1장 추가 (쯔모/론 가정)"""
+        return self._replace(hand=self.hand + (tile,), counts=_bump(self.counts, tile_to_kind(tile), 1))
+
+    def discard(self, tile):
+        """손패에서 패 1장을 버림패로 이동"""
+        index = self.hand.index(tile)
+        return self._replace(hand=self.hand[:index] + self.hand[index + 1:],
+                             counts=_bump(self.counts, tile_to_kind(tile), -1),
+                             discards=self.discards + (tile,))
+
+    def add_flower(self, tile):
+        return self._replace(flowers=self.flowers + (tile,))
+
+    def add_meld(self, meld, removed_tiles=()):
+        """멜드 추가 (removed_tiles는 손패에서 빠지는 패)"""
+        hand = list(self.hand)
+        counts = self.counts
+        for tile in removed_tiles:
+            hand.remove(tile)
+            counts = _bump(counts, tile_to_kind(tile), -1)
+        if not isinstance(meld, MeldState):
+            meld = meld_state_from_dict(meld)
+        return self._replace(hand=tuple(hand), counts=counts, melds=self.melds + (meld,))
+
+    def upgrade_meld(self, meld, removed_tiles=()):
+        """가깡 - 같은 종류의 펑을 meld로 바꿈 (펑이 없으면 새로 추가)"""
+        if not isinstance(meld, MeldState):
+            meld = meld_state_from_dict(meld)
+        kind = _meld_kind(meld)
+        index = next((i for i, old in enumerate(self.melds) if old.type == 'peng' and _meld_kind(old) == kind), None)
+        seat = self.add_meld(meld, removed_tiles)
+        if index is None:
+            return seat
+        melds = seat.melds[:-1]
+        return seat._replace(melds=melds[:index] + (meld,) + melds[index + 1:])
+
+    def claim_discard(self, tile):
+        """버림패 더미 마지막 패를 다른 좌석이 가져감 (마지막 패가 tile일 때만)"""
+        if not self.discards or self.discards[-1] != tile:
+            return self
+        return self._replace(discards=self.discards[:-1])
+
+    def virtual_counts(self):
+        """멜드를 3장씩 펼친 개수 벡터 (check_winning_hand_with_melds의 가상 손패와 같은 구성)"""
+        counts = self.counts
+        for meld in self.melds:
+            if meld.type in MELD_TYPES:
+                counts = _bump(counts, _meld_kind(meld), 3)
+        return counts
+
+    def has_unknown_tiles(self):
+        """개수 벡터로 표현되지 않는 패가 있는지 (있으면 개수 기반 판정 불가)"""
+        return sum(self.counts) != len(self.hand)
+
+    def completes_with(self, tile):
+        """tile을 받으면 머리 1 + 몸통 4 형태가 되는지 (역 판정 전 빠른 필터)"""
+        kind = tile_to_kind(tile)
+        if kind < 0 or self.has_unknown_tiles():
+            return True  # 판정 불가 - 정식 체크에 맡김
+        return is_complete_counts(_bump(self.virtual_counts(), kind, 1))
+
+    def winning_candidates(self, tiles):
+        """tiles 중 형태상 화료가 되는 패 (종류별 판정은 한 번만)"""
+        virtual = None if self.has_unknown_tiles() else self.virtual_counts()
+        decided = {}
+        result = []
+        for tile in tiles:
+            kind = tile_to_kind(tile)
+            if virtual is None or kind < 0:
+                result.append(tile)
+                continue
+            complete = decided.get(kind)
+            if complete is None:
+                complete = decided[kind] = is_complete_counts(_bump(virtual, kind, 1))
+            if complete:
+                result.append(tile)
+        return result
+
+
+WallCursor = namedtuple('WallCursor', ['dealt_mask', 'dealt_count', 'regular_head', 'wang_tail'])
+
+
+class TableState(namedtuple('TableState', ['seats', 'current_turn', 'turn_counter', 'player_riichi',
+                                           'after_peng', 'last_discard_player', 'wall'])):
+    """테이블 전체 불변 상태 - 바뀐 좌석만 새로 만들고 나머지 좌석은 그대로 공유"""
+
+    __slots__ = ()
+
+    @classmethod
+    def from_table(cls, table):
+        """MahjongGame / HeadlessTable의 현재 상태 (리스트는 튜플로 복사)"""
+        seats = tuple(SeatState.create(table.hands[i], table.melds[i], table.flower_tiles[i], table.discard_piles[i])
+                      for i in range(4))
+        wall_manager = getattr(table, 'wall_manager', None)
+        wall = None
+        if wall_manager is not None:
+            wall = WallCursor(wall_manager.dealt_mask, wall_manager.dealt_count,
+                              wall_manager.regular_head, wall_manager.wang_tail)
+        return cls(seats, table.current_turn, getattr(table, 'turn_counter', 0),
+                   getattr(table, 'player_riichi', False), getattr(table, 'after_peng', False),
+                   getattr(table, 'last_discard_player', None), wall)
+
+    def with_seat(self, player_idx, seat):
+        return self._replace(seats=self.seats[:player_idx] + (seat,) + self.seats[player_idx + 1:])
+
+    def draw(self, player_idx, tile):
+        return self.with_seat(player_idx, self.seats[player_idx].draw(tile))
+
+    def discard(self, player_idx, tile):
+        return self.with_seat(player_idx, self.seats[player_idx].discard(tile))._replace(last_discard_player=player_idx)
+
+    def apply_to(self, table):
+        """상태를 테이블 객체에 되돌려 쓰기 (무르기) - 리스트/딕셔너리는 새로 만듦"""
+        table.hands = [list(seat.hand) for seat in self.seats]
+        table.melds = [[meld_state_to_dict(meld) for meld in seat.melds] for seat in self.seats]
+        table.flower_tiles = [list(seat.flowers) for seat in self.seats]
+        table.discard_piles = [list(seat.discards) for seat in self.seats]
+        table.current_turn = self.current_turn
+        table.turn_counter = self.turn_counter
+        table.player_riichi = self.player_riichi
+        table.after_peng = self.after_peng
+        table.last_discard_player = self.last_discard_player
+        if self.wall is not None:
+            wall_manager = table.wall_manager
+            wall_manager.dealt_mask = self.wall.dealt_mask
+            wall_manager.dealt_count = self.wall.dealt_count
+            wall_manager.regular_head = self.wall.regular_head
+            wall_manager.wang_tail = self.wall.wang_tail
+
+
+class TableHistory:
+    """턴 시작 상태 스택 - 상태가 불변이라 복사 없이 참조만 보관"""
+
+    def __init__(self, limit=HISTORY_LIMIT):
+        self.limit = limit
+        self.states = []
+
+    def push(self, state):
+        self.states.append(state)
+        if len(self.states) > self.limit:
+            del self.states[0]
+
+    def can_undo(self):
+        return len(self.states) >= 2
+
+    def undo(self):
+        """현재 턴을 버리고 직전 턴 시작 상태를 꺼내 반환 (없으면 None) - 그 턴을 다시 시작하면 다시 push됨"""
+        if not self.can_undo():
+            return None
+        self.states.pop()
+        return self.states.pop()
+
+    def clear(self):
+        self.states = []
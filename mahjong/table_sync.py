@@ -0,0 +1,443 @@
+"""
+테이블 상태 동기화 (관전자/원격 클라이언트용, pygame 없이 사용 가능)
+- SyncEncoder: EventLog 구독자 - 이벤트 1건을 몇 바이트짜리 델타 레코드로 인코딩 (패는 table_protocol의 1바이트 번호)
+- 보는 사람별 가림: 보는 좌석이 아니면 손패/뽑은 패/암깡으로 빠진 패는 TILE_NONE (reveal_all이면 모두 공개)
+- 판 시작과 keyframe_interval 이벤트마다 키프레임(전체 상태), 그 사이는 델타 - flush()가 쌓인 레코드를 프레임 1개로 묶음
+- SyncClient: 프레임을 받아 로컬 TableState 갱신 + 다시 그릴 렌더 레이어 표시
+  (순서 번호가 끊기면 다음 키프레임까지 델타를 버림)
+
+    python table_sync.py --hands 50     (턴당 바이트 수와 인코딩/적용 시간 측정, numpy 필요)
+"""
+
+import argparse
+import struct
+import sys
+import time
+
+from game_events import (GameEvent, MeldCall, HandResult, REDUCERS, EVENT_START, EVENT_DRAW, EVENT_DISCARD,
+                         EVENT_TURN, EVENT_PENG, EVENT_GANG, EVENT_WIN, EVENT_DRAW_GAME)
+from table_state import MeldState, SeatState, TableState, MELD_TYPES
+from table_protocol import (frame, tile_id, tile_name, FRAME_HEADER, MSG_SYNC_KEYFRAME, MSG_SYNC_DELTA, SEAT_NONE,
+                            RESULT_TYPES)
+
+
+DEFAULT_KEYFRAME_INTERVAL = 64  # 이 이벤트 수마다 flush 때 키프레임 추가
+
+# 렌더 레이어 (main.py RenderBatch 레이어 이름 + 배치를 쓰지 않는 영역)
+LAYER_PLAYER = 'player'
+LAYER_HINT = 'hint'
+LAYER_AI = 'ai'
+LAYER_DISCARDS = 'discards'
+LAYER_WALL = 'wall'
+LAYER_INFO = 'info'
+LAYER_DIALOG = 'dialog'
+ALL_LAYERS = frozenset((LAYER_PLAYER, LAYER_HINT, LAYER_AI, LAYER_DISCARDS, LAYER_WALL, LAYER_INFO, LAYER_DIALOG))
+
+_SEQ = struct.Struct('!I')
+_RECORD = struct.Struct('!BBB')      # kind, seat, tile
+_TURN = struct.Struct('!BBH')        # kind, seat, turn_counter
+_MELD = struct.Struct('!BBBB')       # type, tile, from_player, 패 수
+_RESULT = struct.Struct('!BB4h')     # result, from_player, 좌석별 점수 변화
+_TABLE = struct.Struct('!BHBBB')     # current_turn, turn_counter, riichi, after_peng, last_discard_player
+
+
+def _seat_byte(seat):
+    return SEAT_NONE if seat is None else seat
+
+
+def _seat_value(seat_byte):
+    return None if seat_byte == SEAT_NONE else seat_byte
+
+
+def _pack_tiles(out, tiles):
+    out.append(len(tiles))
+    out += bytes(tile_id(tile) for tile in tiles)
+
+
+def _unpack_tiles(payload, offset):
+    count = payload[offset]
+    end = offset + 1 + count
+    return tuple(tile_name(value) for value in payload[offset + 1:end]), end
+
+
+def _pack_meld(out, meld):
+    out += _MELD.pack(MELD_TYPES.index(meld.type), tile_id(meld.tile), _seat_byte(meld.from_player), len(meld.tiles))
+    out += bytes(tile_id(tile) for tile in meld.tiles)
+
+
+def _unpack_meld(payload, offset):
+    meld_type, tile, from_player, count = _MELD.unpack_from(payload, offset)
+    offset += _MELD.size
+    tiles = tuple(tile_name(value) for value in payload[offset:offset + count])
+    return MeldState(MELD_TYPES[meld_type], tile_name(tile), tiles, _seat_value(from_player)), offset + count
+
+
+# ----- 키프레임 (전체 상태) -----
+
+def pack_state(state, visible):
+    """TableState → 바이트 (visible에 없는 좌석 손패는 장수만 남기고 가림)"""
+    out = bytearray(_TABLE.pack(state.current_turn, state.turn_counter, state.player_riichi, state.after_peng,
+                                _seat_byte(state.last_discard_player)))
+    for index, seat in enumerate(state.seats):
+        _pack_tiles(out, seat.hand if index in visible else (None,) * len(seat.hand))
+        _pack_tiles(out, seat.flowers)
+        _pack_tiles(out, seat.discards)
+        out.append(len(seat.melds))
+        for meld in seat.melds:
+            _pack_meld(out, meld)
+    return out
+
+
+def unpack_state(payload, offset=0):
+    current_turn, turn_counter, riichi, after_peng, last_discard = _TABLE.unpack_from(payload, offset)
+    offset += _TABLE.size
+    seats = []
+    for _ in range(4):
+        hand, offset = _unpack_tiles(payload, offset)
+        flowers, offset = _unpack_tiles(payload, offset)
+        discards, offset = _unpack_tiles(payload, offset)
+        meld_count = payload[offset]
+        offset += 1
+        melds = []
+        for _ in range(meld_count):
+            meld, offset = _unpack_meld(payload, offset)
+            melds.append(meld)
+        seats.append(SeatState.create(hand, melds, flowers, discards))
+    return TableState(tuple(seats), current_turn, turn_counter, bool(riichi), bool(after_peng),
+                      _seat_value(last_discard), None)
+
+
+# ----- 델타 레코드 (이벤트 1건) -----
+
+def _pack_simple(out, event, tile):
+    out += _RECORD.pack(event.kind, _seat_byte(event.seat), tile_id(tile))
+
+
+def _pack_turn(out, event, tile):
+    out += _TURN.pack(event.kind, event.seat, event.detail)
+
+
+def _pack_call(out, event, tile):
+    call = event.detail
+    _pack_simple(out, event, tile)
+    _pack_meld(out, call.meld)
+    out.append(_seat_byte(call.from_player))
+    _pack_tiles(out, call.removed)
+
+
+def _pack_result(out, event, tile):
+    result = event.detail
+    _pack_simple(out, event, tile)
+    out += _RESULT.pack(RESULT_TYPES.index(result.result_type), _seat_byte(result.from_player), *result.score_deltas)
+
+
+def _unpack_simple(payload, offset):
+    kind, seat, tile = _RECORD.unpack_from(payload, offset)
+    return GameEvent(kind, _seat_value(seat), tile_name(tile), None), offset + _RECORD.size
+
+
+def _unpack_turn(payload, offset):
+    kind, seat, turn_counter = _TURN.unpack_from(payload, offset)
+    return GameEvent(kind, seat, None, turn_counter), offset + _TURN.size
+
+
+def _unpack_call(payload, offset):
+    event, offset = _unpack_simple(payload, offset)
+    meld, offset = _unpack_meld(payload, offset)
+    from_player = _seat_value(payload[offset])
+    removed, offset = _unpack_tiles(payload, offset + 1)
+    return event._replace(detail=MeldCall(meld, removed, from_player)), offset
+
+
+def _unpack_result(payload, offset):
+    event, offset = _unpack_simple(payload, offset)
+    result, from_player, *deltas = _RESULT.unpack_from(payload, offset)
+    return (event._replace(detail=HandResult(RESULT_TYPES[result], _seat_value(from_player), tuple(deltas))),
+            offset + _RESULT.size)
+
+
+# 이벤트 종류별 (인코더, 디코더) - EVENT_START는 키프레임으로만 보냄
+RECORD_CODECS = (
+    (None, None),
+    (_pack_simple, _unpack_simple),   # draw
+    (_pack_simple, _unpack_simple),   # flower
+    (_pack_simple, _unpack_simple),   # discard
+    (_pack_turn, _unpack_turn),       # turn
+    (_pack_call, _unpack_call),       # peng
+    (_pack_call, _unpack_call),       # gang
+    (_pack_simple, _unpack_simple),   # riichi
+    (_pack_result, _unpack_result),   # win
+    (_pack_result, _unpack_result),   # draw_game
+)
+
+
+def unpack_deltas(payload, offset=0):
+    """델타 프레임 본문(순서 번호 뒤) → GameEvent 목록"""
+    events = []
+    while offset < len(payload):
+        event, offset = RECORD_CODECS[payload[offset]][1](payload, offset)
+        events.append(event)
+    return events
+
+
+class SyncEncoder:
+    """보는 사람 1명(좌석 또는 관전자)용 동기화 스트림
+
+    EventLog에 attach하면 이벤트마다 델타 레코드를 쌓고, flush()가 그동안의 레코드를 프레임으로 묶어 돌려준다.
+    viewer가 None이면 공개 정보만 보는 관전자, reveal_all이면 모든 손패 공개 (리플레이/해설용).
+    """
+
+    def __init__(self, viewer=None, keyframe_interval=DEFAULT_KEYFRAME_INTERVAL, reveal_all=False):
+        self.viewer = viewer
+        self.keyframe_interval = keyframe_interval
+        self.visible = frozenset(range(4)) if reveal_all else frozenset(() if viewer is None else (viewer,))
+        self.state = None
+        self.seq = 0
+        self.records = bytearray()    # 아직 프레임으로 묶지 않은 델타 레코드
+        self.out = bytearray()        # flush()로 내보낼 프레임
+        self.since_keyframe = 0
+        self.frames_sent = 0
+        self.keyframes_sent = 0
+        self.bytes_sent = 0
+
+    def attach(self, event_log):
+        """이벤트 로그 구독 - 판 진행 중이면 현재 상태로 키프레임부터 시작"""
+        event_log.subscribe(self.on_event)
+        if event_log.state is not None:
+            self.state = event_log.state
+            self._keyframe()
+
+    def detach(self, event_log):
+        event_log.unsubscribe(self.on_event)
+
+    def on_event(self, event, state):
+        self.state = state
+        if event.kind == EVENT_START:
+            self._close_deltas()
+            self._keyframe()
+            return
+        tile = event.tile
+        if event.seat not in self.visible and event.kind == EVENT_DRAW:
+            tile = None
+        if (event.kind == EVENT_GANG and event.seat not in self.visible and event.detail.meld.type == 'an_gang'):
+            event = event._replace(detail=event.detail._replace(removed=(None,) * len(event.detail.removed)))
+        RECORD_CODECS[event.kind][0](self.records, event, tile)
+        self.since_keyframe += 1
+
+    def flush(self):
+        """쌓인 프레임 바이트 (델타 프레임 1개 + 주기가 되면 키프레임) - 보낼 것이 없으면 b''"""
+        self._close_deltas()
+        if self.since_keyframe >= self.keyframe_interval and self.state is not None:
+            self._keyframe()
+        data = bytes(self.out)
+        self.out.clear()
+        return data
+
+    def _close_deltas(self):
+        if not self.records:
+            return
+        self.seq += 1
+        self._write(MSG_SYNC_DELTA, _SEQ.pack(self.seq) + self.records)
+        self.records.clear()
+
+    def _keyframe(self):
+        self.seq += 1
+        self._write(MSG_SYNC_KEYFRAME, _SEQ.pack(self.seq) + pack_state(self.state, self.visible))
+        self.keyframes_sent += 1
+        self.since_keyframe = 0
+
+    def _write(self, msg_type, payload):
+        data = frame(msg_type, payload)
+        self.out += data
+        self.frames_sent += 1
+        self.bytes_sent += len(data)
+
+
+# ----- 클라이언트 -----
+
+def _reveal(state, seat_index, tiles):
+    """가려진 손패(None)를 실제 패로 바꿈 - 버림/멜드로 공개된 패를 기존 리듀서로 적용하기 전에 호출"""
+    seat = state.seats[seat_index]
+    hand = list(seat.hand)
+    changed = False
+    for tile in tiles:
+        if tile is None or tile in hand or None not in hand:
+            continue
+        hand[hand.index(None)] = tile
+        changed = True
+    if not changed:
+        return state
+    return state.with_seat(seat_index, SeatState.create(hand, seat.melds, seat.flowers, seat.discards))
+
+
+def _reveal_discard(state, event):
+    return _reveal(state, event.seat, (event.tile,))
+
+
+def _reveal_call(state, event):
+    return _reveal(state, event.seat, event.detail.removed)
+
+
+# 종류별 적용 전 공개 처리 (없으면 그대로 리듀서)
+REVEALERS = {EVENT_DISCARD: _reveal_discard, EVENT_PENG: _reveal_call, EVENT_GANG: _reveal_call}
+
+# 종류별로 다시 그릴 레이어 (SEAT는 그 좌석 영역으로 바뀜)
+SEAT = 'seat'
+EVENT_LAYERS = (
+    ALL_LAYERS,                                 # start
+    (SEAT, LAYER_WALL, LAYER_INFO),             # draw
+    (SEAT,),                                    # flower
+    (SEAT, LAYER_DISCARDS),                     # discard
+    (LAYER_INFO,),                              # turn
+    (SEAT, LAYER_DISCARDS),                     # peng
+    (SEAT, LAYER_DISCARDS, LAYER_WALL),         # gang
+    (SEAT, LAYER_INFO),                         # riichi
+    (LAYER_DIALOG, LAYER_INFO),                 # win
+    (LAYER_DIALOG, LAYER_INFO),                 # draw_game
+)
+
+
+class SyncClient:
+    """동기화 프레임 수신측 - 로컬 TableState와 다시 그릴 레이어(dirty) 유지
+
+    보는 좌석 영역은 LAYER_PLAYER/LAYER_HINT, 다른 좌석은 LAYER_AI로 표시한다 (관전자는 0번 좌석이 아래쪽).
+    렌더러는 프레임마다 take_dirty()로 바뀐 레이어만 다시 그린다.
+    """
+
+    def __init__(self, viewer=None):
+        self.viewer = viewer
+        self.bottom_seat = 0 if viewer is None else viewer
+        self.state = None
+        self.seq = 0
+        self.synced = False
+        self.dirty = set()
+        self.last_result = None   # 마지막 화료/유국 이벤트 (다음 판이 시작돼도 유지)
+        self.applied_events = 0
+        self.dropped_frames = 0
+
+    def apply_frame(self, msg_type, payload):
+        """프레임 1개 적용 (적용했으면 True, 순서가 끊긴 델타라 버렸으면 False)"""
+        seq, = _SEQ.unpack_from(payload)
+        if msg_type == MSG_SYNC_KEYFRAME:
+            self.state = unpack_state(payload, _SEQ.size)
+            self.seq = seq
+            self.synced = True
+            self.dirty |= ALL_LAYERS
+            return True
+        if msg_type != MSG_SYNC_DELTA:
+            return False
+        if not self.synced or seq != self.seq + 1:
+            self.synced = False  # 다음 키프레임까지 대기
+            self.dropped_frames += 1
+            return False
+        self.seq = seq
+        for event in unpack_deltas(payload, _SEQ.size):
+            self.apply_event(event)
+        return True
+
+    def apply_bytes(self, data):
+        """frame()으로 이어 붙인 바이트 묶음 적용 (SyncEncoder.flush() 결과) - 적용한 프레임 수"""
+        applied = 0
+        offset = 0
+        while offset < len(data):
+            length, msg_type = FRAME_HEADER.unpack_from(data, offset)
+            payload = data[offset + FRAME_HEADER.size:offset + FRAME_HEADER.size - 1 + length]
+            offset += FRAME_HEADER.size - 1 + length
+            applied += self.apply_frame(msg_type, payload)
+        return applied
+
+    def apply_event(self, event):
+        reveal = REVEALERS.get(event.kind)
+        state = self.state if reveal is None else reveal(self.state, event)
+        self.state = REDUCERS[event.kind](state, event)
+        if event.kind in (EVENT_WIN, EVENT_DRAW_GAME):
+            self.last_result = event
+        self.applied_events += 1
+        for layer in EVENT_LAYERS[event.kind]:
+            if layer != SEAT:
+                self.dirty.add(layer)
+            elif event.seat == self.bottom_seat:
+                self.dirty.add(LAYER_PLAYER)
+                self.dirty.add(LAYER_HINT)
+            else:
+                self.dirty.add(LAYER_AI)
+
+    def take_dirty(self):
+        """다시 그릴 레이어를 꺼내고 비움"""
+        dirty = self.dirty
+        self.dirty = set()
+        return dirty
+
+
+# ----- 벤치마크 -----
+
+def bench(hands=50, seed=0, keyframe_interval=DEFAULT_KEYFRAME_INTERVAL):
+    """HeadlessTable을 AI끼리 진행하며 좌석 0 / 관전자 스트림의 턴당 바이트와 인코딩/적용 시간 측정
+
+    턴이 넘어갈 때(와 판이 끝날 때)마다 flush해서 바로 클라이언트에 적용한다.
+    비교 기준 full_state_bytes_per_turn은 같은 시점 전체 상태를 매번 보냈을 때의 크기.
+    """
+    from mahjong_env import HeadlessTable
+
+    table = HeadlessTable(seed, agent_seats=(), total_games=hands, record_events=True)
+    viewers = {'seat0': SyncEncoder(0, keyframe_interval), 'spectator': SyncEncoder(None, keyframe_interval)}
+    clients = {'seat0': SyncClient(0), 'spectator': SyncClient(None)}
+    for encoder in viewers.values():
+        encoder.attach(table.event_log)
+    encode_ns = dict.fromkeys(viewers, 0)
+    apply_ns = dict.fromkeys(viewers, 0)
+    full_state_bytes = 0
+    turns = 0
+    events = 0
+
+    def on_turn(event, state):
+        nonlocal turns, full_state_bytes
+        turns += 1
+        full_state_bytes += len(pack_state(state, frozenset(range(4))))
+        for name, encoder in viewers.items():
+            started = time.perf_counter_ns()
+            data = encoder.flush()
+            encode_ns[name] += time.perf_counter_ns() - started
+            started = time.perf_counter_ns()
+            clients[name].apply_bytes(data)
+            apply_ns[name] += time.perf_counter_ns() - started
+
+    table.event_log.subscribe(on_turn, (EVENT_TURN, EVENT_WIN, EVENT_DRAW_GAME))
+    table.reset_match()
+    while not table.match_done:
+        table.start_hand()
+        events += len(table.event_log.events)
+    result = {'hands': hands, 'turns': turns, 'events': events,
+              'full_state_bytes_per_turn': full_state_bytes / max(1, turns)}
+    for name, encoder in viewers.items():
+        result[name] = {'bytes_per_turn': encoder.bytes_sent / max(1, turns),
+                        'keyframes': encoder.keyframes_sent,
+                        'encode_us_per_turn': encode_ns[name] / max(1, turns) / 1000,
+                        'apply_us_per_turn': apply_ns[name] / max(1, turns) / 1000,
+                        'dropped_frames': clients[name].dropped_frames}
+    return result
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog='python table_sync.py', description='상태 동기화 대역폭/비용 측정')
+    parser.add_argument('--hands', type=int, default=50, help='진행할 판 수')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--keyframe-interval', type=int, default=DEFAULT_KEYFRAME_INTERVAL)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    result = bench(args.hands, args.seed, args.keyframe_interval)
+    print(f"{result['hands']}판 / {result['turns']}턴 / 이벤트 {result['events']}개, "
+          f"전체 상태 {result['full_state_bytes_per_turn']:.0f}바이트")
+    for name in ('seat0', 'spectator'):
+        stats = result[name]
+        print(f"  {name}: 턴당 {stats['bytes_per_turn']:.1f}바이트, 키프레임 {stats['keyframes']}개, "
+              f"인코딩 {stats['encode_us_per_turn']:.1f}us / 적용 {stats['apply_us_per_turn']:.1f}us (턴당), "
+              f"버린 프레임 {stats['dropped_frames']}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# 모듈은 mahjong/ 디렉터리에서 바로 import 하는 스크립트 구성
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,62 @@
+"""배치 반응 평가 - 좌석별 평가 함수와 같은 결과"""
+
+import numpy as np
+
+from ai_batch import evaluate_reactions_batch, yaku_potential_batch, counts_to_tiles
+from mahjong_ai import evaluate_call, estimate_yaku_potential, MIN_OPEN_YAKU_POINTS
+from mahjong_game import NUM_TILE_KINDS, TILE_KINDS
+
+
+def _random_tables(rng, batch):
+    """(B, 4, 34) 손패 (일부 좌석은 멜드 1개) / 멜드 수 / 꽃패 / 버림패 종류 / 버린 좌석"""
+    hands = np.zeros((batch, 4, NUM_TILE_KINDS), dtype=np.int64)
+    melds = np.zeros_like(hands)
+    for b in range(batch):
+        wall = rng.permutation(np.repeat(np.arange(NUM_TILE_KINDS), 4))
+        position = 0
+        for seat in range(4):
+            size = 13
+            if rng.random() < 0.4:
+                kind = wall[position]
+                melds[b, seat, kind] = 1
+                size = 10
+            np.add.at(hands[b, seat], wall[position:position + size], 1)
+            position += size
+    # 버림패는 가장 많이 가진 종류 (펑/명깡 후보가 생기도록), 버린 좌석은 그 종류가 가장 적은 좌석
+    kinds = np.array([int(np.argmax(hands[b].max(axis=0))) for b in range(batch)])
+    discarders = np.array([int(np.argmin(hands[b, :, kinds[b]])) for b in range(batch)])
+    return hands, melds, np.zeros((batch, 4), dtype=np.int64), kinds, discarders
+
+
+def test_yaku_potential_batch_matches_scalar():
+    rng = np.random.default_rng(0)
+    hands, melds, *_ = _random_tables(rng, 64)
+    batch = yaku_potential_batch(hands, melds)
+    for b in range(64):
+        for seat in range(4):
+            meld_kinds = [kind for kind in range(NUM_TILE_KINDS) for _ in range(melds[b, seat, kind])]
+            assert batch[b, seat] == estimate_yaku_potential(list(hands[b, seat]), meld_kinds)
+
+
+def test_call_scores_match_evaluate_call():
+    rng = np.random.default_rng(1)
+    hands, melds, flowers, kinds, discarders = _random_tables(rng, 64)
+    result = evaluate_reactions_batch(hands, melds, flowers, kinds, discarders)
+    checked = scored = 0
+    for b in range(64):
+        for seat in range(4):
+            for call_type, score_key, accept_key in (('peng', 'peng_score', 'peng_accept'),
+                                                     ('ming_gang', 'gang_score', 'gang_accept')):
+                if not result[call_type][b, seat] or result['ron'][b, seat]:
+                    continue
+                evaluation = evaluate_call(counts_to_tiles(hands[b, seat]), TILE_KINDS[kinds[b]], call_type,
+                                           counts_to_tiles(melds[b, seat]))
+                assert result[accept_key][b, seat] == evaluation['accept']
+                if evaluation['yaku_potential'] < MIN_OPEN_YAKU_POINTS:
+                    assert np.isnan(result[score_key][b, seat])
+                else:
+                    assert result[score_key][b, seat] == evaluation['score']
+                    scored += 1
+                checked += 1
+    assert checked >= 64
+    assert 0 < scored < checked
@@ -0,0 +1,63 @@
+"""AI 캐시 - 이벤트로 갱신한 Zobrist 키, 캐시 파일"""
+
+from ai_cache import DecisionCache, ZobristTracker, hash_state
+from game_events import EVENT_TURN, EVENT_PENG, EVENT_GANG
+from mahjong_env import HeadlessTable
+from mahjong_ai import evaluate_discards
+from mahjong_game import hand_to_counts, NUM_TILE_KINDS
+
+
+def test_tracker_matches_full_hash():
+    checked = calls = 0
+    for seed in range(4):
+        table = HeadlessTable(seed, agent_seats=(), opponent_strategy='efficiency', total_games=2,
+                              record_events=True)
+        tracker = ZobristTracker()
+        tracker.attach(table.event_log)
+
+        def check(event, state):
+            nonlocal checked
+            visible = table.get_visible_tile_counts()
+            for seat in range(4):
+                expected = hash_state(hand_to_counts(table.hands[seat]), len(table.melds[seat]), visible)
+                assert tracker.keys[seat].value == expected
+            checked += 1
+
+        table.event_log.subscribe(check, (EVENT_TURN,))
+        while not table.match_done:
+            table.start_hand()
+        calls += table.event_log.counts[EVENT_PENG] + table.event_log.counts[EVENT_GANG]
+    assert checked > 100
+    assert calls > 0
+
+
+def test_cache_file_round_trip(tmp_path):
+    cache = DecisionCache()
+    counts = [0] * NUM_TILE_KINDS
+    for kind in (0, 1, 2, 13, 13, 24, 25, 26, 27, 27, 27, 18, 20, 17):
+        counts[kind] += 1
+    scores = evaluate_discards(counts)
+    assert scores
+    cache.put(hash_state(counts), scores)
+    cache.put(2 ** 64 - 1, ((-1, 12, 33), (0, 0, 0)))
+    path = str(tmp_path / 'ai.cache')
+    cache.save(path)
+
+    loaded = DecisionCache()
+    assert loaded.load(path) == 2
+    assert loaded.entries == cache.entries
+
+
+def test_cache_file_rejects_truncated_and_foreign_files(tmp_path):
+    cache = DecisionCache()
+    cache.put(1, ((1, 4, 2),))
+    path = str(tmp_path / 'ai.cache')
+    cache.save(path)
+    with open(path, 'rb') as f:
+        data = f.read()
+    with open(path, 'wb') as f:
+        f.write(data[:-2])
+    assert DecisionCache().load(path) == 0
+    with open(path, 'wb') as f:
+        f.write(b'\x80\x04not a cache file')
+    assert DecisionCache().load(path) == 0
@@ -0,0 +1,50 @@
+"""BotConnection - 기동 시간 여유와 멈춘 봇 재시작"""
+
+import os
+import sys
+
+from bot_protocol import BotConnection, legal_action_bits
+from mahjong_env import HeadlessTable
+
+MAHJONG_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 0.5초 늦게 뜨는 참고 봇
+SLOW_START_BOT = [sys.executable, '-c',
+                  'import sys, time, runpy\n'
+                  f'time.sleep(0.5)\nsys.path.insert(0, {MAHJONG_DIR!r})\nsys.argv = ["bot_protocol.py", "--bot"]\n'
+                  f'runpy.run_path({os.path.join(MAHJONG_DIR, "bot_protocol.py")!r}, run_name="__main__")']
+SILENT_BOT = [sys.executable, '-c', 'import sys\nfor line in sys.stdin: pass']
+
+
+def _discard_decision():
+    table = HeadlessTable(3, agent_seats=(0,), total_games=1)
+    table.start_hand()
+    observation = table.build_observation(table.decision['seat'])
+    return ('d', observation, legal_action_bits('d', observation['hand']))
+
+
+def test_startup_time_does_not_count_against_deadline():
+    connection = BotConnection(SLOW_START_BOT, deadline_ms=100, restart_after=1)
+    try:
+        decision = _discard_decision()
+        for _ in range(3):
+            connection.decide([decision])
+        summary = connection.summary()
+        assert summary['timeouts'] == 0
+        assert summary['restarts'] == 0
+    finally:
+        connection.close()
+
+
+def test_restart_after_consecutive_misses():
+    connection = BotConnection(SILENT_BOT, deadline_ms=20, restart_after=3, startup_ms=0)
+    try:
+        decision = _discard_decision()
+        connection.decide([decision])
+        connection.decide([decision])
+        assert connection.summary()['restarts'] == 0
+        connection.decide([decision])
+        assert connection.summary()['restarts'] == 1
+        assert connection.process is None  # 다음 묶음에서 다시 띄움
+    finally:
+        connection.close()
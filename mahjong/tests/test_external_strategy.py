@@ -0,0 +1,41 @@
+"""외부 봇 전략 - 기한 초과 시 대신 결정"""
+
+import random
+import sys
+
+from ai_strategies import create_strategy
+from mahjong_ai import ai_improved_discard
+from mahjong_env import HeadlessTable
+from mahjong_game import tile_to_kind
+
+# 요청을 읽기만 하고 응답하지 않는 봇
+SILENT_BOT = [sys.executable, '-c', 'import sys\nfor line in sys.stdin: pass']
+
+
+def test_timeout_discard_uses_ai_improved_discard():
+    table = HeadlessTable(7, agent_seats=(0,), total_games=1)
+    table.start_hand()
+    observation = table.build_observation(table.decision['seat'])
+    strategy = create_strategy('external', command=SILENT_BOT, deadline_ms=50, startup_ms=0)
+    try:
+        for seed in range(3):
+            random.seed(seed)
+            chosen = strategy.discard(observation)
+            random.seed(seed)
+            expected = ai_improved_discard(observation['hand'])
+            assert tile_to_kind(chosen) == tile_to_kind(expected)
+        assert strategy.connection.summary()['timeouts'] == 3
+    finally:
+        strategy.close()
+
+
+def test_timeout_reaction_passes():
+    table = HeadlessTable(7, agent_seats=(0,), total_games=1)
+    table.start_hand()
+    observation = table.build_observation(0)
+    strategy = create_strategy('external', command=SILENT_BOT, deadline_ms=50, startup_ms=0)
+    try:
+        peng = {'type': 'peng', 'tile': observation['hand'][0]}
+        assert strategy.react(observation, [peng]) is None
+    finally:
+        strategy.close()
@@ -0,0 +1,49 @@
+"""게임 서버 - 잘못된 프레임은 MSG_ERROR로 응답"""
+
+import asyncio
+import os
+
+import pytest
+
+from game_server import GameServer
+from table_protocol import (frame, pack_join, read_frame, unpack_action, ProtocolError, MSG_ACTION, MSG_ERROR,
+                            MSG_JOIN)
+
+
+async def _send_and_wait_error(path, frames):
+    reader, writer = await asyncio.open_unix_connection(path)
+    try:
+        for data in frames:
+            writer.write(data)
+        await writer.drain()
+        while True:
+            msg_type, payload = await asyncio.wait_for(read_frame(reader), 5)
+            if msg_type == MSG_ERROR:
+                return payload.decode('utf-8')
+    finally:
+        writer.close()
+
+
+def _run_with_server(tmp_path, frames_list):
+    async def run():
+        path = os.path.join(str(tmp_path), 'server.sock')
+        server = GameServer(2, seed=0, total_games=1)
+        await server.start(path=path)
+        try:
+            return [await _send_and_wait_error(path, frames) for frames in frames_list]
+        finally:
+            await server.close()
+    return asyncio.run(run())
+
+
+def test_truncated_action_frame_gets_error(tmp_path):
+    truncated_action = [pack_join(0, 0, 'bot'), frame(MSG_ACTION, b'\x00\x00\x01')]
+    truncated_join = [frame(MSG_JOIN, b'\x00\x00')]
+    errors = _run_with_server(tmp_path, [truncated_action, truncated_join])
+    assert all('본문 길이 오류' in error for error in errors)
+
+
+def test_unpack_rejects_wrong_size():
+    for payload in (b'', b'\x00' * 4, b'\x00' * 6):
+        with pytest.raises(ProtocolError):
+            unpack_action(payload)
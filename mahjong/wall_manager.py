@@ -1,74 +1,317 @@
+from collections import namedtuple
+from functools import lru_cache
+from types import MappingProxyType
+
 import pygame
 from mahjong_resources import TABLE_CENTER_X, TABLE_CENTER_Y, TILE_SIZE_DISCARD, SCREEN_WIDTH, SCREEN_HEIGHT
+from render_batch import RenderBatch
+
+
+# 패산 구조: 4면 × 13스택 × 2층 = 104장
+STACKS_PER_WALL = 13
+LAYERS_PER_STACK = 2
+TOTAL_WALLS = 4
+TILES_PER_WALL = STACKS_PER_WALL * LAYERS_PER_STACK
+TOTAL_WALL_TILES = TILES_PER_WALL * TOTAL_WALLS
+
+# 마작 방향 시계방향 순서 (고정)
+MAHJONG_CLOCKWISE_ORDER = ('동', '남', '서', '북')
+
+# 화면 위치 시계방향 순서 (테이블 중심 관점: 상단→우측→하단→좌측)
+SCREEN_CLOCKWISE_ORDER = ('top', 'right', 'bottom', 'left')
+
+# 화면 중심에서 각 플레이어를 바라보는 관점: 시계방향 스택 진행 (시작, 끝, 방향)
+SCREEN_STACK_DIRECTIONS = MappingProxyType({
+    'top': (0, 12, 1),     # 상단: 왼쪽→오른쪽 (0→12)
+    'right': (0, 12, 1),   # 우측: 위→아래 (0→12)
+    'bottom': (12, 0, -1), # 하단: 오른쪽→왼쪽 (12→0)
+    'left': (12, 0, -1)    # 좌측: 아래→위 (12→0)
+})
+
+# 화면 위치별 패산 회전 각도
+SCREEN_WALL_ROTATION = MappingProxyType({'top': 0, 'right': 90, 'bottom': 0, 'left': -90})
+
+
+def _build_wall_screen_coords():
+    """패 인덱스별 화면 좌표 (화면 시계방향 순서로 면마다 스택0→12, 아래층→위층)
+
+    패 인덱스와 (화면 위치, 스택, 층)의 대응은 주사위/동가와 무관하므로 한 번만 계산
+    """
+    wall_tile_size = TILE_SIZE_DISCARD
+    coords = []
+    screens = []
+    for screen_pos in SCREEN_CLOCKWISE_ORDER:
+        if screen_pos == 'bottom':
+            start_x = TABLE_CENTER_X - (STACKS_PER_WALL * (wall_tile_size[0] + 1)) // 2
+            start_y = SCREEN_HEIGHT - 220
+            dx, dy = wall_tile_size[0] + 1, 0
+        elif screen_pos == 'top':
+            start_x = TABLE_CENTER_X - (STACKS_PER_WALL * (wall_tile_size[0] + 1)) // 2
+            start_y = 125
+            dx, dy = wall_tile_size[0] + 1, 0
+        elif screen_pos == 'right':
+            # 좌측과 대칭으로 우측 패산 위치 설정
+            start_x = SCREEN_WIDTH - 280 - wall_tile_size[1]  # 좌측 280과 대칭
+            start_y = TABLE_CENTER_Y - (STACKS_PER_WALL * (wall_tile_size[0] + 1)) // 2 - (wall_tile_size[0] // 2)
+            dx, dy = 0, wall_tile_size[0] + 1
+        else:  # left
+            start_x = 280
+            start_y = TABLE_CENTER_Y - (STACKS_PER_WALL * (wall_tile_size[0] + 1)) // 2 - (wall_tile_size[0] // 2)
+            dx, dy = 0, wall_tile_size[0] + 1
+
+        for stack in range(STACKS_PER_WALL):
+            for layer in range(LAYERS_PER_STACK):
+                coords.append((start_x + stack * dx - layer * 2, start_y + stack * dy - layer * 4))
+                screens.append(screen_pos)
+    return tuple(coords), tuple(screens)
+
+
+# 모든 패산 레이아웃이 공유하는 좌표 테이블 (렌더러와 get_wall_tile_position 공용)
+WALL_TILE_COORDS, WALL_TILE_SCREENS = _build_wall_screen_coords()
+
+
+def wall_tile_index(screen_pos, stack, layer):
+    """(화면 위치, 스택, 층) → 패 인덱스"""
+    return SCREEN_CLOCKWISE_ORDER.index(screen_pos) * TILES_PER_WALL + stack * LAYERS_PER_STACK + layer
+
+
+# 패산 색상 (스택+층 순서로 반복)
+WALL_COLORS = (
+    (100, 50, 50),    # 어두운 적색
+    (50, 100, 50),    # 어두운 녹색
+    (50, 50, 100),    # 어두운 청색
+    (100, 100, 50),   # 어두운 황색
+    (100, 50, 100),   # 어두운 자색
+    (50, 100, 100),   # 어두운 청록색
+)
+
+# 화면 렌더링 순서 (겹치는 부분이 있어 기존 순서 유지)
+WALL_RENDER_ORDER = ('bottom', 'top', 'left', 'right')
+
+_wall_sprite_entries = None
+
+
+def _build_wall_tile_surface(color, rotate_angle):
+    """패산 패 뒷면 서피스 (색상 + 테두리 + 점 무늬)"""
+    wall_tile_size = TILE_SIZE_DISCARD
+    tile_surface = pygame.Surface(wall_tile_size)
+    tile_surface.fill(color)
+    pygame.draw.rect(tile_surface, (30, 30, 30), tile_surface.get_rect(), 2)
+
+    # 패턴 추가
+    pattern_size = 4
+    for px in range(3):
+        for py in range(4):
+            pattern_x = 8 + px * 10
+            pattern_y = 8 + py * 10
+            if pattern_x < wall_tile_size[0] - 8 and pattern_y < wall_tile_size[1] - 8:
+                pattern_rect = pygame.Rect(pattern_x, pattern_y, pattern_size, pattern_size)
+                pygame.draw.rect(tile_surface, (200, 200, 200), pattern_rect)
+
+    if rotate_angle != 0:
+        tile_surface = pygame.transform.rotate(tile_surface, rotate_angle)
+    return tile_surface
+
+
+def _build_wall_shadow_surface(rotate_angle):
+    """아래층 패 그림자 서피스"""
+    shadow_surface = pygame.Surface(TILE_SIZE_DISCARD)
+    shadow_surface.fill((20, 20, 20))
+    shadow_surface.set_alpha(80)
+    if rotate_angle != 0:
+        shadow_surface = pygame.transform.rotate(shadow_surface, rotate_angle)
+    return shadow_surface
+
+
+def get_wall_sprite_entries():
+    """렌더링 순서대로 (패 인덱스, ((서피스, 좌표), ...)) 목록 - 처음 호출 시 한 번만 생성
+
+    패 서피스는 색상 6가지 × 회전 3가지뿐이라 공유하고, 그림자는 아래층에만 붙인다.
+    """
+    global _wall_sprite_entries
+    if _wall_sprite_entries is None:
+        tile_surfaces = {}
+        shadow_surfaces = {}
+        entries = []
+        for screen_pos in WALL_RENDER_ORDER:
+            rotate_angle = SCREEN_WALL_ROTATION[screen_pos]
+            for stack in range(STACKS_PER_WALL):
+                for layer in range(LAYERS_PER_STACK):
+                    tile_index = wall_tile_index(screen_pos, stack, layer)
+                    tile_x, tile_y = WALL_TILE_COORDS[tile_index]
+                    color_idx = (stack + layer) % len(WALL_COLORS)
+                    key = (color_idx, rotate_angle)
+                    if key not in tile_surfaces:
+                        tile_surfaces[key] = _build_wall_tile_surface(WALL_COLORS[color_idx], rotate_angle)
+                    sprites = []
+                    if layer == 0:
+                        if rotate_angle not in shadow_surfaces:
+                            shadow_surfaces[rotate_angle] = _build_wall_shadow_surface(rotate_angle)
+                        sprites.append((shadow_surfaces[rotate_angle], (tile_x + 3, tile_y + 3)))
+                    sprites.append((tile_surfaces[key], (tile_x, tile_y)))
+                    entries.append((tile_index, tuple(sprites)))
+        _wall_sprite_entries = tuple(entries)
+    return _wall_sprite_entries
+
+
+WallLayout = namedtuple('WallLayout', [
+    'dice_sum',
+    'screen_to_direction',   # {화면 위치: 방향}
+    'direction_to_screen',   # {방향: 화면 위치}
+    'wall_state',            # {(면, 스택, 층): 패 인덱스}
+    'index_positions',       # 패 인덱스별 (면, 스택, 층)
+    'regular_start',         # 일반패 시작 (면, 스택, 층)
+    'wang_start',            # 왕패 시작 (면, 스택, 층)
+    'regular_order',         # 일반패 뽑기 순서 (패 인덱스, 시계방향 한 바퀴)
+    'wang_order',            # 왕패 뽑기 경로 (패 인덱스, 반복 구간 포함)
+    'wang_cycle_start',      # 왕패 경로 끝에서 돌아갈 위치
+])
+
+
+def get_wall_layout(dice_sum, player_directions):
+    """주사위 합과 화면 위치별 방향으로 패산 레이아웃 선택 (11가지 주사위 합 × 4 동가 = 44가지, 캐시)"""
+    wall_directions = tuple(player_directions[screen_pos] for screen_pos in SCREEN_CLOCKWISE_ORDER)
+    return _build_wall_layout(dice_sum, wall_directions)
+
+
+@lru_cache(maxsize=None)
+def _build_wall_layout(dice_sum, wall_directions):
+    """패산 레이아웃 계산 - 일반패/왕패 뽑기 순서를 불변 튜플로"""
+    screen_to_direction = dict(zip(SCREEN_CLOCKWISE_ORDER, wall_directions))
+    direction_to_screen = {v: k for k, v in screen_to_direction.items()}
+
+    # 화면 시계방향 순서로 패 배치 (상단→우측→하단→좌측)
+    wall_state = {}
+    index_positions = []
+    for screen_pos in SCREEN_CLOCKWISE_ORDER:
+        wall_name = screen_to_direction[screen_pos]
+        for stack in range(STACKS_PER_WALL):
+            for layer in range(LAYERS_PER_STACK):
+                wall_state[(wall_name, stack, layer)] = len(index_positions)
+                index_positions.append((wall_name, stack, layer))
+
+    def next_wall(wall, step):
+        """화면 시계방향(step=1)/반시계방향(step=-1)으로 이웃 면"""
+        index = SCREEN_CLOCKWISE_ORDER.index(direction_to_screen[wall])
+        return screen_to_direction[SCREEN_CLOCKWISE_ORDER[(index + step) % 4]]
+
+    def counter_clockwise_prev_stack(wall, stack):
+        """현재 면에서 반시계방향으로 이전 스택 (None이면 면 끝)"""
+        start, end, direction = SCREEN_STACK_DIRECTIONS[direction_to_screen[wall]]
+        # 반시계방향이므로 방향을 반대로
+        wang_direction = -direction
+        prev_stack = stack + wang_direction
+        if wang_direction > 0:  # 증가 방향
+            return prev_stack if prev_stack <= end else None
+        return prev_stack if prev_stack >= start else None
+
+    def counter_clockwise_last_stack(wall):
+        """각 면의 반시계방향 마지막 스택 (시계방향의 반대 끝점)"""
+        start, end, direction = SCREEN_STACK_DIRECTIONS[direction_to_screen[wall]]
+        return end if direction > 0 else start
+
+    def next_regular(wall, stack, layer):
+        """일반패 다음 위치 (2층→1층→다음스택 2층→1층...)"""
+        if layer == 1:
+            return wall, stack, 0
+        start, end, direction = SCREEN_STACK_DIRECTIONS[direction_to_screen[wall]]
+        next_stack = stack + direction
+        if (direction > 0 and next_stack <= end) or (direction < 0 and next_stack >= end):
+            return wall, next_stack, 1
+        wall = next_wall(wall, 1)
+        return wall, SCREEN_STACK_DIRECTIONS[direction_to_screen[wall]][0], 1
+
+    def next_wang(wall, stack, layer):
+        """왕패 다음 위치 (일반패의 반대 - 반시계방향)"""
+        if layer == 1:
+            return wall, stack, 0
+        prev_stack = counter_clockwise_prev_stack(wall, stack)
+        if prev_stack is not None:
+            return wall, prev_stack, 1
+        wall = next_wall(wall, -1)
+        return wall, counter_clockwise_last_stack(wall), 1
+
+    # 주사위 합으로 시작 화면 위치 결정 (동가부터 화면 시계방향으로 카운트)
+    east_screen_index = SCREEN_CLOCKWISE_ORDER.index(direction_to_screen['동'])
+    start_screen_pos = SCREEN_CLOCKWISE_ORDER[(east_screen_index + dice_sum - 1) % 4]
+
+    # 주사위 합으로 시작 스택 결정 (화면 위치별 시계방향 고려, 면 끝을 넘지 않도록 제한)
+    base_stack = (dice_sum - 1) % STACKS_PER_WALL
+    start, end, direction = SCREEN_STACK_DIRECTIONS[start_screen_pos]
+    start_stack = min(start + base_stack, end) if direction > 0 else max(start - base_stack, end)
+
+    # 일반패는 위층부터 시작
+    regular_start = (screen_to_direction[start_screen_pos], start_stack, 1)
+
+    # 왕패는 일반패 시작 위치에서 반시계방향으로 한 스택 이전의 위층부터
+    wang_wall, wang_stack, _ = regular_start
+    prev_stack = counter_clockwise_prev_stack(wang_wall, wang_stack)
+    if prev_stack is None:
+        wang_wall = next_wall(wang_wall, -1)
+        prev_stack = counter_clockwise_last_stack(wang_wall)
+    wang_start = (wang_wall, prev_stack, 1)
+
+    regular_order = []
+    position = regular_start
+    for _ in range(TOTAL_WALL_TILES):
+        regular_order.append(wall_state[position])
+        position = next_regular(*position)
+
+    # 왕패 이동은 면에 따라 한 바퀴가 아니라 일부만 도는 경우가 있어 위치가 반복될 때까지 기록
+    seen = {}
+    wang_order = []
+    position = wang_start
+    while position not in seen:
+        seen[position] = len(wang_order)
+        wang_order.append(wall_state[position])
+        position = next_wang(*position)
+
+    return WallLayout(
+        dice_sum=dice_sum,
+        screen_to_direction=MappingProxyType(screen_to_direction),
+        direction_to_screen=MappingProxyType(direction_to_screen),
+        wall_state=MappingProxyType(wall_state),
+        index_positions=tuple(index_positions),
+        regular_start=regular_start,
+        wang_start=wang_start,
+        regular_order=tuple(regular_order),
+        wang_order=tuple(wang_order),
+        wang_cycle_start=seen[position],
+    )
+
 
 class WallManager:
     """한국 마작 패산 관리자 - 정확한 패산 뽑기 방식 구현"""
     
-    def __init__(self, wall_tiles, screen):
+    STACKS_PER_WALL = STACKS_PER_WALL
+    LAYERS_PER_STACK = LAYERS_PER_STACK
+    TOTAL_WALLS = TOTAL_WALLS
+    MAHJONG_CLOCKWISE_ORDER = MAHJONG_CLOCKWISE_ORDER
+    SCREEN_CLOCKWISE_ORDER = SCREEN_CLOCKWISE_ORDER
+    SCREEN_STACK_DIRECTIONS = SCREEN_STACK_DIRECTIONS
+    
+    def __init__(self, wall_tiles, screen, verbose=False, render_batch=None):
         self.wall_tiles = wall_tiles  # 104장의 패 리스트
         self.screen = screen
+        self.render_batch = render_batch if render_batch is not None else RenderBatch(screen)
+        self.verbose = verbose  # 뽑을 때마다 디버그 출력 여부
         
-        # 패산 구조: 4면 × 13스택 × 2층 = 104장
-        self.STACKS_PER_WALL = 13
-        self.LAYERS_PER_STACK = 2
-        self.TOTAL_WALLS = 4
-        
-        # 마작 방향 시계방향 순서 (고정)
-        self.MAHJONG_CLOCKWISE_ORDER = ['동', '남', '서', '북']
-        
-        # 화면 위치 시계방향 순서 (테이블 중심 관점: 상단→우측→하단→좌측)
-        self.SCREEN_CLOCKWISE_ORDER = ['top', 'right', 'bottom', 'left']
-        
-        # 화면 중심에서 각 플레이어를 바라보는 관점: 시계방향 스택 진행
-        # 상단: 왼쪽→오른쪽 (0→12) - 작동함
-        # 우측: 위→아래 (0→12) - 작동함  
-        # 하단: 오른쪽→왼쪽 (12→0) - 수정 필요
-        # 좌측: 아래→위 (12→0) - 수정 필요
-        self.SCREEN_STACK_DIRECTIONS = {
-            'top': (0, 12, 1),     # 상단: 왼쪽→오른쪽 (0→12)
-            'right': (0, 12, 1),   # 우측: 위→아래 (0→12)
-            'bottom': (12, 0, -1), # 하단: 오른쪽→왼쪽 (12→0)
-            'left': (12, 0, -1)    # 좌측: 아래→위 (12→0)
-        }
-        
-        # 동가 위치에 따른 방향 매핑 (게임 시작시 설정됨)
+        # 주사위 결정 시 선택되는 패산 레이아웃 (동가 위치에 따른 방향 매핑, 뽑기 순서)
+        self.layout = None
         self.direction_to_screen = {}
         self.screen_to_direction = {}
-        
-        # 패산 상태 추적
         self.wall_state = {}  # {(wall, stack, layer): tile_index}
-        self.dealt_tiles = set()  # 뽑힌 패의 인덱스들
-        
-        # 현재 뽑기 위치 추적
-        self.current_wall = None      # 현재 뽑고 있는 면 ('동', '남', '서', '북')
-        self.current_stack = None     # 현재 뽑고 있는 스택 (0~12)
-        self.current_layer = None     # 현재 뽑고 있는 층 (0=아래층, 1=위층)
-        
-        # 왕패 뽑기 위치 추적 (꽃패 보충용)
-        self.wang_wall = None
-        self.wang_stack = None
-        self.wang_layer = None
         
-        self._initialize_wall_state()
-    
-    def _initialize_wall_state(self):
-        """패산 상태 초기화 - 화면 시계방향 순서로 패 배치"""
-        # 이 메서드는 set_dice_start_position에서 매핑이 설정된 후 호출되어야 함
-        pass
-    
-    def _setup_wall_state_with_mapping(self):
-        """매핑 설정 후 패산 상태 초기화"""
-        tile_index = 0
-        
-        # 화면 시계방향 순서로 패 배치 (상단→우측→하단→좌측)
-        # 각 면은 화면 중심에서 바라본 관점으로 왼쪽(0)→오른쪽(12) 순서
-        for screen_pos in self.SCREEN_CLOCKWISE_ORDER:
-            wall_name = self.screen_to_direction.get(screen_pos)
-            if wall_name:
-                for stack in range(self.STACKS_PER_WALL):
-                    for layer in range(self.LAYERS_PER_STACK):
-                        self.wall_state[(wall_name, stack, layer)] = tile_index
-                        tile_index += 1
+        # 패산 상태 추적
+        self.dealt_mask = 0  # 뽑힌 패 비트셋 (비트 i = 패 인덱스 i, 좌표 테이블과 같은 순서)
+        self.dealt_count = 0
+        
+        # 뽑기 포인터 (레이아웃의 순서 배열 위치)
+        self.regular_order = ()
+        self.regular_head = 0
+        self.wang_order = ()
+        self.wang_cycle_start = 0
+        self.wang_tail = 0
     
     def set_dice_start_position(self, dice_sum, player_directions):
         """주사위 합과 플레이어 방향 정보로 시작 위치 설정
@@ -77,259 +320,89 @@ class WallManager:
             dice_sum: 주사위 두 개의 합 (2~12)
             player_directions: {'bottom': '동', 'left': '남', 'top': '서', 'right': '북'}
         """
-        print(f"[DEBUG] 주사위 합: {dice_sum}, 플레이어 방향: {player_directions}")
-        
-        # 동가 위치에 따른 방향 매핑 설정
-        self.screen_to_direction = player_directions.copy()
-        self.direction_to_screen = {v: k for k, v in player_directions.items()}
-        
-        # 매핑 설정 후 패산 상태 초기화
-        self._setup_wall_state_with_mapping()
-        
-        # 동가 화면 위치 찾기
-        east_screen_pos = self.direction_to_screen['동']
-        east_screen_index = self.SCREEN_CLOCKWISE_ORDER.index(east_screen_pos)
-        
-        # 주사위 합으로 시작 화면 위치 결정 (동가부터 화면 시계방향으로 카운트)
-        start_screen_index = (east_screen_index + dice_sum - 1) % 4
-        start_screen_pos = self.SCREEN_CLOCKWISE_ORDER[start_screen_index]
-        start_wall = self.screen_to_direction[start_screen_pos]
-        
-        # 주사위 합으로 시작 스택 결정 (화면 위치별 시계방향 고려)
-        base_stack = (dice_sum - 1) % self.STACKS_PER_WALL
-        start_stack = self._get_actual_start_stack(start_screen_pos, base_stack)
-        
-        # 일반패 뽑기 시작 위치 설정
-        self.current_wall = start_wall
-        self.current_stack = start_stack
-        self.current_layer = 1  # 위층부터 시작
-        
-        # 왕패 뽑기 시작 위치 설정 (일반패의 정확한 반대 방향)
-        self.wang_wall = self.current_wall
-        self.wang_stack = self.current_stack
-        self.wang_layer = 1  # 2층(위층)부터 시작
-        
-        # 일반패 시작 위치에서 반시계방향으로 한 위치 이전으로 이동
-        self._move_wang_to_counter_clockwise_previous()
-        
-        print(f"[DEBUG] 일반패 시작: {self.current_wall}면 {self.current_stack}스택 {self.current_layer}층")
-        print(f"[DEBUG] 왕패 시작: {self.wang_wall}면 {self.wang_stack}스택 {self.wang_layer}층")
-    
-    def _get_actual_start_stack(self, screen_pos, base_stack):
-        """화면 위치별 시계방향을 고려한 실제 시작 스택 계산"""
-        start, end, direction = self.SCREEN_STACK_DIRECTIONS[screen_pos]
-        
-        if direction > 0:  # 증가 방향 (상단, 우측)
-            result = start + base_stack
-            return min(result, end)  # end를 넘지 않도록 제한
-        else:  # 감소 방향 (하단, 좌측)
-            result = start - base_stack
-            return max(result, end)  # end 이상으로 제한
+        if self.verbose:
+            print(f"[DEBUG] 주사위 합: {dice_sum}, 플레이어 방향: {player_directions}")
+        
+        # 미리 계산된 레이아웃 선택 - 이후 뽑기는 포인터 이동만
+        layout = get_wall_layout(dice_sum, player_directions)
+        self.layout = layout
+        self.screen_to_direction = layout.screen_to_direction
+        self.direction_to_screen = layout.direction_to_screen
+        self.wall_state = layout.wall_state
+        self.regular_order = layout.regular_order
+        self.regular_head = 0
+        self.wang_order = layout.wang_order
+        self.wang_cycle_start = layout.wang_cycle_start
+        self.wang_tail = 0
+        
+        if self.verbose:
+            print(f"[DEBUG] 일반패 시작: {self._position_label(self.regular_order, 0)}")
+            print(f"[DEBUG] 왕패 시작: {self._position_label(self.wang_order, 0)}")
     
     def draw_regular_tile(self):
         """일반 패산에서 패 뽑기 - 한국 마작 방식"""
-        if len(self.dealt_tiles) >= len(self.wall_tiles):
-            print(f"[DEBUG] 모든 패가 뽑힘")
+        if self.dealt_count >= len(self.wall_tiles):
+            if self.verbose:
+                print(f"[DEBUG] 모든 패가 뽑힘")
             return None
         
-        # 현재 위치에서 패 뽑기
-        max_attempts = 104  # 무한루프 방지
-        for attempt in range(max_attempts):
-            # 현재 위치의 패 확인
-            pos_key = (self.current_wall, self.current_stack, self.current_layer)
-            if pos_key not in self.wall_state:
-                print(f"[DEBUG] 잘못된 위치: {pos_key}")
-                return None
-            
-            tile_index = self.wall_state[pos_key]
-            
-            # 이미 뽑힌 패가 아니면 뽑기
-            if tile_index not in self.dealt_tiles:
-                tile = self.wall_tiles[tile_index]
-                self.dealt_tiles.add(tile_index)
-                
-                print(f"[DEBUG] 일반패 뽑음: {self.current_wall}면 {self.current_stack}스택 {self.current_layer}층 → {tile} (인덱스={tile_index})")
-                
-                # 다음 위치로 이동
-                self._advance_regular_position()
-                return tile, tile_index
-            
-            # 이미 뽑힌 패면 다음 위치로 이동
-            self._advance_regular_position()
+        # 왕패로 이미 뽑힌 칸은 건너뛰기 (지나간 칸은 모두 뽑힌 상태)
+        order = self.regular_order
+        head = self.regular_head
+        while head < len(order) and self.dealt_mask >> order[head] & 1:
+            head += 1
+        if head >= len(order):
+            self.regular_head = head
+            return None
         
-        print(f"[DEBUG] 일반패 뽑기 실패 - 최대 시도 횟수 초과")
-        return None
+        tile_index = order[head]
+        self.regular_head = head + 1
+        return self._take_tile(tile_index, "일반패")
     
     def draw_wang_tile(self):
         """왕패에서 패 뽑기 (꽃패 보충용) - 한국 마작 방식"""
-        if len(self.dealt_tiles) >= len(self.wall_tiles):
-            print(f"[DEBUG] 모든 패가 뽑힘")
+        if self.dealt_count >= len(self.wall_tiles):
+            if self.verbose:
+                print(f"[DEBUG] 모든 패가 뽑힘")
             return None
         
-        # 현재 위치에서 패 뽑기
-        max_attempts = 200  # 무한루프 방지
-        for attempt in range(max_attempts):
-            # 현재 위치의 패 확인
-            pos_key = (self.wang_wall, self.wang_stack, self.wang_layer)
-            if pos_key not in self.wall_state:
-                print(f"[DEBUG] 잘못된 왕패 위치: {pos_key}")
-                return None
-            
-            tile_index = self.wall_state[pos_key]
-            
-            # 이미 뽑힌 패가 아니면 뽑기
-            if tile_index not in self.dealt_tiles:
-                tile = self.wall_tiles[tile_index]
-                self.dealt_tiles.add(tile_index)
-                
-                print(f"[DEBUG] 왕패 뽑음: {self.wang_wall}면 {self.wang_stack}스택 {self.wang_layer}층 → {tile} (인덱스={tile_index})")
-                
-                # 다음 위치로 이동
-                self._advance_wang_position()
-                return tile, tile_index
-            
-            # 이미 뽑힌 패면 다음 위치로 이동
-            self._advance_wang_position()
-        
-        print(f"[DEBUG] 왕패 뽑기 실패 - 최대 시도 횟수 초과")
-        return None
-    
-    def _advance_regular_position(self):
-        """일반패 뽑기 위치를 다음으로 이동 (2층→1층→다음스택 2층→1층...)"""
-        if self.current_layer == 1:
-            # 위층에서 아래층으로
-            self.current_layer = 0
-        else:
-            # 아래층에서 다음 스택의 위층으로
-            self.current_layer = 1
-            
-            # 현재 면에서 다음 스택으로 이동
-            next_stack = self._get_next_stack_in_wall(self.current_wall, self.current_stack)
-            
-            if next_stack is not None:
-                # 같은 면 내에서 다음 스택으로 이동
-                self.current_stack = next_stack
-            else:
-                # 현재 면이 끝났으므로 다음 면으로 이동
-                self._move_to_next_wall()
-                self.current_stack = self._get_first_stack_in_wall(self.current_wall)
-    
-    def _get_next_stack_in_wall(self, wall, current_stack):
-        """현재 면에서 시계방향으로 다음 스택 반환 (None이면 면 끝)"""
-        screen_pos = self.direction_to_screen[wall]
-        start, end, direction = self.SCREEN_STACK_DIRECTIONS[screen_pos]
-        
-        next_stack = current_stack + direction
+        order = self.wang_order
+        if not order:
+            return None
         
-        if direction > 0:  # 증가 방향
-            return next_stack if next_stack <= end else None
-        else:  # 감소 방향
-            return next_stack if next_stack >= end else None
-    
-    def _get_first_stack_in_wall(self, wall):
-        """각 면의 시계방향 첫 번째 스택 반환"""
-        screen_pos = self.direction_to_screen[wall]
-        start, end, direction = self.SCREEN_STACK_DIRECTIONS[screen_pos]
-        return start
-    
-    def _advance_wang_position(self):
-        """왕패 뽑기 위치를 다음으로 이동 (일반패의 정확한 반대 - 반시계방향)"""
-        if self.wang_layer == 1:
-            # 위층에서 아래층으로
-            self.wang_layer = 0
+        # 이미 뽑힌 칸은 건너뛰기 (경로 끝이면 반복 구간 처음으로)
+        tail = self.wang_tail
+        for _ in range(len(order)):
+            if not self.dealt_mask >> order[tail] & 1:
+                break
+            tail = tail + 1 if tail + 1 < len(order) else self.wang_cycle_start
         else:
-            # 아래층에서 이전 스택의 위층으로 (반시계방향)
-            self.wang_layer = 1
-            
-            # 현재 면에서 반시계방향으로 이전 스택으로 이동
-            prev_stack = self._get_counter_clockwise_prev_stack(self.wang_wall, self.wang_stack)
-            
-            if prev_stack is not None:
-                # 같은 면 내에서 이전 스택으로 이동
-                self.wang_stack = prev_stack
-            else:
-                # 현재 면이 끝났으므로 이전 면으로 이동 (반시계방향)
-                self._move_wang_to_counter_clockwise_prev_wall()
-                new_stack = self._get_counter_clockwise_last_stack(self.wang_wall)
-                
-                # 스택 범위 검증
-                if 0 <= new_stack <= 12:
-                    self.wang_stack = new_stack
-                else:
-                    print(f"[DEBUG] 왕패 스택 범위 오류: {new_stack}, 0으로 설정")
-                    self.wang_stack = 0
-    
-    def _get_counter_clockwise_prev_stack(self, wall, current_stack):
-        """현재 면에서 반시계방향으로 이전 스택 반환 (None이면 면 끝)"""
-        screen_pos = self.direction_to_screen[wall]
-        start, end, direction = self.SCREEN_STACK_DIRECTIONS[screen_pos]
-        
-        # 반시계방향이므로 방향을 반대로
-        wang_direction = -direction
-        prev_stack = current_stack + wang_direction
+            if self.verbose:
+                print(f"[DEBUG] 왕패 뽑기 실패 - 남은 왕패 없음")
+            return None
         
-        if wang_direction > 0:  # 증가 방향
-            return prev_stack if prev_stack <= end else None
-        else:  # 감소 방향
-            return prev_stack if prev_stack >= start else None
+        tile_index = order[tail]
+        self.wang_tail = tail + 1 if tail + 1 < len(order) else self.wang_cycle_start
+        return self._take_tile(tile_index, "왕패")
     
-    def _get_counter_clockwise_last_stack(self, wall):
-        """각 면의 반시계방향 마지막 스택 반환"""
-        screen_pos = self.direction_to_screen[wall]
-        start, end, direction = self.SCREEN_STACK_DIRECTIONS[screen_pos]
-        
-        # 반시계방향이므로 시계방향의 반대 끝점부터 시작
-        # 시계방향이 start→end라면, 반시계방향은 end→start
-        return end if direction > 0 else start
-    
-    def _move_to_next_wall(self):
-        """다음 면으로 이동 (화면 시계방향)"""
-        current_screen_pos = self.direction_to_screen[self.current_wall]
-        current_index = self.SCREEN_CLOCKWISE_ORDER.index(current_screen_pos)
-        next_index = (current_index + 1) % 4
-        next_screen_pos = self.SCREEN_CLOCKWISE_ORDER[next_index]
-        self.current_wall = self.screen_to_direction[next_screen_pos]
-        print(f"[DEBUG] 다음 면으로 이동: {self.current_wall}")
-    
-    def _move_wang_to_counter_clockwise_prev_wall(self):
-        """왕패 이전 면으로 이동 (화면 반시계방향)"""
-        current_screen_pos = self.direction_to_screen[self.wang_wall]
-        current_index = self.SCREEN_CLOCKWISE_ORDER.index(current_screen_pos)
-        prev_index = (current_index - 1) % 4
-        prev_screen_pos = self.SCREEN_CLOCKWISE_ORDER[prev_index]
-        self.wang_wall = self.screen_to_direction[prev_screen_pos]
-        print(f"[DEBUG] 왕패 이전 면으로 이동: {self.wang_wall}")
-    
-    def _move_wang_to_counter_clockwise_previous(self):
-        """왕패 위치를 일반패 시작 위치에서 반시계방향으로 한 위치 이전으로 이동"""
-        print(f"[DEBUG] 왕패 초기 위치 조정 시작: {self.wang_wall}면 {self.wang_stack}스택")
-        
-        # 현재 면에서 반시계방향으로 이전 스택으로 이동
-        prev_stack = self._get_counter_clockwise_prev_stack(self.wang_wall, self.wang_stack)
-        
-        if prev_stack is not None:
-            # 같은 면 내에서 이전 스택으로 이동
-            self.wang_stack = prev_stack
-            print(f"[DEBUG] 같은 면 내 이전 스택으로 이동: {self.wang_stack}")
-        else:
-            # 현재 면이 끝났으므로 이전 면으로 이동 (반시계방향)
-            print(f"[DEBUG] 면 끝 도달, 이전 면으로 이동")
-            self._move_wang_to_counter_clockwise_prev_wall()
-            new_stack = self._get_counter_clockwise_last_stack(self.wang_wall)
-            
-            # 스택 범위 검증
-            if 0 <= new_stack <= 12:
-                self.wang_stack = new_stack
-            else:
-                print(f"[DEBUG] 왕패 초기 스택 범위 오류: {new_stack}, 12로 설정")
-                self.wang_stack = 12
-            print(f"[DEBUG] 새 면의 마지막 스택: {self.wang_stack}")
-        
-        print(f"[DEBUG] 왕패 초기 위치 조정 완료: {self.wang_wall}면 {self.wang_stack}스택")
+    def _take_tile(self, tile_index, label):
+        """패 인덱스를 뽑힌 것으로 표시하고 (패, 인덱스) 반환"""
+        tile = self.wall_tiles[tile_index]
+        self.dealt_mask |= 1 << tile_index
+        self.dealt_count += 1
+        if self.verbose:
+            wall, stack, layer = self.layout.index_positions[tile_index]
+            print(f"[DEBUG] {label} 뽑음: {wall}면 {stack}스택 {layer}층 → {tile} (인덱스={tile_index})")
+        return tile, tile_index
     
     def get_remaining_tiles_count(self):
         """남은 패 수 반환"""
-        return len(self.wall_tiles) - len(self.dealt_tiles)
+        return len(self.wall_tiles) - self.dealt_count
+    
+    def get_tile_screen_position(self, tile_index):
+        """패 인덱스의 화면 좌표와 화면 위치 (x, y, screen_pos)"""
+        x, y = WALL_TILE_COORDS[tile_index]
+        return x, y, WALL_TILE_SCREENS[tile_index]
     
     def is_tile_dealt(self, wall, stack, layer):
         """특정 위치의 패가 뽑혔는지 확인"""
@@ -338,112 +411,33 @@ class WallManager:
             return True  # 잘못된 위치는 뽑힌 것으로 간주
         
         tile_index = self.wall_state[pos_key]
-        return tile_index in self.dealt_tiles
+        return bool(self.dealt_mask >> tile_index & 1)
     
     def render_wall(self, player_directions):
-        """패산 렌더링 - 현재 패산 상태 기반"""
-        remaining_tiles = self.get_remaining_tiles_count()
-        if remaining_tiles <= 0:
+        """패산 렌더링 - 뽑히지 않은 패의 스프라이트를 모아 한 번에 blits"""
+        if self.layout is None or self.get_remaining_tiles_count() <= 0:
             return
         
-        # 각 화면 위치별로 패산 렌더링
-        for screen_pos in ['bottom', 'top', 'left', 'right']:
-            wall_direction = self.screen_to_direction.get(screen_pos)
-            if wall_direction:
-                self._render_wall_side(screen_pos, wall_direction)
-    
-    def _render_wall_side(self, screen_pos, wall_direction):
-        """특정 면의 패산 렌더링"""
-        wall_tile_size = TILE_SIZE_DISCARD
-        stacks_per_side = self.STACKS_PER_WALL
-        
-        # 화면 위치별 렌더링 좌표 계산
-        if screen_pos == 'bottom':
-            start_x = TABLE_CENTER_X - (stacks_per_side * (wall_tile_size[0] + 1)) // 2
-            start_y = SCREEN_HEIGHT - 220
-            dx, dy = wall_tile_size[0] + 1, 0
-            rotate_angle = 0
-        elif screen_pos == 'top':
-            start_x = TABLE_CENTER_X - (stacks_per_side * (wall_tile_size[0] + 1)) // 2
-            start_y = 125
-            dx, dy = wall_tile_size[0] + 1, 0
-            rotate_angle = 0
-        elif screen_pos == 'right':
-            # 좌측과 대칭으로 우측 패산 위치 설정
-            start_x = SCREEN_WIDTH - 280 - wall_tile_size[1]  # 좌측 280과 대칭
-            start_y = TABLE_CENTER_Y - (stacks_per_side * (wall_tile_size[0] + 1)) // 2 - (wall_tile_size[0] // 2)
-            dx, dy = 0, wall_tile_size[0] + 1
-            rotate_angle = 90
-        elif screen_pos == 'left':
-            start_x = 280
-            start_y = TABLE_CENTER_Y - (stacks_per_side * (wall_tile_size[0] + 1)) // 2 - (wall_tile_size[0] // 2)
-            dx, dy = 0, wall_tile_size[0] + 1
-            rotate_angle = -90
-        
-        # 각 스택 렌더링
-        for stack_idx in range(stacks_per_side):
-            stack_x = start_x + stack_idx * dx
-            stack_y = start_y + stack_idx * dy
-            
-            for layer in range(2):
-                # 해당 위치의 패가 뽑혔는지 확인
-                if self.is_tile_dealt(wall_direction, stack_idx, layer):
-                    continue  # 뽑힌 패는 렌더링하지 않음
-                
-                # 패 렌더링
-                tile_x = stack_x - layer * 2
-                tile_y = stack_y - layer * 4
-                
-                # 패산 색상 및 패턴
-                color_idx = (stack_idx + layer) % 6
-                wall_color = self._get_wall_color(color_idx)
-                
-                tile_surface = pygame.Surface(wall_tile_size)
-                tile_surface.fill(wall_color)
-                pygame.draw.rect(tile_surface, (30, 30, 30), tile_surface.get_rect(), 2)
-                
-                # 패턴 추가
-                pattern_size = 4
-                for px in range(3):
-                    for py in range(4):
-                        pattern_x = 8 + px * 10
-                        pattern_y = 8 + py * 10
-                        if pattern_x < wall_tile_size[0] - 8 and pattern_y < wall_tile_size[1] - 8:
-                            pattern_rect = pygame.Rect(pattern_x, pattern_y, pattern_size, pattern_size)
-                            pygame.draw.rect(tile_surface, (200, 200, 200), pattern_rect)
-                
-                # 그림자 효과 (아래층만)
-                if layer == 0:
-                    shadow_surface = pygame.Surface(wall_tile_size)
-                    shadow_surface.fill((20, 20, 20))
-                    shadow_surface.set_alpha(80)
-                    if rotate_angle != 0:
-                        shadow_surface = pygame.transform.rotate(shadow_surface, rotate_angle)
-                    self.screen.blit(shadow_surface, (tile_x + 3, tile_y + 3))
-                
-                # 회전 적용
-                if rotate_angle != 0:
-                    tile_surface = pygame.transform.rotate(tile_surface, rotate_angle)
-                
-                self.screen.blit(tile_surface, (tile_x, tile_y))
+        dealt_mask = self.dealt_mask
+        sprites = []
+        for tile_index, tile_sprites in get_wall_sprite_entries():
+            if not dealt_mask >> tile_index & 1:
+                sprites.extend(tile_sprites)
+        self.render_batch.extend('wall', sprites)
+        self.render_batch.flush('wall')
     
-    def _get_wall_color(self, color_index):
-        """패산 색상 반환"""
-        wall_colors = [
-            (100, 50, 50),    # 어두운 적색
-            (50, 100, 50),    # 어두운 녹색
-            (50, 50, 100),    # 어두운 청색
-            (100, 100, 50),   # 어두운 황색
-            (100, 50, 100),   # 어두운 자색
-            (50, 100, 100),   # 어두운 청록색
-        ]
-        return wall_colors[color_index]
+    def _position_label(self, order, pointer):
+        """뽑기 순서 배열의 포인터 위치를 '면 스택 층' 문자열로"""
+        if pointer >= len(order):
+            return "없음"
+        wall, stack, layer = self.layout.index_positions[order[pointer]]
+        return f"{wall}면 {stack}스택 {layer}층"
     
     def get_debug_info(self):
         """디버그 정보 반환"""
         return {
             'remaining_tiles': self.get_remaining_tiles_count(),
-            'dealt_tiles': len(self.dealt_tiles),
-            'current_position': f"{self.current_wall}면 {self.current_stack}스택 {self.current_layer}층",
-            'wang_position': f"{self.wang_wall}면 {self.wang_stack}스택 {self.wang_layer}층"
+            'dealt_tiles': self.dealt_count,
+            'current_position': self._position_label(self.regular_order, self.regular_head),
+            'wang_position': self._position_label(self.wang_order, self.wang_tail)
         } 
\ No newline at end of file